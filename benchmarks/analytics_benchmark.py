@@ -0,0 +1,146 @@
+"""
+DuckDB analitik motoru için karşılaştırma betiği.
+
+Bu betik sentetik bir yıllık veritabanı üretir, tabloları Parquet arşivine
+aktarır ve standart rapor sorgularını SQLite ile DuckDB (Parquet arşivi ve,
+eklenti yüklenebiliyorsa, doğrudan SQLite dosyası) üzerinde çalıştırır.
+
+Kullanım:
+    python benchmarks/analytics_benchmark.py [--days 365] [--repeat 3]
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import sqlite3
+import argparse
+import tempfile
+import datetime
+from sqlalchemy import create_engine
+
+# Modül yolunu ekle (veri işleme modülü src dizinini kök olarak kullanır)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from data_collection.database import Base, WindowActivity, KeyboardActivity, BrowserActivity, create_read_engine
+from data_processing.export import export_table, output_path
+from data_processing.analytics import AnalyticsEngine, AnalyticsUnavailable, SOURCE_PARQUET, SOURCE_SQLITE
+
+APPS = ["code.exe", "chrome.exe", "slack.exe", "spotify.exe", "explorer.exe", "outlook.exe", "word.exe", "excel.exe"]
+DOMAINS = [f"site{index}.com" for index in range(200)]
+
+# DuckDB rapor sorgularının SQLite karşılıkları
+SQLITE_QUERIES = {
+    'domain_distribution': """
+        SELECT domain, strftime('%Y-%m', timestamp) AS month, sum(duration) AS seconds, count(*) AS visits
+        FROM browser_activities WHERE timestamp >= :start AND timestamp < :end
+        GROUP BY domain, month ORDER BY month, seconds DESC
+    """,
+    'typing_intensity': """
+        SELECT w.application_name, sum(k.key_count) AS keys,
+               count(DISTINCT strftime('%Y-%m-%d %H:%M', k.timestamp)) AS active_minutes
+        FROM keyboard_activities k JOIN window_activities w ON w.id = k.window_id
+        WHERE k.timestamp >= :start AND k.timestamp < :end
+        GROUP BY w.application_name ORDER BY keys DESC
+    """,
+    'app_weekday_hours': """
+        SELECT application_name, strftime('%w', timestamp) AS weekday, strftime('%H', timestamp) AS hour,
+               sum(duration) AS seconds
+        FROM window_activities WHERE timestamp >= :start AND timestamp < :end
+        GROUP BY application_name, weekday, hour ORDER BY application_name, weekday, hour
+    """,
+    'daily_app_totals': """
+        SELECT date(timestamp) AS day, application_name, sum(duration) AS seconds
+        FROM window_activities WHERE timestamp >= :start AND timestamp < :end
+        GROUP BY day, application_name ORDER BY day, seconds DESC
+    """,
+}
+
+def build_database(path, days):
+    """Sentetik pencere, klavye ve tarayıcı kayıtları üret.
+
+    Returns:
+        datetime.datetime: Verinin başlangıcı.
+    """
+    rng = random.Random(42)
+    engine = create_engine(f'sqlite:///{path}')
+    Base.metadata.create_all(engine)
+    started = datetime.datetime(2024, 1, 1)
+    windows, keyboards, pages = [], [], []
+    for day in range(days):
+        moment = started + datetime.timedelta(days=day, hours=9)
+        finish = moment + datetime.timedelta(hours=9)
+        while moment < finish:
+            duration = rng.randint(30, 600)
+            windows.append({'id': len(windows) + 1, 'timestamp': moment, 'application_name': rng.choice(APPS),
+                            'duration': duration, 'session_id': 1})
+            for minute in range(0, duration, 60):
+                keyboards.append({'timestamp': moment + datetime.timedelta(seconds=minute), 'key_count': rng.randint(0, 200),
+                                  'window_id': len(windows), 'session_id': 1})
+            if windows[-1]['application_name'] == "chrome.exe":
+                domain = rng.choice(DOMAINS)
+                pages.append({'timestamp': moment, 'domain': domain, 'url': f"https://{domain}/", 'duration': duration,
+                              'session_id': 1})
+            moment += datetime.timedelta(seconds=duration)
+    with engine.begin() as connection:
+        connection.execute(WindowActivity.__table__.insert(), windows)
+        connection.execute(KeyboardActivity.__table__.insert(), keyboards)
+        connection.execute(BrowserActivity.__table__.insert(), pages)
+    engine.dispose()
+    print(f"{days} gün: {len(windows)} pencere, {len(keyboards)} klavye, {len(pages)} tarayıcı kaydı")
+    return started
+
+def timed(function, repeat):
+    """Fonksiyonun en iyi çalışma süresini ve sonucunu döndür."""
+    best, result = None, None
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - begin
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    """Ana fonksiyon."""
+    parser = argparse.ArgumentParser(description='DuckDB ve SQLite rapor sorgusu karşılaştırması')
+    parser.add_argument('--days', type=int, default=365, help='Sentetik veri gün sayısı')
+    parser.add_argument('--repeat', type=int, default=3, help='Sorgu başına tekrar sayısı')
+    args = parser.parse_args()
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(temp_dir, 'activity.db')
+        started = build_database(db_path, args.days)
+        start, end = started, started + datetime.timedelta(days=args.days)
+
+        read_engine = create_read_engine(db_path, pool_size=1)
+        with read_engine.connect() as connection:
+            for table_name in ('window_activities', 'keyboard_activities', 'browser_activities'):
+                export_table(connection, table_name, output_path(temp_dir, table_name, 'parquet'), 'parquet')
+        read_engine.dispose()
+
+        engines = {'DuckDB/Parquet': AnalyticsEngine(SOURCE_PARQUET, parquet_dir=temp_dir)}
+        try:
+            engines['DuckDB/SQLite'] = AnalyticsEngine(SOURCE_SQLITE, database_path=db_path)
+        except AnalyticsUnavailable as e:
+            print(f"DuckDB sqlite eklentisi kullanılamıyor, atlanıyor: {e}".splitlines()[0])
+
+        sqlite = sqlite3.connect(db_path)
+        parameters = {'start': str(start), 'end': str(end)}
+        print(f"{'Sorgu':<22}{'SQLite':>12}" + ''.join(f"{name:>18}" for name in engines))
+        for name, sql in SQLITE_QUERIES.items():
+            baseline, rows = timed(lambda: sqlite.execute(sql, parameters).fetchall(), args.repeat)
+            line = f"{name:<22}{baseline * 1000:>10.1f}ms"
+            for engine in engines.values():
+                elapsed, table = timed(lambda: engine.report(name, start, end), args.repeat)
+                assert table.num_rows == len(rows), f"{name}: {table.num_rows} != {len(rows)}"
+                line += f"{elapsed * 1000:>10.1f}ms ({baseline / elapsed:4.1f}x)"
+            print(line)
+        sqlite.close()
+        for engine in engines.values():
+            engine.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
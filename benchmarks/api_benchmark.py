@@ -0,0 +1,156 @@
+"""
+Yerel okuma API'si için yük testi.
+
+Bu betik, sentetik bir veritabanı üzerinde API'yi uvicorn ile başlatır ve
+eşzamanlı istemcilerle toplam, zaman çizelgesi ve arama uç noktalarına
+istek gönderir. İlk tur tam yanıtları, ikinci tur If-None-Match ile 304
+yanıtlarını ölçer.
+
+Kullanım:
+    python benchmarks/api_benchmark.py [--days 30] [--clients 8] [--requests 400]
+"""
+import os
+import sys
+import time
+import socket
+import random
+import shutil
+import argparse
+import tempfile
+import datetime
+import threading
+import statistics
+import concurrent.futures
+import requests
+from sqlalchemy import create_engine
+
+# Modül yolunu ekle (API modülü src dizinini kök olarak kullanır)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from data_collection.database import Base, WindowActivity, TimelineSegment, create_read_engine
+from data_collection.write_path import rollup_contributions, apply_rollups, write_commit_watermark
+from content_publishing.api import create_app
+
+APPS = ["code.exe", "chrome.exe", "slack.exe", "spotify.exe", "explorer.exe", "outlook.exe"]
+
+def build_database(path, days):
+    """Sentetik pencere, zaman çizelgesi ve toplam kayıtları üret.
+
+    Args:
+        path: Veritabanı dosyası.
+        days: Gün sayısı.
+
+    Returns:
+        datetime.datetime: Verinin başlangıcı.
+    """
+    rng = random.Random(42)
+    engine = create_engine(f'sqlite:///{path}')
+    Base.metadata.create_all(engine)
+    started = datetime.datetime(2024, 1, 1)
+    windows, segments = [], []
+    moment = started
+    while moment < started + datetime.timedelta(days=days):
+        duration = rng.randint(5, 300)
+        app = rng.choice(APPS)
+        windows.append({'timestamp': moment, 'application_name': app, 'window_title': f"{app} belge {rng.randint(1, 500)}",
+                        'duration': duration, 'session_id': 1})
+        segments.append({'start_time': moment, 'end_time': moment + datetime.timedelta(seconds=duration),
+                         'duration': duration, 'application_name': app})
+        moment += datetime.timedelta(seconds=duration)
+    with engine.begin() as connection:
+        connection.execute(WindowActivity.__table__.insert(), windows)
+        connection.execute(TimelineSegment.__table__.insert(), segments)
+        totals, _ = rollup_contributions([WindowActivity(**row) for row in windows])
+        apply_rollups(connection, totals)
+    engine.dispose()
+    print(f"{days} gün için {len(windows)} pencere kaydı üretildi")
+    return started
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def run_round(base_url, paths, clients, total, etags=None):
+    """Eşzamanlı istek turu çalıştır.
+
+    Returns:
+        tuple: (süre, gecikme listesi, durum kodu → sayı, yol → ETag).
+    """
+    local = threading.local()
+    found_etags = {}
+
+    def fetch(index):
+        http = getattr(local, 'http', None)
+        if http is None:
+            http = local.http = requests.Session()
+        path = paths[index % len(paths)]
+        headers = {'If-None-Match': etags[path]} if etags and path in etags else {}
+        begin = time.perf_counter()
+        response = http.get(base_url + path, headers=headers)
+        _ = response.content
+        elapsed = time.perf_counter() - begin
+        found_etags[path] = response.headers.get('etag')
+        return response.status_code, elapsed
+
+    begin = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=clients) as executor:
+        results = list(executor.map(fetch, range(total)))
+    duration = time.perf_counter() - begin
+    statuses = {}
+    for status, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    return duration, [elapsed for _, elapsed in results], statuses, found_etags
+
+def report(title, duration, latencies, statuses, total):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{title}: {total / duration:,.0f} istek/s, p50 {statistics.median(latencies) * 1000:.1f} ms, "
+          f"p95 {p95 * 1000:.1f} ms, durumlar {statuses}")
+
+def main():
+    """Ana fonksiyon."""
+    parser = argparse.ArgumentParser(description='Yerel okuma API\'si yük testi')
+    parser.add_argument('--days', type=int, default=30, help='Sentetik veri gün sayısı')
+    parser.add_argument('--clients', type=int, default=8, help='Eşzamanlı istemci sayısı')
+    parser.add_argument('--requests', type=int, default=400, help='Tur başına istek sayısı')
+    args = parser.parse_args()
+
+    import uvicorn
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(temp_dir, 'activity.db')
+        watermark_path = db_path + '.watermark'
+        started = build_database(db_path, args.days)
+        write_commit_watermark(watermark_path)
+
+        read_engine = create_read_engine(db_path, pool_size=args.clients)
+        port = free_port()
+        server = uvicorn.Server(uvicorn.Config(create_app(read_engine, watermark_path), host='127.0.0.1', port=port,
+                                               log_level='warning'))
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.05)
+
+        end = started + datetime.timedelta(days=args.days)
+        day = f"start={started.isoformat()}&end={(started + datetime.timedelta(days=1)).isoformat()}"
+        month = f"start={started.isoformat()}&end={end.isoformat()}"
+        paths = [f"/aggregates/app?{month}", f"/aggregates/category?{day}", f"/timeline?{day}",
+                 f"/search?q=belge%2042&{month}"]
+        base_url = f"http://127.0.0.1:{port}"
+
+        duration, latencies, statuses, etags = run_round(base_url, paths, args.clients, args.requests)
+        report("Tam yanıtlar", duration, latencies, statuses, args.requests)
+        duration, latencies, statuses, _ = run_round(base_url, paths, args.clients, args.requests, etags)
+        report("ETag (304)  ", duration, latencies, statuses, args.requests)
+
+        server.should_exit = True
+        thread.join()
+        read_engine.dispose()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Dosya yolu filtresi için performans ölçümü.
+
+Bu betik, 1 milyon sentetik dosya yolunu eski satır içi kontrollerden ve
+derlenmiş PathFilter zincirinden geçirerek süreleri karşılaştırır.
+
+Kullanım:
+    python benchmarks/path_filter_benchmark.py [--count 1000000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_collection.path_filter import PathFilter
+
+IGNORED_PATTERNS = ["*.tmp", "~$*", "*.swp", "*~", "*.db-journal"]
+
+def build_paths(count, home):
+    """Sentetik dosya yolları üret.
+
+    Args:
+        count: Üretilecek yol sayısı.
+        home: Sentetik kullanıcı dizini.
+
+    Returns:
+        list: Dosya yolları.
+    """
+    rng = random.Random(42)
+    roots = ["Desktop", "Documents", "Downloads", os.path.join("Documents", "Private"), os.path.join("Projects", "ActivityTracker", "data")]
+    folders = ["src", "notes", "photos", "node_modules", "build", "reports", "2024", "misc"]
+    names = ["report.docx", "notes.txt", "~$report.docx", "image.png", "main.py", "cache.tmp", ".main.py.swp", "data.db-journal", "draft.md~"]
+    paths = []
+    for _ in range(count):
+        parts = [home, rng.choice(roots)]
+        for _ in range(rng.randint(0, 4)):
+            parts.append(rng.choice(folders))
+        parts.append(rng.choice(names))
+        paths.append(os.path.join(*parts))
+    return paths
+
+def legacy_filter(paths, project_dir, db_file_path, excluded):
+    """FileTracker.add_file_event içindeki eski kontrol dizisini uygula."""
+    accepted = 0
+    for file_path in paths:
+        abs_file_path = os.path.abspath(file_path)
+        if os.path.commonpath([abs_file_path, project_dir]) == project_dir:
+            continue
+        if abs_file_path == db_file_path or (
+            os.path.dirname(abs_file_path) == os.path.dirname(db_file_path) and
+            abs_file_path.endswith('.db')
+        ):
+            continue
+        if any(abs_file_path.startswith(item) for item in excluded):
+            continue
+        _, file_extension = os.path.splitext(abs_file_path)
+        file_extension = file_extension.lower().lstrip('.')
+        accepted += 1
+    return accepted
+
+def compiled_filter(paths, path_filter):
+    """Derlenmiş filtre zincirini uygula."""
+    accepted = 0
+    match = path_filter.match
+    for file_path in paths:
+        if match(file_path) is not None:
+            accepted += 1
+    return accepted
+
+def main():
+    """Ana fonksiyon."""
+    parser = argparse.ArgumentParser(description='Dosya yolu filtresi performans ölçümü')
+    parser.add_argument('--count', type=int, default=1000000, help='Üretilecek yol sayısı')
+    args = parser.parse_args()
+
+    home = os.path.abspath(os.path.join(os.sep, "home", "user"))
+    project_dir = os.path.join(home, "Projects", "ActivityTracker")
+    db_file_path = os.path.join(project_dir, "data", "activity_data.db")
+    excluded = [os.path.join(home, "Documents", "Private")] + [os.path.join(home, f"Excluded{i}") for i in range(20)]
+
+    paths = build_paths(args.count, home)
+    print(f"{len(paths)} sentetik yol üretildi")
+
+    start = time.perf_counter()
+    legacy_accepted = legacy_filter(paths, project_dir, db_file_path, excluded)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    path_filter = PathFilter(
+        excluded_roots=excluded,
+        ignored_patterns=IGNORED_PATTERNS,
+        own_dirs=[project_dir],
+        own_files=[db_file_path]
+    )
+    compiled_accepted = compiled_filter(paths, path_filter)
+    compiled_time = time.perf_counter() - start
+
+    print(f"Eski kontroller:    {legacy_time:.2f}s ({len(paths) / legacy_time:,.0f} yol/s), kabul edilen {legacy_accepted}")
+    print(f"Derlenmiş filtre:   {compiled_time:.2f}s ({len(paths) / compiled_time:,.0f} yol/s), kabul edilen {compiled_accepted}")
+    print(f"Hızlanma: {legacy_time / compiled_time:.1f}x (derlenmiş filtre geçici dosyaları da eler)")
+
+if __name__ == '__main__':
+    main()
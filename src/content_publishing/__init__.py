@@ -0,0 +1,7 @@
+"""
+İçerik Yayınlama Modülü.
+
+Bu modül, toplanan verileri yerel API ve yayınlanan içerikler aracılığıyla sunan bileşenleri içerir.
+"""
+
+__version__ = '0.1.0'
@@ -0,0 +1,304 @@
+"""
+Yerel okuma API'si.
+
+Bu modül, aktivite veritabanını yalnızca localhost üzerinden okunabilir
+şekilde sunar. Sorgular salt okunur, havuzlu bir motorla çalışır; büyük
+sonuçlar NDJSON olarak akıtılır. ETag ve Last-Modified değerleri yazıcının
+commit işaretinden üretilir, böylece veri değişmediyse 304 yanıtı SQLite'a
+hiç dokunmadan döner.
+
+Bir olay yolu verildiğinde (izleyici sürecinde çalışırken) canlı olaylar
+SSE ve WebSocket üzerinden, veritabanı okunmadan istemcilere iletilir.
+"""
+import json
+import time
+import asyncio
+import threading
+import hashlib
+import logging
+import datetime
+from email.utils import formatdate, parsedate_to_datetime
+from fastapi import FastAPI, Request, Query, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import select, or_
+from sqlalchemy.orm import sessionmaker
+
+from data_collection.config import (
+    DATABASE_PATH, API_HOST, API_PORT, API_POOL_SIZE, COMMIT_WATERMARK_FILE, LIVE_STREAM_BUFFER_SIZE
+)
+from data_collection.event_bus import EVENT_TYPES
+from data_collection.database import (
+    create_read_engine, ActivitySession, WindowActivity, BrowserActivity, TimelineSegment
+)
+from data_collection.write_path import (
+    read_commit_watermark, get_rollup_totals,
+    DIMENSION_TOTAL, DIMENSION_APP, DIMENSION_DOMAIN, DIMENSION_CATEGORY, DIMENSION_GAME
+)
+from data_processing.query_cache import get_query_cache
+
+logger = logging.getLogger(__name__)
+
+DIMENSIONS = (DIMENSION_TOTAL, DIMENSION_APP, DIMENSION_DOMAIN, DIMENSION_CATEGORY, DIMENSION_GAME)
+
+# Akıtılan sonuçlarda tek seferde okunan satır sayısı
+STREAM_CHUNK_SIZE = 1000
+
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+
+# Canlı akışta olay gelmediğinde bağlantıyı canlı tutma aralığı (saniye)
+LIVE_KEEPALIVE_SECONDS = 15
+
+def _default_range(start, end):
+    """Verilmeyen aralık sınırlarını bugün olarak doldur."""
+    if start is None:
+        start = datetime.datetime.combine(datetime.date.today(), datetime.time.min)
+    if end is None:
+        end = start + datetime.timedelta(days=1)
+    if end <= start:
+        raise HTTPException(status_code=400, detail="Bitiş zamanı başlangıçtan sonra olmalıdır")
+    return start, end
+
+def _escape_like(text):
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def _event_types(types):
+    """Virgülle ayrılmış olay türü filtresini ayrıştır."""
+    if not types:
+        return None
+    selected = {item.strip() for item in types.split(',') if item.strip()}
+    unknown = selected - set(EVENT_TYPES)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Bilinmeyen olay türü: {', '.join(sorted(unknown))}")
+    return selected
+
+def sse_frames(events):
+    """Olayları Server-Sent Events çerçevelerine dönüştür."""
+    return ''.join(
+        f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False, default=str)}\n\n" for event in events
+    )
+
+def create_app(read_engine=None, watermark_path=COMMIT_WATERMARK_FILE, event_bus=None, query_cache=None):
+    """API uygulamasını oluştur.
+
+    Args:
+        read_engine: Salt okunur motor (None ise yapılandırılmış veritabanı için oluşturulur).
+        watermark_path: Yazıcının commit işareti dosyası.
+        event_bus: Canlı olaylar için EventBus (None ise canlı uç noktalar eklenmez).
+        query_cache: Ölçümleri sunulan QueryCache (None ise ilk istekte get_query_cache()).
+
+    Returns:
+        FastAPI: Uygulama.
+    """
+    read_engine = read_engine or create_read_engine(DATABASE_PATH, API_POOL_SIZE)
+    ReadSession = sessionmaker(bind=read_engine)
+    app = FastAPI(title="Activity Tracker API")
+
+    def validators(request):
+        """İsteğin ETag ve Last-Modified değerlerini hesapla.
+
+        Returns:
+            tuple: (başlıklar, 304 yanıtı veya None).
+        """
+        watermark, modified = read_commit_watermark(watermark_path)
+        if watermark is None:
+            return {}, None
+        query = '&'.join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items()))
+        etag = '"' + hashlib.sha1(f"{watermark}|{request.url.path}?{query}".encode('utf-8')).hexdigest() + '"'
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        # Last-Modified saniye çözünürlüğündedir; işaretin saniyesi henüz bitmediyse aynı saniyede
+        # gelecek bir commit ayırt edilemeyeceğinden başlık gönderilmez (doğrulama ETag ile yapılır)
+        if int(modified) < int(time.time()):
+            headers['Last-Modified'] = formatdate(modified, usegmt=True)
+
+        if_none_match = request.headers.get('if-none-match')
+        if if_none_match is not None:
+            if etag in [tag.strip() for tag in if_none_match.split(',')]:
+                return headers, Response(status_code=304, headers=headers)
+            return headers, None
+        if_modified_since = request.headers.get('if-modified-since')
+        if if_modified_since:
+            try:
+                if int(modified) <= parsedate_to_datetime(if_modified_since).timestamp():
+                    return headers, Response(status_code=304, headers=headers)
+            except (TypeError, ValueError):
+                pass
+        return headers, None
+
+    def json_response(request, compute):
+        headers, not_modified = validators(request)
+        if not_modified is not None:
+            return not_modified
+        return Response(json.dumps(compute(), ensure_ascii=False, default=str),
+                        media_type='application/json', headers=headers)
+
+    def ndjson_response(request, statement):
+        headers, not_modified = validators(request)
+        if not_modified is not None:
+            return not_modified
+
+        def rows():
+            with read_engine.connect() as connection:
+                result = connection.execution_options(stream_results=True, yield_per=STREAM_CHUNK_SIZE).execute(statement)
+                for partition in result.mappings().partitions():
+                    yield ''.join(json.dumps(dict(row), ensure_ascii=False, default=str) + '\n' for row in partition)
+
+        return StreamingResponse(rows(), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+    @app.get('/health')
+    def health():
+        watermark, modified = read_commit_watermark(watermark_path)
+        return {'status': 'ok', 'watermark': watermark, 'last_modified': modified}
+
+    @app.get('/cache/metrics')
+    def cache_metrics():
+        return (query_cache or get_query_cache()).stats()
+
+    @app.get('/sessions')
+    def sessions(request: Request, start: datetime.datetime = None, end: datetime.datetime = None):
+        start, end = _default_range(start, end)
+
+        def compute():
+            with ReadSession() as db_session:
+                rows = db_session.execute(
+                    select(ActivitySession.id, ActivitySession.start_time, ActivitySession.end_time, ActivitySession.is_active)
+                    .where(ActivitySession.start_time < end,
+                           or_(ActivitySession.end_time.is_(None), ActivitySession.end_time > start))
+                    .order_by(ActivitySession.start_time)
+                ).mappings().all()
+                return [dict(row) for row in rows]
+
+        return json_response(request, compute)
+
+    @app.get('/timeline')
+    def timeline(request: Request, start: datetime.datetime = None, end: datetime.datetime = None):
+        start, end = _default_range(start, end)
+        columns = [column for column in TimelineSegment.__table__.columns if column.name != 'id']
+        # Bölümler gece yarısında bölündüğü için bir günden uzun olamaz
+        statement = (
+            select(*columns)
+            .where(TimelineSegment.start_time >= start - datetime.timedelta(days=1),
+                   TimelineSegment.start_time < end, TimelineSegment.end_time > start)
+            .order_by(TimelineSegment.start_time)
+        )
+        return ndjson_response(request, statement)
+
+    @app.get('/aggregates/{dimension}')
+    def aggregates(request: Request, dimension: str, start: datetime.datetime = None, end: datetime.datetime = None):
+        if dimension not in DIMENSIONS:
+            raise HTTPException(status_code=404, detail=f"Bilinmeyen boyut: {dimension}")
+        start, end = _default_range(start, end)
+
+        def compute():
+            with ReadSession() as db_session:
+                return get_rollup_totals(db_session, start, end, dimension)
+
+        return json_response(request, compute)
+
+    @app.get('/search')
+    def search(request: Request, q: str = Query(..., min_length=2), start: datetime.datetime = None,
+               end: datetime.datetime = None, limit: int = Query(1000, ge=1, le=100000)):
+        if start is None and end is None:
+            start, end = datetime.datetime.min, datetime.datetime.max
+        start, end = _default_range(start, end)
+        pattern = f"%{_escape_like(q)}%"
+        windows = (
+            select(WindowActivity.timestamp, WindowActivity.application_name.label('source'),
+                   WindowActivity.window_title.label('text'), WindowActivity.duration)
+            .where(WindowActivity.timestamp >= start, WindowActivity.timestamp < end,
+                   WindowActivity.window_title.like(pattern, escape='\\'))
+        )
+        pages = (
+            select(BrowserActivity.timestamp, BrowserActivity.domain.label('source'),
+                   BrowserActivity.title.label('text'), BrowserActivity.duration)
+            .where(BrowserActivity.timestamp >= start, BrowserActivity.timestamp < end,
+                   or_(BrowserActivity.title.like(pattern, escape='\\'), BrowserActivity.url.like(pattern, escape='\\')))
+        )
+        statement = windows.union_all(pages).order_by('timestamp').limit(limit)
+        return ndjson_response(request, statement)
+
+    if event_bus is not None:
+        _add_live_routes(app, event_bus)
+
+    return app
+
+def _add_live_routes(app, event_bus):
+    """Canlı olay uç noktalarını ekle."""
+
+    @app.get('/live')
+    async def live(request: Request, types: str = None):
+        subscription = event_bus.subscribe(LIVE_STREAM_BUFFER_SIZE, _event_types(types), asyncio.get_running_loop())
+
+        async def stream():
+            try:
+                while not subscription.closed and not await request.is_disconnected():
+                    events = await subscription.get_async(LIVE_KEEPALIVE_SECONDS)
+                    yield sse_frames(events) if events else ': keepalive\n\n'
+            finally:
+                subscription.close()
+
+        return StreamingResponse(stream(), media_type='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+    @app.websocket('/live/ws')
+    async def live_ws(websocket: WebSocket, types: str = None):
+        await websocket.accept()
+        subscription = event_bus.subscribe(LIVE_STREAM_BUFFER_SIZE, _event_types(types), asyncio.get_running_loop())
+        disconnected = asyncio.Event()
+
+        async def watch_disconnect():
+            # İstemci ayrıldığında bekleyen okumayı uyandırmak için abonelik kapatılır
+            try:
+                while True:
+                    await websocket.receive_text()
+            except WebSocketDisconnect:
+                disconnected.set()
+            finally:
+                subscription.close()
+
+        watcher = asyncio.ensure_future(watch_disconnect())
+        try:
+            while not subscription.closed:
+                events = await subscription.get_async(LIVE_KEEPALIVE_SECONDS)
+                if events and not disconnected.is_set():
+                    await websocket.send_text(json.dumps(events, ensure_ascii=False, default=str))
+            if not disconnected.is_set():
+                # Yetişemeyen istemcinin bağlantısı kesildi
+                await websocket.close(code=1013)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            watcher.cancel()
+            subscription.close()
+
+    @app.get('/live/metrics')
+    def live_metrics():
+        return event_bus.get_metrics()
+
+def serve(host=API_HOST, port=API_PORT):
+    """API'yi uvicorn ile çalıştır.
+
+    Args:
+        host: Dinlenecek adres (varsayılan yalnızca localhost).
+        port: Dinlenecek port.
+    """
+    import uvicorn
+    logger.info(f"Yerel API başlatılıyor: http://{host}:{port}")
+    uvicorn.run(create_app(), host=host, port=port, log_level='info')
+
+def start_background_server(event_bus, host=API_HOST, port=API_PORT):
+    """API'yi canlı olay uç noktalarıyla birlikte arka plan iş parçacığında başlat.
+
+    İzleyici sürecinde kullanılır; olaylar aynı süreçteki olay yolundan okunur.
+
+    Args:
+        event_bus: İzleyicilerin yayınladığı EventBus.
+        host: Dinlenecek adres.
+        port: Dinlenecek port.
+
+    Returns:
+        uvicorn.Server: Durdurmak için should_exit = True atanabilir.
+    """
+    import uvicorn
+    server = uvicorn.Server(uvicorn.Config(create_app(event_bus=event_bus), host=host, port=port, log_level='warning'))
+    threading.Thread(target=server.run, name='live-api', daemon=True).start()
+    logger.info(f"Canlı olay akışı başlatıldı: http://{host}:{port}/live")
+    return server
@@ -0,0 +1,341 @@
+"""
+Statik Site Yayınlama Modülü.
+
+Bu modül, DailySummary ve zaman çizelgesi verilerinden günlük, haftalık ve
+aylık etkinlik sayfalarını Jinja2 şablonlarıyla statik bir site dizinine
+üretir. Yayınlama artımlıdır: her sayfanın girdilerinden (gün sürümü, özet
+parmak izi, şablonlar) bir içerik özeti hesaplanır ve manifest dosyasındaki
+özetle aynı olan sayfalar yeniden üretilmez. Değişen sayfalar bir işlem
+havuzunda paralel işlenir; tüm dosyalar geçici adla yazılıp yerine taşınır.
+
+Jinja2 ve markdown yalnızca sayfa üretilirken içe aktarılır; komut satırı
+argümanları bu paketler olmadan da tanımlanabilir.
+"""
+import os
+import sys
+import json
+import hashlib
+import logging
+import argparse
+import concurrent.futures
+
+# Doğrudan çalıştırıldığında src dizinini modül yoluna ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from data_collection.config import PUBLISH_DIR, PROCESS_WORKERS
+from data_collection.database import get_session, DailySummary
+from data_collection.write_path import get_day_versions
+from data_processing.daily_aggregator import day_bounds
+from data_processing.timeline import get_timeline
+from data_processing.process_data import parse_date
+
+logger = logging.getLogger(__name__)
+
+# Sayfa üretim mantığı değiştiğinde artırılır; tüm sayfaların yeniden üretilmesini sağlar
+SITE_VERSION = 1
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+MANIFEST_NAME = 'manifest.json'
+
+# Sayfalarda gösterilen en fazla uygulama/alan adı sayısı
+TOP_ITEMS = 15
+
+def week_key(day):
+    """Günün ISO hafta anahtarını döndür (ör. 2024-W03)."""
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+def month_key(day):
+    """Günün ay anahtarını döndür (ör. 2024-01)."""
+    return day.strftime('%Y-%m')
+
+def format_duration(seconds):
+    """Saniyeyi okunabilir süreye dönüştür."""
+    minutes = int(seconds or 0) // 60
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours} sa {minutes:02d} dk" if hours else f"{minutes} dk"
+
+def _hash(*parts):
+    return hashlib.sha1(json.dumps(parts, default=str, sort_keys=True).encode('utf-8')).hexdigest()
+
+def template_fingerprint():
+    """Şablonların, statik dosyaların ve site sürümünün parmak izini döndür."""
+    digest = hashlib.sha1(str(SITE_VERSION).encode('utf-8'))
+    for directory in (TEMPLATE_DIR, STATIC_DIR):
+        for name in sorted(os.listdir(directory)):
+            with open(os.path.join(directory, name), 'rb') as stream:
+                digest.update(name.encode('utf-8'))
+                digest.update(stream.read())
+    return digest.hexdigest()
+
+def write_atomic(path, data):
+    """Dosyayı geçici adla yazıp yerine taşı; okuyucular yarım dosya görmez."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as stream:
+        stream.write(data)
+    os.replace(temp_path, path)
+
+class Page:
+    """Üretilecek bir sayfa ve girdilerinin özeti."""
+    __slots__ = ('path', 'template', 'kind', 'key', 'days', 'fingerprint')
+
+    def __init__(self, path, template, kind, key, days, fingerprint):
+        self.path = path
+        self.template = template
+        self.kind = kind
+        self.key = key
+        self.days = days
+        self.fingerprint = fingerprint
+
+def load_summaries(db_session):
+    """Tüm günlük özetleri gün → özet sözlüğü olarak oku."""
+    return {summary.date.date(): summary for summary in db_session.query(DailySummary).order_by(DailySummary.date)}
+
+def plan_pages(summaries, versions, templates):
+    """Sayfaları ve girdi özetlerini belirle.
+
+    Gün sayfasının özeti günün yazma sürümüne ve özet kaydına, hafta ve ay
+    sayfalarının özeti üye günlerin özetlerine, ana sayfanın özeti ay
+    sayfalarının özetlerine bağlıdır. Böylece yeni bir gün yalnızca kendi
+    sayfasını, haftasını, ayını ve ana sayfayı etkiler.
+
+    Args:
+        summaries: Gün → DailySummary.
+        versions: Gün → yazma sürümü.
+        templates: Şablon parmak izi.
+
+    Returns:
+        list: Page nesneleri.
+    """
+    pages, weeks, months = [], {}, {}
+    for day, summary in summaries.items():
+        fingerprint = _hash(templates, versions.get(day, 0), summary.updated_at, summary.source_checksum,
+                            summary.summary_text)
+        pages.append(Page(f"days/{day.isoformat()}.html", 'day.html', 'day', day, [day], fingerprint))
+        weeks.setdefault(week_key(day), []).append((day, fingerprint))
+        months.setdefault(month_key(day), []).append((day, fingerprint))
+
+    month_fingerprints = []
+    for kind, groups in (('week', weeks), ('month', months)):
+        for key, members in sorted(groups.items()):
+            fingerprint = _hash(templates, kind, key, members)
+            pages.append(Page(f"{kind}s/{key}.html", 'period.html', kind, key, [day for day, _ in members], fingerprint))
+            if kind == 'month':
+                month_fingerprints.append((key, fingerprint))
+    pages.append(Page('index.html', 'index.html', 'index', None, list(summaries), _hash(templates, month_fingerprints)))
+    return pages
+
+def _summary_row(day, summary):
+    return {
+        'day': day,
+        'week': week_key(day),
+        'month': month_key(day),
+        'total_active_time': summary.total_active_time or 0,
+        'productivity_score': summary.productivity_score or 0,
+    }
+
+def _ranked(totals, limit=TOP_ITEMS):
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+def _merged_times(summaries, days, column):
+    totals = {}
+    for day in days:
+        for key, seconds in json.loads(getattr(summaries[day], column) or '{}').items():
+            totals[key] = totals.get(key, 0) + seconds
+    return totals
+
+def build_context(db_session, page, summaries):
+    """Sayfanın şablon bağlamını veritabanından oluştur.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        page: Page nesnesi.
+        summaries: Gün → DailySummary.
+
+    Returns:
+        dict: Şablon bağlamı.
+    """
+    if page.kind == 'day':
+        day = page.key
+        summary = summaries[day]
+        start, end = day_bounds(day)
+        segments = []
+        for segment in get_timeline(db_session, start, end):
+            begin, finish = max(segment.start_time, start), min(segment.end_time, end)
+            if finish <= begin:
+                continue
+            segments.append({
+                'left': round((begin - start).total_seconds() / 864, 3),
+                'width': round((finish - begin).total_seconds() / 864, 3),
+                'label': segment.application_name or segment.domain or segment.game_name or "",
+                'title': segment.window_title or "",
+                'start': begin.strftime('%H:%M'),
+            })
+        return {
+            'root': '../',
+            'title': f"{day.isoformat()} etkinliği",
+            'row': _summary_row(day, summary),
+            'apps': _ranked(json.loads(summary.app_times or '{}')),
+            'domains': _ranked(json.loads(summary.domain_times or '{}')),
+            'categories': _ranked(json.loads(summary.categories or '{}')),
+            'summary_html': _render_markdown(summary.summary_text) if summary.summary_text else None,
+            'segments': segments,
+        }
+
+    rows = [_summary_row(day, summaries[day]) for day in page.days]
+    if page.kind in ('week', 'month'):
+        return {
+            'root': '../',
+            'title': f"{page.key} {'haftası' if page.kind == 'week' else 'ayı'}",
+            'rows': rows,
+            'total_active_time': sum(row['total_active_time'] for row in rows),
+            'apps': _ranked(_merged_times(summaries, page.days, 'app_times')),
+            'categories': _ranked(_merged_times(summaries, page.days, 'categories')),
+        }
+
+    months = {}
+    for row in rows:
+        month = months.setdefault(row['month'], {'key': row['month'], 'days': 0, 'total_active_time': 0})
+        month['days'] += 1
+        month['total_active_time'] += row['total_active_time']
+    return {
+        'root': '',
+        'title': "Etkinlik günlüğü",
+        'months': sorted(months.values(), key=lambda month: month['key'], reverse=True),
+        'recent': list(reversed(rows))[:14],
+    }
+
+def _render_markdown(text):
+    """Markdown metnini HTML'e dönüştür."""
+    import markdown
+    return markdown.markdown(text)
+
+_environment = None
+
+def _get_environment():
+    """İşlem başına Jinja2 ortamını döndür."""
+    global _environment
+    if _environment is None:
+        from jinja2 import Environment, FileSystemLoader, select_autoescape
+        _environment = Environment(loader=FileSystemLoader(TEMPLATE_DIR), autoescape=select_autoescape(['html']))
+        _environment.filters['duration'] = format_duration
+    return _environment
+
+def render_page(task):
+    """Sayfayı işle ve atomik olarak yaz (işlem havuzunda çalışır).
+
+    Args:
+        task: (şablon adı, bağlam, çıktı yolu) üçlüsü.
+
+    Returns:
+        str: Yazılan dosyanın yolu.
+    """
+    template, context, path = task
+    html = _get_environment().get_template(template).render(**context)
+    write_atomic(path, html.encode('utf-8'))
+    return path
+
+def read_manifest(output_dir):
+    """Önceki yayının manifest dosyasını oku."""
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), 'r', encoding='utf-8') as stream:
+            return json.load(stream)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def publish_site(output_dir=PUBLISH_DIR, day=None, workers=None, force=False):
+    """Statik siteyi artımlı olarak üret.
+
+    Args:
+        output_dir: Site dizini.
+        day: Yalnızca bu günü etkileyen sayfaları üret (None ise tümü).
+        workers: İşlem sayısı (None: PROCESS_WORKERS, 0: işlemci sayısı).
+        force: True ise değişmemiş sayfalar da üretilir.
+
+    Returns:
+        list: Yeniden üretilen sayfaların site dizinine göre yolları.
+    """
+    templates = template_fingerprint()
+    manifest = {} if force else read_manifest(output_dir)
+    pages_manifest = manifest.get('pages', {})
+
+    db_session = get_session()
+    try:
+        summaries = load_summaries(db_session)
+        if not summaries:
+            logger.info("Yayınlanacak günlük özet bulunamadı")
+            return []
+        pages = plan_pages(summaries, get_day_versions(db_session, list(summaries)), templates)
+        if day is not None:
+            pages = [page for page in pages if day in page.days]
+        stale = [
+            page for page in pages
+            if pages_manifest.get(page.path) != page.fingerprint or not os.path.exists(os.path.join(output_dir, page.path))
+        ]
+        skipped = len(pages) - len(stale)
+        if skipped:
+            logger.info(f"{skipped} sayfa değişmediği için atlandı")
+        # Bağlamlar veritabanından tek oturumda okunur; işleme ve yazma havuzda yapılır
+        tasks = [(page.template, build_context(db_session, page, summaries), os.path.join(output_dir, page.path))
+                 for page in stale]
+    finally:
+        db_session.close()
+
+    if manifest.get('templates') != templates:
+        for name in sorted(os.listdir(STATIC_DIR)):
+            with open(os.path.join(STATIC_DIR, name), 'rb') as stream:
+                write_atomic(os.path.join(output_dir, 'assets', name), stream.read())
+
+    workers = PROCESS_WORKERS if workers is None else workers
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        for task in tasks:
+            render_page(task)
+    elif tasks:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(render_page, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+    # Manifest yalnızca sayfalar yazıldıktan sonra güncellenir; yarıda kalan yayın tekrarlanır
+    pages_manifest.update({page.path: page.fingerprint for page in stale})
+    write_atomic(os.path.join(output_dir, MANIFEST_NAME), json.dumps(
+        {'templates': templates, 'pages': pages_manifest}, indent=1, sort_keys=True
+    ).encode('utf-8'))
+    logger.info(f"{len(stale)} sayfa üretildi → {output_dir}")
+    return [page.path for page in stale]
+
+def add_publish_arguments(parser):
+    """Yayınlama argümanlarını ayrıştırıcıya ekle.
+
+    Args:
+        parser: argparse.ArgumentParser nesnesi.
+    """
+    parser.add_argument('--date', type=parse_date, help='Yalnızca bu günü etkileyen sayfaları üret (YYYY-MM-DD formatında)')
+    parser.add_argument('--output', help='Site dizini (varsayılan: PUBLISH_DIR)')
+    parser.add_argument('--workers', type=int, help='Paralel işlem sayısı (0: işlemci sayısı)')
+    parser.add_argument('--force', action='store_true', help='Değişmemiş sayfaları da yeniden üret')
+
+def run_publish(args):
+    """Argümanlara göre statik siteyi üret.
+
+    Args:
+        args: argparse.Namespace nesnesi.
+
+    Returns:
+        list: Yeniden üretilen sayfalar.
+    """
+    return publish_site(args.output or PUBLISH_DIR, args.date, args.workers, args.force)
+
+def main():
+    """Ana fonksiyon."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    parser = argparse.ArgumentParser(description='Etkinlik sayfalarını statik site olarak yayınla')
+    add_publish_arguments(parser)
+    run_publish(parser.parse_args())
+
+if __name__ == '__main__':
+    main()
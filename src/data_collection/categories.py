@@ -0,0 +1,333 @@
+"""
+Kategori kuralları motoru.
+
+Bu modül, uygulama, alan adı, pencere başlığı ve dosya yolu için kullanıcı
+tanımlı kategori kurallarını tek bir eşleştiricide derler. Sonuçlar anahtar
+başına önbelleğe alınır; kurallar dosyası değiştiğinde yalnızca kategorisi
+değişen anahtarlar güncellenir.
+
+Kurallar dosyası biçimi:
+    {
+        "weights": {"development": 1.0, "social": 0.1},
+        "rules": [
+            {"category": "development", "apps": ["code*.exe"], "domains": ["github.com"],
+             "titles": ["(?i)pull request"], "paths": ["C:/Users/me/Projects"]}
+        ]
+    }
+
+Kurallar sırayla değerlendirilir; birden fazla kural eşleşirse dosyada önce
+gelen kazanır. Kullanıcı kuralları yerleşik kurallardan önce gelir.
+"""
+import os
+import re
+import json
+import fnmatch
+import hashlib
+import logging
+import functools
+import threading
+from sqlalchemy import select
+
+from .config import CATEGORY_RULES_FILE
+from .database import WindowActivity, BrowserActivity, CategoryAssignment
+
+logger = logging.getLogger(__name__)
+
+# Hiçbir kuralla eşleşmeyen etkinliklerin kategorisi
+DEFAULT_CATEGORY = "other"
+
+# Pencere anahtarlarında uygulama adı ile başlığı ayıran karakter
+KEY_SEPARATOR = "\x1f"
+
+# Yerleşik kurallar (kullanıcı kurallarından sonra değerlendirilir)
+DEFAULT_CATEGORY_RULES = [
+    {"category": "development", "apps": [
+        "code.exe", "cursor.exe", "pycharm*.exe", "idea*.exe", "devenv.exe", "windowsterminal.exe",
+        "cmd.exe", "powershell.exe", "sublime_text.exe"
+    ], "domains": [
+        "github.com", "gitlab.com", "stackoverflow.com", "python.org", "readthedocs.io", "developer.mozilla.org"
+    ]},
+    {"category": "productivity", "apps": [
+        "winword.exe", "excel.exe", "powerpnt.exe", "onenote.exe", "notion.exe", "obsidian.exe",
+        "explorer.exe", "acrord32.exe"
+    ], "domains": ["docs.google.com", "notion.so", "office.com"]},
+    {"category": "communication", "apps": [
+        "outlook.exe", "teams.exe", "slack.exe", "discord.exe", "zoom.exe", "telegram.exe", "whatsapp.exe"
+    ], "domains": ["mail.google.com", "outlook.live.com", "slack.com", "web.whatsapp.com"]},
+    {"category": "entertainment", "apps": ["spotify.exe", "vlc.exe", "netflix.exe"],
+     "domains": ["youtube.com", "netflix.com", "twitch.tv"]},
+    {"category": "social", "domains": [
+        "twitter.com", "x.com", "facebook.com", "instagram.com", "reddit.com", "linkedin.com"
+    ]},
+    {"category": "games", "apps": ["steam.exe", "epicgameslauncher.exe"]},
+    {"category": "browsing", "apps": [
+        "chrome.exe", "firefox.exe", "msedge.exe", "opera.exe", "brave.exe", "safari.exe", "iexplore.exe"
+    ]},
+]
+
+# Kategorilerin verimlilik puanına katkısı (0-1 arası)
+DEFAULT_CATEGORY_WEIGHTS = {
+    "development": 1.0,
+    "productivity": 1.0,
+    "communication": 0.6,
+    "browsing": 0.5,
+    "other": 0.5,
+    "social": 0.1,
+    "entertainment": 0.0,
+    "games": 0.0,
+}
+
+def _normalize_rule_path(path):
+    return os.path.normcase(os.path.normpath(os.path.expanduser(path))).replace('\\', '/').rstrip('/')
+
+class CategoryRules:
+    """Derlenmiş kategori kuralları."""
+
+    def __init__(self, rules=None, weights=None, cache_size=65536):
+        """Kuralları derle.
+
+        Args:
+            rules: Kural sözlükleri listesi (yerleşik kuralların önüne eklenir).
+            weights: Kategori → verimlilik ağırlığı (yerleşik ağırlıkları günceller).
+            cache_size: Sınıflandırma sonuçları için önbellek boyutu.
+        """
+        self.rules = list(rules or []) + DEFAULT_CATEGORY_RULES
+        self.weights = dict(DEFAULT_CATEGORY_WEIGHTS)
+        self.weights.update(weights or {})
+        self.categories = [rule.get("category", DEFAULT_CATEGORY) for rule in self.rules]
+        self.version = hashlib.sha1(
+            json.dumps([self.rules, self.weights], sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        # Ağırlıklar yalnızca verimlilik puanını etkiler; günlük özet parmak izlerine bu özet eklenir
+        self.weights_version = hashlib.sha1(
+            json.dumps(self.weights, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+        app_patterns = []
+        title_patterns = []
+        self._domains = {}
+        self._paths = {}
+        for index, rule in enumerate(self.rules):
+            for pattern in rule.get("apps", []):
+                app_patterns.append((index, fnmatch.translate(pattern.lower())))
+            for pattern in rule.get("titles", []):
+                try:
+                    re.compile(pattern)
+                except re.error as e:
+                    logger.warning(f"Geçersiz başlık kuralı atlandı ({pattern}): {e}")
+                    continue
+                title_patterns.append((index, pattern))
+            for domain in rule.get("domains", []):
+                self._domains.setdefault(domain.lower().lstrip("."), index)
+            for path in rule.get("paths", []):
+                self._paths.setdefault(_normalize_rule_path(path), index)
+
+        self._apps = self._combine(app_patterns)
+        self._titles = self._combine(title_patterns)
+        self._title_rules = [(index, re.compile(_scoped_flags(pattern))) for index, pattern in title_patterns]
+        self.classify = functools.lru_cache(maxsize=cache_size)(self._classify)
+
+    @staticmethod
+    def _combine(patterns):
+        """Desenleri kural numarasını grup adı olarak taşıyan tek ifadede birleştir."""
+        if not patterns:
+            return None
+        # Satır içi bayraklar ("(?i)" gibi) her alternatifin başında yalnızca gruplandırılmış olarak geçerlidir
+        alternatives = [
+            f"(?P<r{index}_{position}>{_scoped_flags(pattern)})"
+            for position, (index, pattern) in enumerate(patterns)
+        ]
+        return re.compile("|".join(alternatives))
+
+    @staticmethod
+    def _rule_of(match):
+        return int(match.lastgroup[1:].split("_")[0])
+
+    def _match_app(self, application_name):
+        if self._apps is None or not application_name:
+            return None
+        match = self._apps.fullmatch(application_name.lower())
+        return self._rule_of(match) if match else None
+
+    def _match_title(self, title):
+        if self._titles is None or not title:
+            return None
+        # Birleşik ifade başlıkta en önce eşleşen kuralı bulur; daha önce gelen bir kural başlığın ilerisinde
+        # eşleşebileceğinden yalnızca ondan önceki kurallar sırayla denenir
+        match = self._titles.search(title)
+        if not match:
+            return None
+        found = self._rule_of(match)
+        for index, regex in self._title_rules:
+            if index >= found:
+                break
+            if regex.search(title):
+                return index
+        return found
+
+    def _match_domain(self, domain):
+        if not domain:
+            return None
+        labels = domain.lower().split(".")
+        matches = [self._domains.get(".".join(labels[index:])) for index in range(len(labels))]
+        matches = [match for match in matches if match is not None]
+        return min(matches) if matches else None
+
+    def _match_path(self, path):
+        if not path or not self._paths:
+            return None
+        current = _normalize_rule_path(path)
+        matches = []
+        while current:
+            if current in self._paths:
+                matches.append(self._paths[current])
+            parent = current.rsplit("/", 1)[0] if "/" in current else ""
+            if parent == current:
+                break
+            current = parent
+        return min(matches) if matches else None
+
+    def _classify(self, application_name=None, domain=None, title=None, path=None):
+        """Etkinliği sınıflandır (önbelleksiz).
+
+        Args:
+            application_name: Uygulama adı.
+            domain: Alan adı.
+            title: Pencere veya sekme başlığı.
+            path: Dosya yolu.
+
+        Returns:
+            str: Eşleşen ilk kuralın kategorisi veya DEFAULT_CATEGORY.
+        """
+        matches = [
+            match for match in (
+                self._match_app(application_name), self._match_domain(domain),
+                self._match_title(title), self._match_path(path)
+            ) if match is not None
+        ]
+        return self.categories[min(matches)] if matches else DEFAULT_CATEGORY
+
+    def weight(self, category):
+        """Kategorinin verimlilik ağırlığını döndür."""
+        return self.weights.get(category, self.weights.get(DEFAULT_CATEGORY, 0.5))
+
+def _scoped_flags(pattern):
+    """Desenin başındaki satır içi bayrakları yalnızca desene uygulanacak biçime dönüştür."""
+    match = re.match(r"^\(\?([aiLmsux]+)\)", pattern)
+    if match:
+        return f"(?{match.group(1)}:{pattern[match.end():]})"
+    return pattern
+
+def load_category_rules(path):
+    """Kurallar dosyasını oku ve derle.
+
+    Args:
+        path: JSON kurallar dosyası yolu; dosya yoksa yalnızca yerleşik kurallar kullanılır.
+
+    Returns:
+        CategoryRules: Derlenmiş kurallar.
+    """
+    if not path or not os.path.exists(path):
+        return CategoryRules()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return CategoryRules(data.get("rules", []), data.get("weights", {}))
+    except (OSError, ValueError, AttributeError) as e:
+        logger.error(f"Kategori kuralları okunamadı ({path}): {e}")
+        return CategoryRules()
+
+_rules_lock = threading.Lock()
+_rules_cache = {}
+
+def get_category_rules(path=None):
+    """Kurallar dosyasının güncel derlenmiş hâlini döndür.
+
+    Dosya yalnızca değişiklik zamanı değiştiğinde yeniden derlenir.
+
+    Args:
+        path: Kurallar dosyası yolu (None ise CATEGORY_RULES_FILE).
+
+    Returns:
+        CategoryRules: Derlenmiş kurallar.
+    """
+    path = path or CATEGORY_RULES_FILE
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime = None
+    with _rules_lock:
+        cached = _rules_cache.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, load_category_rules(path))
+            _rules_cache[path] = cached
+        return cached[1]
+
+def window_key(application_name, title):
+    """Pencere etkinliği için sınıflandırma anahtarı oluştur."""
+    return f"{application_name or ''}{KEY_SEPARATOR}{title or ''}"
+
+def classify_key(rules, kind, key):
+    """Saklanan anahtarı sınıflandır.
+
+    Args:
+        rules: CategoryRules nesnesi.
+        kind: "window" veya "domain".
+        key: window_key ile oluşturulmuş anahtar veya alan adı.
+
+    Returns:
+        str: Kategori.
+    """
+    if kind == "window":
+        application_name, _, title = key.partition(KEY_SEPARATOR)
+        return rules.classify(application_name or None, None, title or None)
+    return rules.classify(None, key)
+
+def _distinct_keys(db_session):
+    """Geçmiş kayıtlardaki tüm farklı pencere ve alan adı anahtarlarını oku."""
+    title = WindowActivity.normalized_title
+    windows = db_session.execute(
+        select(WindowActivity.application_name, title, WindowActivity.window_title).distinct()
+    )
+    keys = {("window", window_key(app, normalized or raw)) for app, normalized, raw in windows}
+    domains = db_session.execute(select(BrowserActivity.domain).distinct().where(BrowserActivity.domain.isnot(None)))
+    keys.update(("domain", domain) for (domain,) in domains)
+    return keys
+
+def sync_category_assignments(db_session, rules=None):
+    """Kalıcı kategori atamalarını kurallarla eşitle.
+
+    Tüm geçmiş kayıtlar tek geçişte farklı anahtarlara indirgenir ve her
+    anahtar bir kez sınıflandırılır. Yalnızca yeni veya kategorisi değişen
+    anahtarlar yazılır.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        rules: CategoryRules nesnesi (None ise get_category_rules()).
+
+    Returns:
+        dict: Tür → kategorisi değişen (veya yeni) anahtar kümesi.
+    """
+    rules = rules or get_category_rules()
+    affected = {"window": set(), "domain": set()}
+    try:
+        stored = {
+            (assignment.kind, assignment.key): assignment
+            for assignment in db_session.query(CategoryAssignment).all()
+        }
+        for kind, key in _distinct_keys(db_session):
+            category = classify_key(rules, kind, key)
+            assignment = stored.get((kind, key))
+            if assignment is None:
+                db_session.add(CategoryAssignment(kind=kind, key=key, category=category, rules_version=rules.version))
+                affected[kind].add(key)
+            elif assignment.category != category:
+                assignment.category = category
+                assignment.rules_version = rules.version
+                affected[kind].add(key)
+        db_session.commit()
+    except Exception as e:
+        logger.error(f"Kategori atamaları güncellenirken hata oluştu: {e}")
+        db_session.rollback()
+        raise
+    return affected
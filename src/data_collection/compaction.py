@@ -0,0 +1,226 @@
+"""
+Aralık sıkıştırma.
+
+Bu modül, yoklama ve yeniden başlatmalar nedeniyle aynı uygulama, başlık, URL
+veya oyun için art arda yazılan aralık kayıtlarını tek kayıtta birleştirir.
+Her tablo için bir yüksek su işareti tutulur; böylece sıkıştırılmış aralıklar
+yeniden taranmaz. Değişen günlerin sürümü aynı işlemde artırılır; bu günlerin
+önbelleğe alınmış sorgu sonuçları ve küpleri geçersiz olur.
+"""
+import datetime
+import logging
+from sqlalchemy import select, update, delete, func
+
+from .database import (
+    WindowActivity, KeyboardActivity, MouseActivity, FileActivity,
+    BrowserActivity, GameActivity, MaintenanceState
+)
+from .write_path import bump_day_versions
+
+logger = logging.getLogger(__name__)
+
+# window_id yabancı anahtarını taşıyan modeller
+WINDOW_REFERENCING_MODELS = (KeyboardActivity, MouseActivity, FileActivity, BrowserActivity, GameActivity)
+
+# SQLite'ın tek ifadedeki parametre sınırının altında kalmak için parça boyutu
+_CHUNK_SIZE = 500
+
+class CompactionTarget:
+    """Sıkıştırılacak tablo ve birleştirme anahtarı."""
+    __slots__ = ('name', 'model', 'key_columns', 'references_windows')
+
+    def __init__(self, name, model, key_columns, references_windows=False):
+        self.name = name
+        self.model = model
+        self.key_columns = key_columns
+        self.references_windows = references_windows
+
+# Pencere kayıtları normalleştirilmiş başlığa göre, eski kayıtlar ham başlığa göre birleştirilir
+COMPACTION_TARGETS = (
+    CompactionTarget(
+        'window_activities', WindowActivity,
+        (WindowActivity.application_name, func.coalesce(WindowActivity.normalized_title, WindowActivity.window_title)),
+        references_windows=True
+    ),
+    CompactionTarget('browser_activities', BrowserActivity, (BrowserActivity.domain, BrowserActivity.url)),
+    CompactionTarget('game_activities', GameActivity, (GameActivity.game_name, GameActivity.platform)),
+)
+
+def _chunks(items, size=_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def get_state(db_session, name, default=None):
+    """Bakım durumu değerini oku.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        name: Durum adı.
+        default: Kayıt yoksa döndürülecek değer.
+
+    Returns:
+        str: Kayıtlı değer veya varsayılan.
+    """
+    state = db_session.get(MaintenanceState, name)
+    return state.value if state is not None else default
+
+def set_state(db_session, name, value):
+    """Bakım durumu değerini yaz (commit çağırana aittir).
+
+    Args:
+        db_session: Veritabanı oturumu.
+        name: Durum adı.
+        value: Yeni değer.
+    """
+    state = db_session.get(MaintenanceState, name)
+    if state is None:
+        db_session.add(MaintenanceState(name=name, value=str(value)))
+    else:
+        state.value = str(value)
+
+def plan_merges(rows, max_gap):
+    """Sıralı kayıtlar için birleştirme planı oluştur.
+
+    Birleştirilen her grupta en yeni kayıt korunur. İzleyiciler yeni kayıtları
+    son yazılan pencere kaydına bağladığından, bu kaydın silinmemesi gerekir.
+
+    Args:
+        rows: (id, başlangıç zamanı, süre, anahtar) demetleri; id sırasına göre.
+        max_gap: Birleştirilecek kayıtlar arasındaki en fazla boşluk (saniye).
+
+    Returns:
+        tuple: (kalan id → (başlangıç, süre), birleştirilen id → kalan id, son kalan id).
+    """
+    survivors = {}
+    merged = {}
+    run = None  # [id listesi, başlangıç, bitiş, anahtar]
+
+    def close(run):
+        if run is not None and len(run[0]) > 1:
+            survivor_id = run[0][-1]
+            survivors[survivor_id] = (run[1], int((run[2] - run[1]).total_seconds()))
+            for merged_id in run[0][:-1]:
+                merged[merged_id] = survivor_id
+
+    for row_id, started, duration, key in rows:
+        if started is None:
+            continue
+        ended = started + datetime.timedelta(seconds=duration or 0)
+        if run is not None and key == run[3]:
+            gap = (started - run[2]).total_seconds()
+            if -max_gap <= gap <= max_gap:
+                run[0].append(row_id)
+                run[1] = min(run[1], started)
+                run[2] = max(run[2], ended)
+                continue
+        close(run)
+        run = [[row_id], started, ended, key]
+    close(run)
+    last_id = run[0][-1] if run is not None else None
+    return survivors, merged, last_id
+
+def _interval_days(started, duration):
+    """Aralığın başladığı ve bittiği günleri döndür."""
+    ended = started + datetime.timedelta(seconds=duration or 0)
+    return {started.date(), ended.date()}
+
+def compact_target(db_session, target, max_gap, batch_size):
+    """Tek bir tablonun yüksek su işaretinden sonraki kısmını sıkıştır.
+
+    Son kalan kayıt bir sonraki çalıştırmada başlangıç kaydı olarak yeniden
+    okunur; böylece parti sınırındaki kayıtlar da birleştirilebilir.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        target: CompactionTarget nesnesi.
+        max_gap: Birleştirilecek kayıtlar arasındaki en fazla boşluk (saniye).
+        batch_size: Tek partide okunacak en fazla kayıt sayısı.
+
+    Returns:
+        tuple: (birleştirilen kayıt sayısı, daha fazla kayıt var mı, değişen günler).
+    """
+    model = target.model
+    batch_size = max(2, batch_size)
+    state_name = f'compaction:{target.name}'
+    high_water = int(get_state(db_session, state_name, 0))
+
+    rows = db_session.execute(
+        select(model.id, model.timestamp, model.duration, *target.key_columns)
+        .where(model.id >= high_water)
+        .order_by(model.id)
+        .limit(batch_size)
+    ).all()
+    if not rows or (len(rows) == 1 and rows[0][0] == high_water):
+        return 0, False, set()
+
+    survivors, merged, last_id = plan_merges(
+        ((row[0], row[1], row[2], tuple(row[3:])) for row in rows), max_gap
+    )
+
+    # Birleştirilen grupların eski ve yeni aralıklarının düştüğü günler
+    days = set()
+    for row in rows:
+        if (row[0] in survivors or row[0] in merged) and row[1] is not None:
+            days |= _interval_days(row[1], row[2])
+    for survivor_id, (started, duration) in survivors.items():
+        days |= _interval_days(started, duration)
+        db_session.execute(update(model).where(model.id == survivor_id).values(timestamp=started, duration=duration))
+
+    if merged:
+        if target.references_windows:
+            by_survivor = {}
+            for merged_id, survivor_id in merged.items():
+                by_survivor.setdefault(survivor_id, []).append(merged_id)
+            for survivor_id, merged_ids in by_survivor.items():
+                for chunk in _chunks(merged_ids):
+                    for referencing in WINDOW_REFERENCING_MODELS:
+                        db_session.execute(
+                            update(referencing)
+                            .where(referencing.window_id.in_(chunk))
+                            .values(window_id=survivor_id)
+                        )
+        for chunk in _chunks(list(merged)):
+            db_session.execute(delete(model).where(model.id.in_(chunk)))
+
+    bump_day_versions(db_session.connection(), days)
+    set_state(db_session, state_name, last_id if last_id is not None else rows[-1][0])
+    return len(merged), len(rows) >= batch_size, days
+
+def compact_intervals(db_session, max_gap=30, batch_size=5000, max_batches=None, should_stop=None, changed_days=None):
+    """Tüm aralık tablolarını artımlı olarak sıkıştır.
+
+    Her parti kendi işleminde yazılır; hata durumunda parti geri alınır ve
+    yüksek su işareti ilerlemez.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        max_gap: Birleştirilecek kayıtlar arasındaki en fazla boşluk (saniye).
+        batch_size: Tek partide okunacak en fazla kayıt sayısı.
+        max_batches: Tablo başına en fazla parti sayısı (None: sınırsız).
+        should_stop: Partiler arasında çağrılır; True dönerse iş yarıda bırakılır.
+        changed_days: Verilirse kayıtları değişen günlerin ekleneceği küme.
+
+    Returns:
+        dict: Tablo adı → birleştirilen kayıt sayısı.
+    """
+    results = {}
+    for target in COMPACTION_TARGETS:
+        results[target.name] = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            if should_stop is not None and should_stop():
+                return results
+            try:
+                merged, has_more, days = compact_target(db_session, target, max_gap, batch_size)
+                db_session.commit()
+            except Exception as e:
+                logger.error(f"{target.name} sıkıştırılırken hata oluştu: {e}")
+                db_session.rollback()
+                break
+            results[target.name] += merged
+            if changed_days is not None:
+                changed_days |= days
+            batches += 1
+            if not has_more:
+                break
+    return results
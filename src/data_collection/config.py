@@ -22,6 +22,9 @@ ENABLE_FILE_TRACKING = os.getenv("ENABLE_FILE_TRACKING", "true").lower() == "tru
 ENABLE_BROWSER_TRACKING = os.getenv("ENABLE_BROWSER_TRACKING", "true").lower() == "true"
 ENABLE_GAME_TRACKING = os.getenv("ENABLE_GAME_TRACKING", "true").lower() == "true"
 
+# Pencere ve sekme odak süresi kaydında tutulacak en fazla öğe sayısı
+FOCUS_REGISTRY_SIZE = int(os.getenv("FOCUS_REGISTRY_SIZE", "1000"))
+
 # Gizlilik ayarları
 def parse_json_env(env_var, default=None):
     """JSON formatındaki çevre değişkenlerini ayrıştırır."""
@@ -38,6 +41,46 @@ EXCLUDED_APPS = parse_json_env("EXCLUDED_APPS", [])
 EXCLUDED_WEBSITES = parse_json_env("EXCLUDED_WEBSITES", [])
 EXCLUDED_DIRECTORIES = parse_json_env("EXCLUDED_DIRECTORIES", [])
 
+# Pencere başlığı normalleştirme: {"global": [...], "apps": {"uygulama.exe": [...]}}
+# Kurallar düzenli ifade dizeleri veya {"pattern": ..., "replace": ...} sözlükleridir; "global" verilirse varsayılan
+# kuralların yerini alır, "apps" altındaki kurallar ise yalnızca ilgili uygulamanın varsayılanlarının yerini alır
+TITLE_NORMALIZATION_RULES = parse_json_env("TITLE_NORMALIZATION_RULES", {})
+STORE_RAW_WINDOW_TITLES = os.getenv("STORE_RAW_WINDOW_TITLES", "true").lower() == "true"
+
+# Yok sayılan dosya adı desenleri (geçici, kilit ve takas dosyaları)
+FILE_IGNORED_PATTERNS = parse_json_env("FILE_IGNORED_PATTERNS", [
+    "*.tmp", "*.temp", "~$*", ".~lock.*", "*.swp", "*.swo", "*~", "*.crdownload", "*.part", "*.db-journal", "*.db-wal", "*.db-shm"
+])
+
+# Dosya izleme kökleri: yol dizeleri veya {"path": ..., "max_depth": ..., "ignore": [...]} sözlükleri
+FILE_WATCH_ROOTS = parse_json_env("FILE_WATCH_ROOTS", ["~/Desktop", "~/Documents", "~/Downloads"])
+FILE_WATCH_IGNORE = parse_json_env("FILE_WATCH_IGNORE", [
+    "node_modules", ".git", ".svn", ".hg", "__pycache__", ".venv", "venv", ".tox", ".cache",
+    "*.photoslibrary", "*.photolibrary", "$RECYCLE.BIN", "System Volume Information"
+])
+FILE_WATCH_POLL_INTERVAL = float(os.getenv("FILE_WATCH_POLL_INTERVAL", "30"))  # İzleme sınırı aşıldığında yoklama aralığı (saniye)
+
+# Çevrimdışı değişiklik tespiti için kalıcı dizin durumu
+ENABLE_FILE_INDEX = os.getenv("ENABLE_FILE_INDEX", "true").lower() == "true"
+FILE_INDEX_SCAN_WORKERS = int(os.getenv("FILE_INDEX_SCAN_WORKERS", "8"))
+FILE_INDEX_FULL_SCAN = os.getenv("FILE_INDEX_FULL_SCAN", "false").lower() == "true"  # Dizin değişiklik zamanı kısayolunu devre dışı bırakır
+
+# Dosya olay kuyruğu ayarları
+FILE_EVENT_QUEUE_SIZE = int(os.getenv("FILE_EVENT_QUEUE_SIZE", "10000"))
+FILE_EVENT_OVERFLOW_POLICY = os.getenv("FILE_EVENT_OVERFLOW_POLICY", "drop-oldest")  # block, drop-oldest, sample
+FILE_EVENT_BLOCK_TIMEOUT = float(os.getenv("FILE_EVENT_BLOCK_TIMEOUT", "1.0"))  # Saniye cinsinden
+
+# Aralık sıkıştırma ayarları (art arda yazılan aynı aralıkların birleştirilmesi)
+ENABLE_COMPACTION = os.getenv("ENABLE_COMPACTION", "true").lower() == "true"
+COMPACTION_INTERVAL = int(os.getenv("COMPACTION_INTERVAL", "300"))  # Çalıştırmalar arası en az süre (saniye)
+COMPACTION_IDLE_SECONDS = int(os.getenv("COMPACTION_IDLE_SECONDS", "120"))  # Çalıştırma için gereken boşta kalma süresi
+COMPACTION_MAX_GAP = int(os.getenv("COMPACTION_MAX_GAP", "30"))  # Birleştirilecek aralıklar arası en fazla boşluk (saniye)
+COMPACTION_BATCH_SIZE = int(os.getenv("COMPACTION_BATCH_SIZE", "5000"))
+
+# Veri işleme ayarları
+PROCESS_WORKERS = int(os.getenv("PROCESS_WORKERS", "0"))  # Günlük özet hesaplama işlem sayısı (0: işlemci sayısı)
+INTERVAL_LOOKBACK_HOURS = int(os.getenv("INTERVAL_LOOKBACK_HOURS", "24"))  # Gün başlangıcından önce başlayan aralıkların aranacağı süre
+
 # Servis ayarları
 SERVICE_NAME = "CursorActivityTracker"
 SERVICE_DISPLAY_NAME = "Cursor Activity Tracker Service"
@@ -49,4 +92,60 @@ LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.a
 
 # Dizinlerin varlığını kontrol et ve oluştur
 os.makedirs(DATA_DIR, exist_ok=True)
-os.makedirs(LOG_DIR, exist_ok=True) 
\ No newline at end of file
+os.makedirs(LOG_DIR, exist_ok=True)
+
+# Kategori kuralları dosyası (yoksa yalnızca yerleşik kurallar kullanılır)
+CATEGORY_RULES_FILE = os.getenv("CATEGORY_RULES_FILE", os.path.join(DATA_DIR, "category_rules.json"))
+
+# Sorgu sonuç önbelleği (boş bırakılırsa yalnızca bellekte tutulur)
+QUERY_CACHE_PATH = os.getenv("QUERY_CACHE_PATH", os.path.join(DATA_DIR, "query_cache.db"))
+QUERY_CACHE_MEMORY_ITEMS = int(os.getenv("QUERY_CACHE_MEMORY_ITEMS", "1024"))  # Bellekteki en fazla kayıt sayısı
+QUERY_CACHE_MAX_BYTES = int(os.getenv("QUERY_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))  # Disk önbelleğinin en fazla boyutu (0: sınırsız)
+
+# Yerel okuma API'si ayarları
+API_HOST = os.getenv("API_HOST", "127.0.0.1")
+API_PORT = int(os.getenv("API_PORT", "8765"))
+API_POOL_SIZE = int(os.getenv("API_POOL_SIZE", "4"))  # Salt okunur bağlantı havuzu boyutu
+COMMIT_WATERMARK_FILE = os.getenv("COMMIT_WATERMARK_FILE", DATABASE_PATH + ".watermark")  # Yazıcının son commit işareti
+
+# Canlı olay akışı (izleyici sürecinde SSE/WebSocket uç noktası açar)
+ENABLE_LIVE_STREAM = os.getenv("ENABLE_LIVE_STREAM", "false").lower() == "true"
+LIVE_STREAM_BUFFER_SIZE = int(os.getenv("LIVE_STREAM_BUFFER_SIZE", "256"))  # İstemci başına tampon boyutu
+LIVE_FOCUS_POLL_INTERVAL = float(os.getenv("LIVE_FOCUS_POLL_INTERVAL", "0.05"))  # Ön plandaki pencere kontrol aralığı (saniye)
+LIVE_INPUT_TICK_INTERVAL = float(os.getenv("LIVE_INPUT_TICK_INTERVAL", "0.1"))  # Girdi sayacı olayları arası en az süre (saniye)
+
+# Toplu dışa aktarma ayarları
+EXPORT_DIR = os.getenv("EXPORT_DIR", os.path.join(DATA_DIR, "exports"))
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "10000"))  # Tek seferde okunup yazılan satır sayısı
+SYNC_EXPORT_DIR = os.getenv("SYNC_EXPORT_DIR", os.path.join(DATA_DIR, "sync"))  # Artımlı eşitleme dosyaları ve su işareti
+
+# Çoklu makine birleştirme hedefi (izleyicinin veritabanından ayrı olmalıdır)
+MERGE_DATABASE_PATH = os.getenv("MERGE_DATABASE_PATH", os.path.join(DATA_DIR, "merged_activity.db"))
+
+# DuckDB analitik motoru (isteğe bağlı; 0: tüm çekirdekler)
+ANALYTICS_THREADS = int(os.getenv("ANALYTICS_THREADS", "0"))
+
+# Statik site yayınlama dizini
+PUBLISH_DIR = os.getenv("PUBLISH_DIR", os.path.join(DATA_DIR, "site"))
+
+# Başlık anahtar kelimesi çıkarma (spaCy modeli; "blank:tr" gibi değerler boş dil hattı kullanır)
+NLP_MODEL = os.getenv("NLP_MODEL", "en_core_web_sm")
+NLP_BATCH_SIZE = int(os.getenv("NLP_BATCH_SIZE", "256"))  # nlp.pipe parti boyutu
+NLP_MAX_KEYWORDS = int(os.getenv("NLP_MAX_KEYWORDS", "5"))  # Başlık başına en fazla anahtar kelime
+
+# Yapay zeka günlük özetleri (OpenAI uyumlu sohbet uç noktası; "none" ise özet üretilmez)
+AI_PROVIDER = os.getenv("AI_PROVIDER", "none")
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
+AI_BASE_URL = os.getenv("AI_BASE_URL", "https://api.openai.com/v1")
+AI_MODEL = os.getenv("AI_MODEL", "gpt-4")
+AI_TEMPERATURE = float(os.getenv("AI_TEMPERATURE", "0.7"))
+AI_TIMEOUT = int(os.getenv("AI_TIMEOUT", "60"))  # İstek zaman aşımı (saniye)
+SUMMARY_TOKEN_BUDGET = int(os.getenv("SUMMARY_TOKEN_BUDGET", "2000"))  # Tek istemin en fazla tahmini girdi jetonu
+SUMMARY_MAX_TOKENS = int(os.getenv("SUMMARY_MAX_TOKENS", "400"))  # Yanıt başına en fazla jeton
+
+# Yazma biriktirme günlüğü (veritabanı yazılamadığında kayıtlar burada bekler)
+SPOOL_PATH = os.getenv("SPOOL_PATH", os.path.join(DATA_DIR, "write_spool.bin"))
+SPOOL_FSYNC_INTERVAL = float(os.getenv("SPOOL_FSYNC_INTERVAL", "1.0"))  # fsync çağrıları arası en az süre (saniye)
+SPOOL_RETRY_INTERVAL = float(os.getenv("SPOOL_RETRY_INTERVAL", "30"))  # Başarısız yazmadan sonra veritabanını yeniden deneme süresi (saniye)
+SPOOL_REPLAY_BATCH = int(os.getenv("SPOOL_REPLAY_BATCH", "5000"))  # Tek işlemde oynatılan en fazla kayıt sayısı
+SPOOL_MAX_ATTEMPTS = int(os.getenv("SPOOL_MAX_ATTEMPTS", "5"))  # Bir kaydın reddedilmeden önce en fazla oynatma denemesi
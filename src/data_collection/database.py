@@ -2,10 +2,13 @@
 Veritabanı modeli ve bağlantı işlevleri.
 """
 import os
+import uuid
+import multiprocessing
 import datetime
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, Boolean, Float, ForeignKey
+from sqlalchemy import create_engine, event, inspect, text, Column, Integer, String, DateTime, Text, Boolean, Float, ForeignKey, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.pool import QueuePool
 
 from .config import DATABASE_PATH
 
@@ -25,6 +28,7 @@ class ActivitySession(Base):
     start_time = Column(DateTime, default=datetime.datetime.now)
     end_time = Column(DateTime, nullable=True)
     is_active = Column(Boolean, default=True)
+    change_seq = Column(Integer, nullable=True, index=True)  # Değişiklik yakalama sırası (tetikleyicilerle atanır)
     
     # İlişkiler
     window_activities = relationship("WindowActivity", back_populates="session")
@@ -40,11 +44,13 @@ class WindowActivity(Base):
     
     id = Column(Integer, primary_key=True)
     session_id = Column(Integer, ForeignKey('activity_sessions.id'))
-    timestamp = Column(DateTime, default=datetime.datetime.now)
-    window_title = Column(String(255))
+    timestamp = Column(DateTime, default=datetime.datetime.now, index=True)
+    window_title = Column(String(255))  # Ham başlık örneği (STORE_RAW_WINDOW_TITLES kapalıysa normalleştirilmiş başlık)
+    normalized_title = Column(String(255), nullable=True)  # Aralık bölütlemesinde kullanılan başlık
     application_name = Column(String(100))
     process_id = Column(Integer)
     duration = Column(Integer, default=0)  # Saniye cinsinden
+    change_seq = Column(Integer, nullable=True, index=True)  # Değişiklik yakalama sırası (tetikleyicilerle atanır)
     
     # İlişkiler
     session = relationship("ActivitySession", back_populates="window_activities")
@@ -55,9 +61,10 @@ class KeyboardActivity(Base):
     
     id = Column(Integer, primary_key=True)
     session_id = Column(Integer, ForeignKey('activity_sessions.id'))
-    timestamp = Column(DateTime, default=datetime.datetime.now)
+    timestamp = Column(DateTime, default=datetime.datetime.now, index=True)
     key_count = Column(Integer, default=0)
     window_id = Column(Integer, ForeignKey('window_activities.id'), nullable=True)
+    change_seq = Column(Integer, nullable=True, index=True)  # Değişiklik yakalama sırası (tetikleyicilerle atanır)
     
     # İlişkiler
     session = relationship("ActivitySession", back_populates="keyboard_activities")
@@ -69,10 +76,11 @@ class MouseActivity(Base):
     
     id = Column(Integer, primary_key=True)
     session_id = Column(Integer, ForeignKey('activity_sessions.id'))
-    timestamp = Column(DateTime, default=datetime.datetime.now)
+    timestamp = Column(DateTime, default=datetime.datetime.now, index=True)
     click_count = Column(Integer, default=0)
     movement_pixels = Column(Integer, default=0)
     window_id = Column(Integer, ForeignKey('window_activities.id'), nullable=True)
+    change_seq = Column(Integer, nullable=True, index=True)  # Değişiklik yakalama sırası (tetikleyicilerle atanır)
     
     # İlişkiler
     session = relationship("ActivitySession", back_populates="mouse_activities")
@@ -84,11 +92,12 @@ class FileActivity(Base):
     
     id = Column(Integer, primary_key=True)
     session_id = Column(Integer, ForeignKey('activity_sessions.id'))
-    timestamp = Column(DateTime, default=datetime.datetime.now)
+    timestamp = Column(DateTime, default=datetime.datetime.now, index=True)
     file_path = Column(String(512))
     action = Column(String(50))  # created, modified, deleted, etc.
     file_type = Column(String(50))  # extension or mime type
     window_id = Column(Integer, ForeignKey('window_activities.id'), nullable=True)
+    change_seq = Column(Integer, nullable=True, index=True)  # Değişiklik yakalama sırası (tetikleyicilerle atanır)
     
     # İlişkiler
     session = relationship("ActivitySession", back_populates="file_activities")
@@ -100,12 +109,13 @@ class BrowserActivity(Base):
     
     id = Column(Integer, primary_key=True)
     session_id = Column(Integer, ForeignKey('activity_sessions.id'))
-    timestamp = Column(DateTime, default=datetime.datetime.now)
+    timestamp = Column(DateTime, default=datetime.datetime.now, index=True)
     url = Column(String(1024))
     title = Column(String(255))
     domain = Column(String(255))
     duration = Column(Integer, default=0)  # Saniye cinsinden
     window_id = Column(Integer, ForeignKey('window_activities.id'), nullable=True)
+    change_seq = Column(Integer, nullable=True, index=True)  # Değişiklik yakalama sırası (tetikleyicilerle atanır)
     
     # İlişkiler
     session = relationship("ActivitySession", back_populates="browser_activities")
@@ -117,11 +127,12 @@ class GameActivity(Base):
     
     id = Column(Integer, primary_key=True)
     session_id = Column(Integer, ForeignKey('activity_sessions.id'))
-    timestamp = Column(DateTime, default=datetime.datetime.now)
+    timestamp = Column(DateTime, default=datetime.datetime.now, index=True)
     game_name = Column(String(255))
     platform = Column(String(100))  # Steam, Epic, etc.
     duration = Column(Integer, default=0)  # Saniye cinsinden
     window_id = Column(Integer, ForeignKey('window_activities.id'), nullable=True)
+    change_seq = Column(Integer, nullable=True, index=True)  # Değişiklik yakalama sırası (tetikleyicilerle atanır)
     
     # İlişkiler
     session = relationship("ActivitySession", back_populates="game_activities")
@@ -132,22 +143,325 @@ class DailySummary(Base):
     __tablename__ = 'daily_summaries'
     
     id = Column(Integer, primary_key=True)
-    date = Column(DateTime, default=datetime.datetime.now)
+    date = Column(DateTime, default=datetime.datetime.now, index=True)
     total_active_time = Column(Integer, default=0)  # Saniye cinsinden
     productivity_score = Column(Float, default=0.0)  # 0-100 arası
     summary_text = Column(Text)
-    categories = Column(String(512))  # JSON formatında kategori listesi
+    categories = Column(String(512))  # JSON formatında kategori → süre (saniye) sözlüğü
+    app_times = Column(Text, nullable=True)  # JSON formatında uygulama → süre (saniye) sözlüğü
+    domain_times = Column(Text, nullable=True)  # JSON formatında alan adı → süre (saniye) sözlüğü
+    source_checksum = Column(String(64), nullable=True)  # Özetin hesaplandığı kaynak kayıtların parmak izi
+    updated_at = Column(DateTime, nullable=True)
     
     def __repr__(self):
         return f"<DailySummary(date='{self.date}', productivity_score={self.productivity_score})>"
 
+class TimelineSegment(Base):
+    """Tüm kaynakların birleştirilmesiyle oluşturulan, çakışmayan zaman çizelgesi bölümü."""
+    __tablename__ = 'timeline_segments'
+    
+    id = Column(Integer, primary_key=True)
+    start_time = Column(DateTime, index=True)
+    end_time = Column(DateTime)
+    duration = Column(Float, default=0.0)  # Saniye cinsinden
+    application_name = Column(String(100), nullable=True)
+    window_title = Column(String(255), nullable=True)
+    window_id = Column(Integer, nullable=True)
+    domain = Column(String(255), nullable=True)
+    game_name = Column(String(255), nullable=True)
+    key_count = Column(Integer, default=0)
+    click_count = Column(Integer, default=0)
+    movement_pixels = Column(Integer, default=0)
+    file_events = Column(Integer, default=0)
+    
+    def __repr__(self):
+        return f"<TimelineSegment(start_time='{self.start_time}', application_name='{self.application_name}')>"
+
+class CategoryAssignment(Base):
+    """Pencere ve alan adı anahtarlarının kategori atamaları."""
+    __tablename__ = 'category_assignments'
+    
+    kind = Column(String(20), primary_key=True)  # window, domain
+    key = Column(String(512), primary_key=True)
+    category = Column(String(100), index=True)
+    rules_version = Column(String(40))
+
+class ActivityRollup(Base):
+    """Saatlik, anlık güncellenen aktivite toplamları (uygulama, alan adı, kategori bazında)."""
+    __tablename__ = 'activity_rollups'
+    
+    bucket = Column(DateTime, primary_key=True)  # Saat başlangıcı
+    dimension = Column(String(20), primary_key=True)  # total, app, domain, category
+    key = Column(String(512), primary_key=True)
+    seconds = Column(Float, default=0.0)
+    event_count = Column(Integer, default=0)
+
+class RollupBatch(Base):
+    """Toplamlara uygulanmış yazma partileri (tekrar oynatmada çift sayımı önler)."""
+    __tablename__ = 'rollup_batches'
+    
+    batch_id = Column(String(64), primary_key=True)
+    applied_at = Column(DateTime, default=datetime.datetime.now, index=True)
+
+class DayVersion(Base):
+    """Yazıcının gün başına artırdığı sürüm (sorgu önbelleğinin gün bazında geçersiz kılınması için)."""
+    __tablename__ = 'day_versions'
+    
+    day = Column(DateTime, primary_key=True)  # Gün başlangıcı
+    version = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.datetime.now)
+
+class DaySketch(Base):
+    """Gün başına birleştirilebilir özet çizimleri (en sık öğeler, farklı öğe sayıları)."""
+    __tablename__ = 'day_sketches'
+    
+    day = Column(DateTime, primary_key=True)  # Gün başlangıcı
+    name = Column(String(50), primary_key=True)  # top:app, cms:app, distinct:url vb.
+    data = Column(LargeBinary)
+    updated_at = Column(DateTime, default=datetime.datetime.now)
+
+class DayCube(Base):
+    """Geçmiş günler için önbelleğe alınmış saat × ölçüt × boyut küpü (ısı haritaları için)."""
+    __tablename__ = 'day_cubes'
+    
+    day = Column(DateTime, primary_key=True)  # Gün başlangıcı
+    version = Column(Integer)
+    keys = Column(Text)  # JSON listesi: "boyut\x1fanahtar"
+    data = Column(LargeBinary)  # Sıkıştırılmış float64 dizisi (anahtar × saat × ölçüt)
+    built_at = Column(DateTime, default=datetime.datetime.now)
+    day_version = Column(Integer, default=0)  # Küp oluşturulurken günün day_versions sürümü
+
+class MaintenanceState(Base):
+    """Bakım işlerinin kalıcı durumu (yüksek su işaretleri vb.)."""
+    __tablename__ = 'maintenance_state'
+    
+    name = Column(String(100), primary_key=True)
+    value = Column(String(255))
+    updated_at = Column(DateTime, default=datetime.datetime.now, onupdate=datetime.datetime.now)
+
+class ChangeSequence(Base):
+    """Değişiklik yakalama için genel sıra sayacı."""
+    __tablename__ = 'change_sequence'
+    
+    name = Column(String(50), primary_key=True)
+    value = Column(Integer, default=0)
+
+class ChangeTombstone(Base):
+    """Değişiklik yakalanan tablolardan silinen kayıtlar."""
+    __tablename__ = 'change_tombstones'
+    
+    change_seq = Column(Integer, primary_key=True)
+    table_name = Column(String(50), index=True)
+    row_id = Column(Integer)
+    deleted_at = Column(DateTime)
+
+class MergeDevice(Base):
+    """Birleştirilmiş veritabanına aktarılan kaynak cihazlar."""
+    __tablename__ = 'merge_devices'
+    
+    device_id = Column(String(36), primary_key=True)
+    device_index = Column(Integer, unique=True)  # Kimlik bloğu: [index * DEVICE_ID_SPAN, (index + 1) * DEVICE_ID_SPAN)
+    source_path = Column(String(1024))
+    merged_at = Column(DateTime, nullable=True)
+    tombstone_seq = Column(Integer, default=0)  # Kaynaktan uygulanan son silme kaydının değişiklik sırası
+
+class TitleKeywords(Base):
+    """Pencere ve sayfa başlıklarından çıkarılan anahtar kelimeler (başlık özetine göre önbellek)."""
+    __tablename__ = 'title_keywords'
+    
+    title_hash = Column(String(40), primary_key=True)  # Başlığın SHA-1 özeti
+    keywords = Column(Text)  # JSON listesi
+    extractor = Column(String(100))  # Model ve çıkarma sürümü; değiştiğinde kayıt yeniden hesaplanır
+
+class LlmResponse(Base):
+    """Dil modeli yanıt önbelleği (istem ve model özetine göre)."""
+    __tablename__ = 'llm_responses'
+    
+    prompt_hash = Column(String(64), primary_key=True)  # Model kimliği, sistem istemi ve istemin SHA-256 özeti
+    response = Column(Text)
+    created_at = Column(DateTime, default=datetime.datetime.now)
+
+class FileIndexEntry(Base):
+    """İzlenen köklerdeki dosyaların kalıcı durum dizini (çevrimdışı değişiklik tespiti için)."""
+    __tablename__ = 'file_index'
+    __table_args__ = {'sqlite_with_rowid': False}
+    
+    path = Column(String(1024), primary_key=True)
+    size = Column(Integer)
+    mtime_ns = Column(Integer)
+    inode = Column(Integer)
+
+class DirectoryIndexEntry(Base):
+    """İzlenen dizinlerin son bilinen değişiklik zamanları."""
+    __tablename__ = 'directory_index'
+    __table_args__ = {'sqlite_with_rowid': False}
+    
+    path = Column(String(1024), primary_key=True)
+    mtime_ns = Column(Integer)
+
 def init_db():
     """Veritabanını başlat ve tabloları oluştur."""
     Base.metadata.create_all(engine)
+    migrate_db(engine)
+    with engine.begin() as connection:
+        get_device_id(connection)
+
+def migrate_db(bind):
+    """Mevcut tablolara sonradan eklenen sütunları ve indeksleri ekle.
+    
+    Args:
+        bind: SQLAlchemy engine nesnesi.
+    """
+    inspector = inspect(bind)
+    with bind.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=bind.dialect)
+                    connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+    
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
     
+    with bind.begin() as connection:
+        install_change_tracking(connection)
+
+# Değişiklik sırası tutulan kaynak tablolar (türetilmiş tablolar yeniden hesaplanabildiği için izlenmez)
+CHANGE_TRACKED_TABLES = (
+    'activity_sessions', 'window_activities', 'keyboard_activities', 'mouse_activities',
+    'file_activities', 'browser_activities', 'game_activities',
+)
+
+_NEXT_CHANGE_SEQ = "UPDATE change_sequence SET value = value + 1 WHERE name = 'global';"
+_CURRENT_CHANGE_SEQ = "SELECT value FROM change_sequence WHERE name = 'global'"
+
+def install_change_tracking(connection):
+    """Değişiklik yakalama tetikleyicilerini kur.
+
+    Her ekleme ve güncelleme kayda genel sayaçtan yeni bir change_seq atar,
+    her silme change_tombstones tablosuna bir kayıt ekler. Tetikleyiciler
+    yazıcının işlemi içinde çalıştığından toplu UPDATE/DELETE ifadeleri
+    (sıkıştırma, pencere bağlama) da yakalanır. Sıra numarası olmayan eski
+    kayıtlara tetikleyiciler kurulmadan önce numara verilir.
+
+    Args:
+        connection: SQLAlchemy bağlantısı (işlem içinde).
+    """
+    connection.execute(text("INSERT OR IGNORE INTO change_sequence (name, value) VALUES ('global', 0)"))
+    for table_name in CHANGE_TRACKED_TABLES:
+        columns = {row[1] for row in connection.execute(text(f"PRAGMA table_info({table_name})"))}
+        if 'change_seq' not in columns:
+            # Eski tablolarda sütun eklendikten sonra migrate_db tarafından kurulur
+            continue
+        missing = connection.execute(text(
+            f"SELECT count(*), max(id) FROM {table_name} WHERE change_seq IS NULL"
+        )).one()
+        if missing[0]:
+            current = connection.execute(text(_CURRENT_CHANGE_SEQ)).scalar()
+            connection.execute(text(f"UPDATE {table_name} SET change_seq = :base + id WHERE change_seq IS NULL"),
+                               {'base': current})
+            connection.execute(text("UPDATE change_sequence SET value = :value WHERE name = 'global'"),
+                               {'value': current + missing[1]})
+
+        connection.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {table_name}_change_insert AFTER INSERT ON {table_name} BEGIN "
+            f"{_NEXT_CHANGE_SEQ} "
+            f"UPDATE {table_name} SET change_seq = ({_CURRENT_CHANGE_SEQ}) WHERE id = NEW.id; END"
+        ))
+        # change_seq'i açıkça değiştiren güncellemeler (tetikleyicinin kendisi dahil) yeniden numaralanmaz
+        connection.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {table_name}_change_update AFTER UPDATE ON {table_name} "
+            f"WHEN NEW.change_seq IS OLD.change_seq BEGIN "
+            f"{_NEXT_CHANGE_SEQ} "
+            f"UPDATE {table_name} SET change_seq = ({_CURRENT_CHANGE_SEQ}) WHERE id = NEW.id; END"
+        ))
+        connection.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {table_name}_change_delete AFTER DELETE ON {table_name} BEGIN "
+            f"{_NEXT_CHANGE_SEQ} "
+            f"INSERT INTO change_tombstones (change_seq, table_name, row_id, deleted_at) "
+            f"VALUES (({_CURRENT_CHANGE_SEQ}), '{table_name}', OLD.id, datetime('now', 'localtime')); END"
+        ))
+
+@event.listens_for(Base.metadata, 'after_create')
+def _install_change_tracking_after_create(target, connection, **kw):
+    install_change_tracking(connection)
+
+def get_device_id(connection, schema='main'):
+    """Veritabanının kalıcı cihaz kimliğini döndür; yoksa oluştur.
+
+    Birden fazla makinenin veritabanları birleştirilirken kaynağı tanımlar.
+
+    Args:
+        connection: SQLAlchemy bağlantısı.
+        schema: Veritabanı şeması (ATTACH ile eklenmiş kaynaklar için takma adı).
+
+    Returns:
+        str: Cihaz kimliği.
+    """
+    device_id = connection.execute(
+        text(f"SELECT value FROM {schema}.maintenance_state WHERE name = 'device_id'")
+    ).scalar()
+    if device_id is None:
+        device_id = str(uuid.uuid4())
+        connection.execute(
+            text(f"INSERT INTO {schema}.maintenance_state (name, value, updated_at) VALUES ('device_id', :value, :now)"),
+            {'value': device_id, 'now': datetime.datetime.now()}
+        )
+    return device_id
+
 def get_session():
     """Yeni bir veritabanı oturumu döndür."""
     return Session()
 
-# Veritabanını başlat
-init_db() 
\ No newline at end of file
+def create_read_engine(path=DATABASE_PATH, pool_size=4):
+    """Salt okunur, bağlantı havuzlu bir motor oluştur.
+
+    Okuyucular (API, raporlar) izleyicilerin yazma kilidiyle yarışmaz; dosya
+    salt okunur modda açılır ve bağlantılar havuzda yeniden kullanılır.
+
+    Args:
+        path: Veritabanı dosyası yolu.
+        pool_size: Havuzdaki bağlantı sayısı.
+
+    Returns:
+        sqlalchemy.engine.Engine: Salt okunur motor.
+    """
+    uri = os.path.abspath(path).replace(os.sep, '/')
+    read_engine = create_engine(
+        f'sqlite:///file:{uri}?mode=ro&uri=true',
+        poolclass=QueuePool, pool_size=pool_size, max_overflow=pool_size,
+        connect_args={'check_same_thread': False}
+    )
+
+    @event.listens_for(read_engine, 'connect')
+    def _set_query_only(dbapi_connection, connection_record):
+        dbapi_connection.execute('PRAGMA query_only = ON')
+
+    return read_engine
+
+def enable_wal(write_engine):
+    """
+    Yazıcı motorun bağlantılarında WAL günlük kipini etkinleştir.
+
+    Varsayılan geri alma günlüğünde açık bir okuma işlemi (ör. API'nin akıttığı
+    bir yanıt) paylaşılan kilidi tuttuğu sürece izleyicilerin commit'leri
+    beklemek zorunda kalır. WAL kipinde salt okunur okuyucular kendi
+    anlık görüntülerini okurken yazıcı commit edebilir.
+
+    Args:
+        write_engine: Yazma için kullanılan SQLAlchemy motoru.
+    """
+    @event.listens_for(write_engine, 'connect')
+    def _set_journal_mode(dbapi_connection, connection_record):
+        dbapi_connection.execute('PRAGMA journal_mode=WAL')
+
+enable_wal(engine)
+
+# Veritabanını başlat; spawn ile başlatılan havuz işlemleri modülü yeniden içe aktarır,
+# DDL ve tetikleyiciler yalnızca ana işlemde çalıştırılır
+if multiprocessing.current_process().name == 'MainProcess':
+    init_db() 
\ No newline at end of file
@@ -0,0 +1,240 @@
+"""
+Canlı olay yolu.
+
+Bu modül, izleyicilerin ürettiği olayları (pencere odağı, girdi sayaçları,
+dosya, tarayıcı ve oyun değişiklikleri) aynı süreçteki abonelere veritabanına
+dokunmadan ileten bir yayınla/abone ol yapısı içerir. Her abonenin sınırlı bir
+tamponu vardır; yetişemeyen abonenin en eski olayları düşürülür, tamponunun
+tamamı kadar olay kaybeden abonenin bağlantısı kesilir. Yayıncılar hiçbir
+zaman beklemez.
+"""
+import time
+import asyncio
+import logging
+import threading
+import collections
+
+logger = logging.getLogger(__name__)
+
+# Olay türleri
+EVENT_WINDOW_FOCUS = 'window.focus'
+EVENT_KEYBOARD = 'input.keyboard'
+EVENT_MOUSE = 'input.mouse'
+EVENT_FILE = 'file'
+EVENT_BROWSER = 'browser'
+EVENT_GAME = 'game'
+EVENT_TYPES = (EVENT_WINDOW_FOCUS, EVENT_KEYBOARD, EVENT_MOUSE, EVENT_FILE, EVENT_BROWSER, EVENT_GAME)
+
+class Subscription:
+    """Tek bir abonenin sınırlı olay tamponu."""
+
+    def __init__(self, bus, max_size=256, event_types=None, loop=None):
+        """Aboneliği başlat.
+
+        Args:
+            bus: Bağlı olunan EventBus.
+            max_size: Tamponda tutulacak en fazla olay sayısı.
+            event_types: Alınacak olay türleri (None ise tümü).
+            loop: Asenkron tüketici için asyncio olay döngüsü.
+        """
+        self.bus = bus
+        self.max_size = max(1, max_size)
+        self.event_types = frozenset(event_types) if event_types else None
+        self.loop = loop
+        self.closed = False
+        self.dropped = 0
+        self._buffer = collections.deque()
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._async_ready = asyncio.Event() if loop is not None else None
+        self._pending_drops = 0  # Son boşaltmadan bu yana düşürülen olay sayısı
+
+    def offer(self, event):
+        """Olayı tampona ekle (yayıncı iş parçacığında çağrılır, beklemez).
+
+        Returns:
+            bool: Abone hâlâ bağlıysa True.
+        """
+        with self._lock:
+            if self.closed:
+                return False
+            if len(self._buffer) >= self.max_size:
+                self._buffer.popleft()
+                self.dropped += 1
+                self._pending_drops += 1
+                if self._pending_drops >= self.max_size:
+                    # Tamponun tamamı kadar olay kaybeden yavaş abonenin bağlantısı kesilir
+                    self.closed = True
+            self._buffer.append(event)
+        self._notify()
+        return not self.closed
+
+    def _notify(self):
+        self._ready.set()
+        if self._async_ready is not None:
+            try:
+                self.loop.call_soon_threadsafe(self._async_ready.set)
+            except RuntimeError:
+                # Olay döngüsü kapanmış; abonelik artık kullanılmıyor
+                self.closed = True
+
+    def _drain(self):
+        with self._lock:
+            items = list(self._buffer)
+            self._buffer.clear()
+            self._pending_drops = 0
+            self._ready.clear()
+            if self._async_ready is not None:
+                self._async_ready.clear()
+        return items
+
+    def get(self, timeout=None):
+        """Biriken olayları döndür; olay yoksa en fazla timeout kadar bekle.
+
+        Returns:
+            list: Olaylar (boş liste zaman aşımı anlamına gelir).
+        """
+        if not self._buffer and not self.closed:
+            self._ready.wait(timeout)
+        return self._drain()
+
+    async def get_async(self, timeout=None):
+        """get() yönteminin asyncio karşılığı."""
+        if not self._buffer and not self.closed:
+            try:
+                await asyncio.wait_for(self._async_ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self._drain()
+
+    def close(self):
+        """Aboneliği sonlandır."""
+        self.closed = True
+        self.bus.unsubscribe(self)
+        self._notify()
+
+class EventBus:
+    """Süreç içi yayınla/abone ol olay yolu."""
+
+    def __init__(self):
+        self._subscribers = ()  # Yayın sırasında kilit gerektirmemek için değişmez demet
+        self._lock = threading.Lock()
+        self._published = 0
+        self._delivered = 0
+        self._disconnected = 0
+
+    @property
+    def has_subscribers(self):
+        return bool(self._subscribers)
+
+    def subscribe(self, max_size=256, event_types=None, loop=None):
+        """Yeni abonelik oluştur.
+
+        Args:
+            max_size: Abonenin tampon boyutu.
+            event_types: Alınacak olay türleri (None ise tümü).
+            loop: Asenkron tüketici için asyncio olay döngüsü.
+
+        Returns:
+            Subscription: Abonelik.
+        """
+        subscription = Subscription(self, max_size, event_types, loop)
+        with self._lock:
+            self._subscribers = self._subscribers + (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers = tuple(item for item in self._subscribers if item is not subscription)
+
+    def publish(self, event_type, **data):
+        """Olayı tüm abonelere ilet.
+
+        Abone yoksa olay oluşturulmaz; izleyiciler için maliyet tek bir kontroldür.
+
+        Args:
+            event_type: Olay türü.
+            **data: Olay verileri.
+
+        Returns:
+            int: Olayı alan abone sayısı.
+        """
+        subscribers = self._subscribers
+        if not subscribers:
+            return 0
+        event = {'type': event_type, 'time': time.time(), **data}
+        delivered = 0
+        for subscription in subscribers:
+            if subscription.event_types is not None and event_type not in subscription.event_types:
+                continue
+            if subscription.offer(event):
+                delivered += 1
+            else:
+                self.unsubscribe(subscription)
+                self._disconnected += 1
+                logger.warning(f"Yavaş abone bağlantısı kesildi ({subscription.dropped} olay düşürüldü)")
+        self._published += 1
+        self._delivered += delivered
+        return delivered
+
+    def get_metrics(self):
+        """Olay yolu metriklerini döndür."""
+        subscribers = self._subscribers
+        return {
+            'subscribers': len(subscribers),
+            'published': self._published,
+            'delivered': self._delivered,
+            'disconnected': self._disconnected,
+            'dropped': sum(subscription.dropped for subscription in subscribers),
+        }
+
+class InputTicker:
+    """Girdi sayaçlarını belirli aralıklarla tek olay olarak yayınlayan yardımcı.
+
+    Sessiz bir dönemden sonraki ilk girdi hemen yayınlanır; sonraki girdiler
+    aralık dolana kadar biriktirilir ve aralık sonunda bir zamanlayıcıyla
+    yayınlanır. Böylece bir girdi patlamasının sonu sonraki girdiyi beklemez.
+    """
+
+    def __init__(self, bus, event_type, interval=0.1):
+        self.bus = bus
+        self.event_type = event_type
+        self.interval = interval
+        self.counts = {}
+        self.last_publish = 0.0
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def add(self, **counts):
+        """Sayaçları artır; aralık dolduysa yayınla, dolmadıysa aralık sonuna zamanla."""
+        if not self.bus.has_subscribers:
+            return
+        with self._lock:
+            for name, value in counts.items():
+                self.counts[name] = self.counts.get(name, 0) + value
+            remaining = self.interval - (time.monotonic() - self.last_publish)
+            if remaining > 0:
+                if self._timer is None:
+                    self._timer = threading.Timer(remaining, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+            pending, self.counts = self.counts, {}
+            self.last_publish = time.monotonic()
+        self.bus.publish(self.event_type, **pending)
+
+    def flush(self):
+        """Biriken sayaçları yayınla."""
+        with self._lock:
+            if self._timer is not None:
+                # Zamanlayıcının kendisinden çağrıldığında cancel etkisizdir
+                self._timer.cancel()
+                self._timer = None
+            pending, self.counts = self.counts, {}
+            if pending:
+                self.last_publish = time.monotonic()
+        if pending:
+            self.bus.publish(self.event_type, **pending)
+
+# Süreç genelindeki olay yolu
+event_bus = EventBus()
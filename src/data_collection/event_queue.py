@@ -0,0 +1,153 @@
+"""
+Sınırlı olay kuyruğu.
+
+Bu modül, izleyici geri çağrılarından gelen olayları veritabanı yazımından ayıran
+çift tamponlu ve sınırlı bir kuyruk içerir.
+"""
+import time
+import random
+import threading
+import collections
+
+# Taşma politikaları
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP_OLDEST = "drop-oldest"
+OVERFLOW_SAMPLE = "sample"
+OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_SAMPLE)
+
+class BoundedEventQueue:
+    """Üreticileri disk G/Ç'sinden ayıran sınırlı, çift tamponlu olay kuyruğu.
+
+    Üreticiler olayları etkin tampona ekler; tüketici ``drain`` ile tamponu
+    yenisiyle değiştirir. Kilit yalnızca ekleme ve tampon değişimi sırasında
+    tutulur, veritabanı yazımı kilit dışında yapılır.
+    """
+
+    def __init__(self, max_size=10000, overflow_policy=OVERFLOW_DROP_OLDEST, block_timeout=1.0):
+        """Kuyruğu başlat.
+
+        Args:
+            max_size: Tamponda tutulabilecek en fazla olay sayısı.
+            overflow_policy: Tampon dolduğunda uygulanacak politika (block, drop-oldest, sample).
+            block_timeout: "block" politikasında yer açılması için beklenecek en uzun süre (saniye).
+        """
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Geçersiz taşma politikası: {overflow_policy}")
+        if max_size <= 0:
+            raise ValueError("Kuyruk boyutu pozitif olmalıdır")
+
+        self.max_size = max_size
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+
+        self._buffer = collections.deque()
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+        self._overflow_seen = 0  # "sample" politikası için dolu tampona gelen olay sayısı
+
+        # Metrikler
+        self._puts = 0
+        self._enqueued = 0
+        self._dropped = 0
+        self._max_depth = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    def put(self, item):
+        """Olayı kuyruğa ekle.
+
+        Args:
+            item: Eklenecek olay.
+
+        Returns:
+            bool: Olay tampona alındıysa True, düşürüldüyse False.
+        """
+        start = time.perf_counter()
+        accepted = True
+
+        with self._lock:
+            if len(self._buffer) >= self.max_size:
+                accepted = self._handle_overflow(item)
+            else:
+                self._buffer.append(item)
+
+            self._puts += 1
+            if accepted:
+                self._enqueued += 1
+            depth = len(self._buffer)
+            if depth > self._max_depth:
+                self._max_depth = depth
+
+            latency = time.perf_counter() - start
+            self._latency_total += latency
+            if latency > self._latency_max:
+                self._latency_max = latency
+
+        return accepted
+
+    def _handle_overflow(self, item):
+        """Dolu tampona gelen olayı politikaya göre işle (kilit tutulurken çağrılır).
+
+        Args:
+            item: Eklenecek olay.
+
+        Returns:
+            bool: Olay tampona alındıysa True.
+        """
+        if self.overflow_policy == OVERFLOW_BLOCK:
+            # Tüketici tamponu boşaltana kadar bekle
+            self._not_full.wait_for(lambda: len(self._buffer) < self.max_size, timeout=self.block_timeout)
+            if len(self._buffer) < self.max_size:
+                self._buffer.append(item)
+                return True
+            self._dropped += 1
+            return False
+
+        if self.overflow_policy == OVERFLOW_DROP_OLDEST:
+            self._buffer.popleft()
+            self._buffer.append(item)
+            self._dropped += 1
+            return True
+
+        # Rezervuar örnekleme: taşma sırasında gelen olaylar eşit olasılıkla temsil edilir
+        self._overflow_seen += 1
+        slot = random.randrange(self.max_size + self._overflow_seen)
+        self._dropped += 1
+        if slot < self.max_size:
+            self._buffer[slot] = item
+            return True
+        return False
+
+    def drain(self):
+        """Tamponu boş bir tamponla değiştir ve eski tamponu döndür.
+
+        Returns:
+            collections.deque: Birikmiş olaylar (eklenme sırasına göre).
+        """
+        with self._lock:
+            items = self._buffer
+            self._buffer = collections.deque()
+            self._overflow_seen = 0
+            self._not_full.notify_all()
+        return items
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def get_metrics(self):
+        """Kuyruk metriklerini döndür.
+
+        Returns:
+            dict: Derinlik, düşürülen olaylar ve ekleme gecikmesi bilgileri.
+        """
+        with self._lock:
+            return {
+                'depth': len(self._buffer),
+                'max_depth': self._max_depth,
+                'capacity': self.max_size,
+                'overflow_policy': self.overflow_policy,
+                'enqueued': self._enqueued,
+                'dropped': self._dropped,
+                'avg_enqueue_latency_ms': (self._latency_total / self._puts * 1000.0) if self._puts else 0.0,
+                'max_enqueue_latency_ms': self._latency_max * 1000.0
+            }
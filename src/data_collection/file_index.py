@@ -0,0 +1,361 @@
+"""
+Dizin durum dizini.
+
+Bu modül, izlenen köklerdeki dosyaların (yol → boyut, değişiklik zamanı, inode)
+durumunu veritabanında saklar ve izleyici çalışmıyorken oluşan değişiklikleri
+başlangıçta paralel bir tarama ile tespit eder.
+"""
+import os
+import logging
+import datetime
+import concurrent.futures
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert
+from .database import FileIndexEntry, DirectoryIndexEntry
+
+logger = logging.getLogger(__name__)
+
+# Toplu yazımlarda kullanılacak parça boyutu
+_CHUNK_SIZE = 500
+
+class IndexChange:
+    """Tarama sırasında tespit edilen çevrimdışı değişiklik."""
+    __slots__ = ('path', 'action', 'src_path', 'mtime_ns')
+
+    def __init__(self, path, action, src_path=None, mtime_ns=None):
+        self.path = path
+        self.action = action
+        self.src_path = src_path
+        self.mtime_ns = mtime_ns
+
+    @property
+    def timestamp(self):
+        """Değişikliğin zamanı (bilinmiyorsa şu an)."""
+        if self.mtime_ns is None:
+            return datetime.datetime.now()
+        return datetime.datetime.fromtimestamp(self.mtime_ns / 1e9)
+
+class _DirectoryResult:
+    """Tek bir dizinin tarama sonucu."""
+    __slots__ = ('path', 'mtime_ns', 'files', 'subdirs', 'missing')
+
+    def __init__(self, path, mtime_ns=None, files=None, subdirs=(), missing=False):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.files = files  # None ise dizin değişmemiş ve dosyaları okunmamıştır
+        self.subdirs = subdirs
+        self.missing = missing
+
+class FileStateIndex:
+    """İzlenen köklerin kalıcı durum dizini."""
+
+    def __init__(self, path_filter=None, workers=8, full_scan=False):
+        """Dizini başlat.
+
+        Args:
+            path_filter: Dosya ve dizinleri eleyen PathFilter nesnesi.
+            workers: Tarama için kullanılacak iş parçacığı sayısı.
+            full_scan: True ise dizin değişiklik zamanı kısayolu kullanılmaz.
+        """
+        self.path_filter = path_filter
+        self.workers = max(1, workers)
+        self.full_scan = full_scan
+        self.files = {}
+        self.dirs = {}
+        self.files_by_dir = {}
+        self.children = {}
+
+    def load(self, db_session):
+        """Kayıtlı durumu veritabanından belleğe yükle.
+
+        Args:
+            db_session: Veritabanı oturumu.
+
+        Returns:
+            int: Yüklenen dosya sayısı.
+        """
+        self.files = {}
+        self.files_by_dir = {}
+        for path, size, mtime_ns, inode in db_session.execute(
+            select(FileIndexEntry.path, FileIndexEntry.size, FileIndexEntry.mtime_ns, FileIndexEntry.inode)
+        ):
+            self.files[path] = (size, mtime_ns, inode)
+            self.files_by_dir.setdefault(os.path.dirname(path), set()).add(path)
+
+        self.dirs = {}
+        self.children = {}
+        for path, mtime_ns in db_session.execute(select(DirectoryIndexEntry.path, DirectoryIndexEntry.mtime_ns)):
+            self.dirs[path] = mtime_ns
+            self.children.setdefault(os.path.dirname(path), set()).add(path)
+
+        return len(self.files)
+
+    def is_empty(self):
+        """Dizinde kayıt olup olmadığını döndür."""
+        return not self.files and not self.dirs
+
+    def scan(self, roots):
+        """Kökleri paralel olarak tara ve kayıtlı durumla karşılaştır.
+
+        Değişiklik zamanı kayıtlı değerle aynı olan dizinlerin dosyaları
+        okunmaz; yalnızca kayıtlı alt dizinlerine inilir. Dizin girdisini
+        değiştirmeden yerinde yazılan dosyalar bu kısayolda görülmez;
+        ``full_scan`` bu durumlar için tüm dosyaları yeniden okur.
+
+        Args:
+            roots: WatchRoot nesneleri.
+
+        Returns:
+            tuple: (değişiklikler, yeni dosya durumları, silinen dosyalar, yeni dizin durumları, silinen dizinler).
+        """
+        created = {}
+        modified = []
+        deleted = {}
+        file_updates = {}
+        dir_updates = {}
+        removed_dirs = set()
+        scanned = skipped = 0
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = {
+                executor.submit(self._scan_directory, root, root.path, 0): root
+                for root in roots
+            }
+            while pending:
+                done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    root = pending.pop(future)
+                    result, depth = future.result()
+
+                    if result.missing:
+                        # Dizin silinmiş: alt ağaçtaki kayıtlı tüm dosyaları silindi olarak işaretle
+                        self._forget_subtree(result.path, removed_dirs, deleted)
+                    elif result.files is None:
+                        skipped += 1
+                    else:
+                        scanned += 1
+                        dir_updates[result.path] = result.mtime_ns
+                        indexed = self.files_by_dir.get(result.path, set())
+                        for path, state in result.files.items():
+                            previous = self.files.get(path)
+                            if previous is None:
+                                created[path] = state
+                                file_updates[path] = state
+                            elif previous[0] != state[0] or previous[1] != state[1]:
+                                modified.append(IndexChange(path, "modified", mtime_ns=state[1]))
+                                file_updates[path] = state
+                        for path in indexed - result.files.keys():
+                            deleted[path] = self.files[path]
+
+                        # Listeden kaybolan kayıtlı alt dizinler
+                        for child in self.children.get(result.path, set()) - set(result.subdirs):
+                            if os.path.isdir(child):
+                                # Artık yok sayılıyor veya hariç tutuluyor: olay üretmeden dizinden çıkar
+                                self._forget_subtree(child, removed_dirs, None)
+                            else:
+                                self._forget_subtree(child, removed_dirs, deleted)
+
+                    for child in result.subdirs:
+                        future_child = executor.submit(self._scan_directory, root, child, depth + 1)
+                        pending[future_child] = root
+
+        # Taşımaları inode, boyut ve değişiklik zamanı eşleşmesi ile tespit et (yeniden kullanılan inode'lar karışmasın)
+        changes = []
+        removed_files = list(deleted)
+        deleted_by_inode = {}
+        for path, state in deleted.items():
+            if state[2]:
+                deleted_by_inode.setdefault((state[2], state[0], state[1]), path)
+        for path, state in created.items():
+            src_path = deleted_by_inode.pop((state[2], state[0], state[1]), None) if state[2] else None
+            if src_path is not None:
+                # Kaynak yol olay listesinden çıkar ama dizinden silinmesi için removed_files'ta kalır
+                del deleted[src_path]
+                changes.append(IndexChange(path, "moved", src_path=src_path, mtime_ns=state[1]))
+            else:
+                changes.append(IndexChange(path, "created", mtime_ns=state[1]))
+        changes.extend(modified)
+        changes.extend(IndexChange(path, "deleted") for path in deleted)
+
+        logger.info(f"Dizin taraması tamamlandı: {scanned} dizin okundu, {skipped} değişmemiş dizin atlandı")
+        return changes, file_updates, removed_files, dir_updates, removed_dirs
+
+    def _forget_subtree(self, path, removed_dirs, deleted):
+        """Kayıtlı bir alt ağacı dizinden çıkar.
+
+        Args:
+            path: Alt ağacın kökü.
+            removed_dirs: Silinecek dizinlerin toplandığı küme.
+            deleted: Silinen dosyaların toplandığı sözlük veya olay üretilmeyecekse None.
+        """
+        stack = [path]
+        while stack:
+            current = stack.pop()
+            removed_dirs.add(current)
+            if deleted is not None:
+                for file_path in self.files_by_dir.get(current, ()):
+                    deleted[file_path] = self.files[file_path]
+            stack.extend(self.children.get(current, ()))
+
+    def _scan_directory(self, root, path, depth):
+        """Tek bir dizini tara (iş parçacığında çalışır).
+
+        Returns:
+            tuple: (_DirectoryResult, derinlik).
+        """
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return _DirectoryResult(path, missing=True), depth
+
+        can_descend = root.max_depth is None or depth < root.max_depth
+
+        if not self.full_scan and self.dirs.get(path) == mtime_ns:
+            subdirs = [
+                child for child in self.children.get(path, ())
+                if can_descend and self._accept_directory(root, child)
+            ]
+            return _DirectoryResult(path, mtime_ns, None, subdirs), depth
+
+        files = {}
+        subdirs = []
+        try:
+            with os.scandir(path) as iterator:
+                for entry in iterator:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if can_descend and self._accept_directory(root, entry.path):
+                                subdirs.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            if self.path_filter is not None and self.path_filter.match(entry.path) is None:
+                                continue
+                            stat = entry.stat(follow_symlinks=False)
+                            files[entry.path] = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.debug(f"Dizin okunamadı ({path}): {e}")
+            return _DirectoryResult(path, mtime_ns, None, []), depth
+
+        return _DirectoryResult(path, mtime_ns, files, subdirs), depth
+
+    def _accept_directory(self, root, path):
+        """Alt dizinin taranıp taranmayacağını belirle."""
+        if root.is_ignored(os.path.basename(path)):
+            return False
+        return self.path_filter is None or not self.path_filter.excludes_directory(path)
+
+    def save(self, db_session, file_updates, deleted_files, dir_updates, removed_dirs):
+        """Tarama sonucunu veritabanına yaz ve bellek içi durumu güncelle.
+
+        Args:
+            db_session: Veritabanı oturumu.
+            file_updates: Yol → (boyut, değişiklik zamanı, inode) sözlüğü.
+            deleted_files: Dizinden çıkarılacak dosya yolları.
+            dir_updates: Yol → değişiklik zamanı sözlüğü.
+            removed_dirs: Dizinden çıkarılacak dizin yolları.
+        """
+        removed_files = set(deleted_files)
+        for directory in removed_dirs:
+            removed_files.update(self.files_by_dir.get(directory, ()))
+
+        self._upsert_files(db_session, file_updates)
+        self._delete(db_session, FileIndexEntry, removed_files)
+        self._upsert_dirs(db_session, dir_updates)
+        self._delete(db_session, DirectoryIndexEntry, removed_dirs)
+        db_session.commit()
+
+        for path in removed_files:
+            self._drop_file(path)
+        for path, state in file_updates.items():
+            self._set_file(path, state)
+        for path in removed_dirs:
+            self.dirs.pop(path, None)
+            self.children.get(os.path.dirname(path), set()).discard(path)
+        for path, mtime_ns in dir_updates.items():
+            self.dirs[path] = mtime_ns
+            self.children.setdefault(os.path.dirname(path), set()).add(path)
+
+    def apply_events(self, db_session, events, update_directories=True):
+        """Canlı dosya olaylarını dizine uygula.
+
+        Args:
+            db_session: Veritabanı oturumu.
+            events: FileEvent nesneleri.
+            update_directories: True ise olayların üst dizinlerinin değişiklik zamanları da güncellenir.
+                Düşürülen olay varsa False verilmelidir; böylece bu dizinler bir sonraki başlangıçta yeniden okunur.
+        """
+        file_updates = {}
+        removed = set()
+        parents = set()
+        for event in events:
+            if event.action == "moved" and event.src_path:
+                removed.add(os.path.abspath(event.src_path))
+                parents.add(os.path.dirname(os.path.abspath(event.src_path)))
+            parents.add(os.path.dirname(event.file_path))
+            if event.action == "deleted":
+                removed.add(event.file_path)
+                file_updates.pop(event.file_path, None)
+                continue
+            try:
+                stat = os.stat(event.file_path)
+            except OSError:
+                removed.add(event.file_path)
+                file_updates.pop(event.file_path, None)
+                continue
+            file_updates[event.file_path] = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+            removed.discard(event.file_path)
+
+        dir_updates = {}
+        if update_directories:
+            for parent in parents:
+                # Yalnızca zaten dizinde olan klasörler güncellenir
+                if parent not in self.dirs:
+                    continue
+                try:
+                    dir_updates[parent] = os.stat(parent).st_mtime_ns
+                except OSError:
+                    continue
+
+        if file_updates or removed or dir_updates:
+            self.save(db_session, file_updates, removed, dir_updates, ())
+
+    def _upsert_files(self, db_session, updates):
+        items = [
+            {'path': path, 'size': state[0], 'mtime_ns': state[1], 'inode': state[2]}
+            for path, state in updates.items()
+        ]
+        for start in range(0, len(items), _CHUNK_SIZE):
+            statement = insert(FileIndexEntry)
+            statement = statement.on_conflict_do_update(
+                index_elements=[FileIndexEntry.path],
+                set_={
+                    'size': statement.excluded.size,
+                    'mtime_ns': statement.excluded.mtime_ns,
+                    'inode': statement.excluded.inode
+                }
+            )
+            db_session.execute(statement, items[start:start + _CHUNK_SIZE])
+
+    def _upsert_dirs(self, db_session, updates):
+        items = [{'path': path, 'mtime_ns': mtime_ns} for path, mtime_ns in updates.items()]
+        for start in range(0, len(items), _CHUNK_SIZE):
+            statement = insert(DirectoryIndexEntry)
+            statement = statement.on_conflict_do_update(
+                index_elements=[DirectoryIndexEntry.path],
+                set_={'mtime_ns': statement.excluded.mtime_ns}
+            )
+            db_session.execute(statement, items[start:start + _CHUNK_SIZE])
+
+    def _delete(self, db_session, model, paths):
+        paths = list(paths)
+        for start in range(0, len(paths), _CHUNK_SIZE):
+            db_session.execute(delete(model).where(model.path.in_(paths[start:start + _CHUNK_SIZE])))
+
+    def _set_file(self, path, state):
+        self.files[path] = state
+        self.files_by_dir.setdefault(os.path.dirname(path), set()).add(path)
+
+    def _drop_file(self, path):
+        if self.files.pop(path, None) is not None:
+            self.files_by_dir.get(os.path.dirname(path), set()).discard(path)
@@ -0,0 +1,137 @@
+"""
+Odak süresi kaydı.
+
+Bu modül, pencere ve sekme gibi odaklanılan öğelerin toplam odak sürelerini
+sınırlı bir LRU yapısında biriktirir ve grup (uygulama, alan adı) bazında toplar.
+"""
+import time
+import collections
+
+class FocusEntry:
+    """Tek bir öğenin odak bilgisi."""
+    __slots__ = ('key', 'group', 'focused_ms', 'focus_started')
+
+    def __init__(self, key, group):
+        self.key = key
+        self.group = group
+        self.focused_ms = 0
+        self.focus_started = None  # Odaktaysa monotonic başlangıç zamanı
+
+class FocusRegistry:
+    """Sınırlı, biriken odak süresi kaydı.
+
+    Öğeler en son kullanılma sırasına göre tutulur; kapasite aşıldığında en
+    eski öğe çıkarılır. Çıkarılan öğelerin süreleri grup toplamlarında kalır.
+    Tüm sorgular O(1) çalışır.
+    """
+
+    def __init__(self, max_entries=1000, max_groups=1000):
+        """Kaydı başlat.
+
+        Args:
+            max_entries: Tutulacak en fazla öğe sayısı.
+            max_groups: Tutulacak en fazla grup sayısı.
+        """
+        self.max_entries = max(1, max_entries)
+        self.max_groups = max(1, max_groups)
+        self._entries = collections.OrderedDict()
+        self._groups = collections.OrderedDict()
+        self._active = None
+
+    def activate(self, key, group, now=None):
+        """Öğeyi odaklanmış olarak işaretle; önceki öğenin odağını kapat.
+
+        Args:
+            key: Öğe anahtarı.
+            group: Öğenin grubu (uygulama veya alan adı).
+            now: Monotonic zaman (test için).
+        """
+        now = time.monotonic() if now is None else now
+        if self._active is not None and self._active.key == key:
+            return
+        self.deactivate(now)
+
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = FocusEntry(key, group)
+            self._entries[key] = entry
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(key)
+
+        entry.focus_started = now
+        self._active = entry
+
+        if group in self._groups:
+            self._groups.move_to_end(group)
+        else:
+            self._groups[group] = 0
+            if len(self._groups) > self.max_groups:
+                self._groups.popitem(last=False)
+
+    def deactivate(self, now=None):
+        """Odaktaki öğenin süresini biriktir ve odağı kapat.
+
+        Args:
+            now: Monotonic zaman (test için).
+        """
+        entry = self._active
+        if entry is None:
+            return
+        now = time.monotonic() if now is None else now
+        elapsed_ms = int((now - entry.focus_started) * 1000)
+        entry.focused_ms += elapsed_ms
+        entry.focus_started = None
+        if entry.group in self._groups:
+            self._groups[entry.group] += elapsed_ms
+        self._active = None
+
+    def is_active(self, key):
+        """Öğenin odakta olup olmadığını döndür."""
+        return self._active is not None and self._active.key == key
+
+    def get_duration_ms(self, key, now=None):
+        """Öğenin toplam odak süresini döndür (devam eden odak dahil).
+
+        Args:
+            key: Öğe anahtarı.
+            now: Monotonic zaman (test için).
+
+        Returns:
+            int: Milisaniye cinsinden süre veya 0.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return 0
+        return entry.focused_ms + self._running_ms(entry, now)
+
+    def get_group_duration_ms(self, group, now=None):
+        """Grubun toplam odak süresini döndür (devam eden odak dahil).
+
+        Args:
+            group: Grup adı.
+            now: Monotonic zaman (test için).
+
+        Returns:
+            int: Milisaniye cinsinden süre veya 0.
+        """
+        total = self._groups.get(group, 0)
+        if self._active is not None and self._active.group == group:
+            total += self._running_ms(self._active, now)
+        return total
+
+    def _running_ms(self, entry, now):
+        if entry.focus_started is None:
+            return 0
+        now = time.monotonic() if now is None else now
+        return int((now - entry.focus_started) * 1000)
+
+    def clear(self):
+        """Tüm kayıtları temizle."""
+        self._entries.clear()
+        self._groups.clear()
+        self._active = None
+
+    def __len__(self):
+        return len(self._entries)
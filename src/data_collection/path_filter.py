@@ -0,0 +1,222 @@
+"""
+Dosya yolu filtreleme.
+
+Bu modül, dosya olaylarını kuyruğa alınmadan önce eleyen, kurulumda bir kez
+derlenen filtre zincirini ve olay kayıt sınıfını içerir.
+"""
+import os
+import re
+import fnmatch
+
+# Ayraç olarak kullanılacak karakter (normcase sonrası)
+_SEP = os.sep
+
+# fnmatch joker karakterleri
+_WILDCARDS = re.compile(r'[*?\[]')
+
+class FileEvent:
+    """Dosya olayı kaydı."""
+    __slots__ = ('file_path', 'action', 'src_path', 'timestamp', 'file_type')
+
+    def __init__(self, file_path, action, src_path, timestamp, file_type):
+        self.file_path = file_path
+        self.action = action
+        self.src_path = src_path
+        self.timestamp = timestamp
+        self.file_type = file_type
+
+    def __repr__(self):
+        return f"<FileEvent(action='{self.action}', file_path='{self.file_path}')>"
+
+def normalize_path(path):
+    """Yolu karşılaştırma için normalleştir.
+
+    Args:
+        path: Dosya veya dizin yolu.
+
+    Returns:
+        str: Mutlak, normcase uygulanmış yol.
+    """
+    return os.path.normcase(os.path.abspath(path))
+
+def compile_name_patterns(patterns):
+    """Ad desenlerini tek bir düzenli ifadede birleştir.
+
+    Windows dışında eşleşme büyük/küçük harfe duyarlıdır (dosya sistemiyle aynı).
+
+    Args:
+        patterns: fnmatch desenleri.
+
+    Returns:
+        re.Pattern: Birleşik ifade veya desen yoksa None.
+    """
+    if not patterns:
+        return None
+    flags = re.IGNORECASE if os.name == 'nt' else 0
+    return re.compile('|'.join(f'(?:{fnmatch.translate(pattern)})' for pattern in patterns), flags)
+
+class PrefixTrie:
+    """Yol bileşenleri üzerinde kök dizin öneki ağacı."""
+
+    _TERMINAL = object()
+
+    def __init__(self, roots=()):
+        """Ağacı oluştur.
+
+        Args:
+            roots: Normalleştirilmiş kök dizinler.
+        """
+        self._root = {}
+        for root in roots:
+            self.add(root)
+
+    def add(self, root):
+        """Kök dizini ekle.
+
+        Args:
+            root: Normalleştirilmiş kök dizin.
+        """
+        node = self._root
+        for part in root.split(_SEP):
+            if not part:
+                continue
+            node = node.setdefault(part, {})
+        node[self._TERMINAL] = True
+
+    def contains(self, path):
+        """Yolun eklenen köklerden birinin içinde olup olmadığını kontrol et.
+
+        Args:
+            path: Normalleştirilmiş yol.
+
+        Returns:
+            bool: Yol bir kökün kendisi veya altındaysa True.
+        """
+        node = self._root
+        if not node:
+            return False
+        terminal = self._TERMINAL
+        for part in path.split(_SEP):
+            if not part:
+                continue
+            node = node.get(part)
+            if node is None:
+                return False
+            if terminal in node:
+                return True
+        return False
+
+    def __bool__(self):
+        return bool(self._root)
+
+class PathFilter:
+    """Dosya olayları için önceden derlenmiş filtre zinciri.
+
+    Sıra: izleyicinin kendi dizin ve dosyaları (tek ``startswith`` çağrısı), dosya adı
+    önek/sonek kümeleri ve diğer desenlerin tek derlenmiş ifadesi, hariç tutulan
+    dizinlerin önek ağacı.
+    """
+
+    def __init__(self, excluded_roots=(), ignored_patterns=(), own_dirs=(), own_files=(), ignored_dir_patterns=(),
+                 ignored_dir_root=None):
+        """Filtreyi derle.
+
+        Args:
+            excluded_roots: Hariç tutulan dizinler.
+            ignored_patterns: Yok sayılan dosya adı desenleri ("*.tmp", "~$*", "*~" gibi).
+            own_dirs: İzleyicinin kendi dizinleri (veri, log, proje dizini).
+            own_files: İzleyicinin kendi dosyaları (veritabanı ve günlük dosyaları).
+            ignored_dir_patterns: Yolun herhangi bir yerinde yok sayılan dizin adları ("node_modules" gibi).
+            ignored_dir_root: Verilirse dizin adları yalnızca bu köke göreli yolda aranır
+                (kökün üstündeki dizinler yok sayma desenleriyle eşleşmez).
+        """
+        own = {normalize_path(path) for path in own_dirs if path}
+        self._own_dirs = frozenset(own | {normalize_path(path) for path in own_files if path})
+        self._own_prefixes = tuple(path.rstrip(_SEP) + _SEP for path in own)
+
+        self._excluded = PrefixTrie(normalize_path(path) for path in excluded_roots if path)
+        self._ignored_dirs = compile_name_patterns(ignored_dir_patterns)
+        self._ignored_dirs_root = normalize_path(ignored_dir_root).rstrip(_SEP) + _SEP if ignored_dir_root else ''
+
+        extensions = set()
+        suffixes = set()
+        prefixes = set()
+        others = []
+        for pattern in ignored_patterns:
+            pattern = pattern.lower()
+            if not pattern:
+                continue
+            # Yalnızca tek joker karakteri başta ("*x") veya sonda ("x*") olan desenler hızlı yoldan geçer
+            if pattern.startswith('*') and not _WILDCARDS.search(pattern[1:]):
+                suffix = pattern[1:]
+                # Tek noktalı uzantılar küme araması ile, diğerleri endswith ile kontrol edilir
+                if suffix.startswith('.') and suffix.count('.') == 1:
+                    extensions.add(suffix)
+                else:
+                    suffixes.add(suffix)
+            elif pattern.endswith('*') and not _WILDCARDS.search(pattern[:-1]):
+                prefixes.add(pattern[:-1])
+            else:
+                # "*cache*", "~$*.docx" ve "Thumbs.db" gibi desenler tam ad üzerinde eşleştirilir
+                others.append(fnmatch.translate(pattern))
+        self._ignored_extensions = frozenset(extensions)
+        self._ignored_suffixes = tuple(sorted(suffixes))
+        self._ignored_prefixes = tuple(sorted(prefixes))
+        self._ignored_names = re.compile('|'.join(others)) if others else None
+
+    def match(self, path):
+        """Yolu filtrele.
+
+        Args:
+            path: Olayın dosya yolu.
+
+        Returns:
+            tuple: Kabul edilirse (mutlak yol, dosya türü), aksi halde None.
+        """
+        # Watchdog mutlak yollar üretir; abspath yalnızca gerektiğinde çağrılır
+        if not os.path.isabs(path):
+            path = os.path.abspath(path)
+        key = os.path.normcase(path)
+
+        # İzleyicinin kendi dizinleri
+        if key.startswith(self._own_prefixes) or key in self._own_dirs:
+            return None
+
+        name = key[key.rfind(_SEP) + 1:].lower()
+        if self._ignored_prefixes and name.startswith(self._ignored_prefixes):
+            return None
+        if self._ignored_suffixes and name.endswith(self._ignored_suffixes):
+            return None
+        if self._ignored_names is not None and self._ignored_names.match(name):
+            return None
+
+        dot = name.rfind('.')
+        extension = name[dot:] if dot > 0 else ''
+        if extension in self._ignored_extensions:
+            return None
+
+        if self._excluded and self._excluded.contains(key):
+            return None
+
+        if self._ignored_dirs is not None:
+            relative = key[len(self._ignored_dirs_root):] if key.startswith(self._ignored_dirs_root) else key
+            # Dosya adı hariç, köke göreli yolun dizin bileşenleri
+            ignored = self._ignored_dirs.match
+            if any(ignored(part) for part in relative.split(_SEP)[:-1] if part):
+                return None
+
+        return path, extension[1:]
+
+    def excludes_directory(self, path):
+        """Dizinin tamamen hariç tutulup tutulmadığını kontrol et.
+
+        Args:
+            path: Dizin yolu.
+
+        Returns:
+            bool: Dizin izleyicinin kendi dizini veya hariç tutulan bir kökün altındaysa True.
+        """
+        key = normalize_path(path)
+        if key in self._own_dirs or key.startswith(self._own_prefixes):
+            return True
+        return bool(self._excluded) and self._excluded.contains(key)
@@ -0,0 +1,370 @@
+"""
+Günlük özet çizimleri (sketch).
+
+Bu modül, en sık görülen öğeler için Space-Saving ve Count-Min, farklı öğe
+sayısı için HyperLogLog çizimlerini içerir. Çizimler gün başına küçük
+ikili bloklar olarak saklanır ve herhangi bir tarih aralığı için
+birleştirilerek tam tablo taramadan, hata sınırlarıyla birlikte yanıt verir.
+"""
+import json
+import math
+import zlib
+import struct
+import hashlib
+import logging
+import datetime
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+
+from .database import WindowActivity, BrowserActivity, FileActivity, DaySketch
+
+logger = logging.getLogger(__name__)
+
+def _hash64(key):
+    """Anahtarın 64 bitlik özetini döndür."""
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+
+class SpaceSaving:
+    """Birleştirilebilir Space-Saving en sık öğeler özeti.
+
+    Her öğe için (sayım, hata) tutulur; gerçek değer [sayım - hata, sayım]
+    aralığındadır. Kapasite dolduğunda en küçük sayımlı öğe çıkarılır.
+    """
+
+    def __init__(self, capacity=200, counters=None):
+        self.capacity = capacity
+        self.counters = counters or {}  # öğe → [sayım, hata]
+
+    def add(self, key, weight=1):
+        """Öğeyi ağırlığıyla ekle."""
+        if not key or weight <= 0:
+            return
+        counter = self.counters.get(key)
+        if counter is not None:
+            counter[0] += weight
+        elif len(self.counters) < self.capacity:
+            self.counters[key] = [weight, 0]
+        else:
+            victim = min(self.counters, key=lambda item: self.counters[item][0])
+            minimum = self.counters.pop(victim)[0]
+            self.counters[key] = [minimum + weight, minimum]
+
+    def _floor(self):
+        """Özette olmayan öğelerin en fazla alabileceği değer."""
+        if len(self.counters) < self.capacity:
+            return 0
+        return min(counter[0] for counter in self.counters.values())
+
+    def merge(self, other):
+        """Diğer özeti bu özetle birleştir (Agarwal vd. birleştirilebilir özetler)."""
+        floor_self, floor_other = self._floor(), other._floor()
+        merged = {}
+        for key in set(self.counters) | set(other.counters):
+            count_a, error_a = self.counters.get(key, (floor_self, floor_self))
+            count_b, error_b = other.counters.get(key, (floor_other, floor_other))
+            merged[key] = [count_a + count_b, error_a + error_b]
+        top = sorted(merged.items(), key=lambda item: item[1][0], reverse=True)[:self.capacity]
+        self.counters = {key: counter for key, counter in top}
+        return self
+
+    def top(self, k):
+        """En büyük k öğeyi (öğe, sayım, hata) olarak döndür."""
+        items = sorted(self.counters.items(), key=lambda item: item[1][0], reverse=True)[:k]
+        return [(key, count, error) for key, (count, error) in items]
+
+    def to_bytes(self):
+        return json.dumps({'capacity': self.capacity, 'counters': self.counters}, ensure_ascii=False).encode('utf-8')
+
+    @classmethod
+    def from_bytes(cls, data):
+        payload = json.loads(data.decode('utf-8'))
+        return cls(payload['capacity'], payload['counters'])
+
+class CountMinSketch:
+    """Count-Min çizimi.
+
+    Tahmin gerçek değerden küçük olmaz ve 1 - e^-derinlik olasılıkla gerçek
+    değeri en fazla (e / genişlik) * toplam kadar aşar.
+    """
+
+    def __init__(self, width=1024, depth=4, table=None, total=0):
+        self.width = width
+        self.depth = depth
+        self.table = table if table is not None else np.zeros((depth, width), dtype=np.int64)
+        self.total = total
+
+    def _columns(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return [(first + row * second) % self.width for row in range(self.depth)]
+
+    def add(self, key, weight=1):
+        if not key or weight <= 0:
+            return
+        weight = int(round(weight))
+        self.table[np.arange(self.depth), self._columns(key)] += weight
+        self.total += weight
+
+    def estimate(self, key):
+        return int(self.table[np.arange(self.depth), self._columns(key)].min())
+
+    @property
+    def error_bound(self):
+        """Tahminin gerçek değeri aşabileceği en büyük miktar."""
+        return math.e / self.width * self.total
+
+    @property
+    def failure_probability(self):
+        return math.exp(-self.depth)
+
+    def merge(self, other):
+        self.table += other.table
+        self.total += other.total
+        return self
+
+    def to_bytes(self):
+        return struct.pack('<IIq', self.width, self.depth, self.total) + self.table.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        width, depth, total = struct.unpack_from('<IIq', data)
+        table = np.frombuffer(data, dtype=np.int64, offset=16).reshape(depth, width).copy()
+        return cls(width, depth, table, total)
+
+class HyperLogLog:
+    """HyperLogLog farklı öğe sayacı (göreli standart hata 1.04 / √m)."""
+
+    def __init__(self, precision=12, registers=None):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = registers if registers is not None else np.zeros(self.size, dtype=np.uint8)
+
+    def add(self, key):
+        if not key:
+            return
+        value = _hash64(key)
+        index = value & (self.size - 1)
+        remaining = value >> self.precision
+        rank = (64 - self.precision) - remaining.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self):
+        """Farklı öğe sayısı tahmini."""
+        alpha = 0.7213 / (1 + 1.079 / self.size)
+        estimate = alpha * self.size ** 2 / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * self.size and zeros:
+            # Küçük kümelerde doğrusal sayım daha doğrudur
+            estimate = self.size * math.log(self.size / zeros)
+        return int(round(estimate))
+
+    @property
+    def relative_error(self):
+        return 1.04 / math.sqrt(self.size)
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def to_bytes(self):
+        return struct.pack('<B', self.precision) + self.registers.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        precision = data[0]
+        return cls(precision, np.frombuffer(data, dtype=np.uint8, offset=1).copy())
+
+# Gün başına tutulan çizimler: ad → (sınıf, açıklama)
+TOP_SKETCHES = ('app', 'domain', 'file')  # Her biri için Space-Saving ve Count-Min
+DISTINCT_SKETCHES = ('file', 'url', 'title')  # Her biri için HyperLogLog
+
+def _sketch_names():
+    names = {}
+    for name in TOP_SKETCHES:
+        names[f'top:{name}'] = SpaceSaving
+        names[f'cms:{name}'] = CountMinSketch
+    for name in DISTINCT_SKETCHES:
+        names[f'distinct:{name}'] = HyperLogLog
+    return names
+
+SKETCH_TYPES = _sketch_names()
+
+def _encode(sketch):
+    return zlib.compress(sketch.to_bytes())
+
+def _decode(name, data):
+    return SKETCH_TYPES[name].from_bytes(zlib.decompress(data))
+
+def sketch_updates(objects):
+    """Yeni kayıtların çizimlere eklenecek öğelerini gün bazında topla.
+
+    Args:
+        objects: Yeni eklenen model nesneleri.
+
+    Returns:
+        dict: Gün başlangıcı → [(çizim kökü, anahtar, ağırlık)] listesi.
+    """
+    updates = {}
+    for obj in objects:
+        if obj.timestamp is None:
+            continue
+        day = datetime.datetime.combine(obj.timestamp.date(), datetime.time.min)
+        items = updates.setdefault(day, [])
+        if isinstance(obj, WindowActivity):
+            items.append(('top:app', obj.application_name, obj.duration or 0))
+            items.append(('distinct:title', obj.normalized_title or obj.window_title, 1))
+        elif isinstance(obj, BrowserActivity):
+            items.append(('top:domain', obj.domain, obj.duration or 0))
+            items.append(('distinct:url', obj.url, 1))
+        elif isinstance(obj, FileActivity):
+            items.append(('top:file', obj.file_path, 1))
+            items.append(('distinct:file', obj.file_path, 1))
+    return updates
+
+def apply_sketch_updates(connection, updates):
+    """Günlük çizimleri bağlantının mevcut işleminde güncelle.
+
+    Args:
+        connection: SQLAlchemy bağlantısı.
+        updates: sketch_updates sonucu.
+    """
+    for day, items in updates.items():
+        touched = set()
+        for name, _, _ in items:
+            touched.add(name)
+            if name.startswith('top:'):
+                touched.add('cms:' + name[4:])
+        stored = dict(connection.execute(
+            select(DaySketch.name, DaySketch.data).where(DaySketch.day == day, DaySketch.name.in_(touched))
+        ).all())
+        sketches = {name: _decode(name, stored[name]) if name in stored else SKETCH_TYPES[name]() for name in touched}
+
+        for name, key, weight in items:
+            if name.startswith('distinct:'):
+                sketches[name].add(key)
+            else:
+                sketches[name].add(key, weight)
+                sketches['cms:' + name[4:]].add(key, weight)
+
+        statement = insert(DaySketch)
+        statement = statement.on_conflict_do_update(
+            index_elements=['day', 'name'],
+            set_={'data': statement.excluded.data, 'updated_at': statement.excluded.updated_at}
+        )
+        now = datetime.datetime.now()
+        connection.execute(statement, [
+            {'day': day, 'name': name, 'data': _encode(sketch), 'updated_at': now}
+            for name, sketch in sketches.items()
+        ])
+
+def rebuild_day_sketches(db_session, day):
+    """Günün çizimlerini ham kayıtlardan yeniden oluştur.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        day: datetime.date nesnesi.
+    """
+    start = datetime.datetime.combine(day, datetime.time.min)
+    end = start + datetime.timedelta(days=1)
+    try:
+        objects = []
+        for model in (WindowActivity, BrowserActivity, FileActivity):
+            objects.extend(db_session.query(model).filter(model.timestamp >= start, model.timestamp < end).yield_per(10000))
+        connection = db_session.connection()
+        connection.execute(DaySketch.__table__.delete().where(DaySketch.day == start))
+        apply_sketch_updates(connection, sketch_updates(objects))
+        db_session.commit()
+    except Exception as e:
+        logger.error(f"Çizimler yeniden oluşturulurken hata oluştu: {e}")
+        db_session.rollback()
+        raise
+
+def days_without_sketches(db_session, days):
+    """Çizimi hiç oluşturulmamış günleri döndür (yazma kancasından önceki veriler için).
+
+    Args:
+        db_session: Veritabanı oturumu.
+        days: datetime.date listesi.
+
+    Returns:
+        list: Çizimi olmayan günler.
+    """
+    if not days:
+        return []
+    start = datetime.datetime.combine(min(days), datetime.time.min)
+    end = datetime.datetime.combine(max(days), datetime.time.min) + datetime.timedelta(days=1)
+    existing = {
+        day.date() for (day,) in db_session.execute(
+            select(DaySketch.day).where(DaySketch.day >= start, DaySketch.day < end).distinct()
+        )
+    }
+    return [day for day in days if day not in existing]
+
+def load_sketch(db_session, name, start_day, end_day):
+    """Tarih aralığındaki (ikisi dahil) günlük çizimleri birleştir.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        name: Çizim adı ("top:domain", "distinct:file" gibi).
+        start_day: Başlangıç günü (datetime.date).
+        end_day: Bitiş günü (datetime.date).
+
+    Returns:
+        Birleştirilmiş çizim (aralıkta veri yoksa boş çizim).
+    """
+    start = datetime.datetime.combine(start_day, datetime.time.min)
+    end = datetime.datetime.combine(end_day, datetime.time.min) + datetime.timedelta(days=1)
+    merged = SKETCH_TYPES[name]()
+    for (data,) in db_session.execute(
+        select(DaySketch.data).where(DaySketch.name == name, DaySketch.day >= start, DaySketch.day < end)
+    ):
+        merged.merge(_decode(name, data))
+    return merged
+
+def top_k(db_session, kind, start_day, end_day, k=20):
+    """Tarih aralığında en çok görülen öğeleri hata sınırlarıyla döndür.
+
+    Adaylar Space-Saving özetinden alınır; tahmin, iki çizimin verdiği üst
+    sınırların küçüğüdür.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        kind: "app", "domain" (ağırlık: saniye) veya "file" (ağırlık: olay sayısı).
+        start_day: Başlangıç günü.
+        end_day: Bitiş günü.
+        k: Döndürülecek öğe sayısı.
+
+    Returns:
+        list: {"key", "estimate", "lower_bound", "error_bound"} sözlükleri; error_bound,
+        Count-Min çiziminin 1 - e^-4 olasılıkla geçerli üst hata sınırıdır.
+    """
+    summary = load_sketch(db_session, f'top:{kind}', start_day, end_day)
+    cms = load_sketch(db_session, f'cms:{kind}', start_day, end_day)
+    results = []
+    for key, count, error in summary.top(max(k * 2, k)):
+        estimate = min(count, cms.estimate(key))
+        results.append({
+            'key': key,
+            'estimate': estimate,
+            'lower_bound': max(0, count - error),
+            'error_bound': min(error, cms.error_bound),
+        })
+    results.sort(key=lambda item: item['estimate'], reverse=True)
+    return results[:k]
+
+def distinct_count(db_session, kind, start_day, end_day):
+    """Tarih aralığındaki farklı öğe sayısını tahmin et.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        kind: "file", "url" veya "title".
+        start_day: Başlangıç günü.
+        end_day: Bitiş günü.
+
+    Returns:
+        dict: {"estimate", "relative_error"}; relative_error göreli standart hatadır.
+    """
+    sketch = load_sketch(db_session, f'distinct:{kind}', start_day, end_day)
+    return {'estimate': sketch.count(), 'relative_error': sketch.relative_error}
@@ -0,0 +1,399 @@
+"""
+Yazma biriktirme günlüğü.
+
+Veritabanı geçici olarak yazılamadığında (yedekleme aracının kilidi, dolu
+disk, yavaş ağ paylaşımı) izleyici kayıtları kaybolmak yerine DATA_DIR
+altındaki yalnızca sona eklenen ikili bir günlüğe yazılır ve veritabanı
+düzeldiğinde toplu olarak yeniden oynatılır.
+
+Dosya biçimi: 8 baytlık sihirli değer ve 16 baytlık kuşak kimliği, ardından
+her kayıt için uzunluk ve CRC32 (küçük sonlu iki uint32) ile JSON yükü. Bir
+eklemedeki kayıtlar bellekte birleştirilip tek bir yazma çağrısıyla işletim
+sistemine aktarılır, fsync belirli aralıklarla yapılır. Çökme sonrası yarım
+kalmış son kayıtlar sağlama toplamıyla tespit edilip atlanır.
+
+Oynatılan bayt konumu kayıtlarla aynı işlemde maintenance_state tablosuna
+yazılır; oynatma yarıda kesilse de kayıtlar iki kez eklenmez.
+
+Çözülemeyen kayıtlar ve veritabanının (kilit, disk gibi geçici hatalar
+dışında) defalarca reddettiği kayıtlar günlüğün yanındaki .rejected
+dosyasına JSON satırı olarak taşınır; tek bir bozuk kayıt oynatmayı
+sonsuza kadar durduramaz.
+"""
+import os
+import json
+import time
+import uuid
+import zlib
+import struct
+import logging
+import datetime
+import threading
+from sqlalchemy import DateTime
+from sqlalchemy.exc import OperationalError
+
+from .config import (
+    SPOOL_PATH, SPOOL_FSYNC_INTERVAL, SPOOL_RETRY_INTERVAL, SPOOL_REPLAY_BATCH, SPOOL_MAX_ATTEMPTS
+)
+from .database import Base, MaintenanceState
+from .compaction import get_state, set_state
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'ATSPOOL1'
+HEADER_SIZE = len(MAGIC) + 16
+RECORD_HEADER = struct.Struct('<II')  # Yük uzunluğu, CRC32
+
+# Oynatılan bayt konumunun durum adı öneki (kuşak kimliği eklenir)
+STATE_PREFIX = 'spool:'
+
+# Biriktirilmeyen, veritabanının atadığı sütunlar
+_MANAGED_COLUMNS = ('id', 'change_seq')
+
+def _models():
+    """Tablo adı → model sınıfı eşlemesini döndür."""
+    return {mapper.local_table.name: mapper.class_ for mapper in Base.registry.mappers}
+
+def encode_record(obj):
+    """ORM nesnesini günlük kaydına dönüştür.
+
+    Args:
+        obj: Henüz veritabanına yazılmamış model nesnesi.
+
+    Returns:
+        bytes: Başlıklı kayıt.
+    """
+    table = obj.__table__
+    row = {}
+    for column in table.columns:
+        if column.key in _MANAGED_COLUMNS:
+            continue
+        value = getattr(obj, column.key)
+        if value is None and column.default is not None and column.default.is_callable:
+            # Zaman damgası gibi varsayılanlar oynatma anında değil, olay anında belirlenir
+            value = column.default.arg(None)
+        elif value is None:
+            continue
+        row[column.key] = value.isoformat() if isinstance(value, (datetime.datetime, datetime.date)) else value
+    payload = json.dumps([table.name, row], ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+def decode_record(payload, models):
+    """Günlük kaydından model nesnesi oluştur."""
+    table_name, row = json.loads(payload)
+    model = models[table_name]
+    for column in model.__table__.columns:
+        if isinstance(column.type, DateTime) and row.get(column.key) is not None:
+            row[column.key] = datetime.datetime.fromisoformat(row[column.key])
+    return model(**row)
+
+def scan_records(data, offset=HEADER_SIZE):
+    """Tampondaki geçerli kayıtları oku.
+
+    İlk eksik veya sağlama toplamı tutmayan kayıtta durulur; çökme sırasında
+    yarım kalan son kayıt böylece atlanır.
+
+    Args:
+        data: Dosya içeriği.
+        offset: Okumaya başlanacak bayt konumu.
+
+    Returns:
+        tuple: (kayıt yükleri listesi, son geçerli kaydın bittiği konum).
+    """
+    payloads = []
+    while offset + RECORD_HEADER.size <= len(data):
+        length, checksum = RECORD_HEADER.unpack_from(data, offset)
+        start = offset + RECORD_HEADER.size
+        payload = data[start:start + length]
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            break
+        payloads.append(payload)
+        offset = start + length
+    return payloads, offset
+
+class WriteSpool:
+    """Veritabanı yazılamadığında kayıtları biriktiren, sona eklemeli günlük."""
+
+    def __init__(self, path=SPOOL_PATH, fsync_interval=SPOOL_FSYNC_INTERVAL, retry_interval=SPOOL_RETRY_INTERVAL,
+                 replay_batch=SPOOL_REPLAY_BATCH, max_attempts=SPOOL_MAX_ATTEMPTS):
+        """Günlüğü aç; yarım kalmış son kayıtları kırp.
+
+        Args:
+            path: Günlük dosyası.
+            fsync_interval: fsync çağrıları arası en az süre (saniye, 0: her eklemede).
+            retry_interval: Başarısız yazmadan sonra veritabanının yeniden deneneceği süre (saniye).
+            replay_batch: Tek işlemde oynatılan en fazla kayıt sayısı.
+            max_attempts: Veritabanının reddettiği bir kaydın .rejected dosyasına taşınmadan önceki deneme sayısı.
+        """
+        self.path = path
+        self.rejected_path = f"{path}.rejected"
+        self.fsync_interval = fsync_interval
+        self.retry_interval = retry_interval
+        self.replay_batch = replay_batch
+        self.max_attempts = max_attempts
+        self.failed_offset = None
+        self.failed_attempts = 0
+        self.failed_error = None
+        self.lock = threading.Lock()
+        self.replay_lock = threading.Lock()
+        self.handle = None
+        self.generation = None
+        self.size = 0
+        self.pending = 0
+        self.retry_at = 0.0
+        self.last_fsync = time.monotonic()
+        self._open()
+
+    def _open(self):
+        data = b''
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as handle:
+                data = handle.read()
+        if len(data) >= HEADER_SIZE and data.startswith(MAGIC):
+            payloads, end = scan_records(data)
+            if end < len(data):
+                logger.warning(f"Biriktirme günlüğünün sonundaki {len(data) - end} baytlık yarım kayıt atlandı")
+            self.handle = open(self.path, 'r+b', buffering=0)
+            self.handle.truncate(end)
+            self.handle.seek(end)
+            self.generation = data[len(MAGIC):HEADER_SIZE].hex()
+            self.size, self.pending = end, len(payloads)
+            if payloads:
+                logger.info(f"Biriktirme günlüğünde oynatılmayı bekleyen {len(payloads)} kayıt bulundu")
+            return
+        if data:
+            corrupt_path = f"{self.path}.{int(time.time())}.corrupt"
+            os.replace(self.path, corrupt_path)
+            logger.error(f"Biriktirme günlüğü tanınmadı, {corrupt_path} olarak saklandı")
+        self._reset()
+
+    def _reset(self):
+        """Günlüğü yeni bir kuşak kimliğiyle boşalt."""
+        generation = uuid.uuid4()
+        if self.handle is None:
+            self.handle = open(self.path, 'w+b', buffering=0)
+        self.handle.seek(0)
+        self.handle.truncate()
+        self._write(MAGIC + generation.bytes)
+        os.fsync(self.handle.fileno())
+        self.generation = generation.hex
+        self.size, self.pending = HEADER_SIZE, 0
+        self.failed_offset, self.failed_attempts, self.failed_error = None, 0, None
+
+    @property
+    def state_name(self):
+        return f"{STATE_PREFIX}{self.generation}"
+
+    def _write(self, data):
+        view = memoryview(data)
+        while view:
+            view = view[self.handle.write(view):]
+
+    def append(self, objects):
+        """Nesneleri bellekte birleştirip günlüğe tek bir yazmayla ekle.
+
+        Args:
+            objects: Model nesneleri.
+
+        Raises:
+            OSError: Günlük de yazılamazsa (yarım yazılan kısım kırpılır).
+        """
+        data = b''.join(encode_record(obj) for obj in objects)
+        with self.lock:
+            self.handle.seek(self.size)
+            try:
+                self._write(data)
+            except OSError:
+                self.handle.truncate(self.size)
+                raise
+            self.size += len(data)
+            self.pending += len(objects)
+            if time.monotonic() - self.last_fsync >= self.fsync_interval:
+                os.fsync(self.handle.fileno())
+                self.last_fsync = time.monotonic()
+
+    def sync(self):
+        """Bekleyen yazmaları diske zorla."""
+        with self.lock:
+            os.fsync(self.handle.fileno())
+            self.last_fsync = time.monotonic()
+
+    def _read_from(self, offset):
+        """Konumdan itibaren geçerli kayıtları oku.
+
+        Returns:
+            tuple: (kayıt yükleri, son geçerli kaydın bittiği konum, okuma anındaki günlük boyutu).
+        """
+        with self.lock:
+            size = self.size
+            self.handle.seek(offset)
+            data = self.handle.read(size - offset)
+        payloads, end = scan_records(data, 0)
+        return payloads, offset + end, size
+
+    def _decode(self, payloads, models):
+        """Kayıt yüklerini model nesnelerine çöz.
+
+        Returns:
+            tuple: (model nesneleri, çözülemeyen (yük, hata) listesi).
+        """
+        objects, rejected = [], []
+        for payload in payloads:
+            try:
+                objects.append(decode_record(payload, models))
+            except (ValueError, KeyError, TypeError) as e:
+                rejected.append((payload, f"Kayıt çözülemedi: {e!r}"))
+        return objects, rejected
+
+    def _record_failure(self, offset, error):
+        """Veritabanının konumdaki partiyi reddettiğini kaydet."""
+        if offset == self.failed_offset:
+            self.failed_attempts += 1
+        else:
+            self.failed_offset, self.failed_attempts = offset, 1
+        self.failed_error = f"Veritabanı kaydı reddetti: {error!r}"
+
+    def _reject(self, rejected):
+        """Kayıtları .rejected dosyasına taşı.
+
+        Dosyaya konum ilerlemeden önce yazılır; işlem başarısız olursa aynı
+        kayıt dosyada birden fazla görünebilir ama kaybolmaz.
+
+        Args:
+            rejected: (yük, hata açıklaması) listesi.
+        """
+        now = datetime.datetime.now().isoformat()
+        with open(self.rejected_path, 'a', encoding='utf-8') as handle:
+            for payload, error in rejected:
+                handle.write(json.dumps({
+                    'rejected_at': now, 'error': error, 'payload': payload.decode('utf-8', errors='replace')
+                }, ensure_ascii=False) + '\n')
+            handle.flush()
+            os.fsync(handle.fileno())
+        for payload, error in rejected:
+            logger.error(f"Biriktirme günlüğündeki kayıt {self.rejected_path} dosyasına taşındı: {error}")
+
+    def replay(self, db_session, force=False):
+        """Biriken kayıtları partiler halinde veritabanına ekle.
+
+        Yeniden deneme süresi dolmadıysa veya başka bir iş parçacığı oynatıyorsa
+        beklemeden döner.
+
+        Args:
+            db_session: Veritabanı oturumu.
+            force: True ise yeniden deneme süresi beklenmez.
+
+        Returns:
+            bool: Günlükte bekleyen kayıt kalmadıysa True.
+        """
+        if not self.pending:
+            return True
+        if (not force and time.monotonic() < self.retry_at) or not self.replay_lock.acquire(blocking=False):
+            return False
+        try:
+            models = _models()
+            state_name = self.state_name
+            offset = int(get_state(db_session, state_name, HEADER_SIZE))
+            replayed = 0
+            while True:
+                payloads, end, size = self._read_from(offset)
+                if not payloads:
+                    with self.lock:
+                        # Okuma ile kilit arasında eklenen kayıtlar varsa günlük boşaltılmaz, döngü onları da okur
+                        if end == self.size:
+                            self._reset()
+                            break
+                        if end < size:
+                            logger.error(f"Biriktirme günlüğünde okunamayan {self.size - end} bayt atlandı")
+                            self._reset()
+                            break
+                    continue
+                index = 0
+                while index < len(payloads):
+                    # Başarısız olan partinin başındaki kayıt tek başına denenerek sorunlu kayıt ayrıştırılır
+                    count = 1 if offset == self.failed_offset else self.replay_batch
+                    batch = payloads[index:index + count]
+                    objects, rejected = self._decode(batch, models)
+                    if offset == self.failed_offset and self.failed_attempts >= self.max_attempts:
+                        objects, rejected = [], [(batch[0], self.failed_error)]
+                    batch_end = offset + sum(RECORD_HEADER.size + len(payload) for payload in batch)
+                    if rejected:
+                        self._reject(rejected)
+                    db_session.info['rollup_batch_id'] = f"{state_name}:{batch_end}"
+                    try:
+                        db_session.add_all(objects)
+                        set_state(db_session, state_name, batch_end)
+                        db_session.commit()
+                    except OperationalError:
+                        # Kilit, dolu disk gibi geçici hatalar deneme sayısına eklenmez
+                        raise
+                    except Exception as e:
+                        self._record_failure(offset, e)
+                        raise
+                    finally:
+                        db_session.info.pop('rollup_batch_id', None)
+                    if offset == self.failed_offset:
+                        self.failed_offset, self.failed_attempts, self.failed_error = None, 0, None
+                    offset = batch_end
+                    index += len(batch)
+                    replayed += len(objects)
+                    with self.lock:
+                        self.pending -= len(batch)
+            db_session.query(MaintenanceState).filter(MaintenanceState.name == state_name).delete()
+            db_session.commit()
+            logger.info(f"Biriktirme günlüğünden {replayed} kayıt veritabanına eklendi")
+            return True
+        except Exception as e:
+            logger.warning(f"Biriktirme günlüğü oynatılamadı, {self.retry_interval} sn sonra yeniden denenecek: {e}")
+            db_session.rollback()
+            self.retry_at = time.monotonic() + self.retry_interval
+            return False
+        finally:
+            self.replay_lock.release()
+
+    def persist(self, db_session, objects):
+        """Nesneleri veritabanına yaz; yazılamıyorsa günlüğe ekle.
+
+        Günlükte bekleyen kayıt varken yeni kayıtlar sırayı korumak için önce
+        oynatmayı dener. Veritabanı sorunluyken yeniden deneme süresi dolana
+        kadar veritabanına hiç gidilmez.
+
+        Args:
+            db_session: Veritabanı oturumu.
+            objects: Model nesneleri.
+
+        Returns:
+            bool: Veritabanına yazıldıysa True, günlüğe eklendiyse False.
+        """
+        if self.pending and not self.replay(db_session):
+            self.append(objects)
+            return False
+        try:
+            db_session.add_all(objects)
+            db_session.commit()
+            return True
+        except Exception as e:
+            logger.warning(f"Veritabanına yazılamadı, {len(objects)} kayıt biriktirme günlüğüne ekleniyor: {e}")
+            db_session.rollback()
+            self.retry_at = time.monotonic() + self.retry_interval
+        self.append(objects)
+        return False
+
+    def close(self):
+        """Günlüğü diske yazıp kapat."""
+        with self.lock:
+            if self.handle is not None:
+                os.fsync(self.handle.fileno())
+                self.handle.close()
+                self.handle = None
+
+_write_spool = None
+_write_spool_lock = threading.Lock()
+
+def get_write_spool():
+    """Süreç genelindeki varsayılan günlüğü döndür."""
+    global _write_spool
+    with _write_spool_lock:
+        if _write_spool is None:
+            _write_spool = WriteSpool()
+        return _write_spool
@@ -0,0 +1,114 @@
+"""
+Pencere başlığı normalleştirme.
+
+Bu modül, pencere başlıklarındaki okunmamış sayaçları, kaydedilmemiş değişiklik
+işaretlerini, saatleri ve uygulamaya özgü gürültüyü temizleyerek aynı
+aktiviteye ait başlıkları tek bir anahtarda toplar.
+"""
+import re
+import logging
+import functools
+
+logger = logging.getLogger(__name__)
+
+# Tüm uygulamalara uygulanan varsayılan kurallar (eşleşen kısım silinir)
+DEFAULT_GLOBAL_RULES = [
+    r'^\s*\(\d[\d.,]*\+?\)\s*',                    # "(3) Inbox" gibi baştaki sayaçlar
+    r'\s*\(\d[\d.,]*\+?\)(?=\s*(?:[-|–—]|$))',     # "Inbox (1,234) - Gmail" gibi sayaçlar
+    r'\s*\[\d+\+?\]',                              # "[12]" sayaçları
+    r'^\s*[●•◉*]\s*',                              # "● file.py" kaydedilmemiş işaretleri
+    r'(?<=\S)\s*[●•◉*](?=\s*(?:[-|–—]|$))',         # "file.py* - Editor" işaretleri
+    r'\s*\[(?:modified|değiştirildi|unsaved)\]',   # "[Modified]" işaretleri
+    r'\b\d{1,2}:\d{2}(?::\d{2})?(?:\s?[AaPp][Mm])?\b',  # Saatler
+]
+
+# Uygulamaya özgü varsayılan kurallar
+DEFAULT_APP_RULES = {
+    'slack.exe': [r'\s*[-|]\s*\d+ new items?'],
+    'slack': [r'\s*[-|]\s*\d+ new items?'],
+    'teams.exe': [r'\s*\|\s*\d+ (?:new|unread)[^|]*'],
+    'outlook.exe': [r'\s*-\s*\d+ (?:unread|okunmamış)[^-]*'],
+}
+
+class TitleNormalizer:
+    """Derlenmiş kurallarla pencere başlığı normalleştirici."""
+
+    def __init__(self, global_rules=None, app_rules=None, cache_size=4096):
+        """Normalleştiriciyi derle.
+
+        Args:
+            global_rules: Tüm başlıklara uygulanan kurallar (None ise varsayılanlar).
+            app_rules: Uygulama adı → kural listesi sözlüğü (verilen uygulamanın varsayılan kurallarının yerini alır).
+            cache_size: Normalleştirme sonuçları için önbellek boyutu.
+
+        Kurallar düzenli ifade dizeleri veya {"pattern": ..., "replace": ...}
+        sözlükleridir. Değiştirme metni verilmeyen kurallar tek bir ifadede
+        birleştirilir ve başlık değişmeyene kadar uygulanır; böylece "(3) ● file.py"
+        gibi üst üste binmiş önekler de temizlenir.
+        """
+        rules = DEFAULT_GLOBAL_RULES if global_rules is None else global_rules
+        self._global = self._compile(rules)
+        # Verilen uygulama kuralları, aynı uygulamanın varsayılan kurallarının yerini alır
+        merged_app_rules = dict(DEFAULT_APP_RULES)
+        merged_app_rules.update({app.lower(): app_specific for app, app_specific in (app_rules or {}).items()})
+        self._apps = {app: self._compile(app_specific) for app, app_specific in merged_app_rules.items()}
+        self.normalize = functools.lru_cache(maxsize=cache_size)(self._normalize)
+
+    @staticmethod
+    def _compile(rules):
+        """Kuralları (silme ifadesi, değiştirme listesi) olarak derle."""
+        deletions = []
+        replacements = []
+        for rule in rules:
+            if isinstance(rule, str):
+                pattern, replace = rule, ''
+            else:
+                pattern, replace = rule.get('pattern'), rule.get('replace', '')
+            try:
+                re.compile(pattern)
+            except (re.error, TypeError) as e:
+                logger.warning(f"Geçersiz başlık kuralı atlandı ({pattern}): {e}")
+                continue
+            if replace:
+                replacements.append((re.compile(pattern), replace))
+            else:
+                deletions.append(f'(?:{pattern})')
+        combined = re.compile('|'.join(deletions)) if deletions else None
+        return combined, replacements
+
+    @staticmethod
+    def _apply(compiled, title):
+        combined, replacements = compiled
+        for regex, replace in replacements:
+            title = regex.sub(replace, title)
+        if combined is not None:
+            # Bir silme başa bağlı başka bir kuralın eşleşmesini açığa çıkarabilir
+            while True:
+                stripped = combined.sub('', title)
+                if stripped == title:
+                    break
+                title = stripped
+        return title
+
+    def _normalize(self, application_name, window_title):
+        """Başlığı normalleştir (önbelleksiz).
+
+        Args:
+            application_name: Uygulama adı.
+            window_title: Ham pencere başlığı.
+
+        Returns:
+            str: Normalleştirilmiş başlık; sonuç boş kalırsa ham başlık.
+        """
+        if not window_title:
+            return window_title
+
+        title = window_title
+        app_rules = self._apps.get((application_name or '').lower())
+        if app_rules is not None:
+            title = self._apply(app_rules, title)
+        title = self._apply(self._global, title)
+
+        # Boşlukları ve kenardaki ayraçları temizle
+        title = ' '.join(title.split()).strip(' -|–—')
+        return title or window_title
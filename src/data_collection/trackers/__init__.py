@@ -11,5 +11,6 @@ __all__ = [
     'mouse_tracker',
     'file_tracker',
     'browser_tracker',
-    'game_tracker'
+    'game_tracker',
+    'maintenance_tracker'
 ] 
\ No newline at end of file
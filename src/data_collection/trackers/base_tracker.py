@@ -8,9 +8,14 @@ import threading
 import logging
 import time
 from ..database import get_session
+from ..write_path import install_rollup_hooks
+from ..spool import get_write_spool
 
 logger = logging.getLogger(__name__)
 
+# İzleyicilerin yazdığı aralıklar saatlik toplamlara aynı işlemde yansıtılır
+install_rollup_hooks()
+
 class BaseTracker(abc.ABC):
     """Tüm izleyiciler için temel sınıf."""
     
@@ -25,6 +30,7 @@ class BaseTracker(abc.ABC):
         self.thread = None
         self.stop_event = threading.Event()
         self.db_session = None
+        self.spool = None  # İlk yazmada açılır; yazmayan izleyiciler günlük dosyası oluşturmaz
         self.logger = logging.getLogger(f'data_collection.trackers.{self.__class__.__name__.lower()}')
     
     def start(self):
@@ -76,10 +82,25 @@ class BaseTracker(abc.ABC):
             self.logger.error(f"Çalışırken hata oluştu: {e}")
             self.is_running = False
         finally:
+            if self.spool is not None:
+                self.spool.sync()
             if self.db_session:
                 self.db_session.close()
                 self.db_session = None
     
+    def _persist(self, objects):
+        """Kayıtları veritabanına yaz; veritabanı yazılamıyorsa biriktirme günlüğüne ekle.
+        
+        Args:
+            objects: Model nesneleri.
+        
+        Returns:
+            bool: Kayıtlar veritabanına yazıldıysa True, günlüğe eklendiyse False.
+        """
+        if self.spool is None:
+            self.spool = get_write_spool()
+        return self.spool.persist(self.db_session, objects)
+    
     @abc.abstractmethod
     def _setup(self):
         """İzleyiciyi hazırla."""
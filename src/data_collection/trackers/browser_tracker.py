@@ -12,8 +12,10 @@ import os
 import psutil
 from .base_tracker import BaseTracker
 from .window_tracker import WindowTracker
-from ..config import COLLECTION_INTERVAL, ENABLE_BROWSER_TRACKING, EXCLUDED_WEBSITES
+from ..config import COLLECTION_INTERVAL, ENABLE_BROWSER_TRACKING, EXCLUDED_WEBSITES, FOCUS_REGISTRY_SIZE
 from ..database import BrowserActivity
+from ..focus_registry import FocusRegistry
+from ..event_bus import event_bus, EVENT_BROWSER
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +34,7 @@ class BrowserTracker(BaseTracker):
         self.current_domain = None
         self.current_start_time = None
         self.window_tracker = None
-        self.active_tabs = {}  # Aktif sekmeleri ve başlangıç zamanlarını tutan sözlük
+        self.focus_registry = FocusRegistry(max_entries=FOCUS_REGISTRY_SIZE)  # Sekme ve alan adı bazında odak süreleri
         
         # Desteklenen tarayıcılar
         self.browsers = [
@@ -113,7 +115,7 @@ class BrowserTracker(BaseTracker):
         self.current_title = None
         self.current_domain = None
         self.current_start_time = None
-        self.active_tabs = {}
+        self.focus_registry.clear()
     
     def _collect_data(self):
         """Veri topla."""
@@ -154,40 +156,20 @@ class BrowserTracker(BaseTracker):
                                 duration=duration_seconds,
                                 window_id=window_id
                             )
-                            self.db_session.add(browser_activity)
-                            self.db_session.commit()
+                            self._persist([browser_activity])
                             self.logger.info(f"Aktivite tespit edildi: {self.current_domain} ({duration_seconds}s)")
                         except Exception as e:
                             self.logger.error(f"Aktivite kaydedilirken hata oluştu: {e}")
                             self.db_session.rollback()
                 
-                # Önceki sekmeyi aktif olmayan olarak işaretle
-                if self.current_url and self.current_domain:
-                    tab_key = f"{self.current_domain}:{self.current_url}"
-                    if tab_key in self.active_tabs:
-                        self.active_tabs[tab_key]['is_active'] = False
-                
                 # Yeni URL'yi ayarla
                 self.current_url = url
                 self.current_title = title
                 self.current_domain = domain
                 self.current_start_time = current_time
                 
-                # Yeni sekmeyi aktif sekmeler sözlüğüne ekle veya güncelle
-                if url and domain:
-                    tab_key = f"{domain}:{url}"
-                    if tab_key in self.active_tabs:
-                        # Eğer daha önce bu sekme açıldıysa, sadece aktif durumunu güncelle
-                        self.active_tabs[tab_key]['is_active'] = True
-                    else:
-                        # Yeni sekme ise, sözlüğe ekle
-                        self.active_tabs[tab_key] = {
-                            'url': url,
-                            'title': title,
-                            'domain': domain,
-                            'start_time': current_time,
-                            'is_active': True
-                        }
+                # Odağı yeni sekmeye aktar (önceki sekmenin süresi biriktirilir)
+                self._activate_tab(domain, url)
             
             # İlk kez URL bilgisi alınıyorsa
             elif not self.current_url and url:
@@ -195,17 +177,7 @@ class BrowserTracker(BaseTracker):
                 self.current_title = title
                 self.current_domain = domain
                 self.current_start_time = current_time
-                
-                # Yeni sekmeyi aktif sekmeler sözlüğüne ekle
-                if url and domain:
-                    tab_key = f"{domain}:{url}"
-                    self.active_tabs[tab_key] = {
-                        'url': url,
-                        'title': title,
-                        'domain': domain,
-                        'start_time': current_time,
-                        'is_active': True
-                    }
+                self._activate_tab(domain, url)
         else:
             # Her 60 saniyede bir çalışan tarayıcıları kontrol et
             if not hasattr(self, 'last_browser_check') or (current_time - self.last_browser_check).total_seconds() > 60:
@@ -240,8 +212,7 @@ class BrowserTracker(BaseTracker):
                             duration=duration_seconds,
                             window_id=window_id
                         )
-                        self.db_session.add(browser_activity)
-                        self.db_session.commit()
+                        self._persist([browser_activity])
                         self.logger.info(f"Son aktivite kaydedildi: {self.current_domain} ({duration_seconds}s)")
                     except Exception as e:
                         self.logger.error(f"Son aktivite kaydedilirken hata oluştu: {e}")
@@ -251,7 +222,21 @@ class BrowserTracker(BaseTracker):
         self.current_title = None
         self.current_domain = None
         self.current_start_time = None
-        self.active_tabs = {}
+        self.focus_registry.clear()
+    
+    def _activate_tab(self, domain, url):
+        """Sekmenin odağını başlat; URL yoksa önceki sekmenin odağı kapatılır.
+        
+        Args:
+            domain: Alan adı.
+            url: URL.
+        """
+        if url and domain:
+            self.focus_registry.activate(f"{domain}:{url}", domain)
+            if not any(excluded.lower() in domain.lower() for excluded in EXCLUDED_WEBSITES):
+                event_bus.publish(EVENT_BROWSER, domain=domain, url=url, title=self.current_title)
+        else:
+            self.focus_registry.deactivate()
     
     def _get_active_browser_window(self):
         """Aktif tarayıcı penceresi bilgilerini al.
@@ -346,20 +331,25 @@ class BrowserTracker(BaseTracker):
         }
     
     def get_active_tab_duration(self, domain, url):
-        """Belirli bir sekmenin aktif olduğu toplam süreyi döndür.
+        """Belirli bir sekmenin odakta kaldığı toplam süreyi döndür.
         
         Args:
             domain: Alan adı.
             url: URL.
             
         Returns:
-            int: Toplam süre (saniye cinsinden) veya 0.
+            int: Toplam süre (saniye cinsinden, devam eden odak dahil) veya 0.
         """
         tab_key = f"{domain}:{url}"
-        if tab_key in self.active_tabs:
-            tab_data = self.active_tabs[tab_key]
-            if tab_data['is_active']:
-                # Eğer sekme hala aktifse, şu ana kadar geçen süreyi hesapla
-                current_time = datetime.datetime.now()
-                return int((current_time - tab_data['start_time']).total_seconds())
-        return 0 
\ No newline at end of file
+        return self.focus_registry.get_duration_ms(tab_key) // 1000
+    
+    def get_domain_duration(self, domain):
+        """Belirli bir alan adının tüm sekmeleriyle odakta kaldığı toplam süreyi döndür.
+        
+        Args:
+            domain: Alan adı.
+            
+        Returns:
+            int: Toplam süre (saniye cinsinden, devam eden odak dahil) veya 0.
+        """
+        return self.focus_registry.get_group_duration_ms(domain) // 1000
@@ -7,13 +7,24 @@ import os
 import time
 import logging
 import datetime
-import threading
 from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
 from watchdog.events import FileSystemEventHandler
 from .base_tracker import BaseTracker
 from .window_tracker import WindowTracker
-from ..config import COLLECTION_INTERVAL, ENABLE_FILE_TRACKING, EXCLUDED_DIRECTORIES, DATABASE_PATH
+from ..config import (
+    COLLECTION_INTERVAL, ENABLE_FILE_TRACKING, EXCLUDED_DIRECTORIES, DATABASE_PATH,
+    FILE_EVENT_QUEUE_SIZE, FILE_EVENT_OVERFLOW_POLICY, FILE_EVENT_BLOCK_TIMEOUT,
+    FILE_IGNORED_PATTERNS, DATA_DIR, LOG_DIR,
+    FILE_WATCH_ROOTS, FILE_WATCH_IGNORE, FILE_WATCH_POLL_INTERVAL,
+    ENABLE_FILE_INDEX, FILE_INDEX_SCAN_WORKERS, FILE_INDEX_FULL_SCAN
+)
+from ..event_queue import BoundedEventQueue
+from ..path_filter import PathFilter, FileEvent, normalize_path
+from ..watch_roots import RootFilters, load_watch_roots, plan_watches, is_watch_limit_error
+from ..file_index import FileStateIndex
 from ..database import FileActivity
+from ..event_bus import event_bus, EVENT_FILE
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +42,7 @@ class FileEventHandler(FileSystemEventHandler):
     def on_created(self, event):
         """Dosya oluşturma olayını işle."""
         if event.is_directory:
+            self.tracker.add_directory(event.src_path)
             return
         self.tracker.add_file_event(event.src_path, "created")
     
@@ -49,6 +61,7 @@ class FileEventHandler(FileSystemEventHandler):
     def on_moved(self, event):
         """Dosya taşıma olayını işle."""
         if event.is_directory:
+            self.tracker.add_directory(event.dest_path)
             return
         self.tracker.add_file_event(event.dest_path, "moved", src_path=event.src_path)
 
@@ -63,43 +76,153 @@ class FileTracker(BaseTracker):
         """
         super().__init__(session_id)
         self.observer = None
+        self.polling_observer = None
         self.event_handler = None
-        self.file_events = []
-        self.file_events_lock = threading.Lock()
+        self.watch_limit_reached = False
+        self.watched = {}  # Normalleştirilmiş dizin yolu → özyinelemeli mi
+        self.event_queue = BoundedEventQueue(
+            max_size=FILE_EVENT_QUEUE_SIZE,
+            overflow_policy=FILE_EVENT_OVERFLOW_POLICY,
+            block_timeout=FILE_EVENT_BLOCK_TIMEOUT
+        )
+        self.reported_drops = 0
         self.window_tracker = None
         
         # Proje dizini ve veritabanı dosyasını hariç tut
         self.project_dir = os.path.abspath(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))))
         self.db_file_path = os.path.abspath(DATABASE_PATH)
         
-        # İzlenecek dizinler
-        self.watch_paths = self._get_watch_paths()
+        # İzlenecek kök dizinler
+        self.watch_roots = load_watch_roots(FILE_WATCH_ROOTS, FILE_WATCH_IGNORE)
+        
+        # Olay filtre zincirini bir kez derle; dizin yok sayma listeleri yalnızca kendi köklerine uygulanır
+        filter_options = dict(
+            excluded_roots=EXCLUDED_DIRECTORIES,
+            ignored_patterns=FILE_IGNORED_PATTERNS,
+            own_dirs=[self.project_dir, DATA_DIR, LOG_DIR],
+            own_files=[self.db_file_path + suffix for suffix in ('', '-journal', '-wal', '-shm')]
+        )
+        self.path_filter = PathFilter(**filter_options)
+        
+        # Hariç tutulan ve var olmayan kökleri filtrele
+        self.watch_roots = [
+            root for root in self.watch_roots
+            if os.path.isdir(root.path) and not self.path_filter.excludes_directory(root.path)
+        ]
+        self.watch_paths = [root.path for root in self.watch_roots]
+        self.root_filters = RootFilters(
+            self.watch_roots,
+            lambda root: PathFilter(**filter_options, ignored_dir_patterns=root.ignore, ignored_dir_root=root.path),
+            self.path_filter
+        )
+        
+        # Çevrimdışı değişiklikleri tespit etmek için kalıcı dizin durumu
+        self.file_index = None
+        self.index_drops_seen = 0
+        if ENABLE_FILE_INDEX:
+            self.file_index = FileStateIndex(
+                path_filter=self.path_filter,
+                workers=FILE_INDEX_SCAN_WORKERS,
+                full_scan=FILE_INDEX_FULL_SCAN
+            )
     
-    def _get_watch_paths(self):
-        """İzlenecek dizinleri belirle.
+    def _register_watches(self):
+        """İzleme planlarını oluştur ve kaydet.
+        
+        İşletim sisteminin izleme sınırına ulaşıldığında kalan dizinler
+        yoklamalı gözlemciye devredilir.
+        """
+        for root in self.watch_roots:
+            plan = plan_watches(root, is_excluded=self.path_filter.excludes_directory)
+            native_count = 0
+            polled_count = 0
+            
+            for entry in plan:
+                native = self._schedule_entry(entry)
+                if native:
+                    native_count += entry.directory_count
+                elif native is not None:
+                    polled_count += entry.directory_count
+            
+            depth = "sınırsız" if root.max_depth is None else root.max_depth
+            self.logger.info(
+                f"İzleme kökü {root.path}: {native_count} dizin izleniyor, "
+                f"{polled_count} dizin yoklanıyor ({len(plan)} kayıt, derinlik: {depth})"
+            )
+    
+    def _schedule_entry(self, entry):
+        """İzleme kaydını yerel gözlemciye, izleme sınırına ulaşıldıysa yoklamalı gözlemciye ekle.
+        
+        Args:
+            entry: WatchPlanEntry nesnesi.
         
         Returns:
-            list: İzlenecek dizinlerin listesi.
+            bool: Yerel olarak izleniyorsa True, yoklanıyorsa False, eklenemediyse None.
         """
-        # Kullanıcı dizinini izle
-        user_home = os.path.expanduser("~")
-        
-        # İzlenecek dizinler
-        watch_paths = [
-            os.path.join(user_home, "Desktop"),
-            os.path.join(user_home, "Documents"),
-            os.path.join(user_home, "Downloads")
-        ]
+        self.watched[normalize_path(entry.path)] = entry.recursive
+        if not self.watch_limit_reached:
+            try:
+                self.observer.schedule(self.event_handler, entry.path, recursive=entry.recursive)
+                return True
+            except Exception as e:
+                if not is_watch_limit_error(e):
+                    self.logger.error(f"Dosya izleme başlatılırken hata oluştu ({entry.path}): {e}")
+                    return None
+                self.watch_limit_reached = True
+                self.logger.warning(
+                    f"İşletim sistemi izleme sınırına ulaşıldı ({entry.path}): {e}. "
+                    f"Kalan dizinler {FILE_WATCH_POLL_INTERVAL:g} saniyede bir yoklanacak"
+                )
         
-        # Hariç tutulan dizinleri filtrele
-        filtered_paths = []
-        for path in watch_paths:
-            if os.path.exists(path) and not any(path.startswith(excluded) for excluded in EXCLUDED_DIRECTORIES):
-                # Proje dizini içinde değilse ekle
-                if not os.path.commonpath([path, self.project_dir]) == self.project_dir:
-                    filtered_paths.append(path)
+        self._schedule_polling(entry.path, entry.recursive)
+        return False
+    
+    def _is_watched(self, path):
+        """Dizinin kendisinin veya özyinelemeli izlenen bir üst dizininin izlenip izlenmediğini kontrol et."""
+        key = normalize_path(path)
+        if key in self.watched:
+            return True
+        parent = os.path.dirname(key)
+        while parent != key:
+            if self.watched.get(parent):
+                return True
+            key, parent = parent, os.path.dirname(parent)
+        return False
+    
+    def add_directory(self, path):
+        """İzleme başladıktan sonra oluşturulan veya taşınan dizini izlemeye ekle.
         
-        return filtered_paths
+        Özyinelemeli izlemelerin altındaki dizinleri gözlemci zaten izler;
+        dizin başına izlenen ağaçlarda yeni dizin için plan oluşturulur.
+        
+        Args:
+            path: Dizin yolu.
+        """
+        if self.observer is None or self._is_watched(path):
+            return
+        root, _ = self.root_filters.lookup(path)
+        if root is None or self.path_filter.excludes_directory(path):
+            return
+        # Yok sayılan bir dizinin altında oluşturulan dizinler de izlenmez
+        if any(root.is_ignored(name) for name in os.path.relpath(path, root.path).split(os.sep)):
+            return
+        for entry in plan_watches(root, is_excluded=self.path_filter.excludes_directory, path=path):
+            self._schedule_entry(entry)
+    
+    def _schedule_polling(self, path, recursive):
+        """Dizini yoklamalı gözlemciye ekle.
+        
+        Args:
+            path: Dizin yolu.
+            recursive: Alt dizinler de yoklansın mı.
+        """
+        if self.polling_observer is None:
+            self.polling_observer = PollingObserver(timeout=FILE_WATCH_POLL_INTERVAL)
+            self.polling_observer.start()
+        try:
+            self.polling_observer.schedule(self.event_handler, path, recursive=recursive)
+        except Exception as e:
+            self.logger.error(f"Dosya yoklaması başlatılırken hata oluştu ({path}): {e}")
     
     def add_file_event(self, file_path, action, src_path=None):
         """Dosya olayını kaydet.
@@ -109,36 +232,13 @@ class FileTracker(BaseTracker):
             action: Olay türü (created, modified, deleted, moved).
             src_path: Taşıma olayı için kaynak yol.
         """
-        # Mutlak dosya yolunu al
-        abs_file_path = os.path.abspath(file_path)
-        
-        # Proje dizinini ve veritabanı dosyasını kontrol et
-        if os.path.commonpath([abs_file_path, self.project_dir]) == self.project_dir:
-            return
-        
-        # Veritabanı dosyasını kontrol et
-        if abs_file_path == self.db_file_path or (
-            os.path.dirname(abs_file_path) == os.path.dirname(self.db_file_path) and 
-            abs_file_path.endswith('.db')
-        ):
+        result = self.root_filters.match(file_path)
+        if result is None:
             return
         
-        # Hariç tutulan dizinleri kontrol et
-        if any(abs_file_path.startswith(excluded) for excluded in EXCLUDED_DIRECTORIES):
-            return
-        
-        # Dosya uzantısını al
-        _, file_extension = os.path.splitext(abs_file_path)
-        file_extension = file_extension.lower().lstrip('.')
-        
-        with self.file_events_lock:
-            self.file_events.append({
-                'file_path': abs_file_path,
-                'action': action,
-                'src_path': src_path,
-                'timestamp': datetime.datetime.now(),
-                'file_type': file_extension
-            })
+        abs_file_path, file_extension = result
+        self.event_queue.put(FileEvent(abs_file_path, action, src_path, datetime.datetime.now(), file_extension))
+        event_bus.publish(EVENT_FILE, file_path=abs_file_path, action=action, file_type=file_extension)
     
     def _setup(self):
         """İzleyiciyi hazırla."""
@@ -152,101 +252,169 @@ class FileTracker(BaseTracker):
         # Pencere izleyicisini oluştur (sadece referans için, başlatma)
         self.window_tracker = WindowTracker(self.session_id)
         
-        # Dosya olayları listesini temizle
-        with self.file_events_lock:
-            self.file_events = []
+        # Dosya olayları kuyruğunu temizle
+        self.event_queue.drain()
         
-        # Watchdog observer'ı başlat
+        # Watchdog observer'ı başlat; izleme hataları kayıt sırasında yakalanabilsin diye önce başlatılır
         self.event_handler = FileEventHandler(self)
         self.observer = Observer()
+        self.observer.start()
+        self.watch_limit_reached = False
+        self.watched = {}
         
         # İzlenecek dizinleri ekle
-        for path in self.watch_paths:
-            try:
-                self.observer.schedule(self.event_handler, path, recursive=True)
-            except Exception as e:
-                self.logger.error(f"Dosya izleme başlatılırken hata oluştu ({path}): {e}")
+        self._register_watches()
         
-        self.observer.start()
+        # İzleyici kapalıyken oluşan değişiklikleri yakala (izlemeler kaydedildikten sonra)
+        self._catch_up_offline_changes()
+    
+    def _catch_up_offline_changes(self):
+        """Kayıtlı dizin durumunu diskle karşılaştır ve sentetik olaylar üret."""
+        if not self.file_index:
+            return
+        
+        try:
+            start = time.perf_counter()
+            self.file_index.load(self.db_session)
+            baseline = self.file_index.is_empty()
+            changes, file_updates, deleted_files, dir_updates, removed_dirs = self.file_index.scan(self.watch_roots)
+            
+            # İlk çalıştırmada dizin yalnızca oluşturulur, olay üretilmez
+            if not baseline and changes:
+                events = []
+                for change in changes:
+                    result = self.root_filters.match(change.path)
+                    if result is None:
+                        continue
+                    events.append(FileEvent(result[0], change.action, change.src_path, change.timestamp, result[1]))
+                
+                for index in range(0, len(events), 1000):
+                    self._save_events(events[index:index + 1000], offline=True)
+            
+            self.file_index.save(self.db_session, file_updates, deleted_files, dir_updates, removed_dirs)
+            
+            elapsed = time.perf_counter() - start
+            if baseline:
+                self.logger.info(f"Dosya dizini oluşturuldu: {len(file_updates)} dosya ({elapsed:.1f}s)")
+            else:
+                self.logger.info(f"Çevrimdışı değişiklik taraması tamamlandı: {len(changes)} değişiklik ({elapsed:.1f}s)")
+        except Exception as e:
+            self.logger.error(f"Çevrimdışı değişiklikler taranırken hata oluştu: {e}")
+            self.db_session.rollback()
     
     def _collect_data(self):
         """Veri topla."""
         if not ENABLE_FILE_TRACKING:
             return
         
-        # Dosya olaylarını işle
-        with self.file_events_lock:
-            if self.file_events:
-                for event in self.file_events:
-                    try:
-                        # Aktif pencere ID'sini al (eğer varsa)
-                        window_id = None
-                        if self.window_tracker:
-                            window_id = self.window_tracker.get_last_window_id()
-                        
-                        # Veritabanına kaydet
-                        file_activity = FileActivity(
-                            session_id=self.session_id,
-                            timestamp=event['timestamp'],
-                            file_path=event['file_path'],
-                            action=event['action'],
-                            file_type=event['file_type'],
-                            window_id=window_id
-                        )
-                        self.db_session.add(file_activity)
-                        self.db_session.commit()
-                        
-                        # Dosya yolunu kısalt
-                        short_path = os.path.basename(event['file_path'])
-                        self.logger.info(f"Aktivite tespit edildi: {event['action']} - {short_path}")
-                    except Exception as e:
-                        self.logger.error(f"Aktivite kaydedilirken hata oluştu: {e}")
-                        self.db_session.rollback()
-                
-                # Olayları temizle
-                self.file_events = []
+        # Tamponu değiştir; veritabanı yazımı kilit dışında yapılır
+        events = self.event_queue.drain()
+        if events:
+            self._save_events(events)
+        
+        self._report_queue_metrics()
         
         # Veri toplama aralığı kadar bekle
         time.sleep(COLLECTION_INTERVAL)
     
+    def _save_events(self, events, final=False, offline=False):
+        """Dosya olaylarını tek bir işlemde veritabanına kaydet.
+        
+        Args:
+            events: Kaydedilecek olaylar.
+            final: Kapanış sırasında yapılan son kayıt ise True.
+            offline: Başlangıç taramasında üretilen sentetik olaylar ise True.
+        """
+        # Aktif pencere ID'sini al (eğer varsa)
+        window_id = None
+        if self.window_tracker and not offline:
+            window_id = self.window_tracker.get_last_window_id()
+        
+        try:
+            persisted = self._persist([
+                FileActivity(
+                    session_id=self.session_id,
+                    timestamp=event.timestamp,
+                    file_path=event.file_path,
+                    action=event.action,
+                    file_type=event.file_type,
+                    window_id=window_id
+                )
+                for event in events
+            ])
+            
+            for event in events:
+                # Dosya yolunu kısalt
+                short_path = os.path.basename(event.file_path)
+                self.logger.debug(f"Aktivite tespit edildi: {event.action} - {short_path}")
+            
+            if final:
+                self.logger.info(f"Son aktiviteler kaydedildi: {len(events)} dosya olayı")
+            elif offline:
+                self.logger.info(f"Çevrimdışı aktivite tespit edildi: {len(events)} dosya olayı")
+            else:
+                self.logger.info(f"Aktivite tespit edildi: {len(events)} dosya olayı")
+        except Exception as e:
+            if final:
+                self.logger.error(f"Son aktiviteler kaydedilirken hata oluştu: {e}")
+            else:
+                self.logger.error(f"Aktivite kaydedilirken hata oluştu: {e}")
+            self.db_session.rollback()
+            return
+        
+        # Günlüğe eklenen olaylar veritabanı düzelince yazılır; dizin o zamana kadar güncellenmez
+        if self.file_index and not offline and persisted:
+            self._update_file_index(events)
+    
+    def _update_file_index(self, events):
+        """Canlı olayları kalıcı dizin durumuna uygula.
+        
+        Args:
+            events: Kaydedilen olaylar.
+        """
+        # Düşürülen olay varsa dizin zamanları güncellenmez; bu dizinler sonraki başlangıçta yeniden okunur
+        dropped = self.event_queue.get_metrics()['dropped']
+        update_directories = dropped == self.index_drops_seen
+        self.index_drops_seen = dropped
+        
+        try:
+            self.file_index.apply_events(self.db_session, events, update_directories=update_directories)
+        except Exception as e:
+            self.logger.error(f"Dosya dizini güncellenirken hata oluştu: {e}")
+            self.db_session.rollback()
+    
+    def _report_queue_metrics(self):
+        """Kuyrukta yeni düşürülen olay varsa uyarı kaydet."""
+        metrics = self.event_queue.get_metrics()
+        if metrics['dropped'] > self.reported_drops:
+            self.logger.warning(
+                f"Dosya olay kuyruğu doldu ({metrics['overflow_policy']}): "
+                f"{metrics['dropped'] - self.reported_drops} olay düşürüldü, "
+                f"en yüksek derinlik {metrics['max_depth']}/{metrics['capacity']}"
+            )
+            self.reported_drops = metrics['dropped']
+    
+    def get_metrics(self):
+        """Dosya olay kuyruğu metriklerini döndür.
+        
+        Returns:
+            dict: Kuyruk derinliği, düşürülen olaylar ve ekleme gecikmesi.
+        """
+        return self.event_queue.get_metrics()
+    
     def _cleanup(self):
         """Kaynakları temizle."""
-        # Son dosya olaylarını kaydet
-        with self.file_events_lock:
-            if self.file_events:
-                for event in self.file_events:
-                    try:
-                        # Aktif pencere ID'sini al (eğer varsa)
-                        window_id = None
-                        if self.window_tracker:
-                            window_id = self.window_tracker.get_last_window_id()
-                        
-                        # Veritabanına kaydet
-                        file_activity = FileActivity(
-                            session_id=self.session_id,
-                            timestamp=event['timestamp'],
-                            file_path=event['file_path'],
-                            action=event['action'],
-                            file_type=event['file_type'],
-                            window_id=window_id
-                        )
-                        self.db_session.add(file_activity)
-                        self.db_session.commit()
-                        
-                        # Dosya yolunu kısalt
-                        short_path = os.path.basename(event['file_path'])
-                        self.logger.info(f"Son aktivite kaydedildi: {event['action']} - {short_path}")
-                    except Exception as e:
-                        self.logger.error(f"Son aktivite kaydedilirken hata oluştu: {e}")
-                        self.db_session.rollback()
-                
-                # Olayları temizle
-                self.file_events = []
+        # Observer'ları durdur
+        for observer in (self.observer, self.polling_observer):
+            if observer:
+                observer.stop()
+                observer.join(timeout=5.0)
+        self.observer = None
+        self.polling_observer = None
         
-        # Observer'ı durdur
-        if self.observer:
-            self.observer.stop()
-            self.observer.join(timeout=5.0)
-            self.observer = None
+        self.event_handler = None
         
-        self.event_handler = None 
\ No newline at end of file
+        # Son dosya olaylarını kaydet
+        events = self.event_queue.drain()
+        if events:
+            self._save_events(events, final=True)
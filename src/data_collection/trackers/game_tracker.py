@@ -13,6 +13,7 @@ from .base_tracker import BaseTracker
 from .window_tracker import WindowTracker
 from ..config import COLLECTION_INTERVAL, ENABLE_GAME_TRACKING
 from ..database import GameActivity
+from ..event_bus import event_bus, EVENT_GAME
 
 logger = logging.getLogger(__name__)
 
@@ -213,8 +214,7 @@ class GameTracker(BaseTracker):
                             duration=duration_seconds,
                             window_id=window_id
                         )
-                        self.db_session.add(game_activity)
-                        self.db_session.commit()
+                        self._persist([game_activity])
                         self.logger.info(f"Aktivite tespit edildi: {self.current_game} ({duration_seconds}s)")
                     except Exception as e:
                         self.logger.error(f"Aktivite kaydedilirken hata oluştu: {e}")
@@ -224,12 +224,14 @@ class GameTracker(BaseTracker):
                 self.current_game = game_name
                 self.current_platform = platform
                 self.current_start_time = end_time
+                event_bus.publish(EVENT_GAME, game_name=game_name, platform=platform)
             
             # İlk kez oyun bilgisi alınıyorsa
             elif not self.current_game and game_name:
                 self.current_game = game_name
                 self.current_platform = platform
                 self.current_start_time = datetime.datetime.now()
+                event_bus.publish(EVENT_GAME, game_name=game_name, platform=platform)
         else:
             # Her 60 saniyede bir çalışan oyunları kontrol et
             current_time = datetime.datetime.now()
@@ -263,8 +265,7 @@ class GameTracker(BaseTracker):
                         duration=duration_seconds,
                         window_id=window_id
                     )
-                    self.db_session.add(game_activity)
-                    self.db_session.commit()
+                    self._persist([game_activity])
                     self.logger.info(f"Son aktivite kaydedildi: {self.current_game} ({duration_seconds}s)")
                 except Exception as e:
                     self.logger.error(f"Son aktivite kaydedilirken hata oluştu: {e}")
@@ -9,8 +9,9 @@ import datetime
 from pynput import keyboard
 from .base_tracker import BaseTracker
 from .window_tracker import WindowTracker
-from ..config import COLLECTION_INTERVAL, ENABLE_KEYBOARD_TRACKING, EXCLUDED_APPS
+from ..config import COLLECTION_INTERVAL, ENABLE_KEYBOARD_TRACKING, EXCLUDED_APPS, LIVE_INPUT_TICK_INTERVAL
 from ..database import KeyboardActivity
+from ..event_bus import event_bus, InputTicker, EVENT_KEYBOARD
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +29,7 @@ class KeyboardTracker(BaseTracker):
         self.last_save_time = None
         self.keyboard_listener = None
         self.window_tracker = None
+        self.input_ticker = InputTicker(event_bus, EVENT_KEYBOARD, LIVE_INPUT_TICK_INTERVAL)
     
     def _setup(self):
         """İzleyiciyi hazırla."""
@@ -58,6 +60,7 @@ class KeyboardTracker(BaseTracker):
         
         # Tuş sayısını artır
         self.key_count += 1
+        self.input_ticker.add(keys=1)
     
     def _collect_data(self):
         """Veri topla."""
@@ -66,6 +69,7 @@ class KeyboardTracker(BaseTracker):
         
         current_time = datetime.datetime.now()
         elapsed_seconds = (current_time - self.last_save_time).total_seconds()
+        self.input_ticker.flush()
         
         # Belirli aralıklarla veritabanına kaydet (10 saniye veya 10+ tuş vuruşu)
         if elapsed_seconds >= 10 or self.key_count >= 10:
@@ -83,8 +87,7 @@ class KeyboardTracker(BaseTracker):
                         key_count=self.key_count,
                         window_id=window_id
                     )
-                    self.db_session.add(keyboard_activity)
-                    self.db_session.commit()
+                    self._persist([keyboard_activity])
                     logger.debug(f"Klavye aktivitesi kaydedildi: {self.key_count} tuş")
                 except Exception as e:
                     logger.error(f"Klavye aktivitesi kaydedilirken hata oluştu: {e}")
@@ -114,8 +117,7 @@ class KeyboardTracker(BaseTracker):
                     key_count=self.key_count,
                     window_id=window_id
                 )
-                self.db_session.add(keyboard_activity)
-                self.db_session.commit()
+                self._persist([keyboard_activity])
                 logger.debug(f"Son klavye aktivitesi kaydedildi: {self.key_count} tuş")
             except Exception as e:
                 logger.error(f"Son klavye aktivitesi kaydedilirken hata oluştu: {e}")
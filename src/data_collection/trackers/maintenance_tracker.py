@@ -0,0 +1,100 @@
+"""
+Bakım izleyicisi.
+
+Bu modül, kullanıcı boştayken aralık sıkıştırma gibi bakım işlerini
+artımlı olarak çalıştırır.
+"""
+import time
+from .base_tracker import BaseTracker
+from ..config import (
+    ENABLE_COMPACTION, COMPACTION_INTERVAL, COMPACTION_IDLE_SECONDS,
+    COMPACTION_MAX_GAP, COMPACTION_BATCH_SIZE
+)
+from ..compaction import compact_intervals
+from ..write_path import prune_rollup_batches, rebuild_rollups
+from ..sketches import rebuild_day_sketches
+
+def get_idle_seconds():
+    """Son kullanıcı girdisinden bu yana geçen süreyi döndür.
+
+    Returns:
+        float: Saniye cinsinden boşta kalma süresi; ölçülemiyorsa None.
+    """
+    try:
+        import win32api
+        return (win32api.GetTickCount() - win32api.GetLastInputInfo()) / 1000.0
+    except Exception:
+        return None
+
+class MaintenanceTracker(BaseTracker):
+    """Boşta kalınan sürelerde bakım işlerini çalıştıran sınıf."""
+
+    def __init__(self, session_id):
+        """İzleyiciyi başlat.
+
+        Args:
+            session_id: Aktivite oturumu ID'si.
+        """
+        super().__init__(session_id)
+        self.last_run_time = None
+
+    def _setup(self):
+        """İzleyiciyi hazırla."""
+        if not ENABLE_COMPACTION:
+            self.logger.info("Aralık sıkıştırma devre dışı bırakıldı")
+            self.stop()
+            return
+
+        self.logger.info("Bakım izleyici hazırlanıyor")
+        self.last_run_time = time.monotonic()
+
+    def _is_idle(self):
+        """Kullanıcının boşta olup olmadığını kontrol et.
+
+        Boşta kalma süresi ölçülemeyen sistemlerde yalnızca çalışma aralığı uygulanır.
+        """
+        idle_seconds = get_idle_seconds()
+        return idle_seconds is None or idle_seconds >= COMPACTION_IDLE_SECONDS
+
+    def _collect_data(self):
+        """Zamanı geldiyse ve kullanıcı boştaysa bakım işlerini çalıştır."""
+        if not self.is_running:
+            return
+
+        if time.monotonic() - self.last_run_time < COMPACTION_INTERVAL or not self._is_idle():
+            return
+
+        changed_days = set()
+        results = compact_intervals(
+            self.db_session,
+            max_gap=COMPACTION_MAX_GAP,
+            batch_size=COMPACTION_BATCH_SIZE,
+            # Kullanıcı geri dönerse veya izleyici durdurulursa partiler arasında bırak
+            should_stop=lambda: self.stop_event.is_set() or not self._is_idle(),
+            changed_days=changed_days
+        )
+        # Birleştirilen kayıtların süreleri aradaki boşlukları da kapsar; toplamlar ve çizimler kayıtlarla eşitlenir
+        self._rebuild_derived(changed_days)
+        prune_rollup_batches(self.db_session)
+        self.last_run_time = time.monotonic()
+
+        merged = sum(results.values())
+        if merged:
+            self.logger.info(f"Aralık sıkıştırma tamamlandı: {merged} kayıt birleştirildi {results}")
+
+    def _rebuild_derived(self, days):
+        """Sıkıştırılan günlerin toplamlarını ve çizimlerini yeniden oluştur.
+
+        Args:
+            days: datetime.date kümesi.
+        """
+        for day in sorted(days):
+            try:
+                rebuild_rollups(self.db_session, day)
+                rebuild_day_sketches(self.db_session, day)
+            except Exception as e:
+                self.logger.error(f"{day} toplamları yeniden oluşturulurken hata oluştu: {e}")
+
+    def _cleanup(self):
+        """Kaynakları temizle."""
+        pass
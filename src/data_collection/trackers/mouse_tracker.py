@@ -10,8 +10,9 @@ import math
 from pynput import mouse
 from .base_tracker import BaseTracker
 from .window_tracker import WindowTracker
-from ..config import COLLECTION_INTERVAL, ENABLE_MOUSE_TRACKING
+from ..config import COLLECTION_INTERVAL, ENABLE_MOUSE_TRACKING, LIVE_INPUT_TICK_INTERVAL
 from ..database import MouseActivity
+from ..event_bus import event_bus, InputTicker, EVENT_MOUSE
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +32,7 @@ class MouseTracker(BaseTracker):
         self.last_save_time = None
         self.mouse_listener = None
         self.window_tracker = None
+        self.input_ticker = InputTicker(event_bus, EVENT_MOUSE, LIVE_INPUT_TICK_INTERVAL)
     
     def _setup(self):
         """İzleyiciyi hazırla."""
@@ -74,6 +76,7 @@ class MouseTracker(BaseTracker):
         distance = math.sqrt((x - self.last_position[0])**2 + (y - self.last_position[1])**2)
         self.movement_pixels += int(distance)
         self.last_position = (x, y)
+        self.input_ticker.add(movement_pixels=int(distance))
     
     def _on_click(self, x, y, button, pressed):
         """Fare tıklama olayını işle.
@@ -90,6 +93,7 @@ class MouseTracker(BaseTracker):
         # Sadece basma olaylarını say
         if pressed:
             self.click_count += 1
+            self.input_ticker.add(clicks=1)
     
     def _collect_data(self):
         """Veri topla."""
@@ -98,6 +102,7 @@ class MouseTracker(BaseTracker):
         
         current_time = datetime.datetime.now()
         elapsed_seconds = (current_time - self.last_save_time).total_seconds()
+        self.input_ticker.flush()
         
         # Belirli aralıklarla veritabanına kaydet (10 saniye veya aktivite varsa)
         if elapsed_seconds >= 10 or self.click_count > 0 or self.movement_pixels > 100:
@@ -116,8 +121,7 @@ class MouseTracker(BaseTracker):
                         movement_pixels=self.movement_pixels,
                         window_id=window_id
                     )
-                    self.db_session.add(mouse_activity)
-                    self.db_session.commit()
+                    self._persist([mouse_activity])
                     logger.debug(f"Fare aktivitesi kaydedildi: {self.click_count} tıklama, {self.movement_pixels} piksel hareket")
                 except Exception as e:
                     logger.error(f"Fare aktivitesi kaydedilirken hata oluştu: {e}")
@@ -149,8 +153,7 @@ class MouseTracker(BaseTracker):
                     movement_pixels=self.movement_pixels,
                     window_id=window_id
                 )
-                self.db_session.add(mouse_activity)
-                self.db_session.commit()
+                self._persist([mouse_activity])
                 logger.debug(f"Son fare aktivitesi kaydedildi: {self.click_count} tıklama, {self.movement_pixels} piksel hareket")
             except Exception as e:
                 logger.error(f"Son fare aktivitesi kaydedilirken hata oluştu: {e}")
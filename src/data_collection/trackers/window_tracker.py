@@ -6,12 +6,19 @@ Bu modül, aktif pencereleri izlemek ve kaydetmek için kullanılır.
 import time
 import logging
 import datetime
+import threading
 import psutil
 import win32gui
 import win32process
 from .base_tracker import BaseTracker
-from ..config import COLLECTION_INTERVAL, ENABLE_WINDOW_TRACKING, EXCLUDED_APPS
+from ..config import (
+    COLLECTION_INTERVAL, ENABLE_WINDOW_TRACKING, EXCLUDED_APPS, FOCUS_REGISTRY_SIZE,
+    TITLE_NORMALIZATION_RULES, STORE_RAW_WINDOW_TITLES, ENABLE_LIVE_STREAM, LIVE_FOCUS_POLL_INTERVAL
+)
 from ..database import WindowActivity
+from ..event_bus import event_bus, EVENT_WINDOW_FOCUS
+from ..focus_registry import FocusRegistry
+from ..title_normalizer import TitleNormalizer
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +35,12 @@ class WindowTracker(BaseTracker):
         self.current_window = None
         self.current_window_start_time = None
         self.last_window_id = None
-        self.active_windows = {}  # Aktif pencereleri ve başlangıç zamanlarını tutan sözlük
+        self.focus_registry = FocusRegistry(max_entries=FOCUS_REGISTRY_SIZE)  # Pencere ve uygulama bazında odak süreleri
+        
+        # Başlık normalleştirici (aralıklar normalleştirilmiş başlığa göre bölünür)
+        rules = TITLE_NORMALIZATION_RULES if isinstance(TITLE_NORMALIZATION_RULES, dict) else {}
+        self.title_normalizer = TitleNormalizer(rules.get('global'), rules.get('apps'))
+        self.focus_watcher = None
     
     def _setup(self):
         """İzleyiciyi hazırla."""
@@ -40,13 +52,13 @@ class WindowTracker(BaseTracker):
         self.current_window = self._get_active_window_info()
         if self.current_window:
             self.current_window_start_time = datetime.datetime.now()
-            # Aktif pencereyi sözlüğe ekle
-            window_key = f"{self.current_window['application_name']}:{self.current_window['window_title']}"
-            self.active_windows[window_key] = {
-                'window': self.current_window,
-                'start_time': self.current_window_start_time,
-                'is_active': True
-            }
+            # Aktif pencerenin odağını başlat
+            self._activate_window(self.current_window)
+        
+        # Canlı akış için odak değişiklikleri kayıt aralığından bağımsız, sık aralıklarla izlenir
+        if ENABLE_LIVE_STREAM:
+            self.focus_watcher = threading.Thread(target=self._watch_focus, daemon=True)
+            self.focus_watcher.start()
     
     def _collect_data(self):
         """Veri topla."""
@@ -59,71 +71,21 @@ class WindowTracker(BaseTracker):
         
         # Pencere değiştiyse, önceki pencere için süreyi kaydet
         if self.current_window and window_info and (
-            window_info['window_title'] != self.current_window['window_title'] or
-            window_info['application_name'] != self.current_window['application_name']
+            window_info['application_name'] != self.current_window['application_name'] or
+            self._normalized_title(window_info) != self._normalized_title(self.current_window)
         ):
-            # Önceki pencere için süreyi hesapla
-            duration_seconds = int((current_time - self.current_window_start_time).total_seconds())
+            self._save_current_window(current_time)
             
-            # Minimum süre kontrolü (1 saniyeden fazla ise kaydet)
-            if duration_seconds > 1:
-                # Hariç tutulan uygulamaları kontrol et
-                app_name = self.current_window['application_name'].lower()
-                if not any(excluded.lower() in app_name for excluded in EXCLUDED_APPS):
-                    try:
-                        # Veritabanına kaydet
-                        window_activity = WindowActivity(
-                            session_id=self.session_id,
-                            timestamp=self.current_window_start_time,
-                            window_title=self.current_window['window_title'],
-                            application_name=self.current_window['application_name'],
-                            process_id=self.current_window['process_id'],
-                            duration=duration_seconds
-                        )
-                        self.db_session.add(window_activity)
-                        self.db_session.commit()
-                        self.last_window_id = window_activity.id
-                        self.logger.info(f"Aktivite tespit edildi: {self.current_window['application_name']} - {self.current_window['window_title']} ({duration_seconds}s)")
-                    except Exception as e:
-                        self.logger.error(f"Aktivite kaydedilirken hata oluştu: {e}")
-                        self.db_session.rollback()
-            
-            # Önceki pencereyi aktif olmayan olarak işaretle
-            if self.current_window:
-                window_key = f"{self.current_window['application_name']}:{self.current_window['window_title']}"
-                if window_key in self.active_windows:
-                    self.active_windows[window_key]['is_active'] = False
-            
-            # Yeni pencereyi ayarla
+            # Yeni pencereyi ayarla ve odağı ona aktar
             self.current_window = window_info
             self.current_window_start_time = current_time
-            
-            # Yeni pencereyi aktif pencereler sözlüğüne ekle veya güncelle
-            if window_info:
-                window_key = f"{window_info['application_name']}:{window_info['window_title']}"
-                if window_key in self.active_windows:
-                    # Eğer daha önce bu pencere açıldıysa, sadece aktif durumunu güncelle
-                    self.active_windows[window_key]['is_active'] = True
-                else:
-                    # Yeni pencere ise, sözlüğe ekle
-                    self.active_windows[window_key] = {
-                        'window': window_info,
-                        'start_time': current_time,
-                        'is_active': True
-                    }
+            self._activate_window(window_info)
         
         # İlk kez pencere bilgisi alınıyorsa
         elif not self.current_window and window_info:
             self.current_window = window_info
             self.current_window_start_time = current_time
-            
-            # Yeni pencereyi aktif pencereler sözlüğüne ekle
-            window_key = f"{window_info['application_name']}:{window_info['window_title']}"
-            self.active_windows[window_key] = {
-                'window': window_info,
-                'start_time': current_time,
-                'is_active': True
-            }
+            self._activate_window(window_info)
         
         # Veri toplama aralığı kadar bekle
         time.sleep(COLLECTION_INTERVAL)
@@ -132,31 +94,113 @@ class WindowTracker(BaseTracker):
         """Kaynakları temizle."""
         # Son aktif pencereyi kaydet
         if self.current_window:
-            end_time = datetime.datetime.now()
-            duration_seconds = int((end_time - self.current_window_start_time).total_seconds())
-            
-            if duration_seconds > 1:
-                app_name = self.current_window['application_name'].lower()
-                if not any(excluded.lower() in app_name for excluded in EXCLUDED_APPS):
-                    try:
-                        window_activity = WindowActivity(
-                            session_id=self.session_id,
-                            timestamp=self.current_window_start_time,
-                            window_title=self.current_window['window_title'],
-                            application_name=self.current_window['application_name'],
-                            process_id=self.current_window['process_id'],
-                            duration=duration_seconds
-                        )
-                        self.db_session.add(window_activity)
-                        self.db_session.commit()
-                        self.logger.info(f"Son aktivite kaydedildi: {self.current_window['application_name']} - {self.current_window['window_title']} ({duration_seconds}s)")
-                    except Exception as e:
-                        self.logger.error(f"Son aktivite kaydedilirken hata oluştu: {e}")
-                        self.db_session.rollback()
+            self._save_current_window(datetime.datetime.now(), final=True)
         
         self.current_window = None
         self.current_window_start_time = None
-        self.active_windows = {}
+        self.focus_registry.clear()
+    
+    def _save_current_window(self, end_time, final=False):
+        """Geçerli pencere aralığını veritabanına kaydet.
+        
+        Args:
+            end_time: Aralığın bitiş zamanı.
+            final: Kapanış sırasında yapılan son kayıt ise True.
+        """
+        duration_seconds = int((end_time - self.current_window_start_time).total_seconds())
+        
+        # Minimum süre kontrolü (1 saniyeden fazla ise kaydet)
+        if duration_seconds <= 1:
+            return
+        
+        # Hariç tutulan uygulamaları kontrol et
+        app_name = self.current_window['application_name'].lower()
+        if any(excluded.lower() in app_name for excluded in EXCLUDED_APPS):
+            return
+        
+        normalized_title = self._normalized_title(self.current_window)
+        window_title = self.current_window['window_title'] if STORE_RAW_WINDOW_TITLES else normalized_title
+        try:
+            # Veritabanına kaydet
+            window_activity = WindowActivity(
+                session_id=self.session_id,
+                timestamp=self.current_window_start_time,
+                window_title=window_title,
+                normalized_title=normalized_title,
+                application_name=self.current_window['application_name'],
+                process_id=self.current_window['process_id'],
+                duration=duration_seconds
+            )
+            # Günlüğe eklenen pencerenin kimliği henüz yoktur; olaylar işleme sırasında pencerelere bağlanır
+            self.last_window_id = window_activity.id if self._persist([window_activity]) else None
+            if final:
+                self.logger.info(f"Son aktivite kaydedildi: {self.current_window['application_name']} - {normalized_title} ({duration_seconds}s)")
+            else:
+                self.logger.info(f"Aktivite tespit edildi: {self.current_window['application_name']} - {normalized_title} ({duration_seconds}s)")
+        except Exception as e:
+            if final:
+                self.logger.error(f"Son aktivite kaydedilirken hata oluştu: {e}")
+            else:
+                self.logger.error(f"Aktivite kaydedilirken hata oluştu: {e}")
+            self.db_session.rollback()
+    
+    def _watch_focus(self):
+        """Ön plandaki pencereyi izle ve değişiklikleri olay yoluna yayınla.
+        
+        Yalnızca abone varken çalışır; veritabanına erişmez.
+        """
+        last_state = None
+        while not self.stop_event.is_set():
+            if event_bus.has_subscribers:
+                try:
+                    hwnd = win32gui.GetForegroundWindow()
+                    state = (hwnd, win32gui.GetWindowText(hwnd))
+                    if state != last_state:
+                        last_state = state
+                        window_info = self._get_active_window_info()
+                        if window_info:
+                            self._publish_focus(window_info)
+                except Exception as e:
+                    self.logger.debug(f"Odak değişikliği yayınlanırken hata oluştu: {e}")
+            else:
+                last_state = None
+            self.stop_event.wait(LIVE_FOCUS_POLL_INTERVAL)
+    
+    def _publish_focus(self, window_info):
+        """Pencere odağı olayını yayınla (hariç tutulan uygulamalar yayınlanmaz).
+        
+        Args:
+            window_info: Pencere bilgileri.
+        """
+        app_name = window_info['application_name'].lower()
+        if any(excluded.lower() in app_name for excluded in EXCLUDED_APPS):
+            return
+        event_bus.publish(
+            EVENT_WINDOW_FOCUS,
+            application_name=window_info['application_name'],
+            window_title=self._normalized_title(window_info),
+            process_id=window_info['process_id']
+        )
+    
+    def _normalized_title(self, window_info):
+        """Pencerenin normalleştirilmiş başlığını döndür (sonuçlar önbelleklenir).
+        
+        Args:
+            window_info: Pencere bilgileri.
+            
+        Returns:
+            str: Normalleştirilmiş başlık.
+        """
+        return self.title_normalizer.normalize(window_info['application_name'], window_info['window_title'])
+    
+    def _activate_window(self, window_info):
+        """Pencerenin odağını başlat; önceki pencerenin odak süresi biriktirilir.
+        
+        Args:
+            window_info: Pencere bilgileri.
+        """
+        window_key = f"{window_info['application_name']}:{self._normalized_title(window_info)}"
+        self.focus_registry.activate(window_key, window_info['application_name'])
     
     def _get_active_window_info(self):
         """Aktif pencere bilgilerini al.
@@ -203,20 +247,25 @@ class WindowTracker(BaseTracker):
         return self.last_window_id
     
     def get_active_window_duration(self, application_name, window_title):
-        """Belirli bir pencerenin aktif olduğu toplam süreyi döndür.
+        """Belirli bir pencerenin odakta kaldığı toplam süreyi döndür.
         
         Args:
             application_name: Uygulama adı.
             window_title: Pencere başlığı.
             
         Returns:
-            int: Toplam süre (saniye cinsinden) veya 0.
+            int: Toplam süre (saniye cinsinden, devam eden odak dahil) veya 0.
+        """
+        window_key = f"{application_name}:{self.title_normalizer.normalize(application_name, window_title)}"
+        return self.focus_registry.get_duration_ms(window_key) // 1000
+    
+    def get_application_duration(self, application_name):
+        """Belirli bir uygulamanın tüm pencereleriyle odakta kaldığı toplam süreyi döndür.
+        
+        Args:
+            application_name: Uygulama adı.
+            
+        Returns:
+            int: Toplam süre (saniye cinsinden, devam eden odak dahil) veya 0.
         """
-        window_key = f"{application_name}:{window_title}"
-        if window_key in self.active_windows:
-            window_data = self.active_windows[window_key]
-            if window_data['is_active']:
-                # Eğer pencere hala aktifse, şu ana kadar geçen süreyi hesapla
-                current_time = datetime.datetime.now()
-                return int((current_time - window_data['start_time']).total_seconds())
-        return 0 
\ No newline at end of file
+        return self.focus_registry.get_group_duration_ms(application_name) // 1000
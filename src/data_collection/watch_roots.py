@@ -0,0 +1,195 @@
+"""
+İzleme kökleri yönetimi.
+
+Bu modül, dosya izleyicisinin izleyeceği kök dizinleri yapılandırmadan okur ve
+derinlik sınırları ile yok sayma desenlerini izlemeler kaydedilmeden önce
+uygulayan bir izleme planı oluşturur.
+"""
+import os
+import errno
+import logging
+from .path_filter import normalize_path, compile_name_patterns
+
+logger = logging.getLogger(__name__)
+
+# İzleme sınırına ulaşıldığını gösteren hata kodları (inotify: ENOSPC, EMFILE)
+WATCH_LIMIT_ERRNOS = (errno.ENOSPC, errno.EMFILE, errno.ENFILE)
+
+class WatchRoot:
+    """İzlenecek kök dizin ve sınırları."""
+
+    def __init__(self, path, max_depth=None, ignore=()):
+        """Kökü oluştur.
+
+        Args:
+            path: Kök dizin yolu.
+            max_depth: İzlenecek en fazla alt dizin derinliği (None: sınırsız, 0: yalnızca kök).
+            ignore: Dizin adları için yok sayma desenleri ("node_modules", "*.photoslibrary" gibi).
+        """
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.max_depth = max_depth
+        self.ignore = tuple(ignore)
+        self._ignore_regex = compile_name_patterns(self.ignore)
+
+    def is_ignored(self, name):
+        """Dizin adının yok sayılıp sayılmadığını kontrol et.
+
+        Args:
+            name: Dizin adı.
+
+        Returns:
+            bool: Ad bir yok sayma deseniyle eşleşiyorsa True.
+        """
+        return self._ignore_regex is not None and self._ignore_regex.match(name) is not None
+
+    def __repr__(self):
+        return f"<WatchRoot(path='{self.path}', max_depth={self.max_depth})>"
+
+class RootFilters:
+    """İzleme köklerine özgü dosya filtreleri.
+
+    Her kökün yok sayma listesi yalnızca o kökün altındaki yollara uygulanır;
+    iç içe köklerde en uzun kök öneki seçilir.
+    """
+
+    def __init__(self, roots, make_filter, default_filter):
+        """Filtreleri derle.
+
+        Args:
+            roots: WatchRoot nesneleri.
+            make_filter: Kök için PathFilter oluşturan fonksiyon.
+            default_filter: Hiçbir kökün altında olmayan yollar için PathFilter.
+        """
+        self.default_filter = default_filter
+        self._roots = sorted(
+            ((normalize_path(root.path).rstrip(os.sep) + os.sep, root, make_filter(root)) for root in roots),
+            key=lambda item: len(item[0]),
+            reverse=True
+        )
+
+    def lookup(self, path):
+        """Yolu içeren en derin kökü ve filtresini döndür.
+
+        Args:
+            path: Dosya veya dizin yolu.
+
+        Returns:
+            tuple: (WatchRoot veya None, PathFilter).
+        """
+        key = normalize_path(path) + os.sep
+        for prefix, root, path_filter in self._roots:
+            if key.startswith(prefix):
+                return root, path_filter
+        return None, self.default_filter
+
+    def match(self, path):
+        """Yolu kökünün filtresiyle filtrele (bkz. PathFilter.match)."""
+        return self.lookup(path)[1].match(path)
+
+class WatchPlanEntry:
+    """Tek bir izleme kaydı."""
+    __slots__ = ('path', 'recursive', 'directory_count')
+
+    def __init__(self, path, recursive, directory_count):
+        self.path = path
+        self.recursive = recursive
+        self.directory_count = directory_count
+
+def load_watch_roots(entries, default_ignore=()):
+    """Yapılandırmadaki izleme köklerini oluştur.
+
+    Args:
+        entries: Yol dizeleri veya {"path", "max_depth", "ignore"} sözlükleri.
+        default_ignore: Her köke uygulanacak varsayılan yok sayma desenleri.
+
+    Returns:
+        list: WatchRoot nesneleri.
+    """
+    roots = []
+    for entry in entries:
+        if isinstance(entry, str):
+            roots.append(WatchRoot(entry, ignore=default_ignore))
+        elif isinstance(entry, dict) and entry.get('path'):
+            max_depth = entry.get('max_depth')
+            roots.append(WatchRoot(
+                entry['path'],
+                max_depth=int(max_depth) if max_depth is not None else None,
+                ignore=list(default_ignore) + list(entry.get('ignore', []))
+            ))
+        else:
+            logger.warning(f"Geçersiz izleme kökü yapılandırması atlandı: {entry}")
+    return roots
+
+def plan_watches(root, is_excluded=None, path=None):
+    """Kök için izleme planı oluştur.
+
+    Sınırsız derinlikteki ve altında yok sayılan dizin bulunmayan alt ağaçlar
+    tek bir özyinelemeli izleme ile, diğerleri dizin başına özyinelemesiz
+    izlemelerle kaydedilir. Böylece yok sayılan dizinler için hiç izleme
+    oluşturulmaz.
+
+    Args:
+        root: WatchRoot nesnesi.
+        is_excluded: Dizinin tamamen hariç tutulup tutulmadığını döndüren fonksiyon.
+        path: Yalnızca bu alt dizini planla (izleme başladıktan sonra oluşturulan dizinler için).
+
+    Returns:
+        list: WatchPlanEntry nesneleri (dizin derinlik sınırının dışındaysa boş).
+    """
+    path = root.path if path is None else os.path.abspath(path)
+    relative = os.path.relpath(path, root.path)
+    depth = 0 if relative == os.curdir else len(relative.split(os.sep))
+    if root.max_depth is not None and depth > root.max_depth:
+        return []
+    entries, _ = _plan_directory(root, path, depth, is_excluded)
+    return entries
+
+def _plan_directory(root, path, depth, is_excluded):
+    """Dizin için planı alttan üste oluştur.
+
+    Returns:
+        tuple: (plan kayıtları, alt ağaç temiz mi).
+    """
+    if root.max_depth is not None and depth >= root.max_depth:
+        return [WatchPlanEntry(path, False, 1)], False
+
+    clean = root.max_depth is None
+    children = []
+    try:
+        with os.scandir(path) as iterator:
+            for entry in iterator:
+                try:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                except OSError:
+                    continue
+                if root.is_ignored(entry.name) or (is_excluded and is_excluded(entry.path)):
+                    clean = False
+                    continue
+                children.append(entry.path)
+    except OSError as e:
+        logger.debug(f"Dizin okunamadı ({path}): {e}")
+        return [WatchPlanEntry(path, False, 1)], False
+
+    child_entries = []
+    for child in children:
+        entries, child_clean = _plan_directory(root, child, depth + 1, is_excluded)
+        child_entries.extend(entries)
+        clean = clean and child_clean
+
+    if clean:
+        directory_count = 1 + sum(entry.directory_count for entry in child_entries)
+        return [WatchPlanEntry(path, True, directory_count)], True
+
+    return [WatchPlanEntry(path, False, 1)] + child_entries, False
+
+def is_watch_limit_error(error):
+    """Hatanın işletim sistemi izleme sınırından kaynaklanıp kaynaklanmadığını kontrol et.
+
+    Args:
+        error: Yakalanan istisna.
+
+    Returns:
+        bool: İzleme sınırı hatası ise True.
+    """
+    return isinstance(error, OSError) and error.errno in WATCH_LIMIT_ERRNOS
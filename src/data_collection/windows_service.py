@@ -20,6 +20,7 @@ from .trackers.mouse_tracker import MouseTracker
 from .trackers.file_tracker import FileTracker
 from .trackers.browser_tracker import BrowserTracker
 from .trackers.game_tracker import GameTracker
+from .trackers.maintenance_tracker import MaintenanceTracker
 from .database import get_session, ActivitySession
 
 # Logging yapılandırması
@@ -120,7 +121,8 @@ class ActivityTrackerService(win32serviceutil.ServiceFramework):
                 MouseTracker(self.session.id),
                 FileTracker(self.session.id),
                 BrowserTracker(self.session.id),
-                GameTracker(self.session.id)
+                GameTracker(self.session.id),
+                MaintenanceTracker(self.session.id)
             ]
             
             for tracker in self.trackers:
@@ -0,0 +1,398 @@
+"""
+Yazma yolu toplamları.
+
+Bu modül, aralık kayıtları veritabanına yazılırken saatlik uygulama, alan adı
+ve kategori toplamlarını aynı işlem içinde günceller. Böylece "bugün şu ana
+kadar" ve "bu hafta" sorguları ham kayıtları taramadan birkaç indeksli
+satırdan yanıtlanır. Günlük özet çizimleri (sketches) de aynı kancada güncellenir
+ve kayıt eklenen günlerin sürümü artırılarak sorgu önbelleğine bildirilir.
+
+Her yazma partisinin içeriğinden bir kimlik türetilir; aynı parti yeniden
+oynatıldığında toplamlar ikinci kez artırılmaz.
+"""
+import os
+import time
+import hashlib
+import logging
+import datetime
+from sqlalchemy import event, select, delete, func
+from sqlalchemy.dialects.sqlite import insert
+
+from .database import (
+    engine, Session, WindowActivity, BrowserActivity, GameActivity, FileActivity, KeyboardActivity, MouseActivity,
+    ActivityRollup, RollupBatch, DayVersion
+)
+from .config import COMMIT_WATERMARK_FILE, INTERVAL_LOOKBACK_HOURS
+from .categories import get_category_rules
+from .sketches import sketch_updates, apply_sketch_updates
+
+logger = logging.getLogger(__name__)
+
+# Toplam boyutları
+DIMENSION_TOTAL = 'total'
+DIMENSION_APP = 'app'
+DIMENSION_DOMAIN = 'domain'
+DIMENSION_CATEGORY = 'category'
+DIMENSION_GAME = 'game'
+
+def split_by_hour(started, seconds):
+    """Aralığı saat sınırlarında böl.
+
+    Args:
+        started: Aralık başlangıcı (datetime).
+        seconds: Aralık süresi (saniye).
+
+    Yields:
+        tuple: (saat başlangıcı, o saatteki süre).
+    """
+    cursor = started
+    remaining = float(seconds or 0)
+    while remaining > 0:
+        hour = cursor.replace(minute=0, second=0, microsecond=0)
+        next_hour = hour + datetime.timedelta(hours=1)
+        part = min(remaining, (next_hour - cursor).total_seconds())
+        yield hour, part
+        cursor = next_hour
+        remaining -= part
+
+def _title_of(window):
+    return window.normalized_title or window.window_title
+
+def rollup_contributions(objects, rules=None):
+    """Yeni kayıtların toplamlara katkılarını hesapla.
+
+    Args:
+        objects: Yeni eklenen model nesneleri.
+        rules: CategoryRules nesnesi (None ise get_category_rules()).
+
+    Returns:
+        tuple: ((saat, boyut, anahtar) → [saniye, olay sayısı] sözlüğü, parti parmak izi parçaları).
+    """
+    rules = rules or get_category_rules()
+    totals = {}
+    fingerprint = []
+
+    def add(hour, dimension, key, seconds, count):
+        entry = totals.setdefault((hour, dimension, key or ''), [0.0, 0])
+        entry[0] += seconds
+        entry[1] += count
+
+    for obj in objects:
+        if isinstance(obj, WindowActivity):
+            keys = [
+                (DIMENSION_TOTAL, ''),
+                (DIMENSION_APP, obj.application_name),
+                (DIMENSION_CATEGORY, rules.classify(obj.application_name, None, _title_of(obj))),
+            ]
+            fingerprint.append(f"w|{obj.timestamp}|{obj.application_name}|{_title_of(obj)}|{obj.duration}|{obj.session_id}")
+        elif isinstance(obj, BrowserActivity):
+            keys = [(DIMENSION_DOMAIN, obj.domain)]
+            fingerprint.append(f"b|{obj.timestamp}|{obj.url}|{obj.duration}|{obj.session_id}")
+        elif isinstance(obj, GameActivity):
+            keys = [(DIMENSION_GAME, obj.game_name)]
+            fingerprint.append(f"g|{obj.timestamp}|{obj.game_name}|{obj.duration}|{obj.session_id}")
+        elif isinstance(obj, FileActivity):
+            # Dosya olayları toplamlara girmez; yalnızca parti kimliğine ve çizimlere katkı verir
+            fingerprint.append(f"f|{obj.timestamp}|{obj.file_path}|{obj.action}|{obj.session_id}")
+            continue
+        else:
+            continue
+        if obj.timestamp is None:
+            continue
+        for position, (hour, seconds) in enumerate(split_by_hour(obj.timestamp, obj.duration)):
+            for dimension, key in keys:
+                # Olay sayısı yalnızca aralığın başladığı saate yazılır
+                add(hour, dimension, key, seconds, 1 if position == 0 else 0)
+    return totals, fingerprint
+
+def touched_days(objects):
+    """Kayıtların düştüğü günleri döndür (aralıklar için bitiş günü de dahil).
+
+    Args:
+        objects: Model nesneleri.
+
+    Returns:
+        set: datetime.date kümesi.
+    """
+    days = set()
+    for obj in objects:
+        if obj.timestamp is None:
+            continue
+        days.add(obj.timestamp.date())
+        duration = getattr(obj, 'duration', None)
+        if duration:
+            days.add((obj.timestamp + datetime.timedelta(seconds=duration)).date())
+    return days
+
+def bump_day_versions(connection, days):
+    """Günlerin sürümünü bağlantının mevcut işleminde artır.
+
+    Args:
+        connection: SQLAlchemy bağlantısı.
+        days: datetime.date koleksiyonu.
+    """
+    if not days:
+        return
+    statement = insert(DayVersion)
+    statement = statement.on_conflict_do_update(
+        index_elements=['day'],
+        set_={'version': DayVersion.version + 1, 'updated_at': statement.excluded.updated_at}
+    )
+    now = datetime.datetime.now()
+    connection.execute(statement, [
+        {'day': datetime.datetime.combine(day, datetime.time.min), 'version': 1, 'updated_at': now}
+        for day in sorted(days)
+    ])
+
+def get_day_versions(db_session, days):
+    """Günlerin güncel sürümlerini döndür.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        days: datetime.date listesi.
+
+    Returns:
+        dict: datetime.date → sürüm (hiç yazılmamış günler için 0).
+    """
+    if not days:
+        return {}
+    start = datetime.datetime.combine(min(days), datetime.time.min)
+    end = datetime.datetime.combine(max(days), datetime.time.min) + datetime.timedelta(days=1)
+    stored = {
+        day.date(): version for day, version in db_session.execute(
+            select(DayVersion.day, DayVersion.version).where(DayVersion.day >= start, DayVersion.day < end)
+        )
+    }
+    return {day: stored.get(day, 0) for day in days}
+
+def claim_batch(connection, batch_id):
+    """Parti kimliğini uygulanmış olarak işaretle.
+
+    Args:
+        connection: SQLAlchemy bağlantısı.
+        batch_id: Parti kimliği.
+
+    Returns:
+        bool: Parti daha önce uygulanmamışsa True.
+    """
+    result = connection.execute(
+        insert(RollupBatch).values(batch_id=batch_id, applied_at=datetime.datetime.now())
+        .on_conflict_do_nothing(index_elements=['batch_id'])
+    )
+    if result.rowcount == 0:
+        logger.debug(f"Parti zaten uygulanmış, atlandı: {batch_id}")
+        return False
+    return True
+
+def apply_rollups(connection, totals, batch_id=None):
+    """Toplamları bağlantının mevcut işleminde artır.
+
+    Args:
+        connection: SQLAlchemy bağlantısı.
+        totals: rollup_contributions sonucu.
+        batch_id: Parti kimliği; daha önce uygulanmışsa hiçbir şey yapılmaz.
+
+    Returns:
+        bool: Toplamlar güncellendiyse True.
+    """
+    if not totals:
+        return False
+    if batch_id is not None and not claim_batch(connection, batch_id):
+        return False
+
+    statement = insert(ActivityRollup)
+    statement = statement.on_conflict_do_update(
+        index_elements=['bucket', 'dimension', 'key'],
+        set_={
+            'seconds': ActivityRollup.seconds + statement.excluded.seconds,
+            'event_count': ActivityRollup.event_count + statement.excluded.event_count,
+        }
+    )
+    connection.execute(statement, [
+        {'bucket': hour, 'dimension': dimension, 'key': key, 'seconds': seconds, 'event_count': count}
+        for (hour, dimension, key), (seconds, count) in totals.items()
+    ])
+    return True
+
+def _after_flush(session, flush_context):
+    """Oturumdaki yeni kayıtları aynı işlemde toplamlara, günlük çizimlere ve gün sürümlerine yansıt."""
+    new_objects = [
+        obj for obj in session.new
+        if isinstance(obj, (WindowActivity, BrowserActivity, GameActivity, FileActivity, KeyboardActivity, MouseActivity))
+    ]
+    if not new_objects:
+        return
+    connection = session.connection()
+    bump_day_versions(connection, touched_days(new_objects))
+
+    objects = [obj for obj in new_objects if not isinstance(obj, (KeyboardActivity, MouseActivity))]
+    if not objects:
+        return
+    try:
+        totals, fingerprint = rollup_contributions(objects)
+        updates = sketch_updates(objects)
+    except Exception as e:
+        # Toplamlar yeniden oluşturulabilir; ham kayıtların yazılması engellenmez
+        logger.error(f"Toplam katkıları hesaplanırken hata oluştu: {e}")
+        return
+    batch_id = session.info.get('rollup_batch_id')
+    if batch_id is None:
+        batch_id = hashlib.sha1('\n'.join(sorted(fingerprint)).encode('utf-8')).hexdigest()
+    if not claim_batch(connection, batch_id):
+        return
+    apply_rollups(connection, totals)
+    if updates:
+        apply_sketch_updates(connection, updates)
+
+def write_commit_watermark(path=COMMIT_WATERMARK_FILE):
+    """Yazıcının son commit işaretini güncelle.
+
+    Okuyucular bu dosyanın içeriğinden ve değişiklik zamanından ETag ve
+    Last-Modified değerleri üretir; böylece veritabanına dokunmadan verinin
+    değişip değişmediğini anlayabilir.
+
+    Args:
+        path: İşaret dosyası yolu (boş ise hiçbir şey yapılmaz).
+    """
+    if not path:
+        return
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'w') as handle:
+            handle.write(str(time.time_ns()))
+        os.replace(temp_path, path)
+    except OSError as e:
+        logger.error(f"Commit işareti yazılırken hata oluştu: {e}")
+
+def read_commit_watermark(path=COMMIT_WATERMARK_FILE):
+    """Son commit işaretini döndür.
+
+    Args:
+        path: İşaret dosyası yolu.
+
+    Returns:
+        tuple: (işaret değeri, değişiklik zamanı olarak Unix saniyesi); dosya yoksa (None, None).
+    """
+    try:
+        with open(path) as handle:
+            return handle.read().strip(), os.path.getmtime(path)
+    except (OSError, TypeError):
+        return None, None
+
+def _after_commit(session):
+    """Commit sonrası işareti güncelle (ekleme dışındaki sıkıştırma, özet gibi yazmalar da kapsanır).
+
+    İşaret yapılandırılan veritabanına aittir; başka motorlara bağlı oturumlar
+    (birleştirme hedefi, testler) işareti değiştirmez.
+    """
+    if session.bind is engine:
+        write_commit_watermark()
+
+def install_rollup_hooks(session_factory=Session):
+    """Oturum fabrikasına toplam güncelleme kancalarını ekle (birden fazla çağrı güvenlidir).
+
+    Args:
+        session_factory: sessionmaker nesnesi veya Session sınıfı.
+    """
+    for name, hook in (('after_flush', _after_flush), ('after_commit', _after_commit)):
+        if not event.contains(session_factory, name, hook):
+            event.listen(session_factory, name, hook)
+
+def rebuild_rollups(db_session, day):
+    """Günün toplamlarını ham kayıtlardan yeniden oluştur.
+
+    Kanca eklenmeden önce yazılmış veya sonradan sıkıştırılmış günler için kullanılır.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        day: datetime.date nesnesi.
+    """
+    start = datetime.datetime.combine(day, datetime.time.min)
+    end = start + datetime.timedelta(days=1)
+    # Önceki günde başlayıp gece yarısını aşan aralıklar da okunur (build_day_cube ile aynı pencere)
+    lookback = start - datetime.timedelta(hours=INTERVAL_LOOKBACK_HOURS)
+    try:
+        objects = []
+        for model in (WindowActivity, BrowserActivity, GameActivity):
+            objects.extend(db_session.query(model).filter(model.timestamp >= lookback, model.timestamp < end).all())
+        totals, _ = rollup_contributions(objects)
+        connection = db_session.connection()
+        connection.execute(delete(ActivityRollup).where(ActivityRollup.bucket >= start, ActivityRollup.bucket < end))
+        # Yalnızca bu günün saatlerine düşen katkılar yazılır; önceki günün saatlerine dokunulmaz
+        apply_rollups(connection, {key: value for key, value in totals.items() if start <= key[0] < end})
+        db_session.commit()
+    except Exception as e:
+        logger.error(f"Toplamlar yeniden oluşturulurken hata oluştu: {e}")
+        db_session.rollback()
+        raise
+
+def prune_rollup_batches(db_session, older_than_days=7):
+    """Eski parti kimliklerini sil.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        older_than_days: Saklanacak gün sayısı.
+
+    Returns:
+        int: Silinen kayıt sayısı.
+    """
+    cutoff = datetime.datetime.now() - datetime.timedelta(days=older_than_days)
+    try:
+        result = db_session.execute(delete(RollupBatch).where(RollupBatch.applied_at < cutoff))
+        db_session.commit()
+        return result.rowcount
+    except Exception as e:
+        logger.error(f"Eski toplam partileri silinirken hata oluştu: {e}")
+        db_session.rollback()
+        return 0
+
+def get_rollup_totals(db_session, start, end, dimension=DIMENSION_APP):
+    """Zaman aralığındaki toplamları döndür.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        start: Aralık başlangıcı (datetime, saat başına yuvarlanır).
+        end: Aralık sonu (datetime).
+        dimension: total, app, domain, category veya game.
+
+    Returns:
+        dict: Anahtar → saniye; büyükten küçüğe sıralı.
+    """
+    start = start.replace(minute=0, second=0, microsecond=0)
+    rows = db_session.execute(
+        select(ActivityRollup.key, func.sum(ActivityRollup.seconds))
+        .where(ActivityRollup.bucket >= start, ActivityRollup.bucket < end, ActivityRollup.dimension == dimension)
+        .group_by(ActivityRollup.key)
+        .order_by(func.sum(ActivityRollup.seconds).desc())
+    )
+    return {key: seconds for key, seconds in rows}
+
+def get_today_totals(db_session, dimension=DIMENSION_APP, now=None):
+    """Bugünün şu ana kadarki toplamlarını döndür.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        dimension: total, app, domain, category veya game.
+        now: Şimdiki zaman (test için).
+
+    Returns:
+        dict: Anahtar → saniye.
+    """
+    now = now or datetime.datetime.now()
+    start = datetime.datetime.combine(now.date(), datetime.time.min)
+    return get_rollup_totals(db_session, start, start + datetime.timedelta(days=1), dimension)
+
+def get_week_totals(db_session, dimension=DIMENSION_APP, now=None):
+    """Bu haftanın (pazartesiden itibaren) toplamlarını döndür.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        dimension: total, app, domain, category veya game.
+        now: Şimdiki zaman (test için).
+
+    Returns:
+        dict: Anahtar → saniye.
+    """
+    now = now or datetime.datetime.now()
+    monday = datetime.datetime.combine(now.date() - datetime.timedelta(days=now.weekday()), datetime.time.min)
+    return get_rollup_totals(db_session, monday, monday + datetime.timedelta(days=7), dimension)
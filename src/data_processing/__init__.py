@@ -0,0 +1,7 @@
+"""
+Veri İşleme Modülü.
+
+Bu modül, toplanan aktivite verilerini günlük özetlere dönüştüren bileşenleri içerir.
+"""
+
+__version__ = '0.1.0'
@@ -0,0 +1,183 @@
+"""
+DuckDB Analitik Modülü.
+
+Bu modül, uzun dönemli analitik sorguları (bir yıllık alan adı dağılımı,
+yazma yoğunluğu ile uygulama ilişkisi vb.) DuckDB'nin vektörel ve çok
+çekirdekli yürütmesiyle çalıştırır. Veri iki kaynaktan okunabilir:
+
+- SQLite veritabanı, DuckDB'nin sqlite eklentisiyle salt okunur bağlanarak,
+- `export --format parquet` komutunun ürettiği Parquet arşivi.
+
+DuckDB isteğe bağlıdır ve yalnızca bu modül kullanıldığında içe aktarılır;
+izleyiciler ona bağımlı değildir. Sonuçlar Arrow tablosu veya pandas
+DataFrame olarak döner.
+"""
+import os
+import logging
+
+from data_collection.config import DATABASE_PATH, EXPORT_DIR, ANALYTICS_THREADS
+from data_collection.database import CHANGE_TRACKED_TABLES
+
+logger = logging.getLogger(__name__)
+
+SOURCE_SQLITE = 'sqlite'
+SOURCE_PARQUET = 'parquet'
+
+# Analitik görünümleri oluşturulan tablolar
+ANALYTICS_TABLES = CHANGE_TRACKED_TABLES + ('timeline_segments', 'daily_summaries')
+
+class AnalyticsUnavailable(Exception):
+    """DuckDB veya istenen veri kaynağı kullanılamadığında oluşur."""
+
+# Standart rapor sorguları; :start ve :end parametreleri aralığı sınırlar
+REPORT_QUERIES = {
+    # Alan adı başına aylık süre dağılımı
+    'domain_distribution': """
+        SELECT domain, date_trunc('month', CAST(timestamp AS TIMESTAMP)) AS month,
+               sum(duration) AS seconds, count(*) AS visits
+        FROM browser_activities
+        WHERE CAST(timestamp AS TIMESTAMP) >= $start AND CAST(timestamp AS TIMESTAMP) < $end
+        GROUP BY ALL
+        ORDER BY month, seconds DESC
+    """,
+    # Uygulama başına yazma yoğunluğu (aktif dakika başına tuş)
+    'typing_intensity': """
+        SELECT w.application_name, sum(k.key_count) AS keys,
+               count(DISTINCT date_trunc('minute', CAST(k.timestamp AS TIMESTAMP))) AS active_minutes,
+               sum(k.key_count) / count(DISTINCT date_trunc('minute', CAST(k.timestamp AS TIMESTAMP))) AS keys_per_minute
+        FROM keyboard_activities k
+        JOIN window_activities w ON w.id = k.window_id
+        WHERE CAST(k.timestamp AS TIMESTAMP) >= $start AND CAST(k.timestamp AS TIMESTAMP) < $end
+        GROUP BY ALL
+        ORDER BY keys DESC
+    """,
+    # Uygulama başına haftanın günü × saat dağılımı
+    'app_weekday_hours': """
+        SELECT application_name, dayofweek(CAST(timestamp AS TIMESTAMP)) AS weekday,
+               hour(CAST(timestamp AS TIMESTAMP)) AS hour, sum(duration) AS seconds
+        FROM window_activities
+        WHERE CAST(timestamp AS TIMESTAMP) >= $start AND CAST(timestamp AS TIMESTAMP) < $end
+        GROUP BY ALL
+        ORDER BY application_name, weekday, hour
+    """,
+    # Günlük uygulama toplamları
+    'daily_app_totals': """
+        SELECT CAST(CAST(timestamp AS TIMESTAMP) AS DATE) AS day, application_name, sum(duration) AS seconds
+        FROM window_activities
+        WHERE CAST(timestamp AS TIMESTAMP) >= $start AND CAST(timestamp AS TIMESTAMP) < $end
+        GROUP BY ALL
+        ORDER BY day, seconds DESC
+    """,
+}
+
+def _to_arrow(result):
+    """DuckDB sonucunu sürümden bağımsız olarak Arrow tablosuna dönüştür."""
+    to_arrow_table = getattr(result, 'to_arrow_table', None)
+    return to_arrow_table() if to_arrow_table is not None else result.fetch_arrow_table()
+
+class AnalyticsEngine:
+    """SQLite deposu veya Parquet arşivi üzerinde DuckDB sorgu motoru."""
+
+    def __init__(self, source=SOURCE_SQLITE, database_path=DATABASE_PATH, parquet_dir=EXPORT_DIR,
+                 threads=ANALYTICS_THREADS):
+        """Motoru başlat ve tablo görünümlerini oluştur.
+
+        Args:
+            source: 'sqlite' veya 'parquet'.
+            database_path: SQLite veritabanı dosyası.
+            parquet_dir: Parquet arşivinin dizini (<tablo>.parquet dosyaları).
+            threads: DuckDB iş parçacığı sayısı (0: tüm çekirdekler).
+
+        Raises:
+            AnalyticsUnavailable: DuckDB kurulu değilse veya kaynak okunamıyorsa.
+        """
+        try:
+            import duckdb  # İsteğe bağlı bağımlılık; yalnızca analitik için gereklidir
+        except ImportError as e:
+            raise AnalyticsUnavailable(f"DuckDB kurulu değil: {e}")
+
+        self.source = source
+        self.connection = duckdb.connect()
+        try:
+            if threads:
+                self.connection.execute(f"SET threads = {int(threads)}")
+            if source == SOURCE_SQLITE:
+                self.tables = self._attach_sqlite(database_path)
+            elif source == SOURCE_PARQUET:
+                self.tables = self._attach_parquet(parquet_dir)
+            else:
+                raise AnalyticsUnavailable(f"Bilinmeyen veri kaynağı: {source}")
+        except duckdb.Error as e:
+            self.connection.close()
+            raise AnalyticsUnavailable(f"{source} kaynağı bağlanamadı: {e}")
+        except BaseException:
+            # Kaynak bulunamadığında da bağlantı açık bırakılmaz
+            self.connection.close()
+            raise
+
+    def _attach_sqlite(self, database_path):
+        if not os.path.exists(database_path):
+            raise AnalyticsUnavailable(f"Veritabanı bulunamadı: {database_path}")
+        self.connection.execute("INSTALL sqlite")
+        self.connection.execute("LOAD sqlite")
+        self.connection.execute("ATTACH ? AS store (TYPE sqlite, READ_ONLY)", [os.path.abspath(database_path)])
+        available = {row[0] for row in self.connection.execute(
+            "SELECT table_name FROM information_schema.tables WHERE table_catalog = 'store'"
+        ).fetchall()}
+        tables = [table_name for table_name in ANALYTICS_TABLES if table_name in available]
+        for table_name in tables:
+            self.connection.execute(f"CREATE VIEW {table_name} AS SELECT * FROM store.{table_name}")
+        return tables
+
+    def _attach_parquet(self, parquet_dir):
+        tables = []
+        for table_name in ANALYTICS_TABLES:
+            path = os.path.join(parquet_dir, f"{table_name}.parquet")
+            if not os.path.exists(path):
+                continue
+            escaped = os.path.abspath(path).replace("'", "''")
+            self.connection.execute(f"CREATE VIEW {table_name} AS SELECT * FROM read_parquet('{escaped}')")
+            tables.append(table_name)
+        if not tables:
+            raise AnalyticsUnavailable(f"Parquet arşivi bulunamadı: {parquet_dir}")
+        return tables
+
+    def query(self, sql, params=None, output='arrow'):
+        """SQL sorgusunu çalıştır.
+
+        Args:
+            sql: DuckDB SQL sorgusu (tablolar görünüm olarak kullanılabilir).
+            params: Sorgu parametreleri (liste veya $ad → değer sözlüğü).
+            output: 'arrow' veya 'pandas'.
+
+        Returns:
+            pyarrow.Table veya pandas.DataFrame: Sorgu sonucu.
+        """
+        result = self.connection.execute(sql, params or [])
+        if output == 'pandas':
+            return result.df()
+        return _to_arrow(result)
+
+    def report(self, name, start, end, output='arrow'):
+        """Standart rapor sorgusunu çalıştır.
+
+        Args:
+            name: REPORT_QUERIES anahtarlarından biri.
+            start: Aralık başlangıcı (datetime, dahil).
+            end: Aralık sonu (datetime, hariç).
+            output: 'arrow' veya 'pandas'.
+
+        Returns:
+            pyarrow.Table veya pandas.DataFrame: Rapor.
+        """
+        return self.query(REPORT_QUERIES[name], {'start': start, 'end': end}, output)
+
+    def close(self):
+        """DuckDB bağlantısını kapat."""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
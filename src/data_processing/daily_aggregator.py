@@ -0,0 +1,320 @@
+"""
+Günlük özet hesaplama.
+
+Bu modül, her gün için aktif süreyi, uygulama/alan adı/kategori bazında
+süreleri ve verimlilik puanını hesaplayarak DailySummary tablosuna yazar.
+Günler bir işlem havuzunda paralel hesaplanır; kaynak kayıtları değişmeyen
+günler parmak izi karşılaştırmasıyla atlanır.
+"""
+import os
+import json
+import hashlib
+import logging
+import datetime
+import concurrent.futures
+import pandas as pd
+from sqlalchemy import select, func
+
+from data_collection.config import PROCESS_WORKERS, INTERVAL_LOOKBACK_HOURS
+from data_collection.categories import get_category_rules, window_key, KEY_SEPARATOR
+from data_collection.database import engine, get_session, WindowActivity, BrowserActivity, DailySummary
+
+logger = logging.getLogger(__name__)
+
+# Hesaplama mantığı değiştiğinde artırılır; tüm günlerin yeniden hesaplanmasını sağlar
+AGGREGATION_VERSION = 2
+
+# Süresi alan adlarına dağıtılan tarayıcı uygulamaları
+BROWSER_APPS = {"chrome.exe", "firefox.exe", "msedge.exe", "opera.exe", "brave.exe", "safari.exe", "iexplore.exe"}
+
+def day_bounds(day):
+    """Günün başlangıç ve bitiş zamanlarını döndür.
+
+    Args:
+        day: datetime.date nesnesi.
+
+    Returns:
+        tuple: (gün başlangıcı, ertesi gün başlangıcı).
+    """
+    start = datetime.datetime.combine(day, datetime.time.min)
+    return start, start + datetime.timedelta(days=1)
+
+def _interval_query(model, columns, day):
+    """Gün ile kesişebilecek aralıklar için tek bir indeksli aralık sorgusu oluştur."""
+    start, end = day_bounds(day)
+    lookback = start - datetime.timedelta(hours=INTERVAL_LOOKBACK_HOURS)
+    return select(*columns).where(model.timestamp >= lookback, model.timestamp < end)
+
+def source_checksum(connection, day):
+    """Günün özetine giren kaynak kayıtların parmak izini hesapla.
+
+    Args:
+        connection: SQLAlchemy bağlantısı.
+        day: datetime.date nesnesi.
+
+    Kategori ağırlıkları da parmak izine girer; ağırlık değiştiğinde tüm
+    günlerin verimlilik puanı yeniden hesaplanır. Kategori kuralı değişiklikleri
+    ise invalidate_summaries ile yalnızca ilgili günlerde geçersiz kılınır.
+
+    Returns:
+        str: Onaltılık parmak izi.
+    """
+    parts = [f"v{AGGREGATION_VERSION}", get_category_rules().weights_version]
+    for model in (WindowActivity, BrowserActivity):
+        row = connection.execute(_interval_query(
+            model, (func.count(model.id), func.max(model.id), func.coalesce(func.sum(model.duration), 0)), day
+        )).one()
+        parts.append(":".join(str(value) for value in row))
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+def _clipped_seconds(frame, day):
+    """Aralıkların gün sınırları içinde kalan sürelerini vektörel olarak hesapla."""
+    start, end = day_bounds(day)
+    if frame.empty:
+        return pd.Series(dtype="float64")
+    started = pd.to_datetime(frame["timestamp"])
+    ended = started + pd.to_timedelta(frame["duration"].fillna(0), unit="s")
+    return (ended.clip(upper=end) - started.clip(lower=start)).dt.total_seconds().clip(lower=0)
+
+def _read_frame(connection, query):
+    """Sorgu sonucunu DataFrame olarak oku."""
+    result = connection.execute(query)
+    return pd.DataFrame(result.all(), columns=list(result.keys()))
+
+def load_day(connection, day):
+    """Günün kaynak kayıtlarını tablo başına tek sorguyla oku.
+
+    Returns:
+        dict: Tablo adı → DataFrame.
+    """
+    return {
+        "window": _read_frame(connection, _interval_query(
+            WindowActivity, (
+                WindowActivity.timestamp, WindowActivity.duration, WindowActivity.application_name,
+                func.coalesce(WindowActivity.normalized_title, WindowActivity.window_title).label("title")
+            ), day
+        )),
+        "browser": _read_frame(connection, _interval_query(
+            BrowserActivity, (BrowserActivity.timestamp, BrowserActivity.duration, BrowserActivity.domain), day
+        )),
+    }
+
+def _to_seconds_dict(series):
+    """Süre serisini büyükten küçüğe sıralı tamsayı sözlüğe dönüştür."""
+    series = series[series > 0].sort_values(ascending=False)
+    return {str(key): int(round(value)) for key, value in series.items()}
+
+def _optional(value):
+    """Pandas eksik değerlerini None'a dönüştür."""
+    return None if pd.isna(value) else value
+
+def aggregate_day(frames, day, rules=None):
+    """Günün özetini hesapla.
+
+    Kategoriler her farklı (uygulama, başlık) ve alan adı anahtarı için bir kez
+    belirlenir. Tarayıcı pencerelerinde geçen süre önce alan adı kayıtlarının
+    kategorilerine dağıtılır; alan adına bağlanamayan kısım pencerenin kendi
+    kategorisinde kalır.
+
+    Args:
+        frames: load_day tarafından döndürülen sözlük.
+        day: datetime.date nesnesi.
+        rules: CategoryRules nesnesi (None ise get_category_rules()).
+
+    Returns:
+        dict: total_active_time, productivity_score, app_times, domain_times, category_times.
+    """
+    rules = rules or get_category_rules()
+    empty = pd.Series(dtype="float64")
+    windows = frames["window"].assign(seconds=_clipped_seconds(frames["window"], day))
+    browser = frames["browser"].assign(seconds=_clipped_seconds(frames["browser"], day))
+
+    app_times = windows.groupby("application_name")["seconds"].sum() if not windows.empty else empty
+    domain_times = browser.groupby("domain")["seconds"].sum() if not browser.empty else empty
+
+    category_times = empty
+    if not windows.empty:
+        keys = windows.groupby(["application_name", "title"], dropna=False)["seconds"].sum()
+        apps = keys.index.get_level_values(0)
+        categories = pd.Index([
+            rules.classify(_optional(app), None, _optional(title)) for app, title in keys.index
+        ])
+        is_browser = pd.Index([str(app).lower() in BROWSER_APPS for app in apps])
+        browser_window_time = float(keys[is_browser].sum())
+        remainder = max(0.0, 1.0 - float(domain_times.sum()) / browser_window_time) if browser_window_time else 0.0
+        weighted = keys.where(~is_browser, keys * remainder)
+        category_times = weighted.groupby(categories).sum()
+
+    if not domain_times.empty:
+        domain_categories = domain_times.index.to_series().map(lambda domain: rules.classify(None, _optional(domain)))
+        category_times = category_times.add(domain_times.groupby(domain_categories).sum(), fill_value=0)
+
+    total = float(category_times.sum()) if not category_times.empty else 0.0
+    weights = category_times.index.to_series().map(rules.weight)
+    score = float((category_times * weights).sum() / total * 100) if total else 0.0
+
+    return {
+        "total_active_time": int(round(total)),
+        "productivity_score": round(score, 1),
+        "app_times": _to_seconds_dict(app_times),
+        "domain_times": _to_seconds_dict(domain_times),
+        "category_times": _to_seconds_dict(category_times),
+    }
+
+def _init_worker():
+    """Havuz işleminde üst işlemden devralınan bağlantı havuzunu bırak.
+
+    fork ile kopyalanan SQLite bağlantıları üst işleme aittir; kapatılmadan
+    bırakılır ve işlem kendi bağlantılarını açar.
+    """
+    engine.dispose(close=False)
+
+def compute_day(day):
+    """Günün özetini tek bir okuma işleminde hesapla (işlem havuzunda çalışır).
+
+    Args:
+        day: datetime.date nesnesi.
+
+    Returns:
+        dict: aggregate_day sonucu ile "date" ve "source_checksum" anahtarları.
+    """
+    with engine.connect() as connection:
+        with connection.begin():
+            checksum = source_checksum(connection, day)
+            result = aggregate_day(load_day(connection, day), day)
+    result["date"] = day
+    result["source_checksum"] = checksum
+    return result
+
+def save_summary(db_session, result):
+    """Günün özetini DailySummary tablosuna yaz veya güncelle (commit çağırana aittir).
+
+    Args:
+        db_session: Veritabanı oturumu.
+        result: compute_day sonucu.
+    """
+    start, _ = day_bounds(result["date"])
+    summary = db_session.query(DailySummary).filter(DailySummary.date == start).first()
+    if summary is None:
+        summary = DailySummary(date=start)
+        db_session.add(summary)
+    summary.total_active_time = result["total_active_time"]
+    summary.productivity_score = result["productivity_score"]
+    summary.categories = json.dumps(result["category_times"], ensure_ascii=False)
+    summary.app_times = json.dumps(result["app_times"], ensure_ascii=False)
+    summary.domain_times = json.dumps(result["domain_times"], ensure_ascii=False)
+    summary.source_checksum = result["source_checksum"]
+    summary.updated_at = datetime.datetime.now()
+
+def find_stale_days(db_session, days):
+    """Kaynak kayıtları son hesaplamadan bu yana değişen günleri döndür.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        days: datetime.date listesi.
+
+    Returns:
+        list: Yeniden hesaplanması gereken günler.
+    """
+    starts = [day_bounds(day)[0] for day in days]
+    stored = dict(
+        db_session.query(DailySummary.date, DailySummary.source_checksum)
+        .filter(DailySummary.date.in_(starts))
+        .all()
+    )
+    connection = db_session.connection()
+    return [day for day, start in zip(days, starts) if stored.get(start) != source_checksum(connection, day)]
+
+def invalidate_summaries(db_session, affected):
+    """Kategorisi değişen anahtarları içeren günlerin özetlerini geçersiz kıl.
+
+    Yalnızca ilgili günlerin parmak izi silinir; bu günler bir sonraki
+    hesaplamada yeniden işlenir.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        affected: Tür → anahtar kümesi (sync_category_assignments sonucu).
+
+    Returns:
+        int: Geçersiz kılınan özet sayısı.
+    """
+    days = set()
+    window_keys = affected.get("window", set())
+    apps = sorted({key.split(KEY_SEPARATOR, 1)[0] for key in window_keys})
+    title = func.coalesce(WindowActivity.normalized_title, WindowActivity.window_title)
+    for offset in range(0, len(apps), 500):
+        rows = db_session.execute(
+            select(func.date(WindowActivity.timestamp), WindowActivity.application_name, title)
+            .where(WindowActivity.application_name.in_(apps[offset:offset + 500]))
+            .distinct()
+        )
+        days.update(day for day, app, window_title in rows if window_key(app, window_title) in window_keys)
+
+    domains = sorted(affected.get("domain", set()))
+    for offset in range(0, len(domains), 500):
+        rows = db_session.execute(
+            select(func.date(BrowserActivity.timestamp))
+            .where(BrowserActivity.domain.in_(domains[offset:offset + 500]))
+            .distinct()
+        )
+        days.update(day for (day,) in rows)
+
+    starts = [datetime.datetime.strptime(day, "%Y-%m-%d") for day in days if day]
+    invalidated = 0
+    for offset in range(0, len(starts), 500):
+        invalidated += (
+            db_session.query(DailySummary)
+            .filter(DailySummary.date.in_(starts[offset:offset + 500]))
+            .update({DailySummary.source_checksum: None}, synchronize_session=False)
+        )
+    db_session.commit()
+    return invalidated
+
+def date_range(start, end):
+    """İki tarih arasındaki (ikisi dahil) günleri döndür."""
+    return [start + datetime.timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+def process_days(days, workers=None, force=False):
+    """Günlerin özetlerini hesapla ve kaydet.
+
+    Args:
+        days: datetime.date listesi.
+        workers: İşlem sayısı (None: PROCESS_WORKERS, 0: işlemci sayısı).
+        force: True ise parmak izi değişmemiş günler de hesaplanır.
+
+    Returns:
+        list: Hesaplanan günler.
+    """
+    db_session = get_session()
+    try:
+        pending = list(days) if force else find_stale_days(db_session, list(days))
+        skipped = len(days) - len(pending)
+        if skipped:
+            logger.info(f"{skipped} gün değişmediği için atlandı")
+        if not pending:
+            return []
+
+        workers = PROCESS_WORKERS if workers is None else workers
+        workers = min(workers or os.cpu_count() or 1, len(pending))
+        if workers <= 1:
+            results = [compute_day(day) for day in pending]
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+                results = list(executor.map(compute_day, pending))
+
+        for result in results:
+            save_summary(db_session, result)
+        db_session.commit()
+
+        for result in results:
+            logger.info(
+                f"{result['date']} özeti hesaplandı: {result['total_active_time']}s aktif, "
+                f"verimlilik {result['productivity_score']}"
+            )
+        return pending
+    except Exception as e:
+        logger.error(f"Günlük özetler hesaplanırken hata oluştu: {e}")
+        db_session.rollback()
+        raise
+    finally:
+        db_session.close()
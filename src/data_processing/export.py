@@ -0,0 +1,266 @@
+"""
+Toplu Dışa Aktarma Modülü.
+
+Bu modül, aktivite tablolarını CSV, NDJSON veya Parquet dosyalarına aktarır.
+Satırlar sunucu taraflı imleçten parça parça okunur, kodlanır ve dosyaya
+yazılır; hiçbir aşamada tablonun tamamı bellekte tutulmaz. Bellek kullanımı
+yalnızca parça boyutuna bağlıdır.
+"""
+import os
+import io
+import csv
+import gzip
+import json
+import time
+import logging
+import datetime
+from sqlalchemy import select
+
+from data_collection.config import DATABASE_PATH, EXPORT_DIR, EXPORT_CHUNK_SIZE
+from data_collection.database import (
+    create_read_engine, ActivitySession, WindowActivity, KeyboardActivity, MouseActivity,
+    FileActivity, BrowserActivity, GameActivity, DailySummary, TimelineSegment
+)
+
+logger = logging.getLogger(__name__)
+
+# Dışa aktarılabilen tablolar ve zaman aralığı filtresinde kullanılan sütunlar
+EXPORT_TABLES = {
+    model.__tablename__: (model, time_column)
+    for model, time_column in (
+        (ActivitySession, 'start_time'),
+        (WindowActivity, 'timestamp'),
+        (KeyboardActivity, 'timestamp'),
+        (MouseActivity, 'timestamp'),
+        (FileActivity, 'timestamp'),
+        (BrowserActivity, 'timestamp'),
+        (GameActivity, 'timestamp'),
+        (DailySummary, 'date'),
+        (TimelineSegment, 'start_time'),
+    )
+}
+
+FORMATS = ('csv', 'ndjson', 'parquet')
+COMPRESSIONS = ('gzip', 'zstd')
+
+_COMPRESSION_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+
+def iter_chunks(connection, table_name, start=None, end=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Tablo satırlarını birincil anahtar sırasıyla parça parça oku.
+
+    Args:
+        connection: SQLAlchemy bağlantısı.
+        table_name: Tablo adı (EXPORT_TABLES anahtarlarından biri).
+        start: Aralık başlangıcı (dahil, None ise sınırsız).
+        end: Aralık sonu (hariç, None ise sınırsız).
+        chunk_size: Parça başına satır sayısı.
+
+    Yields:
+        list: En fazla chunk_size satırlık parça.
+    """
+    model, time_column = EXPORT_TABLES[table_name]
+    table = model.__table__
+    statement = select(*table.columns).order_by(*table.primary_key.columns)
+    if start is not None:
+        statement = statement.where(table.c[time_column] >= start)
+    if end is not None:
+        statement = statement.where(table.c[time_column] < end)
+    result = connection.execution_options(stream_results=True, yield_per=chunk_size).execute(statement)
+    for partition in result.partitions():
+        yield partition
+
+def open_output(path, compression=None):
+    """Çıktı dosyasını isteğe bağlı sıkıştırmayla ikili yazma kipinde aç.
+
+    Args:
+        path: Dosya yolu.
+        compression: None, 'gzip' veya 'zstd'.
+
+    Returns:
+        Dosya benzeri ikili yazıcı.
+    """
+    if compression == 'gzip':
+        return gzip.open(path, 'wb', compresslevel=6)
+    if compression == 'zstd':
+        import zstandard  # Yalnızca zstd sıkıştırması için gereklidir
+        return zstandard.ZstdCompressor(level=3).stream_writer(open(path, 'wb'))
+    return open(path, 'wb', buffering=1024 * 1024)
+
+class _CsvWriter:
+    """Parçaları başlık satırlı CSV olarak yazar."""
+
+    def __init__(self, path, columns, compression):
+        self.stream = io.TextIOWrapper(open_output(path, compression), encoding='utf-8', newline='')
+        self.writer = csv.writer(self.stream)
+        self.writer.writerow([column.name for column in columns])
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.stream.close()
+
+class _NdjsonWriter:
+    """Parçaları satır başına bir JSON nesnesi olarak yazar."""
+
+    def __init__(self, path, columns, compression):
+        self.stream = io.TextIOWrapper(open_output(path, compression), encoding='utf-8', newline='\n')
+        self.names = [column.name for column in columns]
+
+    def write(self, rows):
+        names = self.names
+        self.stream.write(''.join(
+            json.dumps(dict(zip(names, row)), ensure_ascii=False, default=str) + '\n' for row in rows
+        ))
+
+    def close(self):
+        self.stream.close()
+
+class _ParquetWriter:
+    """Her parçayı ayrı bir satır grubu olarak Parquet dosyasına yazar."""
+
+    def __init__(self, path, columns, compression):
+        import pyarrow  # Yalnızca Parquet çıktısı için gereklidir
+        import pyarrow.parquet
+        self.pyarrow = pyarrow
+        self.schema = pyarrow.schema([(column.name, self._arrow_type(column)) for column in columns])
+        self.writer = pyarrow.parquet.ParquetWriter(path, self.schema, compression=compression or 'snappy')
+
+    def _arrow_type(self, column):
+        python_type = column.type.python_type
+        if python_type is bool:
+            return self.pyarrow.bool_()
+        if python_type is int:
+            return self.pyarrow.int64()
+        if python_type is float:
+            return self.pyarrow.float64()
+        if python_type is datetime.datetime:
+            return self.pyarrow.timestamp('us')
+        if python_type is bytes:
+            return self.pyarrow.binary()
+        return self.pyarrow.string()
+
+    def write(self, rows):
+        arrays = [
+            self.pyarrow.array(values, type=field.type)
+            for values, field in zip(zip(*rows), self.schema)
+        ]
+        self.writer.write_table(self.pyarrow.Table.from_arrays(arrays, schema=self.schema), row_group_size=len(rows))
+
+    def close(self):
+        self.writer.close()
+
+_WRITERS = {'csv': _CsvWriter, 'ndjson': _NdjsonWriter, 'parquet': _ParquetWriter}
+
+def output_path(directory, table_name, fmt, compression=None):
+    """Tablo için çıktı dosyası yolunu döndür.
+
+    Parquet sıkıştırması dosyanın içinde uygulandığından uzantıya eklenmez.
+    """
+    name = f"{table_name}.{fmt}"
+    if compression and fmt != 'parquet':
+        name += _COMPRESSION_SUFFIXES[compression]
+    return os.path.join(directory, name)
+
+def export_table(connection, table_name, path, fmt='csv', compression=None, start=None, end=None,
+                 chunk_size=EXPORT_CHUNK_SIZE):
+    """Tek bir tabloyu dosyaya aktar.
+
+    Dosya önce geçici adla yazılır ve tamamlandığında yerine taşınır; yarıda
+    kalan bir aktarım eski dosyayı bozmaz.
+
+    Args:
+        connection: SQLAlchemy bağlantısı.
+        table_name: Tablo adı.
+        path: Çıktı dosyası.
+        fmt: 'csv', 'ndjson' veya 'parquet'.
+        compression: None, 'gzip' veya 'zstd'.
+        start: Aralık başlangıcı (dahil).
+        end: Aralık sonu (hariç).
+        chunk_size: Parça başına satır sayısı.
+
+    Returns:
+        dict: Tablo, dosya, satır sayısı, süre, saniye başına satır ve dosya boyutu.
+    """
+    model, _ = EXPORT_TABLES[table_name]
+    began = time.perf_counter()
+    temp_path = path + '.tmp'
+    writer = _WRITERS[fmt](temp_path, list(model.__table__.columns), compression)
+    rows = 0
+    try:
+        for chunk in iter_chunks(connection, table_name, start, end, chunk_size):
+            writer.write(chunk)
+            rows += len(chunk)
+    except BaseException:
+        writer.close()
+        os.remove(temp_path)
+        raise
+    writer.close()
+    os.replace(temp_path, path)
+
+    seconds = time.perf_counter() - began
+    return {
+        'table': table_name,
+        'path': path,
+        'rows': rows,
+        'seconds': seconds,
+        'rows_per_second': rows / seconds if seconds > 0 else 0.0,
+        'bytes': os.path.getsize(path),
+    }
+
+def add_export_arguments(parser):
+    """Dışa aktarma argümanlarını ayrıştırıcıya ekle.
+
+    Args:
+        parser: argparse.ArgumentParser nesnesi.
+    """
+    from data_processing.process_data import parse_date
+    parser.add_argument('--tables', nargs='+', choices=sorted(EXPORT_TABLES), help='Aktarılacak tablolar (varsayılan: tümü)')
+    parser.add_argument('--format', choices=FORMATS, default='csv', help='Çıktı biçimi')
+    parser.add_argument('--compression', choices=COMPRESSIONS, help='Sıkıştırma (Parquet için dosya içi kodek)')
+    parser.add_argument('--start', type=parse_date, help='Tarih aralığının başlangıcı (YYYY-MM-DD formatında)')
+    parser.add_argument('--end', type=parse_date, help='Tarih aralığının sonu (YYYY-MM-DD formatında, dahil)')
+    parser.add_argument('--output', help='Çıktı dizini (varsayılan: EXPORT_DIR)')
+    parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE, help='Parça başına satır sayısı')
+
+def run_export(args, read_engine=None):
+    """Argümanlara göre seçilen tabloları dışa aktar.
+
+    Args:
+        args: argparse.Namespace nesnesi.
+        read_engine: Okuma motoru (None ise veritabanı salt okunur açılır).
+
+    Returns:
+        list: Her tablo için export_table sonucu.
+    """
+    start = datetime.datetime.combine(args.start, datetime.time.min) if args.start else None
+    end = datetime.datetime.combine(args.end + datetime.timedelta(days=1), datetime.time.min) if args.end else None
+    directory = args.output or EXPORT_DIR
+    os.makedirs(directory, exist_ok=True)
+
+    owns_engine = read_engine is None
+    read_engine = read_engine or create_read_engine(DATABASE_PATH, pool_size=1)
+    results = []
+    try:
+        with read_engine.connect() as connection:
+            for table_name in args.tables or list(EXPORT_TABLES):
+                path = output_path(directory, table_name, args.format, args.compression)
+                try:
+                    result = export_table(connection, table_name, path, args.format, args.compression,
+                                          start, end, args.chunk_size)
+                except ImportError as e:
+                    logger.error(f"{args.format} çıktısı için gerekli paket kurulu değil: {e}")
+                    break
+                logger.info(f"{table_name}: {result['rows']} satır, {result['seconds']:.2f} sn "
+                            f"({result['rows_per_second']:,.0f} satır/sn, {result['bytes']:,} bayt) → {path}")
+                results.append(result)
+    finally:
+        if owns_engine:
+            read_engine.dispose()
+
+    total_rows = sum(result['rows'] for result in results)
+    total_seconds = sum(result['seconds'] for result in results)
+    if total_seconds > 0:
+        logger.info(f"Toplam {total_rows} satır {total_seconds:.2f} sn içinde aktarıldı "
+                    f"({total_rows / total_seconds:,.0f} satır/sn)")
+    return results
@@ -0,0 +1,295 @@
+"""
+Isı haritası sorguları.
+
+Bu modül, her gün için anahtar × saat × ölçüt biçiminde küçük bir küp
+oluşturur. Aralıklar saat sınırlarında NumPy ile vektörel olarak bölünür.
+Değişmeyecek kadar eski günlerin küpleri veritabanında saklanır; takvim ve
+haftanın günü × saat ısı haritaları bu küplerin toplanmasıyla üretilir.
+Yakın günlerin küpleri sorgu önbelleğinde tutulur ve yalnızca yazıcı o güne
+kayıt eklediğinde yeniden hesaplanır.
+"""
+import json
+import zlib
+import logging
+import datetime
+import numpy as np
+from sqlalchemy import select, func
+from sqlalchemy.dialects.sqlite import insert
+
+from data_collection.config import INTERVAL_LOOKBACK_HOURS
+from data_collection.categories import KEY_SEPARATOR
+from data_collection.database import (
+    WindowActivity, BrowserActivity, KeyboardActivity, MouseActivity, DayCube
+)
+from data_collection.write_path import get_day_versions
+from data_processing.daily_aggregator import day_bounds, date_range
+from data_processing.window_attribution import _epoch_seconds
+from data_processing.query_cache import get_query_cache
+
+logger = logging.getLogger(__name__)
+
+# Küp biçimi değiştiğinde artırılır; saklanan küplerin yeniden oluşturulmasını sağlar
+CUBE_VERSION = 1
+
+# Ölçütler (küpün son ekseni)
+METRICS = ('active', 'keys', 'clicks', 'browsing')
+
+# Boyutlar: active/keys/clicks uygulamaya, browsing alan adına yazılır
+DIMENSION_APP = 'app'
+DIMENSION_DOMAIN = 'domain'
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+def _epoch(moment):
+    return (moment - _EPOCH).total_seconds()
+
+def _fetch(connection, query):
+    """Sorgu sonucunu (sayısal dizi, anahtar listesi) olarak oku; ilk sütun zaman, son sütun anahtardır."""
+    rows = [tuple(row) for row in connection.execute(query).all()]
+    if not rows:
+        return np.empty((0, 2)), []
+    values = np.array([row[:-1] for row in rows], dtype=np.float64)
+    # julianday dönüşümünün kayan nokta hatası milisaniyeye yuvarlanarak giderilir
+    values[:, 0] = np.round(values[:, 0], 3)
+    return values, [row[-1] or '' for row in rows]
+
+def hour_overlaps(starts, ends, day_start):
+    """Aralıkların günün her saatiyle kesişim sürelerini hesapla.
+
+    Args:
+        starts: Aralık başlangıçları (Unix saniyesi dizisi).
+        ends: Aralık bitişleri (Unix saniyesi dizisi).
+        day_start: Gün başlangıcı (Unix saniyesi).
+
+    Returns:
+        numpy.ndarray: (aralık sayısı × 24) saniye dizisi.
+    """
+    edges = day_start + 3600.0 * np.arange(25)
+    overlap = np.minimum(ends[:, None], edges[None, 1:]) - np.maximum(starts[:, None], edges[None, :-1])
+    return np.clip(overlap, 0, None)
+
+class _CubeBuilder:
+    """Anahtar dizinlerini tutarak küpü dolduran yardımcı sınıf."""
+
+    def __init__(self):
+        self.index = {}
+        self.parts = []
+
+    def _rows(self, dimension, keys):
+        labels = [f"{dimension}{KEY_SEPARATOR}{key}" for key in keys]
+        return np.array([self.index.setdefault(label, len(self.index)) for label in labels], dtype=np.int64)
+
+    def add_hours(self, metric, dimension, keys, hourly):
+        """Saatlik değer matrisini (kayıt × 24) ekle."""
+        if len(keys):
+            self.parts.append((METRICS.index(metric), self._rows(dimension, keys), hourly))
+
+    def add_points(self, metric, dimension, keys, hours, values):
+        """Anlık değerleri saatlerine ekle."""
+        if len(keys):
+            hourly = np.zeros((len(keys), 24))
+            hourly[np.arange(len(keys)), hours] = values
+            self.parts.append((METRICS.index(metric), self._rows(dimension, keys), hourly))
+
+    def build(self):
+        cube = np.zeros((len(self.index), 24, len(METRICS)))
+        for metric, rows, hourly in self.parts:
+            np.add.at(cube[:, :, metric], rows, hourly)
+        return list(self.index), cube
+
+def build_day_cube(connection, day):
+    """Günün küpünü ham kayıtlardan oluştur.
+
+    Args:
+        connection: SQLAlchemy bağlantısı.
+        day: datetime.date nesnesi.
+
+    Returns:
+        tuple: (anahtar listesi, anahtar × 24 × ölçüt NumPy dizisi).
+    """
+    start, end = day_bounds(day)
+    lookback = start - datetime.timedelta(hours=INTERVAL_LOOKBACK_HOURS)
+    day_start = _epoch(start)
+    builder = _CubeBuilder()
+
+    windows, apps = _fetch(connection, select(
+        _epoch_seconds(WindowActivity.timestamp), func.coalesce(WindowActivity.duration, 0), WindowActivity.application_name
+    ).where(WindowActivity.timestamp >= lookback, WindowActivity.timestamp < end).order_by(WindowActivity.timestamp))
+    if apps:
+        starts = windows[:, 0]
+        # Çakışan aralıklarda sonraki pencere öncekini keser
+        ends = np.minimum(starts + windows[:, 1], np.append(starts[1:], np.inf))
+        builder.add_hours('active', DIMENSION_APP, apps, hour_overlaps(starts, ends, day_start))
+
+    browsing, domains = _fetch(connection, select(
+        _epoch_seconds(BrowserActivity.timestamp), func.coalesce(BrowserActivity.duration, 0), BrowserActivity.domain
+    ).where(BrowserActivity.timestamp >= lookback, BrowserActivity.timestamp < end))
+    if domains:
+        builder.add_hours('browsing', DIMENSION_DOMAIN, domains,
+                          hour_overlaps(browsing[:, 0], browsing[:, 0] + browsing[:, 1], day_start))
+
+    for metric, model, column in (('keys', KeyboardActivity, KeyboardActivity.key_count),
+                                  ('clicks', MouseActivity, MouseActivity.click_count)):
+        points, point_apps = _fetch(connection, select(
+            _epoch_seconds(model.timestamp), func.coalesce(column, 0), WindowActivity.application_name
+        ).select_from(model).outerjoin(WindowActivity, model.window_id == WindowActivity.id)
+         .where(model.timestamp >= start, model.timestamp < end))
+        if point_apps:
+            hours = np.clip(((points[:, 0] - day_start) // 3600).astype(np.int64), 0, 23)
+            builder.add_points(metric, DIMENSION_APP, point_apps, hours, points[:, 1])
+
+    return builder.build()
+
+def _is_immutable(day, now):
+    """Günün kayıtlarının artık değişmeyeceğini kontrol et (yeniden bakma süresi geçmiş)."""
+    return day_bounds(day)[1] + datetime.timedelta(hours=INTERVAL_LOOKBACK_HOURS) <= now
+
+def get_day_cubes(db_session, start_day, end_day, now=None, cache=None):
+    """Tarih aralığındaki (ikisi dahil) günlerin küplerini döndür.
+
+    Saklanan küpler, oluşturuldukları andaki gün sürümü güncel sürümle aynıysa
+    okunur; böylece sıkıştırma veya pencere eşleştirme gibi geçmiş günleri
+    değiştiren yazmalar küpleri kendiliğinden geçersiz kılar. Eksik günler
+    hesaplanır ve değişmeyecek kadar eskiyse saklanır, değilse sorgu
+    önbelleğinden alınır.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        start_day: Başlangıç günü.
+        end_day: Bitiş günü.
+        now: Şimdiki zaman (test için).
+        cache: QueryCache nesnesi (None ise get_query_cache()).
+
+    Returns:
+        dict: Gün → (anahtar listesi, küp).
+    """
+    now = now or datetime.datetime.now()
+    days = date_range(start_day, end_day)
+    if not days:
+        return {}
+
+    cubes = {}
+    versions = get_day_versions(db_session, days)
+    stored = db_session.execute(
+        select(DayCube.day, DayCube.keys, DayCube.data, DayCube.built_at, DayCube.day_version)
+        .where(DayCube.day >= day_bounds(days[0])[0], DayCube.day < day_bounds(days[-1])[1],
+               DayCube.version == CUBE_VERSION)
+    )
+    for day, keys, data, built_at, day_version in stored:
+        if _is_immutable(day.date(), built_at) and (day_version or 0) == versions[day.date()]:
+            keys = json.loads(keys)
+            cubes[day.date()] = (keys, np.frombuffer(zlib.decompress(data)).reshape(len(keys), 24, len(METRICS)))
+
+    missing = [day for day in days if day not in cubes]
+    if not missing:
+        return cubes
+
+    recent = [day for day in missing if not _is_immutable(day, now)]
+    if recent:
+        cache = cache or get_query_cache()
+        cubes.update(cache.get_days(
+            db_session, 'day_cube', {'version': CUBE_VERSION}, recent,
+            lambda day: build_day_cube(db_session.connection(), day)
+        ))
+
+    connection = db_session.connection()
+    rows = []
+    for day in missing:
+        if day in cubes:
+            continue
+        keys, cube = build_day_cube(connection, day)
+        cubes[day] = (keys, cube)
+        rows.append({
+            'day': day_bounds(day)[0], 'version': CUBE_VERSION, 'keys': json.dumps(keys, ensure_ascii=False),
+            'data': zlib.compress(cube.tobytes()), 'built_at': now, 'day_version': versions[day],
+        })
+    if rows:
+        try:
+            statement = insert(DayCube)
+            db_session.execute(statement.on_conflict_do_update(
+                index_elements=['day'],
+                set_={
+                    column: statement.excluded[column] for column in ('version', 'keys', 'data', 'built_at', 'day_version')
+                }
+            ), rows)
+            db_session.commit()
+        except Exception as e:
+            logger.error(f"Günlük küpler kaydedilirken hata oluştu: {e}")
+            db_session.rollback()
+    return cubes
+
+def invalidate_cubes(db_session, days):
+    """Günlerin saklanan küplerini sil (geçmiş veriler değiştiğinde).
+
+    Args:
+        db_session: Veritabanı oturumu.
+        days: datetime.date listesi.
+
+    Returns:
+        int: Silinen küp sayısı.
+    """
+    if not days:
+        return 0
+    try:
+        result = db_session.execute(DayCube.__table__.delete().where(DayCube.day.in_([day_bounds(day)[0] for day in days])))
+        db_session.commit()
+        return result.rowcount
+    except Exception as e:
+        logger.error(f"Günlük küpler silinirken hata oluştu: {e}")
+        db_session.rollback()
+        return 0
+
+def _select(keys, dimension, key):
+    """Boyut ve anahtar filtresine uyan küp satırlarını seç."""
+    if dimension is None:
+        return slice(None)
+    prefix = f"{dimension}{KEY_SEPARATOR}"
+    wanted = None if key is None else prefix + key
+    return np.array([label.startswith(prefix) and (wanted is None or label == wanted) for label in keys], dtype=bool)
+
+def _day_hours(cube_entry, metric, dimension, key):
+    """Günün seçilen ölçüt için 24 saatlik toplamlarını döndür."""
+    keys, cube = cube_entry
+    if not keys:
+        return np.zeros(24)
+    return cube[_select(keys, dimension, key), :, METRICS.index(metric)].sum(axis=0)
+
+def calendar_heatmap(db_session, start_day, end_day, metric='active', dimension=None, key=None, now=None, cache=None):
+    """Takvim ısı haritası için gün başına toplamları döndür.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        start_day: Başlangıç günü.
+        end_day: Bitiş günü.
+        metric: active, keys, clicks veya browsing.
+        dimension: "app", "domain" veya None (tümü).
+        key: Boyut içindeki anahtar (örn. "code.exe"); None ise boyutun tamamı.
+        now: Şimdiki zaman (test için).
+        cache: QueryCache nesnesi (None ise get_query_cache()).
+
+    Returns:
+        dict: datetime.date → toplam.
+    """
+    cubes = get_day_cubes(db_session, start_day, end_day, now, cache)
+    return {day: float(_day_hours(entry, metric, dimension, key).sum()) for day, entry in sorted(cubes.items())}
+
+def week_hour_heatmap(db_session, start_day, end_day, metric='active', dimension=None, key=None, now=None, cache=None):
+    """Haftanın günü × saat ısı haritasını döndür.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        start_day: Başlangıç günü.
+        end_day: Bitiş günü.
+        metric: active, keys, clicks veya browsing.
+        dimension: "app", "domain" veya None (tümü).
+        key: Boyut içindeki anahtar; None ise boyutun tamamı.
+        now: Şimdiki zaman (test için).
+        cache: QueryCache nesnesi (None ise get_query_cache()).
+
+    Returns:
+        numpy.ndarray: 7 × 24 dizi (satır 0 pazartesi).
+    """
+    grid = np.zeros((7, 24))
+    for day, entry in get_day_cubes(db_session, start_day, end_day, now, cache).items():
+        grid[day.weekday()] += _day_hours(entry, metric, dimension, key)
+    return grid
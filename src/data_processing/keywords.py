@@ -0,0 +1,310 @@
+"""
+Başlık Anahtar Kelimesi Çıkarma Modülü.
+
+Bu modül, pencere ve tarayıcı sayfası başlıklarından spaCy ile anahtar
+kelimeler çıkarır. Kayıtların büyük çoğunluğu aynı başlığı tekrarladığından
+başlıklar önce veritabanında tekilleştirilir; yalnızca önbellekte bulunmayan
+başlıklar nlp.pipe partileriyle (gerekirse bir işlem havuzunda) işlenir.
+Sonuçlar başlığın SHA-1 özetiyle title_keywords tablosunda kalıcı olarak
+saklanır, böylece günlük işleme maliyeti yalnızca yeni farklı başlık sayısı
+kadardır.
+
+spaCy yalnızca bu modül kullanıldığında içe aktarılır.
+"""
+import os
+import re
+import json
+import hashlib
+import logging
+import collections
+import concurrent.futures
+from sqlalchemy import select, func
+from sqlalchemy.dialects.sqlite import insert
+
+from data_collection.config import PROCESS_WORKERS, NLP_MODEL, NLP_BATCH_SIZE, NLP_MAX_KEYWORDS
+from data_collection.database import WindowActivity, BrowserActivity, TitleKeywords
+from data_processing.daily_aggregator import BROWSER_APPS
+
+logger = logging.getLogger(__name__)
+
+# Çıkarma mantığı değiştiğinde artırılır; önbellekteki tüm başlıkların yeniden işlenmesini sağlar
+KEYWORDS_VERSION = 1
+
+# Etiketleyicisi olan modellerde anahtar kelime sayılan sözcük türleri
+KEYWORD_POS = {"NOUN", "PROPN"}
+
+# "Belge - Uygulama" biçimindeki başlıklarda uygulama adını ayıran ayraçlar
+_SUFFIX_SEPARATOR = re.compile(r'\s+[-|–—]\s+')
+
+# Tek seferde veritabanında aranan özet sayısı
+_LOOKUP_CHUNK = 500
+
+class KeywordsUnavailable(Exception):
+    """spaCy veya istenen model yüklenemediğinde oluşur."""
+
+def title_hash(title):
+    """Başlığın önbellek anahtarını döndür."""
+    return hashlib.sha1(title.encode("utf-8")).hexdigest()
+
+def extractor_id(model_name=NLP_MODEL):
+    """Önbellek kayıtlarının geçerliliğini belirleyen model ve sürüm kimliğini döndür."""
+    return f"{model_name}:v{KEYWORDS_VERSION}"
+
+def load_nlp(model_name=NLP_MODEL):
+    """spaCy dil hattını yükle.
+
+    Args:
+        model_name: Kurulu model adı veya boş dil hattı için "blank:<dil>".
+
+    Returns:
+        spacy.Language: Yalnızca etiketleme ve sözcük kökü bileşenleri etkin dil hattı.
+
+    Raises:
+        KeywordsUnavailable: spaCy kurulu değilse veya model bulunamazsa.
+    """
+    try:
+        import spacy  # İsteğe bağlı bağımlılık; yalnızca anahtar kelime çıkarma için gereklidir
+    except ImportError as e:
+        raise KeywordsUnavailable(f"spaCy kurulu değil: {e}")
+    try:
+        if model_name.startswith("blank:"):
+            return spacy.blank(model_name.split(":", 1)[1])
+        # Başlıklar için cümle ayrıştırması ve varlık tanıma gerekmez
+        return spacy.load(model_name, disable=["parser", "ner"])
+    except (OSError, ImportError) as e:
+        raise KeywordsUnavailable(f"spaCy modeli yüklenemedi ({model_name}): {e}")
+
+def strip_app_suffix(title):
+    """Başlığın sonundaki uygulama adı bölümünü kaldır ("rapor.docx - Word" → "rapor.docx")."""
+    parts = _SUFFIX_SEPARATOR.split(title)
+    return " - ".join(parts[:-1]) if len(parts) > 1 else title
+
+def doc_keywords(doc, limit=NLP_MAX_KEYWORDS):
+    """İşlenmiş başlıktan anahtar kelimeleri çıkar.
+
+    Etiketleyicisi olan modellerde yalnızca isimler ve özel isimler alınır;
+    boş dil hatlarında durak sözcükleri dışındaki tüm sözcükler kullanılır.
+
+    Args:
+        doc: spaCy Doc nesnesi.
+        limit: En fazla anahtar kelime sayısı.
+
+    Returns:
+        list: Başlıktaki sırasıyla küçük harfli, tekil anahtar kelimeler.
+    """
+    tagged = doc.has_annotation("POS")
+    lemmatized = doc.has_annotation("LEMMA")
+    keywords = []
+    for token in doc:
+        if token.is_stop or not token.is_alpha or len(token) < 3:
+            continue
+        if tagged and token.pos_ not in KEYWORD_POS:
+            continue
+        keyword = (token.lemma_ if lemmatized and token.lemma_ else token.text).lower()
+        if keyword not in keywords:
+            keywords.append(keyword)
+            if len(keywords) >= limit:
+                break
+    return keywords
+
+# İşlem başına yüklenen dil hattı
+_nlp = None
+
+def _init_worker(model_name):
+    """Havuz işleminde dil hattını bir kez yükle."""
+    global _nlp
+    _nlp = load_nlp(model_name)
+
+def extract_batch(titles, limit=NLP_MAX_KEYWORDS, batch_size=NLP_BATCH_SIZE):
+    """Başlık partisinin anahtar kelimelerini çıkar (işlem havuzunda çalışır).
+
+    Args:
+        titles: Başlık listesi.
+        limit: Başlık başına en fazla anahtar kelime sayısı.
+        batch_size: nlp.pipe parti boyutu.
+
+    Returns:
+        list: Her başlık için anahtar kelime listesi.
+    """
+    texts = (strip_app_suffix(title) for title in titles)
+    return [doc_keywords(doc, limit) for doc in _nlp.pipe(texts, batch_size=batch_size)]
+
+def distinct_titles(db_session, start=None, end=None):
+    """Aralıktaki farklı pencere ve sayfa başlıklarını oku.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        start: Aralık başlangıcı (None: sınırsız).
+        end: Aralık sonu (None: sınırsız, hariç).
+
+    Returns:
+        set: Boş olmayan başlıklar.
+    """
+    sources = (
+        (WindowActivity, func.coalesce(WindowActivity.normalized_title, WindowActivity.window_title)),
+        (BrowserActivity, BrowserActivity.title),
+    )
+    titles = set()
+    for model, title in sources:
+        query = select(title).where(title.isnot(None), title != '').distinct()
+        if start is not None:
+            query = query.where(model.timestamp >= start)
+        if end is not None:
+            query = query.where(model.timestamp < end)
+        titles.update(value for (value,) in db_session.execute(query))
+    return titles
+
+def find_missing_titles(db_session, titles, extractor=None):
+    """Önbellekte bulunmayan veya başka bir çıkarıcıyla hesaplanmış başlıkları döndür.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        titles: Başlık koleksiyonu.
+        extractor: extractor_id sonucu (None: varsayılan model).
+
+    Returns:
+        list: İşlenmesi gereken başlıklar (sıralı).
+    """
+    extractor = extractor or extractor_id()
+    hashes = {title_hash(title): title for title in titles}
+    keys = sorted(hashes)
+    cached = set()
+    for offset in range(0, len(keys), _LOOKUP_CHUNK):
+        cached.update(db_session.execute(
+            select(TitleKeywords.title_hash).where(
+                TitleKeywords.title_hash.in_(keys[offset:offset + _LOOKUP_CHUNK]),
+                TitleKeywords.extractor == extractor,
+            )
+        ).scalars())
+    return sorted(title for key, title in hashes.items() if key not in cached)
+
+def save_keywords(db_session, titles, results, extractor):
+    """Başlıkların anahtar kelimelerini önbelleğe yaz (commit çağırana aittir)."""
+    rows = [
+        {"title_hash": title_hash(title), "keywords": json.dumps(keywords, ensure_ascii=False), "extractor": extractor}
+        for title, keywords in zip(titles, results)
+    ]
+    if not rows:
+        return
+    statement = insert(TitleKeywords).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=['title_hash'],
+        set_={'keywords': statement.excluded.keywords, 'extractor': statement.excluded.extractor},
+    )
+    db_session.execute(statement)
+
+def update_title_keywords(db_session, start=None, end=None, workers=None, model_name=NLP_MODEL,
+                          batch_size=NLP_BATCH_SIZE):
+    """Aralıktaki yeni başlıkların anahtar kelimelerini çıkar ve önbelleğe yaz.
+
+    Her parti ayrı commit edilir; kesintiye uğrayan çalıştırma kaldığı
+    yerden devam eder.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        start: Aralık başlangıcı (None: tüm geçmiş).
+        end: Aralık sonu (None: sınırsız, hariç).
+        workers: İşlem sayısı (None: PROCESS_WORKERS, 0: işlemci sayısı).
+        model_name: spaCy model adı.
+        batch_size: nlp.pipe parti boyutu.
+
+    Returns:
+        int: İşlenen yeni başlık sayısı.
+
+    Raises:
+        KeywordsUnavailable: spaCy veya model yüklenemezse.
+    """
+    extractor = extractor_id(model_name)
+    titles = distinct_titles(db_session, start, end)
+    pending = find_missing_titles(db_session, titles, extractor)
+    logger.info(f"{len(titles)} farklı başlığın {len(pending)} tanesi için anahtar kelime çıkarılacak")
+    if not pending:
+        return 0
+
+    # Havuz görevleri birkaç nlp.pipe partisi büyüklüğündedir
+    chunk_size = batch_size * 4
+    chunks = [pending[offset:offset + chunk_size] for offset in range(0, len(pending), chunk_size)]
+    workers = PROCESS_WORKERS if workers is None else workers
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+    if workers <= 1:
+        _init_worker(model_name)
+    else:
+        # Model ana işlemde bir kez denenir; böylece eksik model havuz başlamadan bildirilir
+        load_nlp(model_name)
+
+    executor = None
+    try:
+        if workers <= 1:
+            results = (extract_batch(chunk, batch_size=batch_size) for chunk in chunks)
+        else:
+            executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(model_name,)
+            )
+            results = executor.map(extract_batch, chunks, [NLP_MAX_KEYWORDS] * len(chunks), [batch_size] * len(chunks))
+        for chunk, keywords in zip(chunks, results):
+            save_keywords(db_session, chunk, keywords, extractor)
+            db_session.commit()
+    except Exception as e:
+        logger.error(f"Başlık anahtar kelimeleri çıkarılırken hata oluştu: {e}")
+        db_session.rollback()
+        raise
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return len(pending)
+
+def cached_keywords(db_session, titles):
+    """Başlıkların önbellekteki anahtar kelimelerini döndür.
+
+    Returns:
+        dict: Başlık → anahtar kelime listesi (önbellekte olmayanlar hariç).
+    """
+    hashes = {title_hash(title): title for title in titles}
+    keys = sorted(hashes)
+    keywords = {}
+    for offset in range(0, len(keys), _LOOKUP_CHUNK):
+        rows = db_session.execute(
+            select(TitleKeywords.title_hash, TitleKeywords.keywords)
+            .where(TitleKeywords.title_hash.in_(keys[offset:offset + _LOOKUP_CHUNK]))
+        )
+        keywords.update((hashes[key], json.loads(value)) for key, value in rows)
+    return keywords
+
+def keyword_times(db_session, start, end, limit=None):
+    """Aralıkta anahtar kelimelere harcanan süreleri hesapla.
+
+    Tarayıcı dışındaki pencerelerin süresi pencere başlığına, tarayıcı
+    süresi sayfa başlığına atanır; böylece tarayıcı zamanı iki kez sayılmaz.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        start: Aralık başlangıcı.
+        end: Aralık sonu (hariç).
+        limit: En fazla anahtar kelime sayısı (None: tümü).
+
+    Returns:
+        list: Süreye göre azalan (anahtar kelime, saniye) çiftleri.
+    """
+    title = func.coalesce(WindowActivity.normalized_title, WindowActivity.window_title)
+    windows = db_session.execute(
+        select(WindowActivity.application_name, title, func.sum(WindowActivity.duration))
+        .where(WindowActivity.timestamp >= start, WindowActivity.timestamp < end, title.isnot(None))
+        .group_by(WindowActivity.application_name, title)
+    )
+    seconds = collections.Counter()
+    for application_name, window_title, duration in windows:
+        if str(application_name).lower() not in BROWSER_APPS:
+            seconds[window_title] += duration or 0
+    pages = db_session.execute(
+        select(BrowserActivity.title, func.sum(BrowserActivity.duration))
+        .where(BrowserActivity.timestamp >= start, BrowserActivity.timestamp < end, BrowserActivity.title.isnot(None))
+        .group_by(BrowserActivity.title)
+    )
+    for page_title, duration in pages:
+        seconds[page_title] += duration or 0
+
+    totals = collections.Counter()
+    for keyword_title, keywords in cached_keywords(db_session, seconds).items():
+        for keyword in keywords:
+            totals[keyword] += seconds[keyword_title]
+    return totals.most_common(limit)
@@ -0,0 +1,316 @@
+"""
+Çoklu Makine Veritabanı Birleştirme Modülü.
+
+Bu modül, farklı makinelerden gelen aktivite veritabanlarını tek bir
+birleştirilmiş veritabanında toplar. Her kaynak ATTACH ile bağlanır ve
+kalıcı cihaz kimliğine göre bir kimlik bloğu alır; birincil ve yabancı
+anahtarlar bu bloğun başlangıcı kadar kaydırılarak tek bir INSERT ... SELECT
+ile aktarılır. Aynı kaynak yeniden birleştirildiğinde (cihaz, kaynak kimliği)
+çifti aynı hedef kimliğe düştüğünden kayıtlar çoğaltılmaz; yalnızca değişen
+kayıtlar güncellenir. Kaynakta silinen kayıtlar (örn. sıkıştırmanın
+birleştirdiği aralıklar) change_tombstones tablosundan cihaz başına bir su
+işaretiyle okunup hedeften de silinir.
+
+Kaynak veritabanına yazılmaz; cihaz kimliği olmayan eski kaynaklar hedefte
+kayıtlı yollarıyla veya dosya özetiyle tanımlanır.
+"""
+import os
+import time
+import uuid
+import hashlib
+import logging
+import datetime
+from sqlalchemy import create_engine, select, func, text
+from sqlalchemy.orm import sessionmaker
+
+from data_collection.config import DATABASE_PATH, MERGE_DATABASE_PATH
+from data_collection.database import (
+    Base, MergeDevice, CHANGE_TRACKED_TABLES, migrate_db
+)
+from data_collection.sketches import rebuild_day_sketches
+from data_collection.write_path import rebuild_rollups, bump_day_versions
+from data_processing.heatmap import invalidate_cubes
+
+logger = logging.getLogger(__name__)
+
+# Her cihaza ayrılan kimlik aralığı; 0. blok hedefin kendi kayıtlarına aittir
+DEVICE_ID_SPAN = 2 ** 40
+
+# Kaynak kimliğiyle aynı bloğa kaydırılan yabancı anahtarlar
+REMAPPED_COLUMNS = ('session_id', 'window_id')
+
+# Hedef tarafından yönetildiği için kaynaktan kopyalanmayan sütunlar
+_MANAGED_COLUMNS = ('id', 'change_seq')
+
+class MergeError(Exception):
+    """Kaynak veya hedef birleştirmeye uygun olmadığında oluşur."""
+
+def device_offsets(connection):
+    """Kayıtlı cihazların kimlik kaydırma değerlerini döndür.
+
+    Returns:
+        dict: Cihaz kimliği → kaydırma değeri.
+    """
+    return {
+        device_id: device_index * DEVICE_ID_SPAN
+        for device_id, device_index in connection.execute(select(MergeDevice.device_id, MergeDevice.device_index))
+    }
+
+def register_device(connection, device_id, source_path):
+    """Cihazı kaydet ve kimlik bloğunun kaydırma değerini döndür."""
+    offsets = device_offsets(connection)
+    if device_id not in offsets:
+        device_index = (connection.execute(select(func.max(MergeDevice.device_index))).scalar() or 0) + 1
+        connection.execute(MergeDevice.__table__.insert().values(
+            device_id=device_id, device_index=device_index, source_path=source_path, tombstone_seq=0
+        ))
+        offsets[device_id] = device_index * DEVICE_ID_SPAN
+    return offsets[device_id]
+
+def file_device_id(path):
+    """Dosya içeriğinden türetilen kararlı cihaz kimliğini döndür."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(1024 * 1024), b''):
+            digest.update(block)
+    return str(uuid.UUID(hex=digest.hexdigest()[:32]))
+
+def source_device_id(connection, source_path):
+    """Bağlı kaynağın cihaz kimliğini kaynağa yazmadan belirle.
+
+    Kimliği olmayan eski kaynaklar için önce aynı yoldan daha önce
+    birleştirilmiş cihaz, yoksa dosya içeriğinin özeti kullanılır.
+
+    Args:
+        connection: Kaynağın 'source' adıyla bağlı olduğu bağlantı.
+        source_path: Kaynak veritabanı dosyası.
+
+    Returns:
+        str: Cihaz kimliği.
+    """
+    device_id = connection.execute(
+        text("SELECT value FROM source.maintenance_state WHERE name = 'device_id'")
+    ).scalar()
+    if device_id is not None:
+        return device_id
+    device_id = connection.execute(
+        select(MergeDevice.device_id).where(MergeDevice.source_path == os.path.abspath(source_path))
+    ).scalar()
+    if device_id is not None:
+        return device_id
+    logger.warning(f"{source_path} cihaz kimliği içermiyor, dosya özetinden türetiliyor")
+    return file_device_id(source_path)
+
+def _columns(connection, schema, table_name):
+    return [row[1] for row in connection.execute(text(f"PRAGMA {schema}.table_info({table_name})"))]
+
+def _check_id_range(connection, table_name):
+    """Kaynak kimliklerinin cihaz bloğuna sığdığını doğrula."""
+    source_max = connection.execute(text(f"SELECT max(id) FROM source.{table_name}")).scalar() or 0
+    if source_max >= DEVICE_ID_SPAN:
+        raise MergeError(f"Kaynak {table_name} tablosu birleştirilmiş kimlikler içeriyor (en büyük kimlik {source_max})")
+
+def merge_table(connection, table_name, device_offset):
+    """Bağlı kaynaktaki tabloyu hedefe kaydırılmış kimliklerle aktar.
+
+    Args:
+        connection: Kaynağın 'source' adıyla bağlı olduğu bağlantı.
+        table_name: Tablo adı.
+        device_offset: Cihazın kimlik kaydırma değeri.
+
+    Returns:
+        int: Eklenen veya güncellenen kayıt sayısı.
+    """
+    source_columns = set(_columns(connection, 'source', table_name))
+    columns = [
+        name for name in _columns(connection, 'main', table_name)
+        if name in source_columns and name not in _MANAGED_COLUMNS
+    ]
+    expressions = [f"s.{name} + :offset" if name in REMAPPED_COLUMNS else f"s.{name}" for name in columns]
+    changed = ' OR '.join(f"{table_name}.{name} IS NOT excluded.{name}" for name in columns)
+    # "WHERE true", SQLite'ın INSERT ... SELECT ile ON CONFLICT ayrıştırma belirsizliğini giderir
+    statement = (
+        f"INSERT INTO main.{table_name} (id, {', '.join(columns)}) "
+        f"SELECT s.id + :offset, {', '.join(expressions)} FROM source.{table_name} s WHERE true "
+        f"ON CONFLICT(id) DO UPDATE SET {', '.join(f'{name} = excluded.{name}' for name in columns)} "
+        f"WHERE {changed}"
+    )
+    return connection.execute(text(statement), {'offset': device_offset}).rowcount
+
+def _changed_days(connection, table_name, device_offset, since):
+    """Birleştirmede eklenen veya değişen kayıtların günlerini döndür."""
+    return _row_days(
+        connection, table_name, "id >= :low AND id < :high AND change_seq > :since",
+        {'low': device_offset, 'high': device_offset + DEVICE_ID_SPAN, 'since': since}
+    )
+
+def _row_days(connection, table_name, where, params):
+    """Hedef tablodaki koşula uyan kayıtların kapsadığı günleri döndür."""
+    columns = set(_columns(connection, 'main', table_name))
+    if 'timestamp' not in columns:
+        return set()
+    days = "date(timestamp)"
+    if 'duration' in columns:
+        days += ", date(timestamp, '+' || coalesce(duration, 0) || ' seconds')"
+    rows = connection.execute(text(f"SELECT DISTINCT {days} FROM main.{table_name} WHERE {where}"), params)
+    return {datetime.date.fromisoformat(day) for row in rows for day in row if day}
+
+def apply_tombstones(connection, table_name, device_offset, since):
+    """Kaynakta silinen kayıtları hedeften sil.
+
+    Args:
+        connection: Kaynağın 'source' adıyla bağlı olduğu bağlantı.
+        table_name: Tablo adı.
+        device_offset: Cihazın kimlik kaydırma değeri.
+        since: Cihaz için daha önce uygulanmış son silme sırası.
+
+    Returns:
+        tuple: (silinen kayıt sayısı, etkilenen günler).
+    """
+    where = (
+        "id IN (SELECT row_id + :offset FROM source.change_tombstones "
+        "WHERE table_name = :table_name AND change_seq > :since)"
+    )
+    params = {'offset': device_offset, 'table_name': table_name, 'since': since}
+    days = _row_days(connection, table_name, where, params)
+    deleted = connection.execute(text(f"DELETE FROM main.{table_name} WHERE {where}"), params).rowcount
+    return deleted, days
+
+def merge_source(connection, source_path):
+    """Tek bir kaynak veritabanını tek işlemde hedefe aktar.
+
+    Args:
+        connection: Hedef veritabanı bağlantısı (işlem dışında).
+        source_path: Kaynak veritabanı dosyası.
+
+    Returns:
+        dict: Cihaz kimliği, tablo başına aktarılan ve silinen kayıt, etkilenen günler ve süre.
+    """
+    began = time.perf_counter()
+    connection.exec_driver_sql("ATTACH DATABASE ? AS source", (os.path.abspath(source_path),))
+    try:
+        available = {row[0] for row in connection.execute(text("SELECT name FROM source.sqlite_master WHERE type = 'table'"))}
+        if 'maintenance_state' not in available:
+            raise MergeError(f"{source_path} bir aktivite veritabanı değil veya çok eski")
+        device_id = source_device_id(connection, source_path)
+        device_offset = register_device(connection, device_id, os.path.abspath(source_path))
+        since = connection.execute(text("SELECT value FROM main.change_sequence WHERE name = 'global'")).scalar() or 0
+        tombstone_since = connection.execute(
+            select(MergeDevice.tombstone_seq).where(MergeDevice.device_id == device_id)
+        ).scalar() or 0
+        has_tombstones = 'change_tombstones' in available
+
+        counts, deleted, days = {}, {}, set()
+        for table_name in CHANGE_TRACKED_TABLES:
+            if table_name not in available:
+                continue
+            _check_id_range(connection, table_name)
+            # Silmeler önce uygulanır; kaynakta aynı kimlikle yeniden eklenen kayıtlar ardından aktarılır
+            if has_tombstones:
+                deleted[table_name], deleted_days = apply_tombstones(connection, table_name, device_offset, tombstone_since)
+                days |= deleted_days
+            counts[table_name] = merge_table(connection, table_name, device_offset)
+            days |= _changed_days(connection, table_name, device_offset, since)
+        tombstone_seq = tombstone_since
+        if has_tombstones:
+            tombstone_seq = connection.execute(
+                text("SELECT max(change_seq) FROM source.change_tombstones")
+            ).scalar() or tombstone_since
+
+        connection.execute(MergeDevice.__table__.update().where(MergeDevice.device_id == device_id).values(
+            merged_at=datetime.datetime.now(), source_path=os.path.abspath(source_path), tombstone_seq=tombstone_seq
+        ))
+        bump_day_versions(connection, days)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.exec_driver_sql("DETACH DATABASE source")
+
+    return {
+        'source': source_path,
+        'device_id': device_id,
+        'rows': counts,
+        'deleted': deleted,
+        'days': days,
+        'seconds': time.perf_counter() - began,
+    }
+
+def refresh_derived(db_session, days):
+    """Birleştirilen günlerin toplamlarını, çizimlerini ve küplerini yenile.
+
+    Args:
+        db_session: Hedef veritabanı oturumu.
+        days: datetime.date koleksiyonu.
+    """
+    for day in sorted(days):
+        rebuild_rollups(db_session, day)
+        rebuild_day_sketches(db_session, day)
+    invalidate_cubes(db_session, sorted(days))
+
+def merge_databases(target_path, source_paths):
+    """Kaynak veritabanlarını hedefte birleştir.
+
+    Args:
+        target_path: Birleştirilmiş veritabanı dosyası (yoksa oluşturulur).
+        source_paths: Kaynak veritabanı dosyaları.
+
+    Returns:
+        list: Her kaynak için merge_source sonucu.
+    """
+    # İzleyicinin yazdığı veritabanına birleştirilen kayıtlar, yerel kimliklerin cihaz bloklarına taşmasına yol açar
+    if os.path.abspath(target_path) == os.path.abspath(DATABASE_PATH):
+        raise MergeError("Hedef, izleyicinin kullandığı veritabanı olamaz")
+    target_engine = create_engine(f'sqlite:///{target_path}')
+    Base.metadata.create_all(target_engine)
+    migrate_db(target_engine)
+
+    results, days = [], set()
+    try:
+        with target_engine.connect() as connection:
+            for source_path in source_paths:
+                result = merge_source(connection, source_path)
+                total = sum(result['rows'].values())
+                logger.info(f"{source_path} ({result['device_id']}): {total} kayıt {result['seconds']:.2f} sn içinde "
+                            f"birleştirildi ({total / max(result['seconds'], 1e-9):,.0f} kayıt/sn)")
+                results.append(result)
+                days |= result['days']
+
+        db_session = sessionmaker(bind=target_engine)()
+        try:
+            refresh_derived(db_session, days)
+        finally:
+            db_session.close()
+        logger.info(f"{len(days)} günün toplamları ve çizimleri yenilendi")
+    finally:
+        target_engine.dispose()
+    return results
+
+def add_merge_arguments(parser):
+    """Birleştirme argümanlarını ayrıştırıcıya ekle.
+
+    Args:
+        parser: argparse.ArgumentParser nesnesi.
+    """
+    parser.add_argument('sources', nargs='+', help='Birleştirilecek kaynak veritabanı dosyaları')
+    parser.add_argument('--target', default=MERGE_DATABASE_PATH, help='Birleştirilmiş veritabanı (varsayılan: MERGE_DATABASE_PATH)')
+
+def run_merge(args):
+    """Argümanlara göre kaynak veritabanlarını birleştir.
+
+    Args:
+        args: argparse.Namespace nesnesi.
+
+    Returns:
+        list: Her kaynak için birleştirme sonucu.
+    """
+    missing = [path for path in args.sources if not os.path.exists(path)]
+    if missing:
+        logger.error(f"Kaynak veritabanı bulunamadı: {', '.join(missing)}")
+        return []
+    try:
+        return merge_databases(args.target, args.sources)
+    except MergeError as e:
+        logger.error(f"Birleştirme yapılamadı: {e}")
+        return []
@@ -0,0 +1,126 @@
+"""
+Veri İşleme Çalıştırma Betiği.
+
+Bu betik, belirtilen tarih veya tarih aralığı için günlük özetleri hesaplar ve
+yapılandırılmışsa yapay zeka özet metinlerini üretir.
+"""
+import os
+import sys
+import argparse
+import logging
+import datetime
+
+# Doğrudan çalıştırıldığında src dizinini modül yoluna ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from data_collection.database import get_session
+from data_collection.categories import sync_category_assignments
+from data_collection.sketches import days_without_sketches, rebuild_day_sketches
+from data_collection.write_path import install_rollup_hooks
+from data_processing.daily_aggregator import process_days, date_range, day_bounds, invalidate_summaries
+from data_processing.window_attribution import attribute_windows
+from data_processing.timeline import update_timeline
+from data_processing.keywords import update_title_keywords, KeywordsUnavailable
+from data_processing.summarizer import summarize_days, get_llm_client
+
+logger = logging.getLogger(__name__)
+
+def parse_date(value):
+    """YYYY-MM-DD formatındaki tarihi ayrıştır."""
+    return datetime.datetime.strptime(value, '%Y-%m-%d').date()
+
+def add_process_arguments(parser):
+    """Veri işleme argümanlarını ayrıştırıcıya ekle.
+
+    Args:
+        parser: argparse.ArgumentParser nesnesi.
+    """
+    parser.add_argument('--date', type=parse_date, help='İşlenecek tarih (YYYY-MM-DD formatında)')
+    parser.add_argument('--start', type=parse_date, help='Tarih aralığının başlangıcı (YYYY-MM-DD formatında)')
+    parser.add_argument('--end', type=parse_date, help='Tarih aralığının sonu (YYYY-MM-DD formatında, dahil)')
+    parser.add_argument('--workers', type=int, help='Paralel işlem sayısı (0: işlemci sayısı)')
+    parser.add_argument('--force', action='store_true', help='Değişmemiş günleri de yeniden hesapla')
+    parser.add_argument('--reattribute', action='store_true', help='Pencereye bağlanmış kayıtları da yeniden bağla')
+
+def run_process(args):
+    """Argümanlara göre günlük özetleri hesapla.
+
+    Tarih verilmezse bugün işlenir; yalnızca --start verilirse bugüne kadar işlenir.
+
+    Args:
+        args: argparse.Namespace nesnesi.
+
+    Returns:
+        list: Hesaplanan günler.
+    """
+    today = datetime.date.today()
+    if args.date:
+        days = [args.date]
+    elif args.start:
+        days = date_range(args.start, args.end or today)
+    else:
+        days = [today]
+
+    if not days:
+        logger.error("Geçersiz tarih aralığı: başlangıç tarihi bitiş tarihinden sonra")
+        return []
+
+    logger.info(f"{days[0]} - {days[-1]} arası {len(days)} gün işleniyor...")
+
+    # Okuyucuların değişikliği görmesi için commit işareti kancalarını etkinleştir
+    install_rollup_hooks()
+
+    # Olay kayıtlarını özetlerden önce pencerelere bağla
+    db_session = get_session()
+    try:
+        attributed = attribute_windows(
+            db_session, day_bounds(days[0])[0], day_bounds(days[-1])[1], only_missing=not args.reattribute
+        )
+        logger.info(f"Pencerelere bağlanan kayıtlar: {attributed}")
+        rebuilt = update_timeline(db_session)
+        if rebuilt:
+            logger.info(f"Zaman çizelgesi {len(rebuilt)} gün için güncellendi")
+
+        # Kurallar veya yeni anahtarlar nedeniyle kategorisi değişen günleri yeniden hesaplat
+        affected = sync_category_assignments(db_session)
+        changed_keys = sum(len(keys) for keys in affected.values())
+        if changed_keys:
+            invalidated = invalidate_summaries(db_session, affected)
+            logger.info(f"{changed_keys} anahtarın kategorisi güncellendi, {invalidated} gün yeniden hesaplanacak")
+
+        # Yalnızca önbellekte olmayan yeni başlıkların anahtar kelimelerini çıkar
+        try:
+            update_title_keywords(db_session, day_bounds(days[0])[0], day_bounds(days[-1])[1], workers=args.workers)
+        except KeywordsUnavailable as e:
+            logger.warning(f"Başlık anahtar kelimeleri atlandı: {e}")
+
+        # Yazma kancası eklenmeden önceki günler için özet çizimlerini oluştur
+        for day in (days if args.force else days_without_sketches(db_session, days)):
+            rebuild_day_sketches(db_session, day)
+    finally:
+        db_session.close()
+
+    processed = process_days(days, workers=args.workers, force=args.force)
+
+    # Yapay zeka özetleri; yanıtlar önbellekte olduğundan değişmeyen günler için model çağrılmaz
+    client = get_llm_client()
+    if client is not None:
+        db_session = get_session()
+        try:
+            summarize_days(db_session, days, client)
+        finally:
+            db_session.close()
+    return processed
+
+def main():
+    """Ana fonksiyon."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    parser = argparse.ArgumentParser(description='Günlük aktivite özetlerini hesapla')
+    add_process_arguments(parser)
+    run_process(parser.parse_args())
+
+if __name__ == '__main__':
+    main()
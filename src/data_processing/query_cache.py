@@ -0,0 +1,253 @@
+"""
+Sorgu sonuç önbelleği.
+
+Bu modül, gün bazında hesaplanan sorgu sonuçlarını (sorgu biçimi,
+parametreler, gün) anahtarıyla saklar. Bellekteki LRU önbelleğin arkasında
+diskte kalıcı bir SQLite önbelleği bulunur. Her kayıt, hesaplandığı andaki
+gün sürümüyle saklanır; yazıcı o güne kayıt eklediğinde sürüm artar ve
+yalnızca o günün kayıtları geçersiz olur. Disk önbelleği bayt sınırını
+aştığında en uzun süredir kullanılmayan kayıtlar silinir.
+"""
+import json
+import time
+import uuid
+import pickle
+import sqlite3
+import logging
+import threading
+import collections
+
+from data_collection.config import QUERY_CACHE_PATH, QUERY_CACHE_MEMORY_ITEMS, QUERY_CACHE_MAX_BYTES
+from data_collection.compaction import get_state, set_state
+from data_collection.write_path import get_day_versions
+
+logger = logging.getLogger(__name__)
+
+# Önbelleğin ait olduğu veritabanını ayırt eden kimliğin durum adı
+GENERATION_STATE = 'query_cache:generation'
+
+def database_generation(db_session):
+    """Veritabanına özgü önbellek kimliğini döndür (yoksa oluştur).
+
+    Veritabanı dosyası değiştirildiğinde gün sürümleri sıfırlanır; kimlik,
+    eski dosyaya ait önbellek kayıtlarının yanlışlıkla kullanılmasını önler.
+
+    Args:
+        db_session: Veritabanı oturumu.
+
+    Returns:
+        str: Kimlik (yazılamayan veritabanlarında boş dize).
+    """
+    generation = get_state(db_session, GENERATION_STATE)
+    if generation is None:
+        generation = uuid.uuid4().hex
+        try:
+            set_state(db_session, GENERATION_STATE, generation)
+            db_session.commit()
+        except Exception as e:
+            logger.warning(f"Sorgu önbelleği kimliği kaydedilemedi: {e}")
+            db_session.rollback()
+            return ''
+    return generation
+
+class QueryCache:
+    """Bellek LRU + disk katmanlı, gün sürümüne göre geçersiz kılınan önbellek."""
+
+    def __init__(self, path=QUERY_CACHE_PATH, max_items=QUERY_CACHE_MEMORY_ITEMS, max_disk_bytes=QUERY_CACHE_MAX_BYTES):
+        """Önbelleği başlat.
+
+        Args:
+            path: Disk önbelleği dosyası (None veya boş ise yalnızca bellek).
+            max_items: Bellekte tutulacak en fazla kayıt sayısı.
+            max_disk_bytes: Disk önbelleğindeki değerlerin en fazla toplam boyutu (0: sınırsız).
+        """
+        self.max_items = max_items
+        self.max_disk_bytes = max_disk_bytes
+        self.memory = collections.OrderedDict()  # anahtar → (sürüm, değer, boyut)
+        self.memory_bytes = 0
+        self.lock = threading.Lock()
+        self.counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+        self.disk_evictions = 0
+        self.disk_bytes = 0
+        self.last_access = 0.0
+        self.disk = None
+        if path:
+            try:
+                self.disk = sqlite3.connect(path, check_same_thread=False)
+                self.disk.execute("PRAGMA journal_mode=WAL")
+                self.disk.execute(
+                    "CREATE TABLE IF NOT EXISTS query_cache "
+                    "(key TEXT PRIMARY KEY, version TEXT, value BLOB, size INTEGER, accessed REAL)"
+                )
+                columns = {row[1] for row in self.disk.execute("PRAGMA table_info(query_cache)")}
+                if 'accessed' not in columns:
+                    self.disk.execute("ALTER TABLE query_cache ADD COLUMN accessed REAL DEFAULT 0")
+                self.disk.execute("CREATE INDEX IF NOT EXISTS ix_query_cache_accessed ON query_cache (accessed)")
+                self.disk.commit()
+                self.disk_bytes = self._stored_bytes()
+            except sqlite3.Error as e:
+                logger.error(f"Disk önbelleği açılırken hata oluştu, yalnızca bellek kullanılacak: {e}")
+                self.disk = None
+
+    @staticmethod
+    def make_key(shape, params, day):
+        """Önbellek anahtarını oluştur."""
+        return json.dumps([shape, params, day.isoformat()], sort_keys=True, default=str, ensure_ascii=False)
+
+    def _remember(self, key, version, value, size):
+        previous = self.memory.pop(key, None)
+        if previous is not None:
+            self.memory_bytes -= previous[2]
+        self.memory[key] = (version, value, size)
+        self.memory_bytes += size
+        while len(self.memory) > self.max_items:
+            _, (_, _, evicted) = self.memory.popitem(last=False)
+            self.memory_bytes -= evicted
+
+    def get(self, key, version):
+        """Anahtarın verilen sürümdeki değerini döndür.
+
+        Returns:
+            tuple: (bulundu mu, değer).
+        """
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None and entry[0] == version:
+                self.memory.move_to_end(key)
+                self.counters['memory_hits'] += 1
+                return True, entry[1]
+            if self.disk is not None:
+                row = self.disk.execute("SELECT value, size FROM query_cache WHERE key = ? AND version = ?",
+                                        (key, version)).fetchone()
+                if row is not None:
+                    value = pickle.loads(row[0])
+                    self._touch(key)
+                    self._remember(key, version, value, row[1])
+                    self.counters['disk_hits'] += 1
+                    return True, value
+            self.counters['misses'] += 1
+            return False, None
+
+    def put(self, key, version, value):
+        """Değeri verilen sürümle sakla (aynı anahtarın eski sürümünün yerine geçer)."""
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self.lock:
+            self._remember(key, version, value, len(data))
+            if self.disk is not None:
+                try:
+                    previous = self.disk.execute("SELECT size FROM query_cache WHERE key = ?", (key,)).fetchone()
+                    self.disk.execute(
+                        "INSERT OR REPLACE INTO query_cache (key, version, value, size, accessed) VALUES (?, ?, ?, ?, ?)",
+                        (key, version, data, len(data), self._access_time())
+                    )
+                    self.disk_bytes += len(data) - (previous[0] if previous else 0)
+                    if self.max_disk_bytes and self.disk_bytes > self.max_disk_bytes:
+                        self._prune_disk()
+                    self.disk.commit()
+                except sqlite3.Error as e:
+                    logger.error(f"Disk önbelleğine yazılırken hata oluştu: {e}")
+                    self.disk.rollback()
+
+    def _stored_bytes(self):
+        return self.disk.execute("SELECT COALESCE(SUM(size), 0) FROM query_cache").fetchone()[0]
+
+    def _access_time(self):
+        """Artan son kullanım zamanını döndür (saat çözünürlüğü düşük sistemlerde de sırayı korur)."""
+        self.last_access = max(time.time(), self.last_access + 1e-6)
+        return self.last_access
+
+    def _touch(self, key):
+        """Disk kaydının son kullanım zamanını güncelle."""
+        try:
+            self.disk.execute("UPDATE query_cache SET accessed = ? WHERE key = ?", (self._access_time(), key))
+            self.disk.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Disk önbelleği kullanım zamanı güncellenemedi: {e}")
+            self.disk.rollback()
+
+    def _prune_disk(self):
+        """Disk önbelleğini en uzun süredir kullanılmayan kayıtlardan başlayarak sınırın altına indir.
+
+        Aynı dosyayı başka süreçler de kullanabildiğinden boyut önce dosyadan
+        yeniden okunur (commit çağırana aittir).
+        """
+        self.disk_bytes = self._stored_bytes()
+        excess = self.disk_bytes - self.max_disk_bytes
+        if excess <= 0:
+            return
+        evicted, freed = [], 0
+        for key, size in self.disk.execute("SELECT key, size FROM query_cache ORDER BY accessed"):
+            if freed >= excess:
+                break
+            evicted.append((key,))
+            freed += size or 0
+        self.disk.executemany("DELETE FROM query_cache WHERE key = ?", evicted)
+        self.disk_bytes -= freed
+        self.disk_evictions += len(evicted)
+
+    def get_days(self, db_session, shape, params, days, compute):
+        """Günlerin sonuçlarını önbellekten al, eksik veya eskiyenleri hesapla.
+
+        Args:
+            db_session: Veritabanı oturumu (gün sürümlerini okumak için).
+            shape: Sorgu biçimi adı (örn. "day_cube").
+            params: JSON'a dönüştürülebilir sorgu parametreleri.
+            days: datetime.date listesi.
+            compute: Gün alıp sonucu döndüren fonksiyon.
+
+        Returns:
+            dict: Gün → sonuç.
+        """
+        generation = database_generation(db_session)
+        versions = get_day_versions(db_session, days)
+        results = {}
+        for day in days:
+            key = self.make_key(shape, params, day)
+            version = f"{generation}:{versions[day]}"
+            found, value = self.get(key, version)
+            if not found:
+                value = compute(day)
+                self.put(key, version, value)
+            results[day] = value
+        return results
+
+    def stats(self):
+        """İsabet oranı ve boyut ölçümlerini döndür.
+
+        Returns:
+            dict: memory_hits, disk_hits, misses, hit_rate, memory_items, memory_bytes, disk_bytes,
+                disk_evictions.
+        """
+        with self.lock:
+            lookups = sum(self.counters.values())
+            hits = self.counters['memory_hits'] + self.counters['disk_hits']
+            disk_bytes = 0
+            if self.disk is not None:
+                disk_bytes = self._stored_bytes()
+            return dict(
+                self.counters,
+                hit_rate=hits / lookups if lookups else 0.0,
+                memory_items=len(self.memory),
+                memory_bytes=self.memory_bytes,
+                disk_bytes=disk_bytes,
+                disk_evictions=self.disk_evictions,
+            )
+
+    def clear(self):
+        """Tüm kayıtları sil."""
+        with self.lock:
+            self.memory.clear()
+            self.memory_bytes = 0
+            if self.disk is not None:
+                self.disk.execute("DELETE FROM query_cache")
+                self.disk.commit()
+                self.disk_bytes = 0
+
+_query_cache = None
+
+def get_query_cache():
+    """Süreç genelindeki varsayılan önbelleği döndür."""
+    global _query_cache
+    if _query_cache is None:
+        _query_cache = QueryCache()
+    return _query_cache
@@ -0,0 +1,336 @@
+"""
+Yapay Zeka Günlük Özet Modülü.
+
+Bu modül, DailySummary.summary_text alanını bir dil modeliyle doldurur.
+Ham kayıtlar yerine gün; toplamlar, anahtar kelimeler ve birleştirilmiş
+zaman çizelgesi bloklarından oluşan kısa bir özete sıkıştırılır. İstem jeton
+bütçesini aşarsa zaman çizelgesi bütçeye sığan bölümlere ayrılır, bölümler
+ayrı ayrı özetlenir ve bölüm özetleri günün özetinde birleştirilir (gerekirse
+birden çok kademede).
+
+Her yanıt, model kimliği ve istemin özetiyle llm_responses tablosunda
+saklanır; değişmeyen bir gün yeniden işlendiğinde modele hiç istek gitmez.
+Dil modeli istemcisi değiştirilebilir: OpenAI uyumlu herhangi bir sohbet uç
+noktası (yerel sunucular dahil) veya AI_PROVIDER ile verilen bir fabrika.
+"""
+import abc
+import json
+import math
+import hashlib
+import logging
+import datetime
+import importlib
+import collections
+import requests
+
+from data_collection.config import (
+    AI_PROVIDER, OPENAI_API_KEY, AI_BASE_URL, AI_MODEL, AI_TEMPERATURE, AI_TIMEOUT,
+    SUMMARY_TOKEN_BUDGET, SUMMARY_MAX_TOKENS
+)
+from data_collection.database import DailySummary, LlmResponse
+from data_processing.daily_aggregator import day_bounds
+from data_processing.timeline import get_timeline
+from data_processing.keywords import keyword_times
+
+logger = logging.getLogger(__name__)
+
+# Özetteki sıralı listelerin en fazla öğe sayısı
+DIGEST_TOP_ITEMS = 8
+
+# Aynı etiketli bölümlerin tek blokta birleştirildiği en fazla boşluk (saniye)
+BLOCK_GAP_SECONDS = 300
+
+# Bu süreden kısa bloklar zaman çizelgesi özetine alınmaz (saniye)
+MIN_BLOCK_SECONDS = 120
+
+# Zaman çizelgesi satırındaki başlıkların en fazla uzunluğu
+MAX_TITLE_LENGTH = 80
+
+WEEKDAYS = ("Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar")
+
+DAY_SYSTEM_PROMPT = (
+    "Sen kişisel bir etkinlik günlüğü asistanısın. Verilen özet verilerinden günün kısa bir "
+    "değerlendirmesini Türkçe ve markdown biçiminde yaz: ne üzerinde çalışıldığını, odak "
+    "dönemlerini ve dikkat dağıtıcıları belirt. Verilerde olmayan bilgileri uydurma."
+)
+
+CHUNK_SYSTEM_PROMPT = (
+    "Sen kişisel bir etkinlik günlüğü asistanısın. Verilen zaman çizelgesi bölümünü, saatleri "
+    "koruyarak en fazla üç cümleyle Türkçe özetle. Verilerde olmayan bilgileri uydurma."
+)
+
+def estimate_tokens(text):
+    """Metnin jeton sayısını kabaca tahmin et (yaklaşık dört karakter bir jeton)."""
+    return math.ceil(len(text) / 4)
+
+class LLMClient(abc.ABC):
+    """Dil modeli istemcisi arayüzü."""
+
+    @abc.abstractmethod
+    def identity(self):
+        """Yanıt önbelleği anahtarına giren model kimliğini döndür."""
+        pass
+
+    @abc.abstractmethod
+    def complete(self, system, prompt, max_tokens):
+        """İstemi tamamla.
+
+        Args:
+            system: Sistem istemi.
+            prompt: Kullanıcı istemi.
+            max_tokens: Yanıtın en fazla jeton sayısı.
+
+        Returns:
+            str: Model yanıtı.
+        """
+        pass
+
+class ChatCompletionsClient(LLMClient):
+    """OpenAI uyumlu /chat/completions uç noktası istemcisi."""
+
+    def __init__(self, base_url=AI_BASE_URL, api_key=OPENAI_API_KEY, model=AI_MODEL, temperature=AI_TEMPERATURE,
+                 timeout=AI_TIMEOUT):
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.model = model
+        self.temperature = temperature
+        self.timeout = timeout
+        self.http = requests.Session()
+
+    def identity(self):
+        return f"{self.base_url}|{self.model}|{self.temperature}"
+
+    def complete(self, system, prompt, max_tokens):
+        headers = {'Authorization': f"Bearer {self.api_key}"} if self.api_key else {}
+        response = self.http.post(f"{self.base_url}/chat/completions", headers=headers, timeout=self.timeout, json={
+            'model': self.model,
+            'messages': [{'role': 'system', 'content': system}, {'role': 'user', 'content': prompt}],
+            'max_tokens': max_tokens,
+            'temperature': self.temperature,
+        })
+        response.raise_for_status()
+        return response.json()['choices'][0]['message']['content'].strip()
+
+def get_llm_client(provider=AI_PROVIDER):
+    """Yapılandırılmış dil modeli istemcisini oluştur.
+
+    Args:
+        provider: "none", "openai" veya "paket.modul:fabrika" biçiminde istemci fabrikası.
+
+    Returns:
+        LLMClient: İstemci (özet üretimi kapalıysa None).
+    """
+    if not provider or provider == 'none':
+        return None
+    if provider == 'openai':
+        return ChatCompletionsClient()
+    module_name, _, factory = provider.partition(':')
+    try:
+        return getattr(importlib.import_module(module_name), factory or 'create_client')()
+    except (ImportError, AttributeError) as e:
+        logger.error(f"Dil modeli istemcisi yüklenemedi ({provider}): {e}")
+        return None
+
+def _duration(seconds):
+    """Süreyi kısa biçimde yaz (örn. "2sa 05dk", "12dk")."""
+    minutes = int(round(seconds / 60))
+    return f"{minutes // 60}sa {minutes % 60:02d}dk" if minutes >= 60 else f"{minutes}dk"
+
+def _ranked(times, limit=DIGEST_TOP_ITEMS):
+    """Süre sözlüğünün en büyük öğelerini tek satırda yaz."""
+    items = sorted(times.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    return ", ".join(f"{key} {_duration(seconds)}" for key, seconds in items) or "-"
+
+def timeline_blocks(segments, start, end):
+    """Zaman çizelgesi bölümlerini aynı etiketli bloklarda birleştir.
+
+    Args:
+        segments: TimelineSegment listesi (başlangıca göre sıralı).
+        start: Gün başlangıcı.
+        end: Gün sonu.
+
+    Returns:
+        list: Özet satırları ("09:00-10:30 code.exe (1sa 20dk): başlık [tuş 1200]").
+    """
+    blocks = []
+    for segment in segments:
+        begin, finish = max(segment.start_time, start), min(segment.end_time, end)
+        if finish <= begin:
+            continue
+        label = segment.application_name or segment.domain or segment.game_name or "diğer"
+        block = blocks[-1] if blocks else None
+        if block is None or block['label'] != label or (begin - block['end']).total_seconds() > BLOCK_GAP_SECONDS:
+            block = {'label': label, 'start': begin, 'end': finish, 'seconds': 0.0, 'keys': 0,
+                     'titles': collections.Counter()}
+            blocks.append(block)
+        seconds = (finish - begin).total_seconds()
+        block['end'] = max(block['end'], finish)
+        block['seconds'] += seconds
+        block['keys'] += segment.key_count or 0
+        if segment.window_title:
+            block['titles'][segment.window_title[:MAX_TITLE_LENGTH]] += seconds
+
+    lines = []
+    for block in blocks:
+        if block['seconds'] < MIN_BLOCK_SECONDS:
+            continue
+        line = f"{block['start']:%H:%M}-{block['end']:%H:%M} {block['label']} ({_duration(block['seconds'])})"
+        titles = [title for title, _ in sorted(block['titles'].items(), key=lambda item: (-item[1], item[0]))[:2]]
+        if titles:
+            line += ": " + "; ".join(titles)
+        if block['keys']:
+            line += f" [tuş {block['keys']}]"
+        lines.append(line)
+    return lines
+
+def build_digest(db_session, day, summary):
+    """Günün toplamlarından ve zaman çizelgesinden özet oluştur.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        day: datetime.date nesnesi.
+        summary: Günün DailySummary kaydı.
+
+    Returns:
+        dict: "header" (toplam satırları) ve "timeline" (blok satırları) listeleri.
+    """
+    start, end = day_bounds(day)
+    keywords = dict(keyword_times(db_session, start, end, DIGEST_TOP_ITEMS))
+    header = [
+        f"Tarih: {day.isoformat()} ({WEEKDAYS[day.weekday()]})",
+        f"Aktif süre: {_duration(summary.total_active_time or 0)} | Verimlilik: {summary.productivity_score or 0}",
+        f"Kategoriler: {_ranked(json.loads(summary.categories or '{}'))}",
+        f"Uygulamalar: {_ranked(json.loads(summary.app_times or '{}'))}",
+        f"Alan adları: {_ranked(json.loads(summary.domain_times or '{}'))}",
+        f"Anahtar kelimeler: {_ranked(keywords)}",
+    ]
+    return {'header': header, 'timeline': timeline_blocks(get_timeline(db_session, start, end), start, end)}
+
+def _day_prompt(header, parts, summarized):
+    title = "Zaman çizelgesi bölüm özetleri:" if summarized else "Zaman çizelgesi:"
+    return "\n".join(header + [title] + parts)
+
+def _chunk_prompt(day_line, lines):
+    return "\n".join([day_line, "Zaman çizelgesi bölümü:"] + lines)
+
+def pack_lines(lines, budget):
+    """Satırları her biri bütçeye sığan ardışık parçalara ayır.
+
+    Bütçeden uzun tek bir satır kısaltılır.
+
+    Returns:
+        list: Satır listelerinin listesi.
+    """
+    chunks, current, used = [], [], 0
+    for line in lines:
+        tokens = estimate_tokens(line) + 1
+        if tokens > budget:
+            line = line[:max(budget - 1, 1) * 4]
+            tokens = estimate_tokens(line) + 1
+        if current and used + tokens > budget:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(line)
+        used += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+def cached_complete(db_session, client, system, prompt, stats, max_tokens=SUMMARY_MAX_TOKENS):
+    """İstemi önbellekten yanıtla, yoksa modele gönder ve yanıtı sakla.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        client: LLMClient nesnesi.
+        system: Sistem istemi.
+        prompt: Kullanıcı istemi.
+        stats: Çağrı ve isabet sayaçları ("calls", "cache_hits").
+        max_tokens: Yanıtın en fazla jeton sayısı.
+
+    Returns:
+        str: Model yanıtı.
+    """
+    key = hashlib.sha256(json.dumps(
+        [client.identity(), max_tokens, system, prompt], ensure_ascii=False
+    ).encode("utf-8")).hexdigest()
+    cached = db_session.get(LlmResponse, key)
+    if cached is not None:
+        stats['cache_hits'] += 1
+        return cached.response
+    response = client.complete(system, prompt, max_tokens)
+    stats['calls'] += 1
+    db_session.merge(LlmResponse(prompt_hash=key, response=response, created_at=datetime.datetime.now()))
+    db_session.commit()
+    return response
+
+def summarize_digest(db_session, client, digest, stats, budget=SUMMARY_TOKEN_BUDGET):
+    """Özeti jeton bütçesi içinde, gerekirse kademeli parçalayarak özetle.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        client: LLMClient nesnesi.
+        digest: build_digest sonucu.
+        stats: Çağrı ve isabet sayaçları.
+        budget: Tek istemin en fazla tahmini jeton sayısı.
+
+    Returns:
+        str: Günün özeti.
+    """
+    header, parts, summarized = digest['header'], digest['timeline'], False
+    chunk_budget = budget - estimate_tokens(CHUNK_SYSTEM_PROMPT) - estimate_tokens(header[0]) - 8
+    while estimate_tokens(DAY_SYSTEM_PROMPT + _day_prompt(header, parts, summarized)) > budget:
+        chunks = pack_lines(parts, chunk_budget)
+        if len(chunks) >= len(parts):
+            # Bölüm özetleri kısalmıyorsa sığmayan son bölümler bırakılır
+            room = budget - estimate_tokens(DAY_SYSTEM_PROMPT + _day_prompt(header, [], summarized))
+            parts = (pack_lines(parts, max(room, 1)) or [[]])[0]
+            logger.warning(f"{header[0]}: zaman çizelgesi jeton bütçesine sığmadığı için kısaltıldı")
+            break
+        parts = [
+            cached_complete(db_session, client, CHUNK_SYSTEM_PROMPT, _chunk_prompt(header[0], chunk), stats)
+            for chunk in chunks
+        ]
+        summarized = True
+    return cached_complete(db_session, client, DAY_SYSTEM_PROMPT, _day_prompt(header, parts, summarized), stats)
+
+def summarize_days(db_session, days, client=None, budget=SUMMARY_TOKEN_BUDGET):
+    """Günlerin yapay zeka özetlerini üret ve summary_text alanına yaz.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        days: datetime.date listesi.
+        client: LLMClient nesnesi (None ise get_llm_client()).
+        budget: Tek istemin en fazla tahmini jeton sayısı.
+
+    Returns:
+        dict: updated (metni değişen gün), calls (model çağrısı), cache_hits (önbellek isabeti).
+    """
+    stats = {'updated': 0, 'calls': 0, 'cache_hits': 0}
+    client = client or get_llm_client()
+    if client is None:
+        return stats
+
+    summaries = {
+        summary.date.date(): summary
+        for summary in db_session.query(DailySummary).filter(DailySummary.date.in_([day_bounds(day)[0] for day in days]))
+    }
+    for day in days:
+        summary = summaries.get(day)
+        if summary is None or not summary.total_active_time:
+            continue
+        try:
+            text = summarize_digest(db_session, client, build_digest(db_session, day, summary), stats, budget)
+            if summary.summary_text != text:
+                summary.summary_text = text
+                summary.updated_at = datetime.datetime.now()
+                db_session.commit()
+                stats['updated'] += 1
+        except Exception as e:
+            logger.error(f"{day} için yapay zeka özeti oluşturulurken hata oluştu: {e}")
+            db_session.rollback()
+
+    logger.info(
+        f"Yapay zeka özetleri: {stats['updated']} gün güncellendi, "
+        f"{stats['calls']} model çağrısı, {stats['cache_hits']} önbellek isabeti"
+    )
+    return stats
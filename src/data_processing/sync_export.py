@@ -0,0 +1,209 @@
+"""
+Artımlı Eşitleme Dışa Aktarma Modülü.
+
+Bu modül, kaynak tablolarda son eşitlemeden bu yana eklenen, değişen veya
+silinen kayıtları tek bir sıkıştırılmış NDJSON toplu dosyasına yazar. Her
+kayıt, yazıcının tetikleyicilerle atadığı genel change_seq değerini taşır;
+silinen kayıtlar change_tombstones tablosundan silme kaydı olarak gelir.
+Tablo başına su işaretleri bir JSON dosyasında tutulur, böylece her gece
+yalnızca o günün farkı okunur.
+
+Toplu dosyadaki satırlar tablo içinde change_seq sırasındadır:
+
+    {"table": "window_activities", "op": "upsert", "change_seq": 42, "row": {...}}
+    {"table": "window_activities", "op": "delete", "change_seq": 43, "id": 7}
+"""
+import os
+import io
+import json
+import time
+import heapq
+import logging
+from sqlalchemy import select, text
+
+from data_collection.config import DATABASE_PATH, SYNC_EXPORT_DIR, EXPORT_CHUNK_SIZE
+from data_collection.database import create_read_engine, Base, ChangeTombstone, CHANGE_TRACKED_TABLES
+from data_processing.export import open_output, COMPRESSIONS
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_FILE_NAME = 'sync_watermark.json'
+
+def read_watermarks(path):
+    """Tablo başına su işaretlerini oku.
+
+    Args:
+        path: Su işareti dosyası.
+
+    Returns:
+        dict: Tablo adı → son aktarılan change_seq (dosya yoksa boş).
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as stream:
+            return {name: int(value) for name, value in json.load(stream)['tables'].items()}
+    except FileNotFoundError:
+        return {}
+
+def write_watermarks(path, watermarks):
+    """Su işaretlerini atomik olarak yaz."""
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as stream:
+        json.dump({'tables': watermarks}, stream, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+def current_sequence(connection):
+    """Genel değişiklik sayacının şu anki değerini döndür."""
+    return connection.execute(text("SELECT value FROM change_sequence WHERE name = 'global'")).scalar() or 0
+
+def _upserts(connection, table_name, since, until, chunk_size):
+    table = Base.metadata.tables[table_name]
+    names = [column.name for column in table.columns]
+    statement = (
+        select(*table.columns)
+        .where(table.c.change_seq > since, table.c.change_seq <= until)
+        .order_by(table.c.change_seq)
+    )
+    result = connection.execution_options(stream_results=True, yield_per=chunk_size).execute(statement)
+    for row in result:
+        record = dict(zip(names, row))
+        yield record['change_seq'], {'table': table_name, 'op': 'upsert', 'change_seq': record['change_seq'], 'row': record}
+
+def _deletes(connection, table_name, since, until, chunk_size):
+    statement = (
+        select(ChangeTombstone.change_seq, ChangeTombstone.row_id)
+        .where(ChangeTombstone.table_name == table_name,
+               ChangeTombstone.change_seq > since, ChangeTombstone.change_seq <= until)
+        .order_by(ChangeTombstone.change_seq)
+    )
+    result = connection.execution_options(stream_results=True, yield_per=chunk_size).execute(statement)
+    for change_seq, row_id in result:
+        yield change_seq, {'table': table_name, 'op': 'delete', 'change_seq': change_seq, 'id': row_id}
+
+def iter_changes(connection, table_name, since, until, chunk_size=EXPORT_CHUNK_SIZE):
+    """Tablonun (since, until] aralığındaki değişikliklerini sırayla üret.
+
+    Güncellemeler ve silmeler change_seq sırasıyla birleştirilir; böylece
+    silinip aynı kimlikle yeniden eklenen bir kayıt alıcıda doğru sırayla
+    uygulanır. Üst sınırdan sonra değişen kayıtlar yeni bir sıra numarası
+    aldığından bir sonraki eşitlemede gelir.
+
+    Yields:
+        dict: Değişiklik kaydı.
+    """
+    upserts = _upserts(connection, table_name, since, until, chunk_size)
+    deletes = _deletes(connection, table_name, since, until, chunk_size)
+    for _, change in heapq.merge(upserts, deletes, key=lambda item: item[0]):
+        yield change
+
+def sync_export(connection, directory, watermarks, tables=CHANGE_TRACKED_TABLES, compression='gzip',
+                chunk_size=EXPORT_CHUNK_SIZE):
+    """Su işaretlerinden sonraki değişiklikleri toplu dosyaya yaz.
+
+    Args:
+        connection: SQLAlchemy bağlantısı.
+        directory: Çıktı dizini.
+        watermarks: Tablo adı → son aktarılan change_seq.
+        tables: Aktarılacak tablolar.
+        compression: None, 'gzip' veya 'zstd'.
+        chunk_size: Tek seferde okunan satır sayısı.
+
+    Returns:
+        dict: Dosya (değişiklik yoksa None), güncelleme ve silme sayıları,
+            yeni su işaretleri, süre ve saniye başına kayıt.
+    """
+    began = time.perf_counter()
+    until = current_sequence(connection)
+    since = min(watermarks.get(table_name, 0) for table_name in tables)
+    path = os.path.join(directory, f"changes_{since:012d}_{until:012d}.ndjson")
+    if compression:
+        path += {'gzip': '.gz', 'zstd': '.zst'}[compression]
+
+    counts = {'upsert': 0, 'delete': 0}
+    temp_path = path + '.tmp'
+    stream = io.TextIOWrapper(open_output(temp_path, compression), encoding='utf-8', newline='\n')
+    try:
+        for table_name in tables:
+            buffer = []
+            for change in iter_changes(connection, table_name, watermarks.get(table_name, 0), until, chunk_size):
+                buffer.append(json.dumps(change, ensure_ascii=False, default=str, separators=(',', ':')))
+                counts[change['op']] += 1
+                if len(buffer) >= chunk_size:
+                    stream.write('\n'.join(buffer) + '\n')
+                    buffer = []
+            if buffer:
+                stream.write('\n'.join(buffer) + '\n')
+    except BaseException:
+        stream.close()
+        os.remove(temp_path)
+        raise
+    stream.close()
+
+    if counts['upsert'] or counts['delete']:
+        os.replace(temp_path, path)
+    else:
+        os.remove(temp_path)
+        path = None
+
+    seconds = time.perf_counter() - began
+    total = counts['upsert'] + counts['delete']
+    return {
+        'path': path,
+        'upserts': counts['upsert'],
+        'deletes': counts['delete'],
+        'watermarks': {**watermarks, **{table_name: until for table_name in tables}},
+        'seconds': seconds,
+        'rows_per_second': total / seconds if seconds > 0 else 0.0,
+    }
+
+def add_sync_export_arguments(parser):
+    """Eşitleme dışa aktarma argümanlarını ayrıştırıcıya ekle.
+
+    Args:
+        parser: argparse.ArgumentParser nesnesi.
+    """
+    parser.add_argument('--since', help='Başlangıç su işareti: change_seq değeri veya su işareti dosyası '
+                                        '(varsayılan: çıktı dizinindeki son su işareti)')
+    parser.add_argument('--tables', nargs='+', choices=CHANGE_TRACKED_TABLES, help='Aktarılacak tablolar (varsayılan: tümü)')
+    parser.add_argument('--compression', choices=COMPRESSIONS, default='gzip', help='Sıkıştırma')
+    parser.add_argument('--output', help='Çıktı dizini (varsayılan: SYNC_EXPORT_DIR)')
+    parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE, help='Tek seferde okunan satır sayısı')
+
+def run_sync_export(args, read_engine=None):
+    """Argümanlara göre artımlı eşitleme dosyası üret ve su işaretini ilerlet.
+
+    Args:
+        args: argparse.Namespace nesnesi.
+        read_engine: Okuma motoru (None ise veritabanı salt okunur açılır).
+
+    Returns:
+        dict: sync_export sonucu.
+    """
+    directory = args.output or SYNC_EXPORT_DIR
+    os.makedirs(directory, exist_ok=True)
+    watermark_path = os.path.join(directory, WATERMARK_FILE_NAME)
+    tables = tuple(args.tables or CHANGE_TRACKED_TABLES)
+
+    if args.since is None:
+        watermarks = read_watermarks(watermark_path)
+    elif args.since.isdigit():
+        watermarks = {table_name: int(args.since) for table_name in tables}
+    else:
+        watermarks = read_watermarks(args.since)
+
+    owns_engine = read_engine is None
+    read_engine = read_engine or create_read_engine(DATABASE_PATH, pool_size=1)
+    try:
+        with read_engine.connect() as connection:
+            result = sync_export(connection, directory, watermarks, tables, args.compression, args.chunk_size)
+    finally:
+        if owns_engine:
+            read_engine.dispose()
+
+    # Dosya tamamen yazıldıktan sonra su işareti ilerletilir
+    write_watermarks(watermark_path, {**read_watermarks(watermark_path), **result['watermarks']})
+    if result['path']:
+        logger.info(f"{result['upserts']} güncelleme, {result['deletes']} silme {result['seconds']:.2f} sn içinde "
+                    f"aktarıldı ({result['rows_per_second']:,.0f} kayıt/sn) → {result['path']}")
+    else:
+        logger.info("Son eşitlemeden bu yana değişiklik yok")
+    return result
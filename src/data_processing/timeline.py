@@ -0,0 +1,283 @@
+"""
+Birleşik aktivite zaman çizelgesi.
+
+Bu modül, pencere, tarayıcı ve oyun aralıklarını klavye, fare ve dosya
+olaylarıyla tek bir akışta birleştirerek çakışmayan zaman çizelgesi
+bölümleri oluşturur. Kaynak tablolar zamana göre sıralı okunur ve
+heapq.merge ile bellekte tamamen tutulmadan birleştirilir.
+
+Yeniden hesaplama birimi gündür; bölümler gece yarısında bölünür ve eklenen
+ya da güncellenen kayıtların dokunduğu günler silinip yeniden oluşturulur.
+"""
+import heapq
+import logging
+import datetime
+from sqlalchemy import select, delete, func
+
+from data_collection.config import INTERVAL_LOOKBACK_HOURS
+from data_collection.compaction import get_state, set_state
+from data_collection.database import (
+    WindowActivity, BrowserActivity, GameActivity, KeyboardActivity, MouseActivity, FileActivity, TimelineSegment,
+    ChangeSequence
+)
+
+logger = logging.getLogger(__name__)
+
+# Aralık kaynakları: (model, tür, bağlam sütunları)
+INTERVAL_SOURCES = (
+    (WindowActivity, 'window', (
+        WindowActivity.application_name,
+        func.coalesce(WindowActivity.normalized_title, WindowActivity.window_title),
+        WindowActivity.id
+    )),
+    (BrowserActivity, 'browser', (BrowserActivity.domain,)),
+    (GameActivity, 'game', (GameActivity.game_name,)),
+)
+
+# Nokta kaynakları: (model, tür, sayaç sütunları)
+POINT_SOURCES = (
+    (KeyboardActivity, 'keyboard', (KeyboardActivity.key_count,)),
+    (MouseActivity, 'mouse', (MouseActivity.click_count, MouseActivity.movement_pixels)),
+    (FileActivity, 'file', ()),
+)
+
+# Zaman çizelgesinin işlediği son değişiklik sırası
+_CHANGE_SEQ_STATE = 'timeline:change_seq'
+
+# Aynı anda başlayan aralıklar noktalardan önce işlenir
+_INTERVAL_START, _POINT = 0, 1
+
+def _same_activity(first, second):
+    """İki bağlamın aynı aktiviteyi gösterip göstermediğini kontrol et (pencere id'si hariç)."""
+    return first[:2] == second[:2] and first[3:] == second[3:]
+
+class _SegmentBuilder:
+    """Sıralı olay akışından çakışmayan bölümler oluşturan tarama çizgisi."""
+
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+        self.cursor = start
+        self.active = {}  # tür → (sıra no, bağlam)
+        self.pending_ends = []  # (bitiş, sıra no, tür)
+        self.sequence = 0
+        self.counts = [0, 0, 0, 0]  # tuş, tıklama, hareket, dosya
+        self.segments = []
+
+    def _context(self):
+        window = self.active.get('window', (None, (None, None, None)))[1]
+        browser = self.active.get('browser', (None, (None,)))[1]
+        game = self.active.get('game', (None, (None,)))[1]
+        return window + browser + game
+
+    def _advance(self, moment):
+        """İmleçten verilen ana kadar olan bölümü kapat."""
+        moment = min(moment, self.end)
+        if moment <= self.cursor:
+            return
+        context = self._context()
+        if any(value is not None for value in context) or any(self.counts):
+            previous = self.segments[-1] if self.segments else None
+            if previous is not None and previous['end'] == self.cursor and _same_activity(previous['context'], context):
+                previous['end'] = moment
+                previous['counts'] = [a + b for a, b in zip(previous['counts'], self.counts)]
+            else:
+                self.segments.append({'start': self.cursor, 'end': moment, 'context': context, 'counts': self.counts})
+        self.counts = [0, 0, 0, 0]
+        self.cursor = moment
+
+    def _close_until(self, moment):
+        """Verilen ana kadar biten aralıkları kapat."""
+        while self.pending_ends and self.pending_ends[0][0] <= moment:
+            ended, sequence, kind = heapq.heappop(self.pending_ends)
+            self._advance(ended)
+            if kind in self.active and self.active[kind][0] == sequence:
+                del self.active[kind]
+
+    def add(self, event):
+        """Olayı taramaya ekle.
+
+        Args:
+            event: (zaman, sıra türü, kaynak türü, bitiş, değerler) demeti.
+        """
+        moment, order, kind, ended, values = event
+        self._close_until(moment)
+        if order == _INTERVAL_START:
+            if ended <= self.start:
+                return
+            self._advance(moment)
+            self.sequence += 1
+            # Aynı türden yeni aralık öncekinin yerini alır
+            self.active[kind] = (self.sequence, values)
+            heapq.heappush(self.pending_ends, (ended, self.sequence, kind))
+        elif self.start <= moment < self.end:
+            if kind == 'keyboard':
+                self.counts[0] += values[0] or 0
+            elif kind == 'mouse':
+                self.counts[1] += values[0] or 0
+                self.counts[2] += values[1] or 0
+            else:
+                self.counts[3] += 1
+
+    def finish(self):
+        """Taramayı bitir ve bölümleri döndür."""
+        self._close_until(self.end)
+        self._advance(self.end)
+        return self.segments
+
+def _interval_stream(connection, model, kind, columns, start, end):
+    """Aralık kaynağını başlangıç zamanına göre sıralı olarak akıt."""
+    lookback = start - datetime.timedelta(hours=INTERVAL_LOOKBACK_HOURS)
+    query = (
+        select(model.timestamp, model.duration, *columns)
+        .where(model.timestamp >= lookback, model.timestamp < end)
+        .order_by(model.timestamp)
+    )
+    for row in connection.execute(query):
+        started = row[0]
+        yield (started, _INTERVAL_START, kind, started + datetime.timedelta(seconds=row[1] or 0), tuple(row[2:]))
+
+def _point_stream(connection, model, kind, columns, start, end):
+    """Nokta kaynağını zamana göre sıralı olarak akıt."""
+    query = (
+        select(model.timestamp, *columns)
+        .where(model.timestamp >= start, model.timestamp < end)
+        .order_by(model.timestamp)
+    )
+    for row in connection.execute(query):
+        yield (row[0], _POINT, kind, None, tuple(row[1:]))
+
+def build_segments(connection, start, end):
+    """Aralık için çakışmayan zaman çizelgesi bölümlerini oluştur.
+
+    Args:
+        connection: SQLAlchemy bağlantısı.
+        start: Aralık başlangıcı (datetime).
+        end: Aralık sonu (datetime).
+
+    Returns:
+        list: Bölüm sözlükleri (start, end, context, counts).
+    """
+    streams = [_interval_stream(connection, *source, start, end) for source in INTERVAL_SOURCES]
+    streams += [_point_stream(connection, *source, start, end) for source in POINT_SOURCES]
+    builder = _SegmentBuilder(start, end)
+    for event in heapq.merge(*streams, key=lambda event: (event[0], event[1])):
+        builder.add(event)
+    return builder.finish()
+
+def _to_rows(segments):
+    rows = []
+    for segment in segments:
+        application_name, window_title, window_id, domain, game_name = segment['context']
+        key_count, click_count, movement_pixels, file_events = segment['counts']
+        rows.append({
+            'start_time': segment['start'],
+            'end_time': segment['end'],
+            'duration': (segment['end'] - segment['start']).total_seconds(),
+            'application_name': application_name,
+            'window_title': window_title,
+            'window_id': window_id,
+            'domain': domain,
+            'game_name': game_name,
+            'key_count': key_count,
+            'click_count': click_count,
+            'movement_pixels': movement_pixels,
+            'file_events': file_events,
+        })
+    return rows
+
+def rebuild_day(db_session, day):
+    """Günün zaman çizelgesi bölümlerini yeniden oluştur (commit çağırana aittir).
+
+    Args:
+        db_session: Veritabanı oturumu.
+        day: datetime.date nesnesi.
+
+    Returns:
+        int: Oluşturulan bölüm sayısı.
+    """
+    start = datetime.datetime.combine(day, datetime.time.min)
+    end = start + datetime.timedelta(days=1)
+    connection = db_session.connection()
+    rows = _to_rows(build_segments(connection, start, end))
+    connection.execute(delete(TimelineSegment).where(TimelineSegment.start_time >= start, TimelineSegment.start_time < end))
+    if rows:
+        connection.execute(TimelineSegment.__table__.insert(), rows)
+    return len(rows)
+
+def _touched_days(db_session):
+    """Son çalıştırmadan bu yana değişen kayıtların dokunduğu günleri ve yeni sıra işaretini bul.
+
+    Kayıtlar id yerine change_seq ile izlenir; böylece eklemelerin yanında
+    sıkıştırmanın ve pencere bağlamanın güncellemeleri de yakalanır.
+    Sıkıştırmanın sildiği kayıtlar, genişletilen hayatta kalan kaydın
+    aralığı içinde kaldığından onun günleriyle birlikte yeniden oluşturulur.
+    """
+    since = int(get_state(db_session, _CHANGE_SEQ_STATE, 0))
+    current = db_session.execute(
+        select(ChangeSequence.value).where(ChangeSequence.name == 'global')
+    ).scalar() or 0
+    if current <= since:
+        return [], current
+
+    days = set()
+    for model, _, _ in INTERVAL_SOURCES + POINT_SOURCES:
+        duration = func.max(model.duration) if hasattr(model, 'duration') else func.max(0)
+        rows = db_session.execute(
+            select(func.min(model.timestamp), func.max(model.timestamp), duration)
+            .where(model.change_seq > since)
+            .group_by(func.date(model.timestamp))
+        )
+        for row_first, row_last, seconds in rows:
+            row_last = row_last + datetime.timedelta(seconds=seconds or 0)
+            days.update(
+                row_first.date() + datetime.timedelta(days=offset)
+                for offset in range((row_last.date() - row_first.date()).days + 1)
+            )
+    return sorted(days), current
+
+def update_timeline(db_session):
+    """Zaman çizelgesini artımlı olarak güncelle.
+
+    Her gün kendi işleminde yazılır; değişiklik sırası işareti yalnızca tüm günler
+    tamamlandığında ilerler, yarıda kalan çalıştırma bir sonrakinde tekrarlanır.
+
+    Args:
+        db_session: Veritabanı oturumu.
+
+    Returns:
+        dict: Gün → oluşturulan bölüm sayısı.
+    """
+    results = {}
+    try:
+        days, change_seq = _touched_days(db_session)
+        for day in days:
+            results[day] = rebuild_day(db_session, day)
+            db_session.commit()
+        set_state(db_session, _CHANGE_SEQ_STATE, change_seq)
+        db_session.commit()
+    except Exception as e:
+        logger.error(f"Zaman çizelgesi güncellenirken hata oluştu: {e}")
+        db_session.rollback()
+        raise
+    return results
+
+def get_timeline(db_session, start, end):
+    """Aralıkla kesişen zaman çizelgesi bölümlerini döndür.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        start: Aralık başlangıcı (datetime).
+        end: Aralık sonu (datetime).
+
+    Returns:
+        list: TimelineSegment nesneleri.
+    """
+    # Bölümler gece yarısında bölündüğü için bir günden uzun olamaz
+    lookback = start - datetime.timedelta(days=1)
+    return (
+        db_session.query(TimelineSegment)
+        .filter(TimelineSegment.start_time >= lookback, TimelineSegment.start_time < end, TimelineSegment.end_time > start)
+        .order_by(TimelineSegment.start_time)
+        .all()
+    )
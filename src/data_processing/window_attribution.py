@@ -0,0 +1,151 @@
+"""
+Pencere ilişkilendirme.
+
+Bu modül, klavye, fare, dosya, tarayıcı ve oyun kayıtlarını kayıt anında
+değil sonradan, zaman damgalarını kapsayan pencere aralıklarına bağlar.
+Aralıklar ve olaylar sıralı NumPy dizileri olarak okunur ve tüm olaylar
+tek bir searchsorted çağrısıyla eşleştirilir.
+"""
+import logging
+import datetime
+import numpy as np
+from sqlalchemy import select, func
+
+from data_collection.config import INTERVAL_LOOKBACK_HOURS
+from data_collection.write_path import bump_day_versions
+from data_collection.database import (
+    WindowActivity, KeyboardActivity, MouseActivity, FileActivity, BrowserActivity, GameActivity
+)
+
+logger = logging.getLogger(__name__)
+
+# Pencereye bağlanan modeller (aralık kayıtları başlangıç anlarına göre bağlanır)
+ATTRIBUTED_MODELS = (KeyboardActivity, MouseActivity, FileActivity, BrowserActivity, GameActivity)
+
+# Tek executemany çağrısındaki güncelleme sayısı
+UPDATE_BATCH_SIZE = 10000
+
+def _epoch_seconds(column):
+    """SQLite zaman damgasını Unix saniyesine dönüştüren ifade.
+
+    Dönüşümün veritabanında yapılması, satır başına Python datetime nesnesi
+    oluşturulmasını önler.
+    """
+    return (func.julianday(column) - 2440587.5) * 86400.0
+
+def _fetch_array(connection, query):
+    """Sorgu sonucunu iki boyutlu float64 dizisi olarak oku.
+
+    Satırlar önce düz demetlere dönüştürülür; Row nesnelerinden doğrudan dizi
+    oluşturmak her hücre için anahtar araması yapar ve çok yavaştır.
+    """
+    result = connection.execute(query)
+    rows = [tuple(row) for row in result.all()]
+    return np.array(rows, dtype=np.float64).reshape(len(rows), len(result.keys()))
+
+def load_window_intervals(connection, start, end):
+    """Aralıkla kesişebilecek pencere aralıklarını sıralı diziler olarak oku.
+
+    Args:
+        connection: SQLAlchemy bağlantısı.
+        start: Aralık başlangıcı (datetime).
+        end: Aralık sonu (datetime).
+
+    Returns:
+        tuple: (başlangıçlar, bitişler, id'ler) NumPy dizileri; başlangıca göre sıralı.
+    """
+    lookback = start - datetime.timedelta(hours=INTERVAL_LOOKBACK_HOURS)
+    data = _fetch_array(
+        connection,
+        select(_epoch_seconds(WindowActivity.timestamp), func.coalesce(WindowActivity.duration, 0), WindowActivity.id)
+        .where(WindowActivity.timestamp >= lookback, WindowActivity.timestamp < end)
+        .order_by(WindowActivity.timestamp)
+    )
+    if len(data) == 0:
+        empty = np.empty(0)
+        return empty, empty, np.empty(0, dtype=np.int64)
+    starts = data[:, 0]
+    # Çakışan aralıklarda sonraki pencere öncekini keser
+    ends = np.minimum(starts + data[:, 1], np.append(starts[1:], np.inf))
+    return starts, ends, data[:, 2].astype(np.int64)
+
+def match_windows(starts, ends, window_ids, timestamps):
+    """Olay zamanlarını kapsayan pencere id'lerini bul.
+
+    Args:
+        starts: Sıralı pencere başlangıçları.
+        ends: Pencere bitişleri.
+        window_ids: Pencere id'leri.
+        timestamps: Olay zamanları.
+
+    Returns:
+        numpy.ndarray: Olay başına pencere id'si; kapsayan pencere yoksa -1.
+    """
+    if len(starts) == 0:
+        return np.full(len(timestamps), -1, dtype=np.int64)
+    positions = np.searchsorted(starts, timestamps, side='right') - 1
+    clipped = np.clip(positions, 0, None)
+    inside = (positions >= 0) & (timestamps < ends[clipped])
+    return np.where(inside, window_ids[clipped], -1)
+
+def attribute_model(db_session, model, starts, ends, window_ids, start, end, only_missing=True):
+    """Tek bir tablonun kayıtlarını pencerelere bağla.
+
+    Returns:
+        int: Güncellenen kayıt sayısı.
+    """
+    query = select(model.id, _epoch_seconds(model.timestamp), func.coalesce(model.window_id, -1)).where(
+        model.timestamp >= start, model.timestamp < end
+    )
+    if only_missing:
+        query = query.where(model.window_id.is_(None))
+    connection = db_session.connection()
+    data = _fetch_array(connection, query)
+    if len(data) == 0:
+        return 0
+
+    row_ids = data[:, 0].astype(np.int64)
+    current = data[:, 2].astype(np.int64)
+    matched = match_windows(starts, ends, window_ids, data[:, 1])
+    changed = np.nonzero((matched != current) & (matched >= 0))[0]
+    if len(changed) == 0:
+        return 0
+
+    # Parametreler doğrudan sürücünün executemany çağrısına verilir
+    statement = f"UPDATE {model.__tablename__} SET window_id = ? WHERE id = ?"
+    for offset in range(0, len(changed), UPDATE_BATCH_SIZE):
+        batch = changed[offset:offset + UPDATE_BATCH_SIZE]
+        connection.exec_driver_sql(statement, list(zip(matched[batch].tolist(), row_ids[batch].tolist())))
+
+    # Uygulama bazlı sorgu sonuçları değiştiğinden etkilenen günlerin önbelleği geçersiz kılınır
+    epoch = datetime.date(1970, 1, 1)
+    bump_day_versions(connection, {
+        epoch + datetime.timedelta(days=int(day)) for day in np.unique(data[changed, 1] // 86400)
+    })
+    return len(changed)
+
+def attribute_windows(db_session, start, end, only_missing=True):
+    """Aralıktaki tüm olay kayıtlarını kapsayan pencerelere bağla.
+
+    Args:
+        db_session: Veritabanı oturumu.
+        start: Aralık başlangıcı (datetime).
+        end: Aralık sonu (datetime).
+        only_missing: True ise yalnızca window_id değeri boş olan kayıtlar işlenir.
+
+    Returns:
+        dict: Tablo adı → güncellenen kayıt sayısı.
+    """
+    results = {}
+    try:
+        starts, ends, window_ids = load_window_intervals(db_session.connection(), start, end)
+        for model in ATTRIBUTED_MODELS:
+            results[model.__tablename__] = attribute_model(
+                db_session, model, starts, ends, window_ids, start, end, only_missing
+            )
+        db_session.commit()
+    except Exception as e:
+        logger.error(f"Kayıtlar pencerelere bağlanırken hata oluştu: {e}")
+        db_session.rollback()
+        raise
+    return results
@@ -8,6 +8,11 @@ import sys
 import argparse
 import logging
 from data_collection.windows_service import install_service
+from data_processing.process_data import add_process_arguments, run_process
+from data_processing.export import add_export_arguments, run_export
+from data_processing.sync_export import add_sync_export_arguments, run_sync_export
+from data_processing.merge import add_merge_arguments, run_merge
+from content_publishing.publish_content import add_publish_arguments, run_publish
 
 # Logging yapılandırması
 logging.basicConfig(
@@ -33,11 +38,26 @@ def parse_args():
     
     # Veri işleme komutları
     process_parser = subparsers.add_parser('process', help='Veri işleme komutları')
-    process_parser.add_argument('--date', help='İşlenecek tarih (YYYY-MM-DD formatında)')
+    add_process_arguments(process_parser)
+    
+    # Dışa aktarma komutları
+    export_parser = subparsers.add_parser('export', help='Tabloları CSV, NDJSON veya Parquet olarak dışa aktar')
+    add_export_arguments(export_parser)
+    sync_export_parser = subparsers.add_parser('sync-export', help='Son eşitlemeden bu yana değişen kayıtları dışa aktar')
+    add_sync_export_arguments(sync_export_parser)
+    
+    # Çoklu makine birleştirme
+    merge_parser = subparsers.add_parser('merge', help='Farklı makinelerin veritabanlarını birleştir')
+    add_merge_arguments(merge_parser)
     
     # İçerik yayınlama komutları
     publish_parser = subparsers.add_parser('publish', help='İçerik yayınlama komutları')
-    publish_parser.add_argument('--date', help='Yayınlanacak tarih (YYYY-MM-DD formatında)')
+    add_publish_arguments(publish_parser)
+    
+    # Yerel okuma API'si
+    serve_parser = subparsers.add_parser('serve', help='Yerel okuma API\'sini başlat')
+    serve_parser.add_argument('--host', help='Dinlenecek adres (varsayılan: API_HOST)')
+    serve_parser.add_argument('--port', type=int, help='Dinlenecek port (varsayılan: API_PORT)')
     
     return parser.parse_args()
 
@@ -65,12 +85,22 @@ def main():
             install_service()
     elif args.command == 'process':
         # Veri işleme komutları
-        logger.info("Veri işleme modülü henüz uygulanmadı.")
-        # TODO: Veri işleme modülünü çağır
+        run_process(args)
+    elif args.command == 'export':
+        # Dışa aktarma komutları
+        run_export(args)
+    elif args.command == 'sync-export':
+        run_sync_export(args)
+    elif args.command == 'merge':
+        run_merge(args)
     elif args.command == 'publish':
-        # İçerik yayınlama komutları
-        logger.info("İçerik yayınlama modülü henüz uygulanmadı.")
-        # TODO: İçerik yayınlama modülünü çağır
+        # İçerik yayınlama komutları (Jinja2 yalnızca sayfa üretilirken içe aktarılır)
+        run_publish(args)
+    elif args.command == 'serve':
+        # FastAPI yalnızca bu komut için gereklidir
+        from data_collection.config import API_HOST, API_PORT
+        from content_publishing.api import serve
+        serve(args.host or API_HOST, args.port or API_PORT)
     else:
         logger.error("Geçersiz komut. Yardım için 'python src/main.py -h' komutunu kullanın.")
         sys.exit(1)
@@ -15,8 +15,10 @@ from data_collection.trackers.mouse_tracker import MouseTracker
 from data_collection.trackers.file_tracker import FileTracker
 from data_collection.trackers.browser_tracker import BrowserTracker
 from data_collection.trackers.game_tracker import GameTracker
+from data_collection.trackers.maintenance_tracker import MaintenanceTracker
 from data_collection.database import get_session, ActivitySession
-from data_collection.config import DATABASE_PATH
+from data_collection.config import DATABASE_PATH, ENABLE_LIVE_STREAM
+from data_collection.event_bus import event_bus
 
 # Logging yapılandırması
 logging.basicConfig(
@@ -65,7 +67,8 @@ def main():
         MouseTracker(session.id),
         FileTracker(session.id),
         BrowserTracker(session.id),
-        GameTracker(session.id)
+        GameTracker(session.id),
+        MaintenanceTracker(session.id)
     ]
     
     for tracker in trackers:
@@ -74,6 +77,15 @@ def main():
         except Exception as e:
             logger.error(f"{tracker.__class__.__name__} başlatılırken hata oluştu: {e}")
     
+    # Canlı olay akışı izleyicilerle aynı süreçte çalışmalıdır (FastAPI isteğe bağlıdır)
+    live_server = None
+    if ENABLE_LIVE_STREAM:
+        try:
+            from content_publishing.api import start_background_server
+            live_server = start_background_server(event_bus)
+        except ImportError as e:
+            logger.warning(f"Canlı olay akışı başlatılamadı, FastAPI/uvicorn kurulu değil: {e}")
+    
     try:
         # Ana program çalışırken bekle
         logger.info("Aktivite takibi başladı. Durdurmak için Ctrl+C tuşlarına basın.")
@@ -86,6 +98,9 @@ def main():
     except Exception as e:
         logger.error(f"Çalışma sırasında hata oluştu: {e}")
     finally:
+        if live_server is not None:
+            live_server.should_exit = True
+        
         # İzleyicileri durdur
         for tracker in trackers:
             try:
@@ -0,0 +1,19 @@
+"""
+Test ortamı ayarları.
+
+database modülü içe aktarılırken yapılandırılan veritabanını oluşturur ve
+şemasını günceller; testlerin data/ altındaki gerçek veritabanına, biriktirme
+günlüğüne ve commit işaretine dokunmaması için yollar geçici bir dizine
+yönlendirilir. Ayarlar test modülleri içe aktarılmadan önce yapılmalıdır.
+"""
+import os
+import atexit
+import shutil
+import tempfile
+
+_TEMP_DIR = tempfile.mkdtemp(prefix='activity-tests-')
+atexit.register(shutil.rmtree, _TEMP_DIR, ignore_errors=True)
+
+os.environ.setdefault('DATABASE_PATH', os.path.join(_TEMP_DIR, 'activity_data.db'))
+os.environ.setdefault('SPOOL_PATH', os.path.join(_TEMP_DIR, 'write_spool.bin'))
+os.environ.setdefault('QUERY_CACHE_PATH', os.path.join(_TEMP_DIR, 'query_cache.db'))
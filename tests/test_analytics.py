@@ -0,0 +1,108 @@
+"""
+DuckDB analitik modülü için test modülü.
+"""
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import datetime
+from unittest.mock import patch
+from sqlalchemy import create_engine
+
+# Modül yolunu ekle (veri işleme modülü src dizinini kök olarak kullanır)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from data_collection.database import Base, WindowActivity, KeyboardActivity, BrowserActivity, create_read_engine
+from data_processing.export import export_table, output_path
+from data_processing.analytics import AnalyticsEngine, AnalyticsUnavailable, SOURCE_PARQUET, SOURCE_SQLITE
+
+try:
+    import duckdb
+    import pyarrow
+except ImportError:  # DuckDB ve pyarrow yalnızca analitik için gereklidir
+    duckdb = None
+
+@unittest.skipIf(duckdb is None, "duckdb veya pyarrow kurulu değil")
+class TestAnalytics(unittest.TestCase):
+    """DuckDB analitik motoru için test sınıfı."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'activity.db')
+        engine = create_engine(f'sqlite:///{self.db_path}')
+        Base.metadata.create_all(engine)
+        self.start = datetime.datetime(2024, 1, 15, 9, 0)
+        with engine.begin() as connection:
+            connection.execute(WindowActivity.__table__.insert(), [
+                {'id': 1, 'timestamp': self.start, 'application_name': "code.exe", 'duration': 600, 'session_id': 1},
+                {'id': 2, 'timestamp': self.start + datetime.timedelta(minutes=10), 'application_name': "slack.exe",
+                 'duration': 120, 'session_id': 1},
+            ])
+            connection.execute(KeyboardActivity.__table__.insert(), [
+                {'timestamp': self.start + datetime.timedelta(minutes=minute), 'key_count': 30, 'window_id': 1, 'session_id': 1}
+                for minute in range(4)
+            ] + [
+                {'timestamp': self.start + datetime.timedelta(minutes=10), 'key_count': 5, 'window_id': 2, 'session_id': 1}
+            ])
+            connection.execute(BrowserActivity.__table__.insert(), [
+                {'timestamp': self.start, 'domain': "github.com", 'url': "https://github.com", 'duration': 300, 'session_id': 1},
+                {'timestamp': self.start + datetime.timedelta(days=40), 'domain': "github.com", 'url': "https://github.com",
+                 'duration': 60, 'session_id': 1},
+            ])
+        engine.dispose()
+
+        read_engine = create_read_engine(self.db_path, pool_size=1)
+        with read_engine.connect() as connection:
+            for table_name in ('window_activities', 'keyboard_activities', 'browser_activities'):
+                export_table(connection, table_name, output_path(self.temp_dir, table_name, 'parquet'), 'parquet')
+        read_engine.dispose()
+        self.range = (datetime.datetime(2024, 1, 1), datetime.datetime(2025, 1, 1))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_reports_over_parquet(self):
+        """Parquet arşivi üzerinde standart raporları test et."""
+        with AnalyticsEngine(SOURCE_PARQUET, parquet_dir=self.temp_dir) as analytics:
+            self.assertEqual(set(analytics.tables), {'window_activities', 'keyboard_activities', 'browser_activities'})
+
+            intensity = analytics.report('typing_intensity', *self.range).to_pylist()
+            self.assertEqual(intensity[0]['application_name'], "code.exe")
+            self.assertEqual((intensity[0]['keys'], intensity[0]['active_minutes']), (120, 4))
+            self.assertEqual(intensity[0]['keys_per_minute'], 30)
+
+            domains = analytics.report('domain_distribution', *self.range, output='pandas')
+            self.assertEqual(domains['seconds'].tolist(), [300, 60])
+
+            totals = analytics.query("SELECT sum(duration) AS total FROM window_activities").to_pylist()
+            self.assertEqual(totals, [{'total': 720}])
+
+    def test_sqlite_source(self):
+        """SQLite kaynağının (eklenti yüklenebiliyorsa) aynı sonucu verdiğini test et."""
+        try:
+            analytics = AnalyticsEngine(SOURCE_SQLITE, database_path=self.db_path)
+        except AnalyticsUnavailable as e:
+            self.skipTest(f"DuckDB sqlite eklentisi yüklenemedi: {e}")
+        with analytics:
+            rows = analytics.report('daily_app_totals', *self.range).to_pylist()
+        self.assertEqual([(row['application_name'], row['seconds']) for row in rows], [("code.exe", 600), ("slack.exe", 120)])
+
+    def test_missing_archive(self):
+        """Parquet arşivi yoksa anlaşılır hata verildiğini test et."""
+        connections = []
+        connect = duckdb.connect
+
+        def tracked_connect(*args, **kwargs):
+            connections.append(connect(*args, **kwargs))
+            return connections[-1]
+
+        with patch.object(duckdb, 'connect', side_effect=tracked_connect):
+            with self.assertRaises(AnalyticsUnavailable):
+                AnalyticsEngine(SOURCE_PARQUET, parquet_dir=os.path.join(self.temp_dir, 'yok'))
+        # Başarısız başlatmada bağlantı kapatılır
+        with self.assertRaises(duckdb.ConnectionException):
+            connections[0].execute("SELECT 1")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+"""
+Yerel okuma API'si için test modülü.
+"""
+import unittest
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Modül yolunu ekle (içerik yayınlama modülü src dizinini kök olarak kullanır)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from data_collection.database import (
+    Base, WindowActivity, BrowserActivity, TimelineSegment, create_read_engine, enable_wal
+)
+from data_collection.write_path import install_rollup_hooks, write_commit_watermark
+from data_processing.query_cache import QueryCache
+
+try:
+    from fastapi.testclient import TestClient
+    from content_publishing.api import create_app
+except ImportError:  # FastAPI yalnızca serve komutu için gereklidir
+    TestClient = None
+
+@unittest.skipIf(TestClient is None, "fastapi kurulu değil")
+class TestApi(unittest.TestCase):
+    """Yerel okuma API'si için test sınıfı."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'activity.db')
+        self.watermark_path = os.path.join(self.temp_dir, 'activity.db.watermark')
+        engine = create_engine(f'sqlite:///{self.db_path}', connect_args={'timeout': 0.2})
+        enable_wal(engine)
+        Base.metadata.create_all(engine)
+        self.engine = engine
+        self.Session = sessionmaker(bind=engine)
+        install_rollup_hooks(self.Session)
+
+        self.start = datetime.datetime(2024, 1, 15, 9, 0)
+        db_session = self.Session()
+        db_session.add_all([
+            WindowActivity(timestamp=self.start, application_name="code.exe", window_title="main.py - ActivityTracker",
+                           duration=600, session_id=1),
+            BrowserActivity(timestamp=self.start, domain="github.com", url="https://github.com/issues",
+                            title="Issues", duration=60, session_id=1),
+        ] + [
+            TimelineSegment(start_time=self.start + datetime.timedelta(minutes=index),
+                            end_time=self.start + datetime.timedelta(minutes=index + 1),
+                            duration=60, application_name="code.exe")
+            for index in range(2000)
+        ])
+        db_session.commit()
+        db_session.close()
+        write_commit_watermark(self.watermark_path)
+
+        self.read_engine = create_read_engine(self.db_path, pool_size=2)
+        self.client = TestClient(create_app(self.read_engine, self.watermark_path))
+        self.params = {'start': '2024-01-15T00:00:00', 'end': '2024-01-17T00:00:00'}
+
+    def tearDown(self):
+        self.read_engine.dispose()
+        self.engine.dispose()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_timeline_streams_ndjson(self):
+        """Zaman çizelgesinin NDJSON olarak akıtıldığını test et."""
+        response = self.client.get('/timeline', params=self.params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['content-type'], 'application/x-ndjson')
+        lines = response.text.splitlines()
+        self.assertEqual(len(lines), 2000)
+        self.assertEqual(json.loads(lines[0])['application_name'], "code.exe")
+
+    def test_aggregates_and_search(self):
+        """Toplam ve arama uç noktalarını test et."""
+        response = self.client.get('/aggregates/app', params=self.params)
+        self.assertEqual(response.json(), {"code.exe": 600})
+        self.assertEqual(self.client.get('/aggregates/unknown').status_code, 404)
+
+        response = self.client.get('/search', params={'q': 'github.com/iss'})
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual([row['source'] for row in rows], ["github.com"])
+
+    def test_etag_returns_304_until_writer_commits(self):
+        """Veri değişmediğinde 304, yazıcı commit ettiğinde yeni yanıt döndüğünü test et."""
+        first = self.client.get('/aggregates/app', params=self.params)
+        etag = first.headers['etag']
+
+        cached = self.client.get('/aggregates/app', params=self.params, headers={'If-None-Match': etag})
+        self.assertEqual(cached.status_code, 304)
+
+        # Farklı parametreler farklı ETag üretir
+        other = self.client.get('/aggregates/domain', params=self.params, headers={'If-None-Match': etag})
+        self.assertEqual(other.status_code, 200)
+
+        db_session = self.Session()
+        db_session.add(WindowActivity(timestamp=self.start, application_name="slack.exe", duration=30, session_id=1))
+        db_session.commit()
+        db_session.close()
+        write_commit_watermark(self.watermark_path)
+
+        changed = self.client.get('/aggregates/app', params=self.params, headers={'If-None-Match': etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.json()["slack.exe"], 30)
+
+    def set_watermark_time(self, seconds_ago):
+        """Commit işaretinin değişiklik zamanını geçmişe (negatifse geleceğe) taşı."""
+        moment = time.time() - seconds_ago
+        os.utime(self.watermark_path, (moment, moment))
+
+    def test_if_modified_since(self):
+        """Last-Modified değerinin koşullu isteklerde 304 ürettiğini test et."""
+        self.set_watermark_time(10)
+        first = self.client.get('/aggregates/app', params=self.params)
+        last_modified = first.headers['last-modified']
+
+        cached = self.client.get('/aggregates/app', params=self.params, headers={'If-Modified-Since': last_modified})
+        self.assertEqual(cached.status_code, 304)
+
+        write_commit_watermark(self.watermark_path)
+        self.set_watermark_time(5)
+        changed = self.client.get('/aggregates/app', params=self.params, headers={'If-Modified-Since': last_modified})
+        self.assertEqual(changed.status_code, 200)
+
+    def test_last_modified_omitted_within_commit_second(self):
+        """İşaretin saniyesi bitmeden Last-Modified gönderilmediğini test et."""
+        # Saniye sınırına denk gelmemek için işaret geleceğe taşınır
+        self.set_watermark_time(-30)
+        response = self.client.get('/aggregates/app', params=self.params)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('last-modified', response.headers)
+        self.assertIn('etag', response.headers)
+
+    def test_open_read_does_not_block_writer_commit(self):
+        """Açık bir okuma sürerken yazıcının commit edebildiğini test et."""
+        with self.read_engine.connect() as connection:
+            rows = connection.exec_driver_sql("SELECT id FROM timeline_segments")
+            rows.fetchone()
+
+            db_session = self.Session()
+            db_session.add(WindowActivity(timestamp=self.start, application_name="slack.exe", duration=30, session_id=1))
+            db_session.commit()
+            db_session.close()
+            self.assertEqual(len(rows.fetchall()), 1999)
+
+    def test_cache_metrics(self):
+        """Sorgu önbelleği ölçümlerinin sunulduğunu test et."""
+        cache = QueryCache(None)
+        cache.put('a', '1', {"x": 1})
+        cache.get('a', '1')
+        client = TestClient(create_app(self.read_engine, self.watermark_path, query_cache=cache))
+        metrics = client.get('/cache/metrics').json()
+        self.assertEqual((metrics['memory_hits'], metrics['memory_items']), (1, 1))
+
+    def test_read_engine_is_read_only(self):
+        """Okuma motorunun yazmaya izin vermediğini test et."""
+        with self.read_engine.connect() as connection:
+            with self.assertRaises(Exception):
+                connection.exec_driver_sql("DELETE FROM window_activities")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Kategori kuralları motoru için test modülü.
+"""
+import unittest
+import os
+import sys
+import json
+import time
+import tempfile
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_collection.database import Base, WindowActivity, BrowserActivity, CategoryAssignment
+from src.data_collection.categories import (
+    CategoryRules, get_category_rules, sync_category_assignments, window_key, DEFAULT_CATEGORY
+)
+
+class TestCategoryRules(unittest.TestCase):
+    """Kategori kuralları için test sınıfı."""
+
+    def setUp(self):
+        self.rules = CategoryRules([
+            {"category": "learning", "domains": ["coursera.org"], "titles": ["(?i)tutorial"]},
+            {"category": "work", "apps": ["code*.exe"], "paths": ["/home/me/projects"]},
+        ], weights={"learning": 0.9})
+
+    def test_app_globs_and_builtin_rules(self):
+        """Uygulama desenlerinin ve yerleşik kuralların uygulandığını test et."""
+        self.assertEqual(self.rules.classify("Code-Insiders.exe"), "work")
+        self.assertEqual(self.rules.classify("slack.exe"), "communication")
+        self.assertEqual(self.rules.classify("unknown.exe"), DEFAULT_CATEGORY)
+
+    def test_domain_suffixes(self):
+        """Alan adı soneklerinin alt alan adlarıyla eşleştiğini test et."""
+        self.assertEqual(self.rules.classify(domain="www.coursera.org"), "learning")
+        self.assertEqual(self.rules.classify(domain="gist.github.com"), "development")
+        self.assertEqual(self.rules.classify(domain="notgithub.com"), DEFAULT_CATEGORY)
+
+    def test_rule_order_decides_between_fields(self):
+        """Birden fazla alan eşleştiğinde önce gelen kuralın kazandığını test et."""
+        self.assertEqual(self.rules.classify("chrome.exe", None, "Python Tutorial - YouTube"), "learning")
+        self.assertEqual(self.rules.classify("code.exe", None, "tutorial.md"), "learning")
+        self.assertEqual(self.rules.classify("chrome.exe", None, "Inbox"), "browsing")
+
+    def test_title_rule_order_beats_position_in_title(self):
+        """Başlıkta daha sonra eşleşse de önce gelen başlık kuralının kazandığını test et."""
+        rules = CategoryRules([
+            {"category": "learning", "titles": ["tutorial"]},
+            {"category": "communication", "titles": ["meet"]},
+        ])
+        self.assertEqual(rules.classify("x.exe", None, "meet about tutorial"), "learning")
+        self.assertEqual(rules.classify("x.exe", None, "meet about lunch"), "communication")
+
+    def test_path_prefixes(self):
+        """Yol öneklerinin yalnızca dizin sınırında eşleştiğini test et."""
+        self.assertEqual(self.rules.classify(path="/home/me/projects/app/main.py"), "work")
+        self.assertEqual(self.rules.classify(path="/home/me/projects-old/main.py"), DEFAULT_CATEGORY)
+
+    def test_weights(self):
+        """Kullanıcı ağırlıklarının yerleşik ağırlıkları güncellediğini test et."""
+        self.assertEqual(self.rules.weight("learning"), 0.9)
+        self.assertEqual(self.rules.weight("development"), 1.0)
+
+    def test_rules_file_is_reloaded_when_changed(self):
+        """Kurallar dosyası değiştiğinde yeniden derlendiğini test et."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "rules.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"rules": [{"category": "chat", "apps": ["slack.exe"]}]}, f)
+            first = get_category_rules(path)
+            self.assertIs(get_category_rules(path), first)
+            self.assertEqual(first.classify("slack.exe"), "chat")
+
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"rules": []}, f)
+            os.utime(path, ns=(time.time_ns(), time.time_ns() + 10 ** 9))
+            self.assertEqual(get_category_rules(path).classify("slack.exe"), "communication")
+
+class TestCategoryAssignments(unittest.TestCase):
+    """Kalıcı kategori atamaları için test sınıfı."""
+
+    def setUp(self):
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine)
+        self.db_session = sessionmaker(bind=engine)()
+        self.db_session.add_all([
+            WindowActivity(application_name="code.exe", window_title="main.py", normalized_title="main.py"),
+            WindowActivity(application_name="code.exe", window_title="main.py", normalized_title="main.py"),
+            WindowActivity(application_name="chrome.exe", window_title="Tutorial"),
+            BrowserActivity(domain="www.youtube.com"),
+        ])
+        self.db_session.commit()
+
+    def tearDown(self):
+        self.db_session.close()
+
+    def test_sync_touches_only_changed_keys(self):
+        """Kurallar değiştiğinde yalnızca etkilenen anahtarların güncellendiğini test et."""
+        affected = sync_category_assignments(self.db_session, CategoryRules())
+        self.assertEqual(len(affected["window"]), 2)
+        self.assertEqual(affected["domain"], {"www.youtube.com"})
+        self.assertEqual(self.db_session.query(CategoryAssignment).count(), 3)
+
+        self.assertEqual(sync_category_assignments(self.db_session, CategoryRules()), {"window": set(), "domain": set()})
+
+        rules = CategoryRules([{"category": "learning", "titles": ["(?i)tutorial"]}])
+        affected = sync_category_assignments(self.db_session, rules)
+        self.assertEqual(affected, {"window": {window_key("chrome.exe", "Tutorial")}, "domain": set()})
+        assignment = self.db_session.get(CategoryAssignment, ("window", window_key("chrome.exe", "Tutorial")))
+        self.assertEqual(assignment.category, "learning")
+
+if __name__ == '__main__':
+    unittest.main()
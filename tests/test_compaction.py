@@ -0,0 +1,136 @@
+"""
+Aralık sıkıştırma için test modülü.
+"""
+import unittest
+import os
+import sys
+import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_collection.database import Base, WindowActivity, KeyboardActivity, BrowserActivity
+from src.data_collection.compaction import compact_intervals, get_state
+from src.data_collection.write_path import get_day_versions, install_rollup_hooks, get_rollup_totals, DIMENSION_APP
+from src.data_collection.trackers import maintenance_tracker
+
+class TestCompaction(unittest.TestCase):
+    """Aralık sıkıştırma için test sınıfı."""
+
+    def setUp(self):
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine)
+        self.db_session = sessionmaker(bind=engine)()
+        self.start = datetime.datetime(2024, 1, 1, 9, 0, 0)
+
+    def tearDown(self):
+        self.db_session.close()
+
+    def _window(self, offset, duration, app="code.exe", title="main.py"):
+        window = WindowActivity(
+            session_id=1, timestamp=self.start + datetime.timedelta(seconds=offset),
+            window_title=title, normalized_title=title, application_name=app, duration=duration
+        )
+        self.db_session.add(window)
+        self.db_session.commit()
+        return window.id
+
+    def test_merges_adjacent_windows_and_repoints_references(self):
+        """Aynı anahtarlı yakın kayıtların birleştirildiğini ve referansların taşındığını test et."""
+        first = self._window(0, 60)
+        second = self._window(65, 60)
+        third = self._window(130, 30)
+        other = self._window(160, 10, app="chrome.exe", title="Docs")
+        self.db_session.add(KeyboardActivity(session_id=1, key_count=5, window_id=first))
+        self.db_session.commit()
+
+        results = compact_intervals(self.db_session, max_gap=10)
+
+        self.assertEqual(results['window_activities'], 2)
+        windows = self.db_session.query(WindowActivity).order_by(WindowActivity.id).all()
+        self.assertEqual([window.id for window in windows], [third, other])
+        self.assertEqual(windows[0].timestamp, self.start)
+        self.assertEqual(windows[0].duration, 160)
+        self.assertEqual(self.db_session.query(KeyboardActivity).one().window_id, third)
+        self.assertNotIn(second, [window.id for window in windows])
+
+    def test_changed_days_are_versioned(self):
+        """Sıkıştırılan günlerin sürümünün artırıldığını ve döndürüldüğünü test et."""
+        self._window(0, 60)
+        self._window(65, 60)
+        self._window(86400, 60, app="slack.exe", title="general")
+        days = set()
+        compact_intervals(self.db_session, max_gap=10, changed_days=days)
+
+        day = self.start.date()
+        self.assertEqual(days, {day})
+        self.assertEqual(get_day_versions(self.db_session, [day, day + datetime.timedelta(days=1)]), {
+            day: 1, day + datetime.timedelta(days=1): 0
+        })
+
+    def test_large_gap_is_not_merged(self):
+        """Eşikten büyük boşluklu kayıtların birleştirilmediğini test et."""
+        self._window(0, 60)
+        self._window(120, 60)
+
+        results = compact_intervals(self.db_session, max_gap=10)
+
+        self.assertEqual(results['window_activities'], 0)
+        self.assertEqual(self.db_session.query(WindowActivity).count(), 2)
+
+    def test_high_water_mark_is_incremental(self):
+        """Yüksek su işaretinin ilerlediğini ve yeni kayıtların önceki kayıtla birleştiğini test et."""
+        self._window(0, 60)
+        first_survivor = self._window(65, 60)
+        compact_intervals(self.db_session, max_gap=10)
+        self.assertEqual(int(get_state(self.db_session, 'compaction:window_activities')), first_survivor)
+
+        latest = self._window(130, 60)
+        results = compact_intervals(self.db_session, max_gap=10)
+
+        self.assertEqual(results['window_activities'], 1)
+        window = self.db_session.query(WindowActivity).one()
+        self.assertEqual(window.id, latest)
+        self.assertEqual(window.duration, 190)
+
+    def test_batches_cover_all_rows(self):
+        """Parti sınırındaki kayıtların da birleştirildiğini test et."""
+        for index in range(7):
+            self.db_session.add(BrowserActivity(
+                session_id=1, timestamp=self.start + datetime.timedelta(seconds=index * 10),
+                url="https://example.com/a", domain="example.com", duration=10
+            ))
+        self.db_session.commit()
+
+        results = compact_intervals(self.db_session, max_gap=5, batch_size=3)
+
+        self.assertEqual(results['browser_activities'], 6)
+        browser = self.db_session.query(BrowserActivity).one()
+        self.assertEqual(browser.duration, 70)
+
+    def test_maintenance_rebuilds_rollups_of_compacted_days(self):
+        """Bakım izleyicisinin sıkıştırılan günlerin toplamlarını kayıtlarla eşitlediğini test et."""
+        Session = sessionmaker(bind=self.db_session.get_bind())
+        install_rollup_hooks(Session)
+        db_session = Session()
+        for index in range(3):
+            db_session.add(WindowActivity(session_id=1, timestamp=self.start + datetime.timedelta(seconds=620 * index),
+                                          window_title="main.py", application_name="code.exe", duration=600))
+            db_session.commit()
+
+        tracker = maintenance_tracker.MaintenanceTracker(1)
+        tracker.db_session = db_session
+        tracker.is_running = True
+        tracker.last_run_time = float('-inf')
+        tracker._collect_data()
+
+        # Birleştirilen kaydın süresi aradaki boşlukları da içerir; toplam kayıtla aynıdır
+        self.assertEqual([window.duration for window in db_session.query(WindowActivity)], [1840])
+        end = self.start + datetime.timedelta(days=1)
+        self.assertEqual(get_rollup_totals(db_session, self.start, end, DIMENSION_APP), {"code.exe": 1840})
+        db_session.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+"""
+Günlük özet hesaplama için test modülü.
+"""
+import unittest
+import os
+import sys
+import json
+import datetime
+import tempfile
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Modül yolunu ekle (veri işleme modülü src dizinini kök olarak kullanır)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from data_collection.database import Base, WindowActivity, BrowserActivity, DailySummary
+from data_collection.categories import CategoryRules, sync_category_assignments
+from data_processing import daily_aggregator
+
+class TestDailyAggregator(unittest.TestCase):
+    """Günlük özet hesaplama için test sınıfı."""
+
+    def setUp(self):
+        # Havuz işlemleri kendi bağlantılarını açabilsin diye dosya tabanlı veritabanı kullanılır
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.temp_dir.name, 'activity.db')}")
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        self.day = datetime.date(2024, 1, 15)
+        self.start = datetime.datetime(2024, 1, 15)
+
+        db_session = self.Session()
+        db_session.add_all([
+            # Önceki günden taşan aralık: yalnızca 600 saniyesi bu güne aittir
+            WindowActivity(timestamp=self.start - datetime.timedelta(seconds=600), application_name="code.exe", duration=1200),
+            WindowActivity(timestamp=self.start + datetime.timedelta(hours=1), application_name="chrome.exe", duration=1000),
+            WindowActivity(timestamp=self.start + datetime.timedelta(hours=2), application_name="spotify.exe", duration=400),
+            BrowserActivity(timestamp=self.start + datetime.timedelta(hours=1), domain="github.com", duration=600),
+            BrowserActivity(timestamp=self.start + datetime.timedelta(hours=1, minutes=10), domain="www.youtube.com", duration=200),
+        ])
+        db_session.commit()
+        db_session.close()
+
+        self.patches = [
+            patch.object(daily_aggregator, 'engine', self.engine),
+            patch.object(daily_aggregator, 'get_session', self.Session),
+        ]
+        for patcher in self.patches:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patches:
+            patcher.stop()
+        self.engine.dispose()
+        self.temp_dir.cleanup()
+
+    def test_compute_day(self):
+        """Gün sınırlarının ve tarayıcı süresi dağıtımının doğru hesaplandığını test et."""
+        result = daily_aggregator.compute_day(self.day)
+
+        self.assertEqual(result["app_times"], {"chrome.exe": 1000, "code.exe": 600, "spotify.exe": 400})
+        self.assertEqual(result["domain_times"], {"github.com": 600, "www.youtube.com": 200})
+        self.assertEqual(result["category_times"], {
+            "development": 1200, "entertainment": 600, "browsing": 200
+        })
+        self.assertEqual(result["total_active_time"], 2000)
+        self.assertEqual(result["productivity_score"], 65.0)
+
+    def test_process_days_upserts_and_skips_unchanged(self):
+        """Özetin kaydedildiğini ve değişmeyen günlerin atlandığını test et."""
+        self.assertEqual(daily_aggregator.process_days([self.day], workers=1), [self.day])
+        self.assertEqual(daily_aggregator.process_days([self.day], workers=1), [])
+
+        db_session = self.Session()
+        db_session.add(WindowActivity(timestamp=self.start + datetime.timedelta(hours=3), application_name="code.exe", duration=100))
+        db_session.commit()
+        self.assertEqual(daily_aggregator.process_days([self.day], workers=1), [self.day])
+
+        summaries = db_session.query(DailySummary).all()
+        self.assertEqual(len(summaries), 1)
+        self.assertEqual(summaries[0].total_active_time, 2100)
+        self.assertEqual(json.loads(summaries[0].app_times)["code.exe"], 700)
+        db_session.close()
+
+    def test_process_pool_matches_serial(self):
+        """Havuz işlemlerinde hesaplanan özetlerin seri hesaplamayla aynı olduğunu test et."""
+        days = [self.day - datetime.timedelta(days=1), self.day]
+        self.assertEqual(daily_aggregator.process_days(days, workers=2, force=True), days)
+        db_session = self.Session()
+        pooled = {summary.date.date(): summary.app_times for summary in db_session.query(DailySummary)}
+        db_session.close()
+
+        daily_aggregator.process_days(days, workers=1, force=True)
+        db_session = self.Session()
+        serial = {summary.date.date(): summary.app_times for summary in db_session.query(DailySummary)}
+        db_session.close()
+        self.assertEqual(pooled, serial)
+        self.assertEqual(json.loads(pooled[self.day])["code.exe"], 600)
+
+    def test_rule_change_invalidates_only_affected_days(self):
+        """Kural değişikliğinin yalnızca ilgili anahtarları içeren günleri geçersiz kıldığını test et."""
+        other_day = self.day + datetime.timedelta(days=1)
+        db_session = self.Session()
+        db_session.add(WindowActivity(timestamp=self.start + datetime.timedelta(days=1, hours=9), application_name="excel.exe", duration=100))
+        db_session.commit()
+        sync_category_assignments(db_session, CategoryRules())
+        daily_aggregator.process_days([self.day, other_day], workers=1)
+
+        rules = CategoryRules([{"category": "music", "apps": ["spotify.exe"]}])
+        affected = sync_category_assignments(db_session, rules)
+        self.assertEqual(daily_aggregator.invalidate_summaries(db_session, affected), 1)
+        db_session.close()
+
+        with patch.object(daily_aggregator, 'get_category_rules', return_value=rules):
+            self.assertEqual(daily_aggregator.process_days([self.day, other_day], workers=1), [self.day])
+        db_session = self.Session()
+        summary = db_session.query(DailySummary).filter(DailySummary.date == self.start).one()
+        self.assertEqual(json.loads(summary.categories)["music"], 400)
+        db_session.close()
+
+    def test_weight_change_recomputes_days(self):
+        """Verimlilik ağırlığı değişikliğinin özetleri yeniden hesaplattığını test et."""
+        daily_aggregator.process_days([self.day], workers=1)
+        rules = CategoryRules(weights={"development": 0.5})
+        with patch.object(daily_aggregator, 'get_category_rules', return_value=rules):
+            self.assertEqual(daily_aggregator.process_days([self.day], workers=1), [self.day])
+            self.assertEqual(daily_aggregator.process_days([self.day], workers=1), [])
+
+if __name__ == '__main__':
+    unittest.main()
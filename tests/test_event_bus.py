@@ -0,0 +1,136 @@
+"""
+Canlı olay yolu için test modülü.
+"""
+import unittest
+import os
+import sys
+import json
+import time
+import threading
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_collection.event_bus import EventBus, InputTicker, EVENT_FILE, EVENT_KEYBOARD, EVENT_WINDOW_FOCUS
+
+class TestEventBus(unittest.TestCase):
+    """Canlı olay yolu için test sınıfı."""
+
+    def test_publish_without_subscribers_is_noop(self):
+        """Abone yokken yayının hiçbir şey yapmadığını test et."""
+        bus = EventBus()
+        self.assertEqual(bus.publish(EVENT_FILE, file_path="a.txt"), 0)
+        self.assertEqual(bus.get_metrics()['published'], 0)
+
+    def test_fan_out_and_type_filter(self):
+        """Olayların tüm abonelere ve tür filtresine göre iletildiğini test et."""
+        bus = EventBus()
+        everything = bus.subscribe()
+        focus_only = bus.subscribe(event_types=[EVENT_WINDOW_FOCUS])
+
+        bus.publish(EVENT_FILE, file_path="a.txt", action="modified")
+        bus.publish(EVENT_WINDOW_FOCUS, application_name="code.exe")
+
+        self.assertEqual([event['type'] for event in everything.get(timeout=0)], [EVENT_FILE, EVENT_WINDOW_FOCUS])
+        events = focus_only.get(timeout=0)
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]['application_name'], "code.exe")
+
+    def test_blocking_consumer_wakes_up_quickly(self):
+        """Bekleyen tüketicinin yayından hemen sonra uyandığını test et."""
+        bus = EventBus()
+        subscription = bus.subscribe()
+        received = []
+
+        def consume():
+            received.extend(subscription.get(timeout=2.0))
+            received.append(time.perf_counter())
+
+        thread = threading.Thread(target=consume)
+        thread.start()
+        time.sleep(0.05)
+        published_at = time.perf_counter()
+        bus.publish(EVENT_FILE, file_path="a.txt")
+        thread.join()
+        self.assertEqual(received[0]['file_path'], "a.txt")
+        self.assertLess(received[-1] - published_at, 0.1)
+
+    def test_slow_consumer_is_dropped(self):
+        """Yetişemeyen abonenin önce eski olaylarının, sonra bağlantısının düşürüldüğünü test et."""
+        bus = EventBus()
+        slow = bus.subscribe(max_size=4)
+        fast = bus.subscribe(max_size=4)
+
+        for index in range(6):
+            bus.publish(EVENT_FILE, index=index)
+            fast.get(timeout=0)
+        self.assertEqual([event['index'] for event in slow.get(timeout=0)], [2, 3, 4, 5])
+        self.assertEqual(slow.dropped, 2)
+
+        for index in range(8):
+            bus.publish(EVENT_FILE, index=index)
+            fast.get(timeout=0)
+        self.assertTrue(slow.closed)
+        self.assertFalse(fast.closed)
+        metrics = bus.get_metrics()
+        self.assertEqual((metrics['subscribers'], metrics['disconnected']), (1, 1))
+
+    def test_input_ticker_coalesces(self):
+        """Girdi sayaçlarının aralık içinde birleştirildiğini test et."""
+        bus = EventBus()
+        subscription = bus.subscribe()
+        ticker = InputTicker(bus, EVENT_KEYBOARD, interval=60)
+        for _ in range(5):
+            ticker.add(keys=1)
+        ticker.flush()
+        self.assertEqual([event['keys'] for event in subscription.get(timeout=0)], [1, 4])
+
+    def test_input_ticker_publishes_trailing_burst(self):
+        """Aralık içinde biriken son girdilerin yeni girdi beklenmeden yayınlandığını test et."""
+        bus = EventBus()
+        subscription = bus.subscribe()
+        ticker = InputTicker(bus, EVENT_KEYBOARD, interval=0.05)
+        for _ in range(3):
+            ticker.add(keys=1)
+        self.assertEqual([event['keys'] for event in subscription.get(timeout=0)], [1])
+        self.assertEqual([event['keys'] for event in subscription.get(timeout=1)], [2])
+
+class TestLiveEndpoints(unittest.TestCase):
+    """Canlı olay uç noktaları için test sınıfı."""
+
+    def setUp(self):
+        sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+        try:
+            from fastapi.testclient import TestClient
+            from content_publishing.api import create_app, sse_frames
+        except ImportError:
+            self.skipTest("fastapi kurulu değil")
+        from data_collection.database import create_read_engine
+        from data_collection.event_bus import EventBus as AppEventBus
+        self.bus = AppEventBus()
+        self.read_engine = create_read_engine(':memory:')
+        self.client = TestClient(create_app(self.read_engine, None, self.bus))
+        self.sse_frames = sse_frames
+
+    def tearDown(self):
+        self.read_engine.dispose()
+
+    def test_websocket_receives_published_events(self):
+        """WebSocket istemcisinin yayınlanan olayları aldığını test et."""
+        with self.client.websocket_connect('/live/ws') as websocket:
+            deadline = time.monotonic() + 2.0
+            while not self.bus.has_subscribers and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.bus.publish('file', file_path="a.txt", action="created")
+            events = json.loads(websocket.receive_text())
+        self.assertEqual(events[0]['file_path'], "a.txt")
+        self.assertEqual(self.client.get('/live/metrics').json()['delivered'], 1)
+
+    def test_sse_frames(self):
+        """SSE çerçeve biçimini test et."""
+        frame = self.sse_frames([{'type': 'file', 'file_path': "a.txt"}])
+        self.assertTrue(frame.startswith("event: file\ndata: "))
+        self.assertTrue(frame.endswith("\n\n"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Sınırlı olay kuyruğu için test modülü.
+"""
+import unittest
+import os
+import sys
+import threading
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_collection.event_queue import BoundedEventQueue
+
+class TestBoundedEventQueue(unittest.TestCase):
+    """Sınırlı olay kuyruğu için test sınıfı."""
+
+    def test_drain_swaps_buffer(self):
+        """drain metodunun olayları sırayla döndürüp tamponu boşalttığını test et."""
+        queue = BoundedEventQueue(max_size=10)
+        for i in range(5):
+            queue.put(i)
+
+        self.assertEqual(list(queue.drain()), [0, 1, 2, 3, 4])
+        self.assertEqual(len(queue), 0)
+        self.assertEqual(list(queue.drain()), [])
+
+    def test_drop_oldest_policy(self):
+        """drop-oldest politikasında en eski olayların düşürüldüğünü test et."""
+        queue = BoundedEventQueue(max_size=3, overflow_policy="drop-oldest")
+        for i in range(5):
+            self.assertTrue(queue.put(i))
+
+        self.assertEqual(list(queue.drain()), [2, 3, 4])
+        metrics = queue.get_metrics()
+        self.assertEqual(metrics['dropped'], 2)
+        self.assertEqual(metrics['max_depth'], 3)
+
+    def test_sample_policy_keeps_capacity(self):
+        """sample politikasında tampon boyutunun aşılmadığını test et."""
+        queue = BoundedEventQueue(max_size=100, overflow_policy="sample")
+        for i in range(10000):
+            queue.put(i)
+
+        items = list(queue.drain())
+        self.assertEqual(len(items), 100)
+        self.assertEqual(queue.get_metrics()['dropped'], 9900)
+        # Örnek yalnızca ilk olaylardan oluşmamalı
+        self.assertTrue(any(item >= 100 for item in items))
+
+    def test_block_policy_waits_for_drain(self):
+        """block politikasında üreticinin tüketiciyi beklediğini test et."""
+        queue = BoundedEventQueue(max_size=1, overflow_policy="block", block_timeout=5.0)
+        queue.put("first")
+
+        producer = threading.Thread(target=queue.put, args=("second",))
+        producer.start()
+        producer.join(timeout=0.1)
+        self.assertTrue(producer.is_alive())
+
+        self.assertEqual(list(queue.drain()), ["first"])
+        producer.join(timeout=5.0)
+        self.assertFalse(producer.is_alive())
+        self.assertEqual(list(queue.drain()), ["second"])
+        self.assertEqual(queue.get_metrics()['dropped'], 0)
+
+    def test_block_policy_drops_after_timeout(self):
+        """block politikasında zaman aşımından sonra olayın düşürüldüğünü test et."""
+        queue = BoundedEventQueue(max_size=1, overflow_policy="block", block_timeout=0.01)
+        queue.put("first")
+
+        self.assertFalse(queue.put("second"))
+        self.assertEqual(queue.get_metrics()['dropped'], 1)
+
+    def test_invalid_policy(self):
+        """Geçersiz politika için hata verildiğini test et."""
+        with self.assertRaises(ValueError):
+            BoundedEventQueue(overflow_policy="unknown")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Toplu dışa aktarma modülü için test modülü.
+"""
+import unittest
+import os
+import sys
+import csv
+import gzip
+import json
+import shutil
+import argparse
+import tempfile
+import datetime
+from sqlalchemy import create_engine
+
+# Modül yolunu ekle (veri işleme modülü src dizinini kök olarak kullanır)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from data_collection.database import Base, FileActivity, WindowActivity, create_read_engine
+from data_processing.export import iter_chunks, export_table, output_path, add_export_arguments, run_export
+
+class TestExport(unittest.TestCase):
+    """Toplu dışa aktarma için test sınıfı."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'activity.db')
+        engine = create_engine(f'sqlite:///{self.db_path}')
+        Base.metadata.create_all(engine)
+        self.start = datetime.datetime(2024, 1, 15, 9, 0)
+        with engine.begin() as connection:
+            connection.execute(FileActivity.__table__.insert(), [
+                {'timestamp': self.start + datetime.timedelta(hours=index), 'file_path': f"C:/proje/dosya_{index}.py",
+                 'action': "modified", 'file_type': ".py", 'session_id': 1}
+                for index in range(48)
+            ])
+            connection.execute(WindowActivity.__table__.insert(), [
+                {'timestamp': self.start, 'application_name': "code.exe", 'window_title': "main.py, \"yeni\"",
+                 'duration': 60, 'session_id': 1}
+            ])
+        engine.dispose()
+        self.read_engine = create_read_engine(self.db_path, pool_size=1)
+
+    def tearDown(self):
+        self.read_engine.dispose()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def parse(self, *argv):
+        parser = argparse.ArgumentParser()
+        add_export_arguments(parser)
+        return parser.parse_args(list(argv) + ['--output', self.temp_dir])
+
+    def test_chunks_are_bounded(self):
+        """Satırların parça boyutunu aşmayan parçalarla okunduğunu test et."""
+        with self.read_engine.connect() as connection:
+            sizes = [len(chunk) for chunk in iter_chunks(connection, 'file_activities', chunk_size=10)]
+        self.assertEqual(sizes, [10, 10, 10, 10, 8])
+
+    def test_csv_gzip_with_date_range(self):
+        """Gzip sıkıştırılmış CSV çıktısını ve tarih aralığını test et."""
+        results = run_export(self.parse('--tables', 'file_activities', 'window_activities', '--compression', 'gzip',
+                                        '--start', '2024-01-15', '--end', '2024-01-15', '--chunk-size', '7'),
+                             self.read_engine)
+        self.assertEqual([result['rows'] for result in results], [15, 1])
+        self.assertGreater(results[0]['rows_per_second'], 0)
+
+        with gzip.open(results[0]['path'], 'rt', encoding='utf-8', newline='') as stream:
+            rows = list(csv.DictReader(stream))
+        self.assertEqual(len(rows), 15)
+        self.assertEqual(rows[0]['file_path'], "C:/proje/dosya_0.py")
+        with gzip.open(results[1]['path'], 'rt', encoding='utf-8', newline='') as stream:
+            self.assertEqual(next(csv.DictReader(stream))['window_title'], "main.py, \"yeni\"")
+        self.assertFalse(os.path.exists(results[0]['path'] + '.tmp'))
+
+    def test_ndjson_zstd(self):
+        """Zstd sıkıştırılmış NDJSON çıktısını test et."""
+        try:
+            import zstandard
+        except ImportError:
+            self.skipTest("zstandard kurulu değil")
+        path = output_path(self.temp_dir, 'file_activities', 'ndjson', 'zstd')
+        self.assertTrue(path.endswith('file_activities.ndjson.zst'))
+        with self.read_engine.connect() as connection:
+            result = export_table(connection, 'file_activities', path, 'ndjson', 'zstd', chunk_size=5)
+        self.assertEqual(result['rows'], 48)
+
+        with open(path, 'rb') as stream:
+            lines = zstandard.ZstdDecompressor().stream_reader(stream).read().decode('utf-8').splitlines()
+        self.assertEqual(len(lines), 48)
+        self.assertEqual(json.loads(lines[-1])['file_path'], "C:/proje/dosya_47.py")
+
+    def test_parquet_row_groups(self):
+        """Parquet çıktısının parça başına bir satır grubu içerdiğini test et."""
+        try:
+            import pyarrow.parquet
+        except ImportError:
+            self.skipTest("pyarrow kurulu değil")
+        results = run_export(self.parse('--tables', 'file_activities', '--format', 'parquet', '--compression', 'zstd',
+                                        '--chunk-size', '20'), self.read_engine)
+        parquet_file = pyarrow.parquet.ParquetFile(results[0]['path'])
+        self.assertEqual(parquet_file.metadata.num_rows, 48)
+        self.assertEqual(parquet_file.metadata.num_row_groups, 3)
+        table = parquet_file.read()
+        self.assertEqual(table.column('timestamp').to_pylist()[1], self.start + datetime.timedelta(hours=1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Dizin durum dizini için test modülü.
+"""
+import unittest
+import os
+import sys
+import tempfile
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_collection.database import Base, FileIndexEntry
+from src.data_collection.watch_roots import WatchRoot
+from src.data_collection.file_index import FileStateIndex
+
+class TestFileStateIndex(unittest.TestCase):
+    """Dizin durum dizini için test sınıfı."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.temp_dir.name, 'root')
+        os.makedirs(os.path.join(self.root, 'docs'))
+        os.makedirs(os.path.join(self.root, 'src'))
+        self.write('docs/a.txt', "a")
+        self.write('src/main.py', "print()")
+        self.engine = create_engine('sqlite://')
+        Base.metadata.create_all(self.engine)
+        self.db_session = sessionmaker(bind=self.engine)()
+        self.index = FileStateIndex(workers=2)
+        self.scan()
+
+    def tearDown(self):
+        self.db_session.close()
+        self.engine.dispose()
+        self.temp_dir.cleanup()
+
+    def path(self, relative):
+        return os.path.join(self.root, *relative.split('/'))
+
+    def write(self, relative, content):
+        with open(self.path(relative), 'w') as handle:
+            handle.write(content)
+
+    def touch_directory(self, relative):
+        """Dizin değişiklik zamanını ileri al (aynı zaman diliminde yapılan değişiklikler için)."""
+        path = self.path(relative)
+        mtime_ns = os.stat(path).st_mtime_ns + 10 ** 9
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    def scan(self):
+        """Kökü tara, sonucu kaydet ve değişiklikleri (eylem, göreli yol, kaynak) olarak döndür."""
+        changes, file_updates, deleted_files, dir_updates, removed_dirs = self.index.scan([WatchRoot(self.root)])
+        self.index.save(self.db_session, file_updates, deleted_files, dir_updates, removed_dirs)
+        self.dir_updates = dir_updates
+        return sorted(
+            (change.action, os.path.relpath(change.path, self.root),
+             change.src_path and os.path.relpath(change.src_path, self.root))
+            for change in changes
+        )
+
+    def indexed_paths(self):
+        return sorted(os.path.relpath(path, self.root) for path, in self.db_session.query(FileIndexEntry.path))
+
+    def test_initial_scan_reports_created_files(self):
+        """İlk taramada tüm dosyaların oluşturuldu olarak raporlandığını test et."""
+        index = FileStateIndex()
+        changes = index.scan([WatchRoot(self.root)])[0]
+        self.assertEqual(sorted(change.action for change in changes), ["created", "created"])
+        self.assertEqual(self.indexed_paths(), [os.path.join('docs', 'a.txt'), os.path.join('src', 'main.py')])
+
+    def test_unchanged_directories_are_skipped(self):
+        """Değişmeyen dizinlerin yeniden okunmadığını ve değişiklik üretmediğini test et."""
+        self.assertEqual(self.scan(), [])
+        self.assertEqual(self.dir_updates, {})
+
+    def test_create_and_delete(self):
+        """Yeni ve silinen dosyaların tespit edildiğini test et."""
+        self.write('docs/b.txt', "b")
+        os.remove(self.path('src/main.py'))
+        self.touch_directory('docs')
+        self.touch_directory('src')
+        self.assertEqual(self.scan(), [
+            ("created", os.path.join('docs', 'b.txt'), None),
+            ("deleted", os.path.join('src', 'main.py'), None)
+        ])
+        self.assertEqual(self.indexed_paths(), [os.path.join('docs', 'a.txt'), os.path.join('docs', 'b.txt')])
+
+    def test_modify(self):
+        """Yerinde değiştirilen dosyaların tam taramada tespit edildiğini test et."""
+        self.write('docs/a.txt', "longer content")
+        self.index.full_scan = True
+        self.assertEqual(self.scan(), [("modified", os.path.join('docs', 'a.txt'), None)])
+
+    def test_move_drops_source_path(self):
+        """Taşınan dosyanın eski yolunun dizinden çıkarıldığını test et."""
+        os.rename(self.path('docs/a.txt'), self.path('src/a.txt'))
+        self.touch_directory('docs')
+        self.touch_directory('src')
+        self.assertEqual(self.scan(), [("moved", os.path.join('src', 'a.txt'), os.path.join('docs', 'a.txt'))])
+        self.assertEqual(self.indexed_paths(), [os.path.join('src', 'a.txt'), os.path.join('src', 'main.py')])
+        self.assertNotIn(self.path('docs/a.txt'), self.index.files)
+
+        # Sonraki taramada eski yol yeniden silindi olarak raporlanmaz
+        self.touch_directory('docs')
+        self.assertEqual(self.scan(), [])
+
+        # Kalıcı durumdan yüklenen yeni bir dizin de aynı sonucu verir
+        self.index = FileStateIndex()
+        self.index.load(self.db_session)
+        self.assertEqual(self.scan(), [])
+
+if __name__ == '__main__':
+    unittest.main()
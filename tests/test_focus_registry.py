@@ -0,0 +1,62 @@
+"""
+Odak süresi kaydı için test modülü.
+"""
+import unittest
+import os
+import sys
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_collection.focus_registry import FocusRegistry
+
+class TestFocusRegistry(unittest.TestCase):
+    """Odak süresi kaydı için test sınıfı."""
+
+    def test_accumulates_focus_time(self):
+        """Odak sürelerinin birden fazla odaklanma boyunca biriktiğini test et."""
+        registry = FocusRegistry()
+        registry.activate("code:main.py", "code", now=0.0)
+        registry.activate("chrome:Inbox", "chrome", now=10.0)
+        registry.activate("code:main.py", "code", now=15.0)
+
+        self.assertEqual(registry.get_duration_ms("code:main.py", now=20.0), 15000)
+        self.assertEqual(registry.get_duration_ms("chrome:Inbox", now=20.0), 5000)
+        self.assertTrue(registry.is_active("code:main.py"))
+
+        registry.deactivate(now=25.0)
+        self.assertEqual(registry.get_duration_ms("code:main.py", now=100.0), 20000)
+        self.assertFalse(registry.is_active("code:main.py"))
+
+    def test_reactivating_same_key_keeps_running_span(self):
+        """Aynı öğenin yeniden etkinleştirilmesinin süreyi bölmediğini test et."""
+        registry = FocusRegistry()
+        registry.activate("code:main.py", "code", now=0.0)
+        registry.activate("code:main.py", "code", now=5.0)
+        self.assertEqual(registry.get_duration_ms("code:main.py", now=8.0), 8000)
+
+    def test_group_totals(self):
+        """Grup toplamlarının öğeler arasında toplandığını test et."""
+        registry = FocusRegistry()
+        registry.activate("code:a.py", "code", now=0.0)
+        registry.activate("code:b.py", "code", now=3.0)
+        registry.activate("chrome:x", "chrome", now=7.0)
+
+        self.assertEqual(registry.get_group_duration_ms("code", now=9.0), 7000)
+        self.assertEqual(registry.get_group_duration_ms("chrome", now=9.0), 2000)
+        self.assertEqual(registry.get_group_duration_ms("missing", now=9.0), 0)
+
+    def test_bounded_size_keeps_group_totals(self):
+        """Kapasite aşıldığında eski öğelerin çıkarıldığını ve grup toplamının korunduğunu test et."""
+        registry = FocusRegistry(max_entries=10)
+        for i in range(1000):
+            registry.activate(f"mail:({i}) Inbox", "mail", now=float(i))
+        registry.deactivate(now=1000.0)
+
+        self.assertEqual(len(registry), 10)
+        self.assertEqual(registry.get_duration_ms("mail:(0) Inbox"), 0)
+        self.assertEqual(registry.get_duration_ms("mail:(999) Inbox"), 1000)
+        self.assertEqual(registry.get_group_duration_ms("mail"), 1000000)
+
+if __name__ == '__main__':
+    unittest.main()
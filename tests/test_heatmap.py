@@ -0,0 +1,105 @@
+"""
+Isı haritası sorguları için test modülü.
+"""
+import unittest
+import os
+import sys
+import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Modül yolunu ekle (veri işleme modülü src dizinini kök olarak kullanır)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from data_collection.database import Base, WindowActivity, BrowserActivity, KeyboardActivity, DayCube
+from data_collection.write_path import bump_day_versions
+from data_processing import heatmap
+from data_processing.query_cache import QueryCache
+
+class TestHeatmap(unittest.TestCase):
+    """Isı haritası sorguları için test sınıfı."""
+
+    def setUp(self):
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine)
+        self.Session = sessionmaker(bind=engine)
+        self.day = datetime.date(2024, 1, 15)  # Pazartesi
+        self.start = datetime.datetime(2024, 1, 15)
+        self.now = datetime.datetime(2024, 1, 20, 12, 0)
+        self.cache = QueryCache(None)
+
+        db_session = self.Session()
+        window = WindowActivity(timestamp=self.start + datetime.timedelta(hours=9, minutes=50),
+                                application_name="code.exe", duration=1200)
+        db_session.add_all([
+            # Önceki günden taşan aralık: yalnızca 600 saniyesi bu güne aittir
+            WindowActivity(timestamp=self.start - datetime.timedelta(seconds=600), application_name="slack.exe", duration=1200),
+            window,
+            BrowserActivity(timestamp=self.start + datetime.timedelta(hours=11), domain="github.com", duration=60),
+        ])
+        db_session.flush()
+        db_session.add(KeyboardActivity(timestamp=self.start + datetime.timedelta(hours=10, minutes=5),
+                                        key_count=40, window_id=window.id))
+        db_session.commit()
+        db_session.close()
+
+    def test_hour_overlaps(self):
+        """Aralıkların saat sınırlarında bölündüğünü test et."""
+        import numpy as np
+        overlaps = heatmap.hour_overlaps(np.array([3000.0]), np.array([4200.0]), 0.0)
+        self.assertEqual(overlaps[0, 0], 600)
+        self.assertEqual(overlaps[0, 1], 600)
+        self.assertEqual(overlaps.sum(), 1200)
+
+    def test_heatmaps(self):
+        """Takvim ve haftanın günü × saat ısı haritalarının doğru toplandığını test et."""
+        db_session = self.Session()
+        end_day = self.day + datetime.timedelta(days=1)
+
+        calendar = heatmap.calendar_heatmap(db_session, self.day, end_day, now=self.now, cache=self.cache)
+        self.assertEqual(calendar, {self.day: 1800.0, end_day: 0.0})
+        self.assertEqual(heatmap.calendar_heatmap(db_session, self.day, self.day, 'active', 'app', 'code.exe',
+                                                  now=self.now, cache=self.cache), {self.day: 1200.0})
+        self.assertEqual(heatmap.calendar_heatmap(db_session, self.day, self.day, 'browsing', now=self.now, cache=self.cache),
+                         {self.day: 60.0})
+
+        grid = heatmap.week_hour_heatmap(db_session, self.day, end_day, now=self.now, cache=self.cache)
+        self.assertEqual(grid[0, 0], 600)
+        self.assertEqual(grid[0, 9], 600)
+        self.assertEqual(grid[0, 10], 600)
+        keys = heatmap.week_hour_heatmap(db_session, self.day, self.day, 'keys', now=self.now, cache=self.cache)
+        self.assertEqual(keys[0, 10], 40)
+        db_session.close()
+
+    def test_past_cubes_are_cached_and_recent_days_recomputed(self):
+        """Eski günlerin küplerinin saklandığını ve yakın günlerin saklanmadığını test et."""
+        db_session = self.Session()
+        heatmap.get_day_cubes(db_session, self.day, self.day + datetime.timedelta(days=5), now=self.now, cache=self.cache)
+        stored = {cube.day.date() for cube in db_session.query(DayCube).all()}
+        self.assertEqual(stored, {self.day + datetime.timedelta(days=offset) for offset in range(4)})
+
+        # Saklanan küp okunur; ham kayıt değişikliği invalidate_cubes çağrılana kadar görünmez
+        db_session.add(WindowActivity(timestamp=self.start + datetime.timedelta(hours=15), application_name="code.exe", duration=100))
+        db_session.commit()
+        self.assertEqual(heatmap.calendar_heatmap(db_session, self.day, self.day, now=self.now, cache=self.cache)[self.day], 1800.0)
+        self.assertEqual(heatmap.invalidate_cubes(db_session, [self.day]), 1)
+        self.assertEqual(heatmap.calendar_heatmap(db_session, self.day, self.day, now=self.now, cache=self.cache)[self.day], 1900.0)
+        db_session.close()
+
+    def test_day_version_change_rebuilds_stored_cube(self):
+        """Gün sürümü artan geçmiş günün saklanan küpünün yeniden oluşturulduğunu test et."""
+        db_session = self.Session()
+        self.assertEqual(heatmap.calendar_heatmap(db_session, self.day, self.day, 'keys', 'app', 'code.exe',
+                                                  now=self.now, cache=self.cache)[self.day], 40.0)
+        # Pencere eşleştirmesi gibi geçmiş kayıtları değiştiren bir yazma gün sürümünü artırır
+        window = db_session.query(WindowActivity).filter(WindowActivity.application_name == "code.exe").one()
+        db_session.add(KeyboardActivity(timestamp=self.start + datetime.timedelta(hours=10, minutes=6),
+                                        key_count=10, window_id=window.id))
+        bump_day_versions(db_session.connection(), [self.day])
+        db_session.commit()
+        self.assertEqual(heatmap.calendar_heatmap(db_session, self.day, self.day, 'keys', 'app', 'code.exe',
+                                                  now=self.now, cache=self.cache)[self.day], 50.0)
+        db_session.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Başlık anahtar kelimesi çıkarma için test modülü.
+"""
+import unittest
+import os
+import sys
+import datetime
+from unittest.mock import patch
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+# Modül yolunu ekle (veri işleme modülü src dizinini kök olarak kullanır)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from data_collection.database import Base, WindowActivity, BrowserActivity, TitleKeywords
+from data_processing import keywords
+
+try:
+    import spacy  # noqa: F401
+    SPACY_AVAILABLE = True
+except ImportError:
+    SPACY_AVAILABLE = False
+
+@unittest.skipUnless(SPACY_AVAILABLE, "spaCy kurulu değil")
+class TestKeywords(unittest.TestCase):
+    """Başlık anahtar kelimesi çıkarma için test sınıfı."""
+
+    def setUp(self):
+        self.engine = create_engine('sqlite://')
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        self.db_session = self.Session()
+        self.start = datetime.datetime(2024, 1, 15, 9)
+        rows = []
+        # Aynı başlık birçok kez tekrarlanır; yalnızca farklı başlıklar işlenmelidir
+        for index in range(30):
+            rows.append(WindowActivity(timestamp=self.start + datetime.timedelta(minutes=index), application_name="code.exe",
+                                       window_title="Invoice parser tests - Visual Studio Code", duration=60))
+        rows.append(WindowActivity(timestamp=self.start + datetime.timedelta(hours=1), application_name="chrome.exe",
+                                   window_title="Quarterly budget - Google Chrome", duration=300))
+        rows.append(BrowserActivity(timestamp=self.start + datetime.timedelta(hours=1), title="Quarterly budget review",
+                                    domain="docs.example.com", duration=300))
+        self.db_session.add_all(rows)
+        self.db_session.commit()
+
+    def tearDown(self):
+        self.db_session.close()
+
+    def test_titles_are_deduplicated_and_cached(self):
+        """Tekrarlanan başlıkların bir kez işlendiğini ve ikinci çalıştırmanın önbellekten geldiğini test et."""
+        processed = keywords.update_title_keywords(self.db_session, workers=1, model_name="blank:en")
+        self.assertEqual(processed, 3)
+        self.assertEqual(self.db_session.query(func.count(TitleKeywords.title_hash)).scalar(), 3)
+
+        cached = keywords.cached_keywords(self.db_session, ["Invoice parser tests - Visual Studio Code"])
+        self.assertEqual(cached["Invoice parser tests - Visual Studio Code"], ["invoice", "parser", "tests"])
+
+        with patch.object(keywords, 'extract_batch') as extract_batch:
+            self.assertEqual(keywords.update_title_keywords(self.db_session, workers=1, model_name="blank:en"), 0)
+        extract_batch.assert_not_called()
+
+        # Yeni bir başlık eklendiğinde yalnızca o işlenir
+        self.db_session.add(WindowActivity(timestamp=self.start + datetime.timedelta(hours=2),
+                                           application_name="word.exe", window_title="Hiring plan - Word", duration=120))
+        self.db_session.commit()
+        self.assertEqual(keywords.update_title_keywords(self.db_session, workers=1, model_name="blank:en"), 1)
+
+        # Model değiştiğinde önbellek geçersiz olur
+        self.assertEqual(len(keywords.find_missing_titles(
+            self.db_session, keywords.distinct_titles(self.db_session), keywords.extractor_id("blank:xx")
+        )), 4)
+
+    def test_process_pool(self):
+        """İşlem havuzunun tek işlemle aynı sonucu ürettiğini test et."""
+        keywords.update_title_keywords(self.db_session, workers=2, model_name="blank:en", batch_size=1)
+        titles = keywords.distinct_titles(self.db_session)
+        pooled = keywords.cached_keywords(self.db_session, titles)
+
+        keywords._init_worker("blank:en")
+        self.assertEqual(pooled, dict(zip(sorted(titles), keywords.extract_batch(sorted(titles)))))
+
+    def test_keyword_times(self):
+        """Anahtar kelime sürelerinin tarayıcı zamanı iki kez sayılmadan hesaplandığını test et."""
+        keywords.update_title_keywords(self.db_session, workers=1, model_name="blank:en")
+        times = dict(keywords.keyword_times(self.db_session, self.start, self.start + datetime.timedelta(days=1)))
+
+        self.assertEqual(times["invoice"], 1800)
+        self.assertEqual(times["parser"], 1800)
+        self.assertEqual(times["quarterly"], 300)
+        self.assertEqual(times["review"], 300)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+Çoklu makine birleştirme modülü için test modülü.
+"""
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import datetime
+from sqlalchemy import create_engine, update, delete, text
+from sqlalchemy.orm import sessionmaker
+
+# Modül yolunu ekle (veri işleme modülü src dizinini kök olarak kullanır)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from data_collection.database import Base, ActivitySession, WindowActivity, KeyboardActivity
+from data_collection.write_path import get_rollup_totals, DIMENSION_APP
+from data_processing.merge import merge_databases, DEVICE_ID_SPAN
+
+class TestMerge(unittest.TestCase):
+    """Veritabanı birleştirme için test sınıfı."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.target = os.path.join(self.temp_dir, 'merged.db')
+        self.start = datetime.datetime(2024, 1, 15, 9, 0)
+        self.sources = [self.make_source(name, app) for name, app in (('a', "code.exe"), ('b', "slack.exe"))]
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def make_source(self, name, app):
+        """Aynı kimlikleri kullanan bir kaynak veritabanı oluştur."""
+        path = os.path.join(self.temp_dir, f'{name}.db')
+        engine = create_engine(f'sqlite:///{path}')
+        Base.metadata.create_all(engine)
+        db_session = sessionmaker(bind=engine)()
+        db_session.add(ActivitySession(id=1, start_time=self.start))
+        db_session.add(WindowActivity(id=1, session_id=1, timestamp=self.start, application_name=app, duration=600))
+        db_session.add(KeyboardActivity(id=1, session_id=1, timestamp=self.start, key_count=10, window_id=1))
+        db_session.commit()
+        db_session.close()
+        engine.dispose()
+        return path
+
+    def open_target(self):
+        engine = create_engine(f'sqlite:///{self.target}')
+        return engine, sessionmaker(bind=engine)()
+
+    def test_ids_and_foreign_keys_are_remapped(self):
+        """Çakışan kimliklerin cihaz bloklarına taşındığını ve yabancı anahtarların izlendiğini test et."""
+        results = merge_databases(self.target, self.sources)
+        self.assertNotEqual(results[0]['device_id'], results[1]['device_id'])
+        self.assertEqual(results[0]['days'], {self.start.date()})
+
+        engine, db_session = self.open_target()
+        keyboards = db_session.query(KeyboardActivity).order_by(KeyboardActivity.id).all()
+        self.assertEqual([row.id for row in keyboards], [DEVICE_ID_SPAN + 1, 2 * DEVICE_ID_SPAN + 1])
+        self.assertEqual([row.window.application_name for row in keyboards], ["code.exe", "slack.exe"])
+        self.assertEqual([row.session_id for row in keyboards], [DEVICE_ID_SPAN + 1, 2 * DEVICE_ID_SPAN + 1])
+
+        # Toplamlar birleştirilen kayıtlardan yeniden oluşturulur
+        totals = get_rollup_totals(db_session, self.start, self.start + datetime.timedelta(days=1), DIMENSION_APP)
+        self.assertEqual(totals, {"code.exe": 600, "slack.exe": 600})
+        db_session.close()
+        engine.dispose()
+
+    def test_remerge_deduplicates_and_updates(self):
+        """Yeniden birleştirmenin kayıt çoğaltmadığını, yalnızca değişenleri aktardığını test et."""
+        merge_databases(self.target, self.sources)
+        again = merge_databases(self.target, self.sources)
+        self.assertEqual(sum(sum(result['rows'].values()) for result in again), 0)
+
+        engine = create_engine(f'sqlite:///{self.sources[0]}')
+        db_session = sessionmaker(bind=engine)()
+        db_session.execute(update(WindowActivity).where(WindowActivity.id == 1).values(duration=900))
+        db_session.add(WindowActivity(id=2, session_id=1, timestamp=self.start, application_name="chrome.exe", duration=60))
+        db_session.commit()
+        db_session.close()
+        engine.dispose()
+
+        result = merge_databases(self.target, self.sources[:1])[0]
+        self.assertEqual(result['rows']['window_activities'], 2)
+
+        engine, db_session = self.open_target()
+        self.assertEqual(db_session.query(WindowActivity).count(), 3)
+        self.assertEqual(db_session.get(WindowActivity, DEVICE_ID_SPAN + 1).duration, 900)
+        db_session.close()
+        engine.dispose()
+
+    def test_remerge_after_compaction_applies_deletions(self):
+        """Kaynakta sıkıştırılan aralıkların hedefte çift sayılmadığını test et."""
+        source = self.sources[0]
+        engine = create_engine(f'sqlite:///{source}')
+        db_session = sessionmaker(bind=engine)()
+        for row_id in (2, 3):
+            db_session.add(WindowActivity(
+                id=row_id, session_id=1, timestamp=self.start + datetime.timedelta(seconds=600 * (row_id - 1)),
+                application_name="code.exe", duration=600
+            ))
+        db_session.commit()
+        merge_databases(self.target, [source])
+
+        # Sıkıştırma üç pencereyi tek bir 1800 sn'lik kayıtta birleştirir
+        db_session.execute(update(WindowActivity).where(WindowActivity.id == 1).values(duration=1800))
+        db_session.execute(delete(WindowActivity).where(WindowActivity.id.in_([2, 3])))
+        db_session.commit()
+        result = merge_databases(self.target, [source])[0]
+        self.assertEqual(result['deleted']['window_activities'], 2)
+
+        # Aynı silmeler sonraki birleştirmelerde yeniden uygulanmaz
+        self.assertEqual(merge_databases(self.target, [source])[0]['deleted']['window_activities'], 0)
+
+        # Kaynağa cihaz kimliği yazılmaz
+        self.assertIsNone(db_session.execute(
+            text("SELECT value FROM maintenance_state WHERE name = 'device_id'")
+        ).scalar())
+        db_session.close()
+        engine.dispose()
+
+        engine, db_session = self.open_target()
+        self.assertEqual(db_session.query(WindowActivity).count(), 1)
+        totals = get_rollup_totals(db_session, self.start, self.start + datetime.timedelta(days=1), DIMENSION_APP)
+        self.assertEqual(totals, {"code.exe": 1800})
+        db_session.close()
+        engine.dispose()
+
+    def test_source_without_device_id_keeps_its_block(self):
+        """Cihaz kimliği olmayan kaynağın kaynağa yazılmadan aynı bloğu kullandığını test et."""
+        first = merge_databases(self.target, self.sources[:1])[0]
+        engine = create_engine(f'sqlite:///{self.sources[0]}')
+        db_session = sessionmaker(bind=engine)()
+        db_session.execute(update(WindowActivity).where(WindowActivity.id == 1).values(duration=900))
+        db_session.commit()
+        db_session.close()
+        engine.dispose()
+
+        # İçerik değişse de daha önce birleştirilen yol aynı cihaza eşlenir
+        again = merge_databases(self.target, self.sources[:1])[0]
+        self.assertEqual(again['device_id'], first['device_id'])
+        engine, db_session = self.open_target()
+        self.assertEqual(db_session.query(WindowActivity).count(), 1)
+        db_session.close()
+        engine.dispose()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Dosya yolu filtresi için test modülü.
+"""
+import unittest
+import os
+import sys
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_collection.path_filter import PathFilter, PrefixTrie, normalize_path
+
+HOME = os.path.abspath(os.path.join(os.sep, "home", "user"))
+
+class TestPathFilter(unittest.TestCase):
+    """Dosya yolu filtresi için test sınıfı."""
+
+    def setUp(self):
+        self.project_dir = os.path.join(HOME, "ActivityTracker")
+        self.path_filter = PathFilter(
+            excluded_roots=[os.path.join(HOME, "Documents", "Private")],
+            ignored_patterns=["*.tmp", "~$*", "*.swp", "*~", "*.db-journal"],
+            own_dirs=[self.project_dir],
+            own_files=[os.path.join(HOME, "activity.db")]
+        )
+
+    def test_accepts_regular_file(self):
+        """Normal dosyanın kabul edildiğini ve uzantısının döndüğünü test et."""
+        path = os.path.join(HOME, "Documents", "Report.DOCX")
+        self.assertEqual(self.path_filter.match(path), (path, "docx"))
+
+    def test_rejects_own_dirs_and_files(self):
+        """İzleyicinin kendi dizin ve dosyalarının elendiğini test et."""
+        self.assertIsNone(self.path_filter.match(os.path.join(self.project_dir, "data", "x.txt")))
+        self.assertIsNone(self.path_filter.match(os.path.join(HOME, "activity.db")))
+        self.assertIsNotNone(self.path_filter.match(os.path.join(HOME, "ActivityTracker2", "x.txt")))
+
+    def test_rejects_excluded_roots(self):
+        """Hariç tutulan dizinlerin bileşen sınırına göre elendiğini test et."""
+        self.assertIsNone(self.path_filter.match(os.path.join(HOME, "Documents", "Private", "a", "b.txt")))
+        self.assertIsNotNone(self.path_filter.match(os.path.join(HOME, "Documents", "PrivateNotes", "b.txt")))
+
+    def test_rejects_ignored_patterns(self):
+        """Yok sayılan dosya adı desenlerinin elendiğini test et."""
+        for name in ["cache.tmp", "CACHE.TMP", "~$report.docx", ".main.py.swp", "notes.md~", "app.db-journal"]:
+            self.assertIsNone(self.path_filter.match(os.path.join(HOME, "Desktop", name)), name)
+
+    def test_wildcard_patterns_match_whole_name(self):
+        """Ortasında joker olan ve jokersiz desenlerin tam dosya adıyla eşleştiğini test et."""
+        path_filter = PathFilter(ignored_patterns=["*cache*", "~$*.docx", "Thumbs.db", "*.sw?"])
+        for name in ["webcache.bin", "CacheFile", "~$report.docx", "thumbs.db", "main.py.swp"]:
+            self.assertIsNone(path_filter.match(os.path.join(HOME, "Desktop", name)), name)
+        for name in ["mythumbs.db", "thumbs.db.bak", "~$report.xlsx", "report.docx", "main.py.sw"]:
+            self.assertIsNotNone(path_filter.match(os.path.join(HOME, "Desktop", name)), name)
+
+    def test_prefix_trie(self):
+        """Önek ağacının kökün kendisini ve altını kapsadığını test et."""
+        root = normalize_path(os.path.join(HOME, "a"))
+        trie = PrefixTrie([root])
+        self.assertTrue(trie.contains(root))
+        self.assertTrue(trie.contains(normalize_path(os.path.join(HOME, "a", "b"))))
+        self.assertFalse(trie.contains(normalize_path(os.path.join(HOME, "ab"))))
+        self.assertFalse(PrefixTrie().contains(root))
+
+if __name__ == '__main__':
+    unittest.main()
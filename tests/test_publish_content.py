@@ -0,0 +1,99 @@
+"""
+Statik site yayınlama modülü için test modülü.
+"""
+import unittest
+import os
+import sys
+import json
+import shutil
+import tempfile
+import datetime
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Modül yolunu ekle (içerik yayınlama modülü src dizinini kök olarak kullanır)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from data_collection.database import Base, DailySummary, TimelineSegment
+
+from content_publishing import publish_content
+
+try:
+    import jinja2
+    import markdown
+except ImportError:  # Jinja2 ve markdown yalnızca sayfa üretimi için gereklidir
+    jinja2 = markdown = None
+
+@unittest.skipIf(jinja2 is None or markdown is None, "jinja2 veya markdown kurulu değil")
+class TestPublishContent(unittest.TestCase):
+    """Statik site yayınlama için test sınıfı."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.engine = create_engine('sqlite://')
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        self.patcher = patch.object(publish_content, 'get_session', self.Session)
+        self.patcher.start()
+
+        db_session = self.Session()
+        for offset in range(3):
+            self.add_day(db_session, datetime.date(2024, 1, 15) + datetime.timedelta(days=offset))
+        db_session.add(TimelineSegment(start_time=datetime.datetime(2024, 1, 15, 9), end_time=datetime.datetime(2024, 1, 15, 10),
+                                       duration=3600, application_name="code.exe", window_title="main.py"))
+        db_session.commit()
+        db_session.close()
+
+    def tearDown(self):
+        self.patcher.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def add_day(self, db_session, day, text=None):
+        db_session.add(DailySummary(
+            date=datetime.datetime.combine(day, datetime.time.min), total_active_time=3600, productivity_score=75.0,
+            categories=json.dumps({"Geliştirme": 3600}), app_times=json.dumps({"code.exe": 3600}),
+            domain_times=json.dumps({}), source_checksum=day.isoformat(), summary_text=text,
+            updated_at=datetime.datetime(2024, 2, 1)
+        ))
+
+    def publish(self, **kwargs):
+        return publish_content.publish_site(self.temp_dir, workers=1, **kwargs)
+
+    def test_full_build(self):
+        """İlk yayında tüm sayfaların ve statik dosyaların üretildiğini test et."""
+        written = self.publish()
+        self.assertEqual(sorted(written), [
+            'days/2024-01-15.html', 'days/2024-01-16.html', 'days/2024-01-17.html',
+            'index.html', 'months/2024-01.html', 'weeks/2024-W03.html',
+        ])
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, 'assets', 'style.css')))
+        with open(os.path.join(self.temp_dir, 'days', '2024-01-15.html'), encoding='utf-8') as stream:
+            html = stream.read()
+        self.assertIn('class="segment" style="left: 37.5%; width: 4.167%"', html)
+        self.assertIn("1 sa 00 dk", html)
+        self.assertEqual([name for name in os.listdir(os.path.join(self.temp_dir, 'days')) if name.endswith('.tmp')], [])
+
+    def test_incremental_build(self):
+        """Değişmeyen sayfaların atlandığını, yeni günün yalnızca ilgili sayfaları etkilediğini test et."""
+        self.publish()
+        self.assertEqual(self.publish(), [])
+
+        db_session = self.Session()
+        self.add_day(db_session, datetime.date(2024, 1, 22), text="**Yoğun** bir gün")
+        db_session.commit()
+        db_session.close()
+
+        written = self.publish()
+        self.assertEqual(sorted(written), ['days/2024-01-22.html', 'index.html', 'months/2024-01.html', 'weeks/2024-W04.html'])
+        with open(os.path.join(self.temp_dir, 'days', '2024-01-22.html'), encoding='utf-8') as stream:
+            self.assertIn("<strong>Yoğun</strong>", stream.read())
+
+    def test_parallel_build(self):
+        """Sayfaların işlem havuzunda üretilebildiğini test et."""
+        written = publish_content.publish_site(self.temp_dir, workers=2)
+        self.assertEqual(len(written), 6)
+        self.assertTrue(all(os.path.exists(os.path.join(self.temp_dir, path)) for path in written))
+
+if __name__ == '__main__':
+    unittest.main()
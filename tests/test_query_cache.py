@@ -0,0 +1,103 @@
+"""
+Sorgu sonuç önbelleği için test modülü.
+"""
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Modül yolunu ekle (veri işleme modülü src dizinini kök olarak kullanır)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from data_collection.database import Base, WindowActivity, KeyboardActivity
+from data_collection.write_path import install_rollup_hooks, get_day_versions
+from data_processing.query_cache import QueryCache
+
+class TestQueryCache(unittest.TestCase):
+    """Sorgu sonuç önbelleği için test sınıfı."""
+
+    def setUp(self):
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine)
+        self.Session = sessionmaker(bind=engine)
+        install_rollup_hooks(self.Session)
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'query_cache.db')
+        self.days = [datetime.date(2024, 1, 15), datetime.date(2024, 1, 16)]
+        self.calls = []
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _compute(self, day):
+        self.calls.append(day)
+        return {"day": day.isoformat()}
+
+    def test_writer_invalidates_only_touched_days(self):
+        """Yalnızca kayıt eklenen günün önbelleğinin geçersiz olduğunu test et."""
+        db_session = self.Session()
+        cache = QueryCache(self.path)
+        cache.get_days(db_session, 'report', {'k': 1}, self.days, self._compute)
+        cache.get_days(db_session, 'report', {'k': 1}, self.days, self._compute)
+        self.assertEqual(self.calls, self.days)
+
+        # Gece yarısını geçen aralık her iki günü de etkiler; klavye kaydı yalnızca kendi gününü
+        db_session.add(KeyboardActivity(timestamp=datetime.datetime(2024, 1, 16, 10, 0), key_count=5))
+        db_session.commit()
+        self.assertEqual(get_day_versions(db_session, self.days), {self.days[0]: 0, self.days[1]: 1})
+        cache.get_days(db_session, 'report', {'k': 1}, self.days, self._compute)
+        self.assertEqual(self.calls, self.days + [self.days[1]])
+
+        db_session.add(WindowActivity(timestamp=datetime.datetime(2024, 1, 15, 23, 50), application_name="code.exe",
+                                      duration=1200))
+        db_session.commit()
+        self.assertEqual(get_day_versions(db_session, self.days), {self.days[0]: 1, self.days[1]: 2})
+
+        stats = cache.stats()
+        self.assertEqual((stats['memory_hits'], stats['misses']), (3, 3))
+        self.assertGreater(stats['disk_bytes'], 0)
+        db_session.close()
+
+    def test_disk_cache_survives_restart(self):
+        """Disk önbelleğinin yeni bir önbellek nesnesinden okunduğunu test et."""
+        db_session = self.Session()
+        QueryCache(self.path).get_days(db_session, 'report', {}, self.days, self._compute)
+
+        cache = QueryCache(self.path, max_items=1)
+        result = cache.get_days(db_session, 'report', {}, self.days, self._compute)
+        self.assertEqual(result[self.days[1]], {"day": "2024-01-16"})
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(cache.stats()['disk_hits'], 2)
+        self.assertEqual(cache.stats()['memory_items'], 1)
+        self.assertEqual(cache.stats()['hit_rate'], 1.0)
+        db_session.close()
+
+    def test_disk_cache_prunes_least_recently_used(self):
+        """Bayt sınırı aşıldığında en uzun süredir kullanılmayan disk kayıtlarının silindiğini test et."""
+        value = b'x' * 1000
+        cache = QueryCache(self.path, max_items=1, max_disk_bytes=2500)
+        cache.put('a', '1', value)
+        cache.put('b', '1', value)
+        # Diskten okunan kayıt en son kullanılan olur
+        self.assertEqual(cache.get('a', '1'), (True, value))
+        cache.put('c', '1', value)
+
+        self.assertEqual(cache.get('b', '1'), (False, None))
+        self.assertTrue(cache.get('a', '1')[0])
+        self.assertTrue(cache.get('c', '1')[0])
+        stats = cache.stats()
+        self.assertEqual(stats['disk_evictions'], 1)
+        self.assertLessEqual(stats['disk_bytes'], 2500)
+
+        # Sınır yeniden açılan önbellekte de mevcut boyuttan hesaplanır
+        cache = QueryCache(self.path, max_disk_bytes=1500)
+        cache.put('d', '1', value)
+        self.assertEqual(cache.stats()['disk_bytes'], cache.disk_bytes)
+        self.assertLessEqual(cache.disk_bytes, 1500)
+
+if __name__ == '__main__':
+    unittest.main()
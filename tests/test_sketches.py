@@ -0,0 +1,108 @@
+"""
+Günlük özet çizimleri için test modülü.
+"""
+import unittest
+import os
+import sys
+import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_collection.database import Base, WindowActivity, BrowserActivity, FileActivity, DaySketch
+from src.data_collection.write_path import install_rollup_hooks
+from src.data_collection.sketches import (
+    SpaceSaving, CountMinSketch, HyperLogLog, top_k, distinct_count, rebuild_day_sketches, days_without_sketches
+)
+
+class TestSketches(unittest.TestCase):
+    """Günlük özet çizimleri için test sınıfı."""
+
+    def setUp(self):
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine)
+        self.Session = sessionmaker(bind=engine)
+        install_rollup_hooks(self.Session)
+        self.day = datetime.date(2024, 1, 15)
+        self.start = datetime.datetime(2024, 1, 15, 9, 0)
+
+    def test_hyperloglog_merge_and_roundtrip(self):
+        """HyperLogLog tahmininin hata sınırı içinde kaldığını ve birleştirmenin birleşim verdiğini test et."""
+        first, second = HyperLogLog(), HyperLogLog()
+        for index in range(20000):
+            first.add(f"file-{index}")
+            second.add(f"file-{index + 10000}")
+        first.merge(HyperLogLog.from_bytes(second.to_bytes()))
+        self.assertLess(abs(first.count() - 30000) / 30000, 4 * first.relative_error)
+
+    def test_space_saving_merge(self):
+        """Birleştirilen Space-Saving özetinin en sık öğeleri koruduğunu test et."""
+        first, second = SpaceSaving(capacity=10), SpaceSaving(capacity=10)
+        for index in range(200):
+            first.add(f"noise-{index}")
+            second.add(f"other-{index}")
+        first.add("code.exe", 500)
+        second.add("code.exe", 300)
+        second.add("chrome.exe", 400)
+        merged = first.merge(SpaceSaving.from_bytes(second.to_bytes()))
+
+        top = merged.top(2)
+        self.assertEqual([key for key, _, _ in top], ["code.exe", "chrome.exe"])
+        for key, count, error in top:
+            true_count = {"code.exe": 800, "chrome.exe": 400}[key]
+            self.assertTrue(count - error <= true_count <= count)
+
+    def test_count_min_bound(self):
+        """Count-Min tahmininin gerçek değerden küçük olmadığını test et."""
+        sketch = CountMinSketch(width=64, depth=4)
+        for index in range(1000):
+            sketch.add(f"key-{index % 50}", 2)
+        restored = CountMinSketch.from_bytes(sketch.to_bytes())
+        self.assertGreaterEqual(restored.estimate("key-7"), 40)
+        self.assertLessEqual(restored.estimate("key-7"), 40 + restored.error_bound * 4)
+
+    def test_sketches_follow_writes_and_union_over_days(self):
+        """Yazma yolunun çizimleri güncellediğini ve günlerin birleştirildiğini test et."""
+        db_session = self.Session()
+        for offset in range(2):
+            started = self.start + datetime.timedelta(days=offset)
+            db_session.add_all([
+                WindowActivity(timestamp=started, application_name="code.exe", window_title=f"main{offset}.py",
+                               duration=600, session_id=1),
+                WindowActivity(timestamp=started, application_name="slack.exe", window_title="general",
+                               duration=100, session_id=1),
+                BrowserActivity(timestamp=started, domain="github.com", url=f"https://github.com/{offset}",
+                                duration=60, session_id=1),
+                FileActivity(timestamp=started, file_path="C:/repo/main.py", action="modified", session_id=1),
+            ])
+            db_session.commit()
+
+        end_day = self.day + datetime.timedelta(days=1)
+        top = top_k(db_session, "app", self.day, end_day, k=2)
+        self.assertEqual([(item["key"], item["estimate"]) for item in top], [("code.exe", 1200), ("slack.exe", 200)])
+        self.assertEqual(top_k(db_session, "file", self.day, end_day)[0]["estimate"], 2)
+        self.assertEqual(distinct_count(db_session, "url", self.day, end_day)["estimate"], 2)
+        self.assertEqual(distinct_count(db_session, "title", self.day, end_day)["estimate"], 3)
+        self.assertEqual(distinct_count(db_session, "file", self.day, end_day)["estimate"], 1)
+        self.assertEqual(days_without_sketches(db_session, [self.day, end_day + datetime.timedelta(days=1)]),
+                         [end_day + datetime.timedelta(days=1)])
+        db_session.close()
+
+    def test_rebuild_day_sketches(self):
+        """Günün çizimlerinin ham kayıtlardan yeniden oluşturulduğunu test et."""
+        db_session = self.Session()
+        db_session.add(WindowActivity(timestamp=self.start, application_name="code.exe", duration=600, session_id=1))
+        db_session.commit()
+        db_session.query(DaySketch).delete()
+        db_session.commit()
+
+        rebuild_day_sketches(db_session, self.day)
+        rebuild_day_sketches(db_session, self.day)
+
+        self.assertEqual(top_k(db_session, "app", self.day, self.day)[0]["estimate"], 600)
+        db_session.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,209 @@
+"""
+Yazma biriktirme günlüğü için test modülü.
+"""
+import unittest
+import os
+import sys
+import json
+import zlib
+import sqlite3
+import datetime
+import tempfile
+import threading
+from unittest.mock import patch
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_collection.database import Base, WindowActivity, KeyboardActivity, MaintenanceState
+from src.data_collection.spool import WriteSpool, HEADER_SIZE, RECORD_HEADER
+
+class TestWriteSpool(unittest.TestCase):
+    """Yazma biriktirme günlüğü için test sınıfı."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'activity.db')
+        self.spool_path = os.path.join(self.temp_dir.name, 'write_spool.bin')
+        # Kısa kilit bekleme süresi: kilitli veritabanı izleyiciyi bekletmemeli
+        self.engine = create_engine(f'sqlite:///{self.db_path}', connect_args={'timeout': 0.1})
+        Base.metadata.create_all(self.engine)
+        self.db_session = sessionmaker(bind=self.engine)()
+        self.start = datetime.datetime(2024, 1, 15, 9)
+
+    def tearDown(self):
+        self.db_session.close()
+        self.engine.dispose()
+        self.temp_dir.cleanup()
+
+    def _windows(self, count, offset=0):
+        return [
+            WindowActivity(timestamp=self.start + datetime.timedelta(minutes=offset + index), application_name="code.exe",
+                           window_title=f"dosya{offset + index}.py", duration=60, session_id=1)
+            for index in range(count)
+        ]
+
+    def _titles(self):
+        return [title for (title,) in self.db_session.query(WindowActivity.window_title).order_by(WindowActivity.id)]
+
+    def _lock_database(self):
+        """Yedekleme aracı gibi veritabanına özel kilit alan bir bağlantı aç."""
+        locker = sqlite3.connect(self.db_path)
+        locker.execute("BEGIN EXCLUSIVE")
+        return locker
+
+    def _append_raw(self, table_name, row):
+        """Günlük dosyasına doğrudan bir kayıt ekle (spool kapalıyken)."""
+        payload = json.dumps([table_name, row]).encode('utf-8')
+        with open(self.spool_path, 'ab') as handle:
+            handle.write(RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+
+    def _rejected(self, spool):
+        with open(spool.rejected_path, encoding='utf-8') as handle:
+            return [json.loads(line) for line in handle]
+
+    def test_spools_while_locked_and_replays_in_order(self):
+        """Kilitli veritabanında kayıtların günlüğe eklendiğini ve düzelince sırayla yazıldığını test et."""
+        spool = WriteSpool(self.spool_path, fsync_interval=0, retry_interval=0, replay_batch=2)
+        self.assertTrue(spool.persist(self.db_session, self._windows(1)))
+
+        locker = self._lock_database()
+        self.assertFalse(spool.persist(self.db_session, self._windows(2, offset=1)))
+        self.assertFalse(spool.persist(self.db_session, [
+            KeyboardActivity(timestamp=self.start, key_count=42, session_id=1)
+        ]))
+        self.assertEqual(spool.pending, 3)
+        locker.rollback()
+        locker.close()
+
+        # Bekleyen kayıtlar yeni kayıttan önce oynatılır
+        self.assertTrue(spool.persist(self.db_session, self._windows(1, offset=3)))
+        self.assertEqual(self._titles(), ["dosya0.py", "dosya1.py", "dosya2.py", "dosya3.py"])
+        keyboard = self.db_session.query(KeyboardActivity).one()
+        self.assertEqual((keyboard.key_count, keyboard.timestamp), (42, self.start))
+        self.assertEqual(spool.pending, 0)
+        self.assertEqual(os.path.getsize(self.spool_path), HEADER_SIZE)
+        self.assertEqual(self.db_session.query(func.count(MaintenanceState.name)).scalar(), 0)
+
+    def test_retry_interval_skips_database(self):
+        """Yeniden deneme süresi dolmadan veritabanına gidilmediğini test et."""
+        spool = WriteSpool(self.spool_path, retry_interval=3600)
+        locker = self._lock_database()
+        self.assertFalse(spool.persist(self.db_session, self._windows(1)))
+        locker.rollback()
+        locker.close()
+
+        with patch.object(self.db_session, 'commit', wraps=self.db_session.commit) as commit:
+            self.assertFalse(spool.persist(self.db_session, self._windows(1, offset=1)))
+        commit.assert_not_called()
+        self.assertTrue(spool.replay(self.db_session, force=True))
+        self.assertEqual(len(self._titles()), 2)
+
+    def test_torn_tail_is_skipped(self):
+        """Çökme sırasında yarım kalan son kaydın atlandığını test et."""
+        spool = WriteSpool(self.spool_path)
+        spool.append(self._windows(3))
+        spool.close()
+        with open(self.spool_path, 'r+b') as handle:
+            handle.truncate(os.path.getsize(self.spool_path) - 5)
+
+        spool = WriteSpool(self.spool_path)
+        self.assertEqual(spool.pending, 2)
+        # Kırpılan kuyruğun ardına eklenen kayıtlar okunabilir kalır
+        spool.append(self._windows(1, offset=3))
+        self.assertTrue(spool.replay(self.db_session, force=True))
+        self.assertEqual(self._titles(), ["dosya0.py", "dosya1.py", "dosya3.py"])
+
+    def test_replay_is_idempotent_after_crash(self):
+        """Oynatma sonrası günlük boşaltılmadan çökülürse kayıtların iki kez eklenmediğini test et."""
+        spool = WriteSpool(self.spool_path, replay_batch=2)
+        spool.append(self._windows(3))
+
+        with patch.object(WriteSpool, '_reset', side_effect=OSError("çökme")):
+            self.assertFalse(spool.replay(self.db_session, force=True))
+        spool.close()
+        self.assertEqual(len(self._titles()), 3)
+
+        spool = WriteSpool(self.spool_path)
+        self.assertTrue(spool.replay(self.db_session, force=True))
+        self.assertEqual(len(self._titles()), 3)
+        self.assertEqual(spool.pending, 0)
+
+    def test_append_during_replay_is_not_lost(self):
+        """Oynatmanın son okuması ile günlüğün boşaltılması arasında eklenen kayıtların kaybolmadığını test et."""
+        spool = WriteSpool(self.spool_path, replay_batch=2)
+        spool.append(self._windows(3))
+        read_from = spool._read_from
+        appended = []
+
+        def read_then_append(offset):
+            result = read_from(offset)
+            if not result[0] and not appended:
+                # Başka bir iş parçacığındaki izleyici, okumadan hemen sonra günlüğe yazar
+                appended.append(True)
+                writer = threading.Thread(target=spool.append, args=(self._windows(2, offset=3),))
+                writer.start()
+                writer.join()
+            return result
+
+        with patch.object(spool, '_read_from', side_effect=read_then_append):
+            self.assertTrue(spool.replay(self.db_session, force=True))
+        self.assertEqual(self._titles(), [f"dosya{index}.py" for index in range(5)])
+        self.assertEqual(spool.pending, 0)
+        self.assertEqual(os.path.getsize(self.spool_path), HEADER_SIZE)
+
+    def test_undecodable_record_is_rejected(self):
+        """Çözülemeyen kaydın beklemeden .rejected dosyasına taşındığını test et."""
+        spool = WriteSpool(self.spool_path)
+        spool.append(self._windows(1))
+        spool.close()
+        self._append_raw('unknown_table', {})
+        spool = WriteSpool(self.spool_path)
+        spool.append(self._windows(1, offset=1))
+
+        self.assertTrue(spool.replay(self.db_session, force=True))
+        self.assertEqual(self._titles(), ["dosya0.py", "dosya1.py"])
+        rejected = self._rejected(spool)
+        self.assertEqual(len(rejected), 1)
+        self.assertIn('unknown_table', rejected[0]['payload'])
+
+    def test_record_refused_by_database_is_rejected_after_attempts(self):
+        """Veritabanının reddettiği kaydın deneme sınırından sonra atlanıp diğerlerinin yazıldığını test et."""
+        self.db_session.add_all(self._windows(1))
+        self.db_session.commit()
+        spool = WriteSpool(self.spool_path)
+        spool.append(self._windows(1, offset=1))
+        spool.close()
+        # Var olan birincil anahtarı kullanan kayıt her denemede reddedilir
+        self._append_raw('window_activities', {'id': 1, 'application_name': "code.exe", 'window_title': "zehirli.py"})
+        spool = WriteSpool(self.spool_path, retry_interval=0, replay_batch=10, max_attempts=2)
+        spool.append(self._windows(1, offset=2))
+
+        attempts = 0
+        while not spool.replay(self.db_session, force=True):
+            attempts += 1
+            self.assertLess(attempts, 10)
+        self.assertEqual(self._titles(), ["dosya0.py", "dosya1.py", "dosya2.py"])
+        self.assertEqual(spool.pending, 0)
+        rejected = self._rejected(spool)
+        self.assertEqual(len(rejected), 1)
+        self.assertIn("zehirli.py", rejected[0]['payload'])
+
+    def test_locked_database_does_not_reject_records(self):
+        """Geçici kilit hatalarının deneme sayısına eklenmediğini test et."""
+        spool = WriteSpool(self.spool_path, retry_interval=0, max_attempts=1)
+        spool.append(self._windows(1))
+        locker = self._lock_database()
+        for _ in range(3):
+            self.assertFalse(spool.replay(self.db_session, force=True))
+        locker.rollback()
+        locker.close()
+
+        self.assertTrue(spool.replay(self.db_session, force=True))
+        self.assertEqual(self._titles(), ["dosya0.py"])
+        self.assertFalse(os.path.exists(spool.rejected_path))
+
+if __name__ == '__main__':
+    unittest.main()
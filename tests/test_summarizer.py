@@ -0,0 +1,139 @@
+"""
+Yapay zeka günlük özetleri için test modülü.
+"""
+import unittest
+import os
+import sys
+import json
+import datetime
+import threading
+from unittest.mock import patch
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Modül yolunu ekle (veri işleme modülü src dizinini kök olarak kullanır)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from data_collection.database import Base, DailySummary, TimelineSegment
+from data_processing import summarizer
+
+class StubHandler(BaseHTTPRequestHandler):
+    """OpenAI uyumlu /chat/completions uç noktasını taklit eden yerel sunucu."""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.server.requests.append(body)
+        prompt = body['messages'][1]['content']
+        content = f"Özet {len(self.server.requests)}: {prompt.splitlines()[-1][:40]}"
+        data = json.dumps({'choices': [{'message': {'role': 'assistant', 'content': content}}]}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+class TestSummarizer(unittest.TestCase):
+    """Yapay zeka günlük özetleri için test sınıfı."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        cls.server.requests = []
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.requests.clear()
+        self.client = summarizer.ChatCompletionsClient(
+            base_url=f"http://127.0.0.1:{self.server.server_address[1]}/v1", api_key="", model="stub", timeout=5
+        )
+        self.engine = create_engine('sqlite://')
+        Base.metadata.create_all(self.engine)
+        self.db_session = sessionmaker(bind=self.engine)()
+        self.day = datetime.date(2024, 1, 15)
+        start = datetime.datetime(2024, 1, 15, 8)
+        segments = []
+        # Uygulamalar her 10 dakikada değişir; 8 saat boyunca 48 blok oluşur
+        for index in range(48):
+            begin = start + datetime.timedelta(minutes=10 * index)
+            segments.append(TimelineSegment(
+                start_time=begin, end_time=begin + datetime.timedelta(minutes=10), duration=600,
+                application_name="code.exe" if index % 2 == 0 else "chrome.exe",
+                window_title=f"Görev {index} - Editör", key_count=100,
+            ))
+        self.db_session.add_all(segments + [DailySummary(
+            date=datetime.datetime(2024, 1, 15), total_active_time=28800, productivity_score=75.0,
+            categories=json.dumps({"development": 14400, "browsing": 14400}),
+            app_times=json.dumps({"code.exe": 14400, "chrome.exe": 14400}), domain_times="{}",
+        )])
+        self.db_session.commit()
+
+    def tearDown(self):
+        self.db_session.close()
+
+    def summary_text(self):
+        return self.db_session.query(DailySummary).one().summary_text
+
+    def test_digest(self):
+        """Özetin toplamları ve birleştirilmiş zaman çizelgesi bloklarını içerdiğini test et."""
+        summary = self.db_session.query(DailySummary).one()
+        digest = summarizer.build_digest(self.db_session, self.day, summary)
+
+        self.assertEqual(digest['header'][0], "Tarih: 2024-01-15 (Pazartesi)")
+        self.assertIn("code.exe 4sa 00dk", digest['header'][3])
+        self.assertEqual(len(digest['timeline']), 48)
+        self.assertEqual(digest['timeline'][0], "08:00-08:10 code.exe (10dk): Görev 0 - Editör [tuş 100]")
+
+    def test_unchanged_day_makes_no_calls(self):
+        """Özetin yazıldığını ve değişmeyen günün yeniden işlenmesinde model çağrılmadığını test et."""
+        stats = summarizer.summarize_days(self.db_session, [self.day], self.client)
+        self.assertEqual(stats['calls'], 1)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertTrue(self.summary_text().startswith("Özet 1"))
+
+        stats = summarizer.summarize_days(self.db_session, [self.day], self.client)
+        self.assertEqual(stats, {'updated': 0, 'calls': 0, 'cache_hits': 1})
+        self.assertEqual(len(self.server.requests), 1)
+
+        # Zaman çizelgesi değişince yeni bir istek gönderilir
+        self.db_session.query(TimelineSegment).filter(TimelineSegment.window_title == "Görev 3 - Editör").update(
+            {TimelineSegment.window_title: "Sunum - Editör"}
+        )
+        self.db_session.commit()
+        stats = summarizer.summarize_days(self.db_session, [self.day], self.client)
+        self.assertEqual((stats['updated'], stats['calls']), (1, 1))
+
+    def test_budget_chunking(self):
+        """Bütçeyi aşan günün bölümlere ayrılarak özetlendiğini ve istemlerin bütçeye sığdığını test et."""
+        budget = 400
+        stats = summarizer.summarize_days(self.db_session, [self.day], self.client, budget=budget)
+
+        self.assertGreater(stats['calls'], 2)
+        for request in self.server.requests:
+            system, prompt = (message['content'] for message in request['messages'])
+            self.assertLessEqual(summarizer.estimate_tokens(system + prompt), budget)
+        self.assertIn("bölüm özetleri", self.server.requests[-1]['messages'][1]['content'])
+        self.assertTrue(self.summary_text())
+
+        calls = len(self.server.requests)
+        summarizer.summarize_days(self.db_session, [self.day], self.client, budget=budget)
+        self.assertEqual(len(self.server.requests), calls)
+
+    def test_disabled_provider(self):
+        """Özet üretimi kapalıyken istemci oluşturulmadığını test et."""
+        self.assertIsNone(summarizer.get_llm_client('none'))
+        self.assertIsInstance(summarizer.get_llm_client('openai'), summarizer.ChatCompletionsClient)
+        with patch.object(summarizer, 'get_llm_client', return_value=None):
+            self.assertEqual(summarizer.summarize_days(self.db_session, [self.day])['calls'], 0)
+        self.assertIsNone(self.summary_text())
+
+if __name__ == '__main__':
+    unittest.main()
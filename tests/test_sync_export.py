@@ -0,0 +1,139 @@
+"""
+Değişiklik yakalama ve artımlı eşitleme için test modülü.
+"""
+import unittest
+import os
+import sys
+import gzip
+import json
+import shutil
+import argparse
+import tempfile
+import datetime
+from sqlalchemy import create_engine, text, update, delete
+from sqlalchemy.orm import sessionmaker
+
+# Modül yolunu ekle (veri işleme modülü src dizinini kök olarak kullanır)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from data_collection.database import (
+    Base, WindowActivity, FileActivity, ChangeTombstone, create_read_engine, migrate_db
+)
+from data_processing.sync_export import add_sync_export_arguments, run_sync_export, read_watermarks
+
+class TestChangeTracking(unittest.TestCase):
+    """Değişiklik sırası tetikleyicileri için test sınıfı."""
+
+    def setUp(self):
+        self.engine = create_engine('sqlite:///:memory:')
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        self.start = datetime.datetime(2024, 1, 15, 9, 0)
+
+    def test_insert_update_delete(self):
+        """Ekleme ve güncellemenin sıra numarası aldığını, silmenin iz bıraktığını test et."""
+        db_session = self.Session()
+        db_session.add_all([
+            WindowActivity(timestamp=self.start, application_name="code.exe", duration=60, session_id=1),
+            WindowActivity(timestamp=self.start, application_name="slack.exe", duration=30, session_id=1),
+        ])
+        db_session.commit()
+        rows = db_session.query(WindowActivity).order_by(WindowActivity.id).all()
+        db_session.expire_all()
+        self.assertEqual([row.change_seq for row in rows], [1, 2])
+
+        # Toplu güncelleme ve silme de yakalanır
+        db_session.execute(update(WindowActivity).where(WindowActivity.id == 1).values(duration=120))
+        db_session.execute(delete(WindowActivity).where(WindowActivity.id == 2))
+        db_session.commit()
+        db_session.expire_all()
+        self.assertEqual(db_session.get(WindowActivity, 1).change_seq, 3)
+        tombstone = db_session.query(ChangeTombstone).one()
+        self.assertEqual((tombstone.change_seq, tombstone.table_name, tombstone.row_id), (4, 'window_activities', 2))
+        db_session.close()
+
+    def test_migration_numbers_existing_rows(self):
+        """Sıra sütunu olmayan eski tablodaki kayıtlara numara verildiğini test et."""
+        engine = create_engine('sqlite:///:memory:')
+        with engine.begin() as connection:
+            connection.execute(text(
+                "CREATE TABLE file_activities (id INTEGER PRIMARY KEY, session_id INTEGER, timestamp DATETIME, "
+                "file_path VARCHAR(512), action VARCHAR(50), file_type VARCHAR(50), window_id INTEGER)"
+            ))
+            connection.execute(text("INSERT INTO file_activities (id, file_path) VALUES (1, 'a.py'), (2, 'b.py')"))
+        Base.metadata.create_all(engine)
+        migrate_db(engine)
+        migrate_db(engine)
+
+        with engine.begin() as connection:
+            connection.execute(text("INSERT INTO file_activities (file_path) VALUES ('c.py')"))
+            rows = connection.execute(text("SELECT file_path, change_seq FROM file_activities ORDER BY id")).all()
+        self.assertEqual([tuple(row) for row in rows], [('a.py', 1), ('b.py', 2), ('c.py', 3)])
+
+class TestSyncExport(unittest.TestCase):
+    """Artımlı eşitleme dışa aktarma için test sınıfı."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'activity.db')
+        self.output = os.path.join(self.temp_dir, 'sync')
+        engine = create_engine(f'sqlite:///{self.db_path}')
+        Base.metadata.create_all(engine)
+        self.Session = sessionmaker(bind=engine)
+        self.start = datetime.datetime(2024, 1, 15, 9, 0)
+        db_session = self.Session()
+        db_session.add_all([
+            FileActivity(timestamp=self.start + datetime.timedelta(minutes=index), file_path=f"dosya_{index}.py",
+                         action="modified", session_id=1)
+            for index in range(10)
+        ])
+        db_session.commit()
+        db_session.close()
+        self.engine = engine
+        self.read_engine = create_read_engine(self.db_path, pool_size=1)
+
+    def tearDown(self):
+        self.read_engine.dispose()
+        self.engine.dispose()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def sync(self, *argv):
+        parser = argparse.ArgumentParser()
+        add_sync_export_arguments(parser)
+        return run_sync_export(parser.parse_args(list(argv) + ['--output', self.output]), self.read_engine)
+
+    def read_changes(self, path):
+        with gzip.open(path, 'rt', encoding='utf-8') as stream:
+            return [json.loads(line) for line in stream]
+
+    def test_only_delta_is_exported(self):
+        """İkinci eşitlemenin yalnızca değişen ve silinen kayıtları içerdiğini test et."""
+        first = self.sync()
+        self.assertEqual((first['upserts'], first['deletes']), (10, 0))
+        self.assertEqual(self.read_changes(first['path'])[0]['row']['file_path'], "dosya_0.py")
+
+        self.assertIsNone(self.sync()['path'])
+
+        db_session = self.Session()
+        db_session.execute(update(FileActivity).where(FileActivity.id == 3).values(action="deleted"))
+        db_session.execute(delete(FileActivity).where(FileActivity.id == 10))
+        # Silinen en büyük kimlik yeniden kullanılır; alıcı silmeyi eklemeden önce uygulamalıdır
+        db_session.add(FileActivity(timestamp=self.start, file_path="yeni.py", action="created", session_id=1))
+        db_session.commit()
+        db_session.close()
+
+        second = self.sync()
+        changes = self.read_changes(second['path'])
+        self.assertEqual([(change['op'], change.get('id') or change['row']['id']) for change in changes],
+                         [('upsert', 3), ('delete', 10), ('upsert', 10)])
+        self.assertEqual(changes[0]['row']['action'], "deleted")
+        self.assertEqual(read_watermarks(os.path.join(self.output, 'sync_watermark.json'))['file_activities'],
+                         changes[-1]['change_seq'])
+
+    def test_explicit_since(self):
+        """--since ile verilen sıra numarasından sonrasının aktarıldığını test et."""
+        result = self.sync('--since', '7', '--tables', 'file_activities')
+        self.assertEqual([change['change_seq'] for change in self.read_changes(result['path'])], [8, 9, 10])
+
+if __name__ == '__main__':
+    unittest.main()
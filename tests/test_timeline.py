@@ -0,0 +1,121 @@
+"""
+Birleşik zaman çizelgesi için test modülü.
+"""
+import unittest
+import os
+import sys
+import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Modül yolunu ekle (veri işleme modülü src dizinini kök olarak kullanır)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from data_collection.database import (
+    Base, WindowActivity, BrowserActivity, KeyboardActivity, FileActivity, TimelineSegment
+)
+from data_collection.compaction import compact_intervals
+from data_processing.timeline import update_timeline, get_timeline
+from data_processing.window_attribution import attribute_windows
+
+class TestTimeline(unittest.TestCase):
+    """Birleşik zaman çizelgesi için test sınıfı."""
+
+    def setUp(self):
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine)
+        self.db_session = sessionmaker(bind=engine)()
+        self.start = datetime.datetime(2024, 1, 15, 14, 0, 0)
+
+    def tearDown(self):
+        self.db_session.close()
+
+    def _at(self, seconds):
+        return self.start + datetime.timedelta(seconds=seconds)
+
+    def test_streaming_merge_builds_non_overlapping_segments(self):
+        """Aralıkların ve olayların çakışmayan bölümlerde birleştiğini test et."""
+        self.db_session.add_all([
+            WindowActivity(timestamp=self._at(0), application_name="code.exe", window_title="main.py", duration=600),
+            WindowActivity(timestamp=self._at(600), application_name="chrome.exe", window_title="GitHub", duration=600),
+            BrowserActivity(timestamp=self._at(700), domain="github.com", duration=300),
+            KeyboardActivity(timestamp=self._at(100), key_count=10),
+            KeyboardActivity(timestamp=self._at(650), key_count=4),
+            FileActivity(timestamp=self._at(200), file_path="main.py", action="modified"),
+        ])
+        self.db_session.commit()
+
+        update_timeline(self.db_session)
+        segments = get_timeline(self.db_session, self._at(0), self._at(3600))
+
+        self.assertEqual(
+            [(s.start_time, s.end_time, s.application_name, s.domain) for s in segments],
+            [
+                (self._at(0), self._at(600), "code.exe", None),
+                (self._at(600), self._at(700), "chrome.exe", None),
+                (self._at(700), self._at(1000), "chrome.exe", "github.com"),
+                (self._at(1000), self._at(1200), "chrome.exe", None),
+            ]
+        )
+        self.assertEqual((segments[0].key_count, segments[0].file_events), (10, 1))
+        self.assertEqual(segments[1].key_count, 4)
+
+    def test_incremental_update_rebuilds_touched_days_only(self):
+        """Yeni kayıt gelmeyen çalıştırmanın hiçbir günü yeniden oluşturmadığını test et."""
+        self.db_session.add(WindowActivity(timestamp=self._at(0), application_name="code.exe", duration=60))
+        self.db_session.commit()
+        self.assertEqual(update_timeline(self.db_session), {self.start.date(): 1})
+        self.assertEqual(update_timeline(self.db_session), {})
+
+        # Önceki aralığın hemen ardından gelen aynı pencere tek bölümde birleşir
+        self.db_session.add(WindowActivity(timestamp=self._at(60), application_name="code.exe", duration=60))
+        self.db_session.commit()
+        update_timeline(self.db_session)
+
+        segment = self.db_session.query(TimelineSegment).one()
+        self.assertEqual(segment.duration, 120)
+
+    def test_compaction_rebuilds_updated_days(self):
+        """Sıkıştırmanın güncellediği ve sildiği kayıtların günlerinin yeniden oluşturulduğunu test et."""
+        self.db_session.add_all([
+            WindowActivity(timestamp=self._at(0), application_name="code.exe", window_title="main.py", duration=60),
+            WindowActivity(timestamp=self._at(70), application_name="code.exe", window_title="main.py", duration=60),
+        ])
+        self.db_session.commit()
+        update_timeline(self.db_session)
+        self.assertEqual(self.db_session.query(TimelineSegment).count(), 2)
+
+        compact_intervals(self.db_session, max_gap=30)
+        self.assertEqual(update_timeline(self.db_session), {self.start.date(): 1})
+
+        segment = self.db_session.query(TimelineSegment).one()
+        self.assertEqual((segment.start_time, segment.end_time), (self._at(0), self._at(130)))
+
+    def test_window_attribution_triggers_rebuild(self):
+        """Pencere bağlamanın güncellediği kayıtların günü yeniden oluşturduğunu test et."""
+        self.db_session.add_all([
+            WindowActivity(timestamp=self._at(0), application_name="code.exe", duration=600),
+            KeyboardActivity(timestamp=self._at(100), key_count=10),
+        ])
+        self.db_session.commit()
+        update_timeline(self.db_session)
+        self.assertEqual(update_timeline(self.db_session), {})
+
+        attribute_windows(self.db_session, self._at(0), self._at(3600))
+        self.assertEqual(update_timeline(self.db_session), {self.start.date(): 1})
+        self.assertEqual(update_timeline(self.db_session), {})
+
+    def test_segments_split_at_midnight(self):
+        """Gece yarısını geçen aralıkların günlere bölündüğünü test et."""
+        late = datetime.datetime(2024, 1, 15, 23, 50, 0)
+        self.db_session.add(WindowActivity(timestamp=late, application_name="code.exe", duration=1200))
+        self.db_session.commit()
+
+        update_timeline(self.db_session)
+
+        segments = self.db_session.query(TimelineSegment).order_by(TimelineSegment.start_time).all()
+        self.assertEqual([segment.duration for segment in segments], [600, 600])
+        self.assertEqual(segments[1].start_time, datetime.datetime(2024, 1, 16))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+Pencere başlığı normalleştirici için test modülü.
+"""
+import unittest
+import os
+import sys
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_collection.title_normalizer import TitleNormalizer
+
+class TestTitleNormalizer(unittest.TestCase):
+    """Başlık normalleştirici için test sınıfı."""
+
+    def setUp(self):
+        self.normalizer = TitleNormalizer()
+
+    def test_strips_counters(self):
+        """Okunmamış sayaçlarının temizlendiğini test et."""
+        expected = "Inbox - Gmail - Google Chrome"
+        self.assertEqual(self.normalizer.normalize("chrome.exe", "(3) Inbox - Gmail - Google Chrome"), expected)
+        self.assertEqual(self.normalizer.normalize("chrome.exe", "(1,234) Inbox - Gmail - Google Chrome"), expected)
+
+    def test_strips_dirty_markers(self):
+        """Kaydedilmemiş değişiklik işaretlerinin temizlendiğini test et."""
+        self.assertEqual(self.normalizer.normalize("code.exe", "● main.py - proj - Visual Studio Code"), "main.py - proj - Visual Studio Code")
+        self.assertEqual(self.normalizer.normalize("notepad.exe", "notes.txt* - Notepad"), "notes.txt - Notepad")
+
+    def test_strips_stacked_prefixes(self):
+        """Üst üste binmiş sayaç ve işaret öneklerinin birlikte temizlendiğini test et."""
+        self.assertEqual(self.normalizer.normalize("code.exe", "(3) ● file.py - Visual Studio Code"), "file.py - Visual Studio Code")
+        self.assertEqual(self.normalizer.normalize("code.exe", "● (3) file.py"), "file.py")
+
+    def test_counter_changes_share_key(self):
+        """Yalnızca sayacı değişen başlıkların aynı anahtara (aynı aralığa) düştüğünü test et."""
+        self.assertEqual(
+            self.normalizer.normalize("chrome.exe", "(3) Inbox - Gmail - Google Chrome"),
+            self.normalizer.normalize("chrome.exe", "(4) Inbox - Gmail - Google Chrome")
+        )
+
+    def test_strips_clocks(self):
+        """Saatlerin temizlendiğini test et."""
+        self.assertEqual(self.normalizer.normalize("zoom.exe", "Meeting - 10:30 AM"), "Meeting")
+
+    def test_keeps_meaningful_titles(self):
+        """Anlamlı başlıkların değişmediğini ve boş sonuçta ham başlığın döndüğünü test et."""
+        self.assertEqual(self.normalizer.normalize("x", "C++ - a*b"), "C++ - a*b")
+        self.assertEqual(self.normalizer.normalize("x", "Report 2024 - Word"), "Report 2024 - Word")
+        self.assertEqual(self.normalizer.normalize("x", "(2)"), "(2)")
+
+    def test_custom_rules(self):
+        """Yapılandırılan genel ve uygulamaya özgü kuralların uygulandığını test et."""
+        normalizer = TitleNormalizer(
+            global_rules=[{"pattern": r"\s+v\d+(\.\d+)*", "replace": ""}],
+            app_rules={"Code.exe": [r" - Visual Studio Code$"]}
+        )
+        self.assertEqual(normalizer.normalize("code.exe", "main.py v1.2 - Visual Studio Code"), "main.py")
+        self.assertEqual(normalizer.normalize("other", "(3) Inbox"), "(3) Inbox")
+
+    def test_app_rules_replace_defaults_of_that_app(self):
+        """Verilen uygulama kurallarının yalnızca o uygulamanın varsayılanlarının yerini aldığını test et."""
+        normalizer = TitleNormalizer(app_rules={"Slack.exe": [r" - Slack$"]})
+        self.assertEqual(normalizer.normalize("slack.exe", "general - 3 new items - Slack"), "general - 3 new items")
+        self.assertEqual(normalizer.normalize("teams.exe", "Chat | 2 unread messages"), "Chat")
+
+if __name__ == '__main__':
+    unittest.main()
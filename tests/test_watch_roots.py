@@ -0,0 +1,125 @@
+"""
+İzleme kökleri yönetimi için test modülü.
+"""
+import unittest
+import os
+import sys
+import errno
+import tempfile
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_collection.path_filter import PathFilter
+from src.data_collection.watch_roots import (
+    WatchRoot, RootFilters, load_watch_roots, plan_watches, is_watch_limit_error
+)
+
+class TestWatchRoots(unittest.TestCase):
+    """İzleme kökleri için test sınıfı."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+        for path in ["a/b/c", "a/node_modules/pkg/lib", "d/e", "f"]:
+            os.makedirs(os.path.join(self.root, *path.split('/')))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _plan(self, **kwargs):
+        return {
+            os.path.relpath(entry.path, self.root): (entry.recursive, entry.directory_count)
+            for entry in plan_watches(WatchRoot(self.root, **kwargs))
+        }
+
+    def test_clean_tree_uses_single_recursive_watch(self):
+        """Yok sayılan dizin yoksa tek özyinelemeli izleme kullanıldığını test et."""
+        self.assertEqual(self._plan(), {'.': (True, 10)})
+
+    def test_ignored_directories_are_never_watched(self):
+        """Yok sayılan dizinlerin plandan çıkarıldığını test et."""
+        plan = self._plan(ignore=["node_modules"])
+        self.assertEqual(plan, {
+            '.': (False, 1),
+            'a': (False, 1),
+            os.path.join('a', 'b'): (True, 2),
+            'd': (True, 2),
+            'f': (True, 1)
+        })
+        self.assertFalse(any('node_modules' in path for path in plan))
+
+    def test_depth_limit(self):
+        """Derinlik sınırının uygulandığını test et."""
+        plan = self._plan(max_depth=1)
+        self.assertEqual(plan, {
+            '.': (False, 1),
+            'a': (False, 1),
+            'd': (False, 1),
+            'f': (False, 1)
+        })
+
+    def test_plan_new_subdirectory(self):
+        """Sonradan oluşturulan alt dizinin kökün derinlik sınırıyla planlandığını test et."""
+        root = WatchRoot(self.root, max_depth=2, ignore=["node_modules"])
+        plan = plan_watches(root, path=os.path.join(self.root, 'a'))
+        self.assertEqual(
+            [(os.path.relpath(entry.path, self.root), entry.recursive) for entry in plan],
+            [('a', False), (os.path.join('a', 'b'), False)]
+        )
+        self.assertEqual(plan_watches(root, path=os.path.join(self.root, 'a', 'b', 'c')), [])
+
+    def test_root_filters_use_own_ignore_list(self):
+        """Yok sayma listelerinin yalnızca kendi köklerine uygulandığını test et."""
+        roots = [WatchRoot(self.root, ignore=["build"]), WatchRoot(os.path.join(self.root, 'd'), ignore=["cache"])]
+        root_filters = RootFilters(roots, lambda root: PathFilter(ignored_dir_patterns=root.ignore), PathFilter())
+
+        self.assertIsNone(root_filters.match(os.path.join(self.root, 'a', 'build', 'x.o')))
+        self.assertIsNotNone(root_filters.match(os.path.join(self.root, 'a', 'cache', 'x.o')))
+        # İç içe köklerde en uzun önek seçilir
+        self.assertIs(root_filters.lookup(os.path.join(self.root, 'd', 'e'))[0], roots[1])
+        self.assertIsNone(root_filters.match(os.path.join(self.root, 'd', 'cache', 'x.o')))
+        self.assertIsNotNone(root_filters.match(os.path.join(self.root, 'd', 'build', 'x.o')))
+        # Kök dışındaki yollar varsayılan filtreyle değerlendirilir
+        self.assertIsNone(root_filters.lookup(self.root + 'x')[0])
+
+    def test_root_filters_ignore_only_below_root(self):
+        """Kökün üstündeki dizinlerin yok sayma desenleriyle eşleşmediğini test et."""
+        root = WatchRoot(os.path.join(self.root, 'build', 'src'), ignore=["build"])
+        root_filters = RootFilters(
+            [root], lambda root: PathFilter(ignored_dir_patterns=root.ignore, ignored_dir_root=root.path), PathFilter()
+        )
+        self.assertIsNotNone(root_filters.match(os.path.join(root.path, 'a', 'x.o')))
+        self.assertIsNone(root_filters.match(os.path.join(root.path, 'a', 'build', 'x.o')))
+        # Dosya adları dizin desenleriyle eşleştirilmez
+        self.assertIsNotNone(root_filters.match(os.path.join(root.path, 'build')))
+
+    def test_directory_patterns_follow_name_case_policy(self):
+        """Dizin desenlerinin is_ignored ile aynı büyük/küçük harf kuralını izlediğini test et."""
+        root = WatchRoot(self.root, ignore=["Cache*"])
+        path_filter = PathFilter(ignored_dir_patterns=root.ignore, ignored_dir_root=root.path)
+        for name in ["Cache2", "cache2"]:
+            ignored = path_filter.match(os.path.join(self.root, 'a', name, 'x.o')) is None
+            self.assertEqual(ignored, root.is_ignored(name), name)
+
+    def test_load_watch_roots(self):
+        """Yapılandırma kayıtlarının ayrıştırıldığını test et."""
+        roots = load_watch_roots(
+            [self.root, {"path": self.root, "max_depth": 2, "ignore": ["*.tmp"]}, {"max_depth": 1}],
+            default_ignore=["node_modules"]
+        )
+        self.assertEqual(len(roots), 2)
+        self.assertIsNone(roots[0].max_depth)
+        self.assertEqual(roots[1].max_depth, 2)
+        self.assertTrue(roots[1].is_ignored("node_modules"))
+        self.assertTrue(roots[1].is_ignored("x.tmp"))
+        self.assertFalse(roots[0].is_ignored("x.tmp"))
+
+    def test_is_watch_limit_error(self):
+        """İzleme sınırı hatalarının tanındığını test et."""
+        self.assertTrue(is_watch_limit_error(OSError(errno.ENOSPC, "inotify watch limit reached")))
+        self.assertFalse(is_watch_limit_error(OSError(errno.EACCES, "permission denied")))
+        self.assertFalse(is_watch_limit_error(ValueError()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+Pencere ilişkilendirme için test modülü.
+"""
+import unittest
+import os
+import sys
+import datetime
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Modül yolunu ekle (veri işleme modülü src dizinini kök olarak kullanır)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from data_collection.database import Base, WindowActivity, KeyboardActivity, FileActivity
+from data_processing.window_attribution import attribute_windows, match_windows
+
+class TestWindowAttribution(unittest.TestCase):
+    """Pencere ilişkilendirme için test sınıfı."""
+
+    def setUp(self):
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine)
+        self.db_session = sessionmaker(bind=engine)()
+        self.start = datetime.datetime(2024, 1, 15, 9, 0, 0)
+
+    def tearDown(self):
+        self.db_session.close()
+
+    def _at(self, seconds):
+        return self.start + datetime.timedelta(seconds=seconds)
+
+    def test_match_windows(self):
+        """Olayların kapsayan pencerelere ve boşluklarda -1'e eşlendiğini test et."""
+        starts = np.array([0.0, 100.0, 300.0])
+        ends = np.array([100.0, 200.0, 400.0])
+        ids = np.array([1, 2, 3])
+        matched = match_windows(starts, ends, ids, np.array([-5.0, 0.0, 99.9, 100.0, 250.0, 399.0, 400.0]))
+        self.assertEqual(matched.tolist(), [-1, 1, 1, 2, -1, 3, -1])
+
+    def test_attribute_windows(self):
+        """Kayıtların pencerelere bağlandığını ve yalnızca boş olanların işlendiğini test et."""
+        first = WindowActivity(timestamp=self._at(0), application_name="code.exe", duration=60)
+        second = WindowActivity(timestamp=self._at(60), application_name="chrome.exe", duration=60)
+        self.db_session.add_all([first, second])
+        self.db_session.commit()
+
+        self.db_session.add_all([
+            KeyboardActivity(timestamp=self._at(10), key_count=5),
+            KeyboardActivity(timestamp=self._at(70), key_count=3),
+            KeyboardActivity(timestamp=self._at(500), key_count=1),
+            FileActivity(timestamp=self._at(30), file_path="a.txt", action="modified", window_id=second.id),
+        ])
+        self.db_session.commit()
+
+        results = attribute_windows(self.db_session, self.start, self._at(3600))
+
+        self.assertEqual(results['keyboard_activities'], 2)
+        self.assertEqual(results['file_activities'], 0)
+        keyboard = self.db_session.query(KeyboardActivity).order_by(KeyboardActivity.id).all()
+        self.assertEqual([row.window_id for row in keyboard], [first.id, second.id, None])
+
+        results = attribute_windows(self.db_session, self.start, self._at(3600), only_missing=False)
+        self.assertEqual(results['file_activities'], 1)
+        self.assertEqual(self.db_session.query(FileActivity).one().window_id, first.id)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Yazma yolu toplamları için test modülü.
+"""
+import unittest
+import os
+import sys
+import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_collection.database import Base, WindowActivity, BrowserActivity, ActivityRollup
+from src.data_collection.write_path import (
+    install_rollup_hooks, split_by_hour, get_today_totals, get_week_totals, rebuild_rollups,
+    DIMENSION_TOTAL, DIMENSION_CATEGORY, DIMENSION_DOMAIN
+)
+
+class TestWritePath(unittest.TestCase):
+    """Yazma yolu toplamları için test sınıfı."""
+
+    def setUp(self):
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine)
+        self.Session = sessionmaker(bind=engine)
+        install_rollup_hooks(self.Session)
+        self.now = datetime.datetime(2024, 1, 17, 18, 0, 0)  # Çarşamba
+
+    def _windows(self):
+        return [
+            WindowActivity(timestamp=datetime.datetime(2024, 1, 17, 9, 50), application_name="code.exe",
+                           window_title="main.py", duration=1200, session_id=1),
+            WindowActivity(timestamp=datetime.datetime(2024, 1, 15, 9, 0), application_name="slack.exe",
+                           window_title="general", duration=300, session_id=1),
+            BrowserActivity(timestamp=datetime.datetime(2024, 1, 17, 11, 0), domain="github.com",
+                            url="https://github.com", duration=60, session_id=1),
+        ]
+
+    def test_split_by_hour(self):
+        """Aralıkların saat sınırlarında bölündüğünü test et."""
+        parts = list(split_by_hour(datetime.datetime(2024, 1, 1, 9, 50), 1200))
+        self.assertEqual(parts, [
+            (datetime.datetime(2024, 1, 1, 9, 0), 600.0),
+            (datetime.datetime(2024, 1, 1, 10, 0), 600.0),
+        ])
+
+    def test_rollups_are_written_in_the_same_transaction(self):
+        """Toplamların ekleme ile birlikte yazıldığını ve geri alındığını test et."""
+        db_session = self.Session()
+        db_session.add_all(self._windows())
+        db_session.commit()
+
+        self.assertEqual(get_today_totals(db_session, now=self.now), {"code.exe": 1200})
+        self.assertEqual(get_today_totals(db_session, DIMENSION_TOTAL, now=self.now), {"": 1200})
+        self.assertEqual(get_today_totals(db_session, DIMENSION_DOMAIN, now=self.now), {"github.com": 60})
+        self.assertEqual(get_week_totals(db_session, DIMENSION_CATEGORY, now=self.now), {
+            "development": 1200, "communication": 300
+        })
+
+        db_session.add(WindowActivity(timestamp=self.now, application_name="code.exe", duration=100, session_id=1))
+        db_session.flush()
+        db_session.rollback()
+        self.assertEqual(get_today_totals(db_session, now=self.now), {"code.exe": 1200})
+        db_session.close()
+
+    def test_replayed_batch_is_not_counted_twice(self):
+        """Aynı partinin yeniden oynatılmasının toplamları değiştirmediğini test et."""
+        for _ in range(2):
+            db_session = self.Session()
+            db_session.add_all(self._windows())
+            db_session.commit()
+            db_session.close()
+
+        db_session = self.Session()
+        self.assertEqual(get_today_totals(db_session, now=self.now), {"code.exe": 1200})
+        db_session.close()
+
+    def test_rebuild_rollups(self):
+        """Günün toplamlarının ham kayıtlardan yeniden oluşturulduğunu test et."""
+        db_session = self.Session()
+        db_session.add_all(self._windows())
+        db_session.commit()
+        db_session.query(ActivityRollup).delete()
+        db_session.commit()
+
+        rebuild_rollups(db_session, self.now.date())
+
+        self.assertEqual(get_today_totals(db_session, now=self.now), {"code.exe": 1200})
+        self.assertEqual(get_week_totals(db_session, now=self.now), {"code.exe": 1200})
+        db_session.close()
+
+    def test_rebuild_keeps_midnight_spillover(self):
+        """Önceki günden taşan aralığın bu güne düşen kısmının yeniden oluşturmada korunduğunu test et."""
+        db_session = self.Session()
+        db_session.add(WindowActivity(timestamp=datetime.datetime(2024, 1, 16, 23, 30), application_name="code.exe",
+                                      duration=3600, session_id=1))
+        db_session.commit()
+        db_session.query(ActivityRollup).delete()
+        db_session.commit()
+
+        rebuild_rollups(db_session, self.now.date())
+
+        self.assertEqual(get_today_totals(db_session, now=self.now), {"code.exe": 1800})
+        # Önceki günün saatleri bu günün yeniden oluşturulmasında yazılmaz
+        self.assertEqual(db_session.query(ActivityRollup).filter(
+            ActivityRollup.bucket < datetime.datetime(2024, 1, 17)
+        ).count(), 0)
+        db_session.close()
+
+if __name__ == '__main__':
+    unittest.main()